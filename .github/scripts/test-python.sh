@@ -103,6 +103,29 @@ python3 ./python-api-examples/offline-speaker-diarization.py
 rm -rf *.wav *.onnx ./sherpa-onnx-pyannote-segmentation-3-0
 
 
+log "test_multi_stream_vad"
+mkdir -p /tmp/vad-models
+pushd /tmp/vad-models
+curl -SL -O https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/silero_vad.onnx
+curl -SL -O https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/ten-vad.onnx
+curl -SL -O https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/lei-jun-test.wav
+popd
+
+python3 ./sherpa-onnx/python/tests/test_multi_stream_vad.py --verbose
+
+rm -rf /tmp/vad-models
+
+log "test_online_speech_denoiser"
+mkdir -p /tmp/speech-enhancement-models
+pushd /tmp/speech-enhancement-models
+curl -SL -O https://github.com/k2-fsa/sherpa-onnx/releases/download/speech-enhancement-models/gtcrn_simple.onnx
+curl -SL -O https://github.com/k2-fsa/sherpa-onnx/releases/download/speech-enhancement-models/speech_with_noise.wav
+popd
+
+python3 ./sherpa-onnx/python/tests/test_online_speech_denoiser.py --verbose
+
+rm -rf /tmp/speech-enhancement-models
+
 log "test_clustering"
 pushd /tmp/
 mkdir test-cluster
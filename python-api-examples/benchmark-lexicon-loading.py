@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+#
+# Copyright (c)  2025  Xiaomi Corporation
+
+"""
+This file measures the startup time of a TTS model with lexicon.txt and
+with the binary lexicon produced by `sherpa-onnx compile-lexicon`.
+
+Usage:
+
+wget https://github.com/k2-fsa/sherpa-onnx/releases/download/tts-models/vits-icefall-zh-aishell3.tar.bz2
+tar xvf vits-icefall-zh-aishell3.tar.bz2
+
+python3 ./python-api-examples/benchmark-lexicon-loading.py \
+ --vits-model=./vits-icefall-zh-aishell3/model.onnx \
+ --vits-lexicon=./vits-icefall-zh-aishell3/lexicon.txt \
+ --vits-tokens=./vits-icefall-zh-aishell3/tokens.txt \
+ --num-runs=5
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import sherpa_onnx
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "--vits-model",
+        type=str,
+        required=True,
+        help="Path to vits model.onnx",
+    )
+
+    parser.add_argument(
+        "--vits-lexicon",
+        type=str,
+        required=True,
+        help="Path to lexicon.txt",
+    )
+
+    parser.add_argument(
+        "--vits-tokens",
+        type=str,
+        required=True,
+        help="Path to tokens.txt",
+    )
+
+    parser.add_argument(
+        "--vits-dict-dir",
+        type=str,
+        default="",
+        help="Path to the dict directory for models using jieba",
+    )
+
+    parser.add_argument(
+        "--num-runs",
+        type=int,
+        default=5,
+        help="Number of times to create the model for each lexicon",
+    )
+
+    return parser.parse_args()
+
+
+def create_tts(args, lexicon: str):
+    config = sherpa_onnx.OfflineTtsConfig(
+        model=sherpa_onnx.OfflineTtsModelConfig(
+            vits=sherpa_onnx.OfflineTtsVitsModelConfig(
+                model=args.vits_model,
+                lexicon=lexicon,
+                dict_dir=args.vits_dict_dir,
+                tokens=args.vits_tokens,
+            ),
+        ),
+    )
+    if not config.validate():
+        raise ValueError("Please check your config")
+
+    return sherpa_onnx.OfflineTts(config)
+
+
+def benchmark(args, lexicon: str) -> float:
+    # The first run warms up the page cache
+    create_tts(args, lexicon)
+
+    start = time.time()
+    for _ in range(args.num_runs):
+        create_tts(args, lexicon)
+    return (time.time() - start) / args.num_runs
+
+
+def main():
+    args = get_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        binary_lexicon = str(Path(d) / "lexicon.bin")
+
+        start = time.time()
+        if not sherpa_onnx.compile_lexicon(
+            lexicon=args.vits_lexicon,
+            tokens=args.vits_tokens,
+            output=binary_lexicon,
+        ):
+            raise RuntimeError(f"Failed to compile {args.vits_lexicon}")
+        compile_time = time.time() - start
+
+        text_time = benchmark(args, args.vits_lexicon)
+        binary_time = benchmark(args, binary_lexicon)
+
+    print(f"Compile lexicon: {compile_time:.3f} s")
+    print(f"Startup with {args.vits_lexicon}: {text_time:.3f} s")
+    print(f"Startup with the binary lexicon: {binary_time:.3f} s")
+    print(f"Speedup: {text_time / binary_time:.2f}")
+
+
+if __name__ == "__main__":
+    main()
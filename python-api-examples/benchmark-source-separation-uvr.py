@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# Copyright (c)  2025  Xiaomi Corporation
+
+"""
+This file measures the throughput of UVR source separation for different
+values of num_chunks_per_run.
+
+Please first download a UVR model and a test file. See
+./offline-source-separation-uvr.py for details.
+
+Usage:
+
+    python3 ./python-api-examples/benchmark-source-separation-uvr.py \
+      --model ./UVR_MDXNET_9482.onnx \
+      --wav ./qi-feng-le-zh.wav \
+      --num-chunks-per-run 1,2,4 \
+      --num-threads 4
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import sherpa_onnx
+import soundfile as sf
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="./UVR_MDXNET_9482.onnx",
+        help="Path to the UVR model",
+    )
+
+    parser.add_argument(
+        "--wav",
+        type=str,
+        default="./qi-feng-le-zh.wav",
+        help="Path to the test wave file",
+    )
+
+    parser.add_argument(
+        "--num-chunks-per-run",
+        type=str,
+        default="1,2,4",
+        help="Comma separated values of num_chunks_per_run to benchmark",
+    )
+
+    parser.add_argument(
+        "--num-threads",
+        type=int,
+        default=1,
+        help="Number of threads for the neural network",
+    )
+
+    parser.add_argument(
+        "--num-runs",
+        type=int,
+        default=3,
+        help="Number of runs for each value of num_chunks_per_run",
+    )
+
+    return parser.parse_args()
+
+
+def create_offline_source_separation(args, num_chunks_per_run: int):
+    config = sherpa_onnx.OfflineSourceSeparationConfig(
+        model=sherpa_onnx.OfflineSourceSeparationModelConfig(
+            uvr=sherpa_onnx.OfflineSourceSeparationUvrModelConfig(
+                model=args.model,
+            ),
+            num_threads=args.num_threads,
+            debug=False,
+            provider="cpu",
+        ),
+        num_chunks_per_run=num_chunks_per_run,
+    )
+    if not config.validate():
+        raise ValueError("Please check your config.")
+
+    return sherpa_onnx.OfflineSourceSeparation(config)
+
+
+def main():
+    args = get_args()
+    for f in [args.model, args.wav]:
+        if not Path(f).is_file():
+            raise ValueError(f"{f} does not exist")
+
+    samples, sample_rate = sf.read(args.wav, dtype="float32", always_2d=True)
+    samples = np.ascontiguousarray(np.transpose(samples))
+    audio_duration = samples.shape[1] / sample_rate
+
+    print(f"Audio duration in seconds: {audio_duration:.3f}")
+    print("num_chunks_per_run | elapsed seconds | RTF")
+
+    for n in map(int, args.num_chunks_per_run.split(",")):
+        sp = create_offline_source_separation(args, n)
+
+        # warm up
+        sp.process(sample_rate=sample_rate, samples=samples[:, :sample_rate])
+
+        start = time.time()
+        for _ in range(args.num_runs):
+            sp.process(sample_rate=sample_rate, samples=samples)
+        elapsed_seconds = (time.time() - start) / args.num_runs
+
+        print(
+            f"{n:18d} | {elapsed_seconds:15.3f} | "
+            f"{elapsed_seconds / audio_duration:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
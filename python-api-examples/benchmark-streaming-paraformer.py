@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# Copyright (c)  2025  Xiaomi Corporation
+
+"""
+This file compares decoding streams one by one with decoding them in a batch
+for streaming paraformer models. It checks that both give the same results
+and prints the throughput of each.
+
+Please first download a model, e.g.,
+
+    wget https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/sherpa-onnx-streaming-paraformer-bilingual-zh-en.tar.bz2
+    tar xvf sherpa-onnx-streaming-paraformer-bilingual-zh-en.tar.bz2
+
+Usage:
+
+    python3 ./python-api-examples/benchmark-streaming-paraformer.py \
+      --tokens ./sherpa-onnx-streaming-paraformer-bilingual-zh-en/tokens.txt \
+      --encoder ./sherpa-onnx-streaming-paraformer-bilingual-zh-en/encoder.int8.onnx \
+      --decoder ./sherpa-onnx-streaming-paraformer-bilingual-zh-en/decoder.int8.onnx \
+      --batch-size 8 \
+      ./sherpa-onnx-streaming-paraformer-bilingual-zh-en/test_wavs/0.wav \
+      ./sherpa-onnx-streaming-paraformer-bilingual-zh-en/test_wavs/1.wav
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import sherpa_onnx
+import soundfile as sf
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument("--tokens", type=str, required=True)
+    parser.add_argument("--encoder", type=str, required=True)
+    parser.add_argument("--decoder", type=str, required=True)
+
+    parser.add_argument(
+        "--num-threads",
+        type=int,
+        default=1,
+        help="Number of threads for the neural network",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=8,
+        help="Number of streams to decode in parallel",
+    )
+
+    parser.add_argument(
+        "sound_files",
+        type=str,
+        nargs="+",
+        help="The input sound files. They are repeated to fill a batch",
+    )
+
+    return parser.parse_args()
+
+
+def read_wave(filename: str) -> Tuple[np.ndarray, int]:
+    samples, sample_rate = sf.read(filename, dtype="float32", always_2d=True)
+    return np.ascontiguousarray(samples[:, 0]), sample_rate
+
+
+def create_streams(recognizer, waves: List[Tuple[np.ndarray, int]]):
+    streams = []
+    for samples, sample_rate in waves:
+        s = recognizer.create_stream()
+        s.accept_waveform(sample_rate, samples)
+
+        tail_paddings = np.zeros(int(0.66 * sample_rate), dtype=np.float32)
+        s.accept_waveform(sample_rate, tail_paddings)
+        s.input_finished()
+        streams.append(s)
+    return streams
+
+
+def decode_one_by_one(recognizer, streams) -> float:
+    start = time.time()
+    for s in streams:
+        while recognizer.is_ready(s):
+            recognizer.decode_stream(s)
+    return time.time() - start
+
+
+def decode_in_batch(recognizer, streams) -> float:
+    start = time.time()
+    while True:
+        ready = [s for s in streams if recognizer.is_ready(s)]
+        if not ready:
+            break
+        recognizer.decode_streams(ready)
+    return time.time() - start
+
+
+def main():
+    args = get_args()
+    for f in [args.tokens, args.encoder, args.decoder] + args.sound_files:
+        if not Path(f).is_file():
+            raise ValueError(f"{f} does not exist")
+
+    recognizer = sherpa_onnx.OnlineRecognizer.from_paraformer(
+        tokens=args.tokens,
+        encoder=args.encoder,
+        decoder=args.decoder,
+        num_threads=args.num_threads,
+    )
+
+    waves = [read_wave(f) for f in args.sound_files]
+    waves = [waves[i % len(waves)] for i in range(args.batch_size)]
+    audio_duration = sum(len(s) / sr for s, sr in waves)
+
+    streams1 = create_streams(recognizer, waves)
+    elapsed1 = decode_one_by_one(recognizer, streams1)
+
+    streams2 = create_streams(recognizer, waves)
+    elapsed2 = decode_in_batch(recognizer, streams2)
+
+    num_mismatches = 0
+    for i, (s1, s2) in enumerate(zip(streams1, streams2)):
+        text1 = recognizer.get_result(s1)
+        text2 = recognizer.get_result(s2)
+        if text1 != text2:
+            num_mismatches += 1
+            print(f"Stream {i}:\n  one by one: {text1}\n  batch: {text2}")
+
+    print(f"Number of streams: {len(streams1)}")
+    print(f"Number of mismatches: {num_mismatches}")
+    print(f"Audio duration in seconds: {audio_duration:.3f}")
+    print(f"One by one: {elapsed1:.3f} s, RTF: {elapsed1 / audio_duration:.3f}")
+    print(f"Batch: {elapsed2:.3f} s, RTF: {elapsed2 / audio_duration:.3f}")
+    print(f"Speedup: {elapsed1 / elapsed2:.2f}")
+
+
+if __name__ == "__main__":
+    main()
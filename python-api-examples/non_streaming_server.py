@@ -146,6 +146,7 @@ It will generate 3 files, one of which is the required `cert.pem`.
 
 import argparse
 import asyncio
+import functools
 import http
 import logging
 import socket
@@ -540,6 +541,27 @@ def get_args():
         """,
     )
 
+    parser.add_argument(
+        "--max-padding-ratio",
+        type=float,
+        default=1.0,
+        help="""If less than 1, requests in a batch are sorted by length and
+        split into smaller batches so that the ratio of padded frames in each
+        of them does not exceed this value. 1 means to decode all requests
+        of a batch together.
+        """,
+    )
+
+    parser.add_argument(
+        "--max-frames-per-batch",
+        type=int,
+        default=0,
+        help="""If positive, requests in a batch are split into smaller batches
+        so that num_requests * max_num_frames of each of them does not exceed
+        this value. 0 means no limit.
+        """,
+    )
+
     parser.add_argument(
         "--nn-pool-size",
         type=int,
@@ -607,6 +629,8 @@ class NonStreamingServer:
         max_active_connections: int,
         doc_root: str,
         certificate: Optional[str] = None,
+        max_padding_ratio: float = 1.0,
+        max_frames_per_batch: int = 0,
     ):
         """
         Args:
@@ -634,6 +658,10 @@ class NonStreamingServer:
             Optional. If not None, it will use secure websocket.
             You can use ./web/generate-certificate.py to generate
             it (the default generated filename is `cert.pem`).
+          max_padding_ratio:
+            See OfflineRecognizer.decode_streams().
+          max_frames_per_batch:
+            See OfflineRecognizer.decode_streams().
         """
         self.recognizer = recognizer
 
@@ -646,7 +674,17 @@ class NonStreamingServer:
             thread_name_prefix="nn",
         )
 
-        self.stream_queue = asyncio.Queue()
+        self.scheduler = sherpa_onnx.BatchScheduler(
+            functools.partial(
+                recognizer.decode_streams,
+                max_padding_ratio=max_padding_ratio,
+                max_frames_per_batch=max_frames_per_batch,
+            ),
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            num_workers=nn_pool_size,
+            executor=self.nn_pool,
+        )
 
         self.max_wait_ms = max_wait_ms
         self.max_batch_size = max_batch_size
@@ -716,9 +754,7 @@ or <a href="/offline_record.html">/offline_record.html</a>
     async def run(self, port: int):
         logging.info("started")
 
-        tasks = []
-        for i in range(self.nn_pool_size):
-            tasks.append(asyncio.create_task(self.stream_consumer_task()))
+        await self.scheduler.start()
 
         if self.certificate:
             logging.info(f"Using certificate: {self.certificate}")
@@ -750,8 +786,6 @@ or <a href="/offline_record.html">/offline_record.html</a>
 
             await asyncio.Future()  # run forever
 
-        await asyncio.gather(*tasks)  # not reachable
-
     async def recv_audio_samples(
         self,
         socket: websockets.WebSocketServerProtocol,
@@ -819,53 +853,18 @@ or <a href="/offline_record.html">/offline_record.html</a>
         array = np.frombuffer(samples, dtype=np.float32)
         return array, sample_rate
 
-    async def stream_consumer_task(self):
-        """This function extracts streams from the queue, batches them up, sends
-        them to the RNN-T model for computation and decoding.
-        """
-        while True:
-            if self.stream_queue.empty():
-                await asyncio.sleep(self.max_wait_ms / 1000)
-                continue
-
-            batch = []
-            try:
-                while len(batch) < self.max_batch_size:
-                    item = self.stream_queue.get_nowait()
-
-                    batch.append(item)
-            except asyncio.QueueEmpty:
-                pass
-
-            stream_list = [b[0] for b in batch]
-            future_list = [b[1] for b in batch]
-
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(
-                self.nn_pool,
-                self.recognizer.decode_streams,
-                stream_list,
-            )
-
-            for f in future_list:
-                self.stream_queue.task_done()
-                f.set_result(None)
-
     async def compute_and_decode(
         self,
         stream: sherpa_onnx.OfflineStream,
     ) -> None:
-        """Put the stream into the queue and wait it to be processed by the
-        consumer task.
+        """Put the stream into the queue of the batch scheduler and wait for
+        it to be processed.
 
         Args:
           stream:
             The stream to be processed. Note: It is changed in-place.
         """
-        loop = asyncio.get_running_loop()
-        future = loop.create_future()
-        await self.stream_queue.put((stream, future))
-        await future
+        await self.scheduler.submit(stream)
 
     async def handle_connection(
         self,
@@ -890,6 +889,7 @@ or <a href="/offline_record.html">/offline_record.html</a>
                 f"Disconnected: {socket.remote_address}. "
                 f"Number of connections: {self.current_active_connections}/{self.max_active_connections}"  # noqa
             )
+            logging.debug(f"Batch scheduler: {self.scheduler.stats()}")
 
     async def handle_connection_impl(
         self,
@@ -1183,6 +1183,8 @@ def main():
         max_active_connections=max_active_connections,
         certificate=certificate,
         doc_root=doc_root,
+        max_padding_ratio=args.max_padding_ratio,
+        max_frames_per_batch=args.max_frames_per_batch,
     )
     asyncio.run(non_streaming_server.run(port))
 
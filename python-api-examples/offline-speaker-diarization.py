@@ -71,6 +71,11 @@ def init_speaker_diarization(num_speakers: int = -1, cluster_threshold: float =
         ),
         min_duration_on=0.3,
         min_duration_off=0.5,
+        # Run the segmentation model on 32 sliding windows per call with
+        # 2 threads. Larger values are faster but use more memory.
+        segmentation_batch_size=32,
+        segmentation_num_workers=2,
+        embedding_batch_size=8,
     )
     if not config.validate():
         raise RuntimeError(
@@ -339,6 +339,16 @@ def get_args():
         help="Number of threads for neural network computation",
     )
 
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=1,
+        help="""Number of sentences that are synthesized in parallel. If it is
+        larger than 1, playback of the first sentence starts while the following
+        sentences are still being synthesized. Each worker uses --num-threads
+        threads.""",
+    )
+
     parser.add_argument(
         "--speed",
         type=float,
@@ -505,6 +515,7 @@ def main():
         ),
         rule_fsts=args.tts_rule_fsts,
         max_num_sentences=1,
+        num_workers=args.num_workers,
     )
 
     if not tts_config.validate():
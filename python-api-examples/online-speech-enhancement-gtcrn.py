@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+"""
+This file shows how to use the streaming speech enhancement API.
+
+The input file is fed to the denoiser chunk by chunk, as if it were read
+from a microphone.
+
+Please download files used this script from
+https://github.com/k2-fsa/sherpa-onnx/releases/tag/speech-enhancement-models
+
+Example:
+
+ wget https://github.com/k2-fsa/sherpa-onnx/releases/download/speech-enhancement-models/gtcrn_simple.onnx
+ wget https://github.com/k2-fsa/sherpa-onnx/releases/download/speech-enhancement-models/speech_with_noise.wav
+"""
+
+import time
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import sherpa_onnx
+import soundfile as sf
+
+
+def create_speech_denoiser():
+    model_filename = "./gtcrn_simple.onnx"
+    if not Path(model_filename).is_file():
+        raise ValueError(
+            "Please first download a model from "
+            "https://github.com/k2-fsa/sherpa-onnx/releases/tag/speech-enhancement-models"
+        )
+
+    config = sherpa_onnx.OnlineSpeechDenoiserConfig(
+        model=sherpa_onnx.OfflineSpeechDenoiserModelConfig(
+            gtcrn=sherpa_onnx.OfflineSpeechDenoiserGtcrnModelConfig(
+                model=model_filename
+            ),
+            debug=False,
+            num_threads=1,
+            provider="cpu",
+        )
+    )
+    if not config.validate():
+        print(config)
+        raise ValueError("Errors in config. Please check previous error logs")
+    return sherpa_onnx.OnlineSpeechDenoiser(config)
+
+
+def load_audio(filename: str) -> Tuple[np.ndarray, int]:
+    data, sample_rate = sf.read(
+        filename,
+        always_2d=True,
+        dtype="float32",
+    )
+    data = data[:, 0]  # use only the first channel
+    samples = np.ascontiguousarray(data)
+    return samples, sample_rate
+
+
+def main():
+    sd = create_speech_denoiser()
+    test_wave = "./speech_with_noise.wav"
+    if not Path(test_wave).is_file():
+        raise ValueError(
+            f"{test_wave} does not exist. You can download it from "
+            "https://github.com/k2-fsa/sherpa-onnx/releases/tag/speech-enhancement-models"
+        )
+
+    samples, sample_rate = load_audio(test_wave)
+
+    stream = sd.create_stream()
+
+    # 10 ms per chunk
+    chunk_size = sample_rate // 100
+
+    start = time.time()
+    denoised = []
+    for i in range(0, len(samples), chunk_size):
+        out = sd.run(stream, samples[i : i + chunk_size], sample_rate)
+        denoised.append(out.samples)
+    denoised.append(sd.flush(stream).samples)
+    end = time.time()
+
+    denoised = np.concatenate(denoised)
+
+    elapsed_seconds = end - start
+    audio_duration = len(samples) / sample_rate
+    real_time_factor = elapsed_seconds / audio_duration
+
+    sf.write("./enhanced_16k_streaming.wav", denoised, sd.sample_rate)
+    print("Saved to ./enhanced_16k_streaming.wav")
+    print(f"Latency: {sd.latency / sd.sample_rate * 1000:.1f} ms")
+    print(f"Elapsed seconds: {elapsed_seconds:.3f}")
+    print(f"Audio duration in seconds: {audio_duration:.3f}")
+    print(f"RTF: {elapsed_seconds:.3f}/{audio_duration:.3f} = {real_time_factor:.3f}")
+
+
+if __name__ == "__main__":
+    main()
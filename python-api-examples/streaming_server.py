@@ -542,7 +542,13 @@ class StreamingServer(object):
             thread_name_prefix="nn",
         )
 
-        self.stream_queue = asyncio.Queue()
+        self.scheduler = sherpa_onnx.BatchScheduler(
+            recognizer,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            num_workers=nn_pool_size,
+            executor=self.nn_pool,
+        )
 
         self.max_wait_ms = max_wait_ms
         self.max_batch_size = max_batch_size
@@ -554,54 +560,18 @@ class StreamingServer(object):
 
         self.sample_rate = int(recognizer.config.feat_config.sampling_rate)
 
-    async def stream_consumer_task(self):
-        """This function extracts streams from the queue, batches them up, sends
-        them to the neural network model for computation and decoding.
-        """
-        while True:
-            if self.stream_queue.empty():
-                await asyncio.sleep(self.max_wait_ms / 1000)
-                continue
-
-            batch = []
-            try:
-                while len(batch) < self.max_batch_size:
-                    item = self.stream_queue.get_nowait()
-
-                    assert self.recognizer.is_ready(item[0])
-
-                    batch.append(item)
-            except asyncio.QueueEmpty:
-                pass
-            stream_list = [b[0] for b in batch]
-            future_list = [b[1] for b in batch]
-
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(
-                self.nn_pool,
-                self.recognizer.decode_streams,
-                stream_list,
-            )
-
-            for f in future_list:
-                self.stream_queue.task_done()
-                f.set_result(None)
-
     async def compute_and_decode(
         self,
         stream: sherpa_onnx.OnlineStream,
     ) -> None:
-        """Put the stream into the queue and wait it to be processed by the
-        consumer task.
+        """Put the stream into the queue of the batch scheduler and wait for
+        it to be processed.
 
         Args:
           stream:
             The stream to be processed. Note: It is changed in-place.
         """
-        loop = asyncio.get_running_loop()
-        future = loop.create_future()
-        await self.stream_queue.put((stream, future))
-        await future
+        await self.scheduler.submit(stream)
 
     async def process_request(
         self,
@@ -654,9 +624,7 @@ Go back to <a href="/streaming_record.html">/streaming_record.html</a>
         return status, header, response
 
     async def run(self, port: int):
-        tasks = []
-        for i in range(self.nn_pool_size):
-            tasks.append(asyncio.create_task(self.stream_consumer_task()))
+        await self.scheduler.start()
 
         if self.certificate:
             logging.info(f"Using certificate: {self.certificate}")
@@ -694,8 +662,6 @@ Go back to <a href="/streaming_record.html">/streaming_record.html</a>
 
             await asyncio.Future()  # run forever
 
-        await asyncio.gather(*tasks)  # not reachable
-
     async def handle_connection(
         self,
         socket: websockets.WebSocketServerProtocol,
@@ -719,6 +685,7 @@ Go back to <a href="/streaming_record.html">/streaming_record.html</a>
                 f"Disconnected: {socket.remote_address}. "
                 f"Number of connections: {self.current_active_connections}/{self.max_active_connections}"  # noqa
             )
+            logging.debug(f"Batch scheduler: {self.scheduler.stats()}")
 
     async def handle_connection_impl(
         self,
@@ -0,0 +1,148 @@
+// sherpa-onnx/csrc/binary-lexicon-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/binary-lexicon.h"
+
+#include <cstdio>
+#include <fstream>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include "gtest/gtest.h"
+#include "sherpa-onnx/csrc/symbol-table.h"
+
+namespace sherpa_onnx {
+
+static void WriteText(const std::string &filename, const std::string &text) {
+  std::ofstream os(filename);
+  os << text;
+}
+
+static std::vector<int32_t> Find(const BinaryLexicon &lexicon,
+                                 const std::string &word) {
+  int32_t num_ids = 0;
+  const int32_t *ids = lexicon.Find(word, &num_ids);
+  if (!ids) {
+    return {};
+  }
+  return {ids, ids + num_ids};
+}
+
+TEST(BinaryLexicon, CompileLexicon) {
+  WriteText("binary-lexicon-test-tokens.txt", "a 1\nb 2\nc 3\nd 4\n 5\n");
+  WriteText("binary-lexicon-test-lexicon.txt",
+            "HELLO a b c\n"
+            "world d a\n"
+            "hello a\n"  // duplicate
+            "\n"
+            "foo a x\n"  // x is not in tokens
+            "你好 c c d\n");
+
+  ASSERT_TRUE(CompileLexicon("binary-lexicon-test-lexicon.txt",
+                             "binary-lexicon-test-tokens.txt",
+                             "binary-lexicon-test-lexicon.bin"));
+
+  auto file = ReadFile("binary-lexicon-test-lexicon.bin");
+  ASSERT_TRUE(BinaryLexicon::IsBinaryLexicon(file.data(), file.size()));
+
+  BinaryLexicon lexicon(std::move(file));
+  EXPECT_EQ(lexicon.NumWords(), 3);
+  EXPECT_EQ(Find(lexicon, "hello"), (std::vector<int32_t>{1, 2, 3}));
+  EXPECT_EQ(Find(lexicon, "world"), (std::vector<int32_t>{4, 1}));
+  EXPECT_EQ(Find(lexicon, "你好"), (std::vector<int32_t>{3, 3, 4}));
+  EXPECT_TRUE(Find(lexicon, "HELLO").empty());
+  EXPECT_TRUE(Find(lexicon, "foo").empty());
+  EXPECT_TRUE(Find(lexicon, "").empty());
+  EXPECT_TRUE(Find(lexicon, "zzz").empty());
+
+  // It is rejected as input
+  EXPECT_FALSE(CompileLexicon("binary-lexicon-test-lexicon.bin",
+                              "binary-lexicon-test-tokens.txt",
+                              "binary-lexicon-test-lexicon2.bin"));
+
+  std::remove("binary-lexicon-test-tokens.txt");
+  std::remove("binary-lexicon-test-lexicon.txt");
+  std::remove("binary-lexicon-test-lexicon.bin");
+}
+
+TEST(BinaryLexicon, CompileTokens) {
+  // <unk> has two IDs
+  WriteText("binary-lexicon-test-tokens.txt",
+            "<blk> 0\n<unk> 1\n▁a 2\n 3\n<unk> 4\n");
+  ASSERT_TRUE(CompileTokens("binary-lexicon-test-tokens.txt",
+                            "binary-lexicon-test-tokens.bin"));
+
+  std::unordered_map<int32_t, std::string> expected_id2token;
+  std::unordered_map<std::string, int32_t> expected_token2id;
+  {
+    std::ifstream is("binary-lexicon-test-tokens.txt");
+    expected_token2id = ReadTokens(is, &expected_id2token);
+  }
+
+  std::unordered_map<int32_t, std::string> id2token;
+  std::unordered_map<std::string, int32_t> token2id;
+  {
+    std::ifstream is("binary-lexicon-test-tokens.bin", std::ios::binary);
+    token2id = ReadTokens(is, &id2token);
+  }
+
+  EXPECT_EQ(token2id, expected_token2id);
+  EXPECT_EQ(id2token, expected_id2token);
+  EXPECT_EQ(token2id.at("<unk>"), 1);
+  EXPECT_EQ(id2token.at(4), "<unk>");
+
+  // Two tokens share the same ID
+  WriteText("binary-lexicon-test-tokens.txt", "a 0\nb 0\n");
+  EXPECT_FALSE(CompileTokens("binary-lexicon-test-tokens.txt",
+                             "binary-lexicon-test-tokens.bin"));
+
+  std::remove("binary-lexicon-test-tokens.txt");
+  std::remove("binary-lexicon-test-tokens.bin");
+}
+
+static std::vector<int32_t> Find(const LexiconTable &lexicon,
+                                 const std::string &word) {
+  int32_t num_ids = 0;
+  const int32_t *ids = lexicon.Find(word, &num_ids);
+  if (!ids) {
+    return {};
+  }
+  return {ids, ids + num_ids};
+}
+
+TEST(LexiconTable, TextAndBinary) {
+  // Files with \r\n are read in binary mode, as on Windows
+  WriteText("binary-lexicon-test-tokens.txt", "a 1\r\nb 2\r\nc 3\r\n");
+  WriteText("binary-lexicon-test-lexicon.txt", "hello a b\r\nWorld c\r\n");
+
+  ASSERT_TRUE(CompileLexicon("binary-lexicon-test-lexicon.txt",
+                             "binary-lexicon-test-tokens.txt",
+                             "binary-lexicon-test-lexicon.bin"));
+
+  std::unordered_map<std::string, int32_t> token2id;
+  {
+    std::ifstream is("binary-lexicon-test-tokens.txt", std::ios::binary);
+    token2id = ReadTokens(is);
+  }
+  EXPECT_EQ(token2id.at("c"), 3);
+
+  LexiconTable text;
+  text.Init(ReadFile("binary-lexicon-test-lexicon.txt"), token2id);
+
+  LexiconTable binary;
+  binary.Init(ReadFile("binary-lexicon-test-lexicon.bin"), token2id);
+
+  for (const auto *lexicon : {&text, &binary}) {
+    EXPECT_EQ(Find(*lexicon, "hello"), (std::vector<int32_t>{1, 2}));
+    EXPECT_EQ(Find(*lexicon, "world"), (std::vector<int32_t>{3}));
+    EXPECT_TRUE(Find(*lexicon, "foo").empty());
+  }
+
+  std::remove("binary-lexicon-test-tokens.txt");
+  std::remove("binary-lexicon-test-lexicon.txt");
+  std::remove("binary-lexicon-test-lexicon.bin");
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,340 @@
+// sherpa-onnx/csrc/binary-lexicon.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/binary-lexicon.h"
+
+#include <algorithm>
+#include <cstring>
+#include <fstream>
+#include <memory>
+#include <sstream>
+#include <string_view>
+#include <strstream>
+#include <utility>
+
+#include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/symbol-table.h"
+#include "sherpa-onnx/csrc/text-utils.h"
+
+namespace sherpa_onnx {
+
+static constexpr char kMagic[] = "SOLEXv01";
+static constexpr size_t kMagicSize = sizeof(kMagic) - 1;
+
+// magic + num_words, num_ids, num_string_bytes, reserved
+static constexpr size_t kHeaderSize = kMagicSize + 4 * sizeof(uint32_t);
+
+bool BinaryLexicon::IsBinaryLexicon(const char *data, size_t size) {
+  return size >= kMagicSize && std::memcmp(data, kMagic, kMagicSize) == 0;
+}
+
+bool BinaryLexicon::IsBinaryLexicon(std::istream &is) {
+  auto pos = is.tellg();
+
+  char magic[kMagicSize];
+  is.read(magic, kMagicSize);
+  bool ans = is.gcount() == static_cast<std::streamsize>(kMagicSize) &&
+             IsBinaryLexicon(magic, kMagicSize);
+
+  is.clear();
+  is.seekg(pos);
+
+  return ans;
+}
+
+BinaryLexicon::BinaryLexicon(MappedFile file) : file_(std::move(file)) {
+  Init(file_.data(), file_.size());
+}
+
+BinaryLexicon::BinaryLexicon(std::vector<char> buffer)
+    : buffer_(std::move(buffer)) {
+  Init(buffer_.data(), buffer_.size());
+}
+
+void BinaryLexicon::Init(const char *data, size_t size) {
+  if (size < kHeaderSize || !IsBinaryLexicon(data, size)) {
+    SHERPA_ONNX_LOGE("Not a binary lexicon");
+    exit(-1);
+  }
+
+  uint32_t header[4];
+  std::memcpy(header, data + kMagicSize, sizeof(header));
+
+  uint32_t num_words = header[0];
+  uint32_t num_ids = header[1];
+  uint32_t num_string_bytes = header[2];
+
+  size_t expected_size = kHeaderSize +
+                         2 * (num_words + 1ULL) * sizeof(uint32_t) +
+                         num_ids * sizeof(int32_t) + num_string_bytes;
+  if (size != expected_size) {
+    SHERPA_ONNX_LOGE(
+        "Corrupted binary lexicon. Expected size: %zu. Actual size: %zu",
+        expected_size, size);
+    exit(-1);
+  }
+
+  const char *p = data + kHeaderSize;
+
+  num_words_ = static_cast<int32_t>(num_words);
+
+  word_offsets_ = reinterpret_cast<const uint32_t *>(p);
+  p += (num_words + 1) * sizeof(uint32_t);
+
+  id_offsets_ = reinterpret_cast<const uint32_t *>(p);
+  p += (num_words + 1) * sizeof(uint32_t);
+
+  ids_ = reinterpret_cast<const int32_t *>(p);
+  p += num_ids * sizeof(int32_t);
+
+  strings_ = p;
+
+  if (word_offsets_[num_words] != num_string_bytes ||
+      id_offsets_[num_words] != num_ids) {
+    SHERPA_ONNX_LOGE("Corrupted binary lexicon");
+    exit(-1);
+  }
+}
+
+const int32_t *BinaryLexicon::Find(const std::string &word,
+                                   int32_t *num_ids) const {
+  auto word_at = [this](int32_t i) {
+    return std::string_view(strings_ + word_offsets_[i],
+                            word_offsets_[i + 1] - word_offsets_[i]);
+  };
+
+  int32_t lo = 0;
+  int32_t hi = num_words_;
+  std::string_view w(word);
+  while (lo < hi) {
+    int32_t mid = lo + (hi - lo) / 2;
+    if (word_at(mid) < w) {
+      lo = mid + 1;
+    } else {
+      hi = mid;
+    }
+  }
+
+  if (lo == num_words_ || word_at(lo) != w) {
+    return nullptr;
+  }
+
+  return Ids(lo, num_ids);
+}
+
+std::string BinaryLexicon::Word(int32_t i) const {
+  return {strings_ + word_offsets_[i], strings_ + word_offsets_[i + 1]};
+}
+
+const int32_t *BinaryLexicon::Ids(int32_t i, int32_t *num_ids) const {
+  *num_ids = static_cast<int32_t>(id_offsets_[i + 1] - id_offsets_[i]);
+  return ids_ + id_offsets_[i];
+}
+
+std::unordered_map<std::string, std::vector<int32_t>> ReadLexicon(
+    std::istream &is,
+    const std::unordered_map<std::string, int32_t> &token2id) {
+  std::unordered_map<std::string, std::vector<int32_t>> word2ids;
+
+  std::string word;
+  std::vector<std::string> token_list;
+  std::string line;
+  std::string phone;
+
+  while (std::getline(is, line)) {
+    std::istringstream iss(line);
+
+    token_list.clear();
+
+    if (!(iss >> word)) {
+      continue;
+    }
+    ToLowerCase(&word);
+
+    if (word2ids.count(word)) {
+      SHERPA_ONNX_LOGE("Duplicated word: %s. Ignore it.", word.c_str());
+      continue;
+    }
+
+    while (iss >> phone) {
+      token_list.push_back(std::move(phone));
+    }
+
+    std::vector<int32_t> ids = ConvertTokensToIds(token2id, token_list);
+    if (ids.empty()) {
+      continue;
+    }
+
+    word2ids.insert({std::move(word), std::move(ids)});
+  }
+
+  return word2ids;
+}
+
+void LexiconTable::Init(
+    MappedFile buf, const std::unordered_map<std::string, int32_t> &token2id) {
+  InitImpl(std::move(buf), token2id);
+}
+
+void LexiconTable::Init(
+    std::vector<char> buf,
+    const std::unordered_map<std::string, int32_t> &token2id) {
+  InitImpl(std::move(buf), token2id);
+}
+
+template <typename Buffer>
+void LexiconTable::InitImpl(
+    Buffer buf, const std::unordered_map<std::string, int32_t> &token2id) {
+  if (BinaryLexicon::IsBinaryLexicon(buf.data(), buf.size())) {
+    binary_lexicon_ = std::make_unique<BinaryLexicon>(std::move(buf));
+    word2ids_.clear();
+    return;
+  }
+
+  std::istrstream is(buf.data(), buf.size());
+  word2ids_ = ReadLexicon(is, token2id);
+  binary_lexicon_.reset();
+}
+
+const int32_t *LexiconTable::Find(const std::string &word,
+                                  int32_t *num_ids) const {
+  if (binary_lexicon_) {
+    return binary_lexicon_->Find(word, num_ids);
+  }
+
+  auto it = word2ids_.find(word);
+  if (it == word2ids_.end()) {
+    return nullptr;
+  }
+
+  *num_ids = static_cast<int32_t>(it->second.size());
+  return it->second.data();
+}
+
+bool WriteBinaryLexicon(
+    const std::unordered_map<std::string, std::vector<int32_t>> &word2ids,
+    const std::string &filename) {
+  std::vector<const std::string *> words;
+  words.reserve(word2ids.size());
+  for (const auto &p : word2ids) {
+    words.push_back(&p.first);
+  }
+  std::sort(words.begin(), words.end(),
+            [](const std::string *a, const std::string *b) { return *a < *b; });
+
+  std::vector<uint32_t> word_offsets;
+  std::vector<uint32_t> id_offsets;
+  std::vector<int32_t> ids;
+  std::string strings;
+
+  word_offsets.reserve(words.size() + 1);
+  id_offsets.reserve(words.size() + 1);
+
+  word_offsets.push_back(0);
+  id_offsets.push_back(0);
+  for (const auto *w : words) {
+    const auto &word_ids = word2ids.at(*w);
+    strings.append(*w);
+    ids.insert(ids.end(), word_ids.begin(), word_ids.end());
+
+    word_offsets.push_back(static_cast<uint32_t>(strings.size()));
+    id_offsets.push_back(static_cast<uint32_t>(ids.size()));
+  }
+
+  uint32_t header[4] = {static_cast<uint32_t>(words.size()),
+                        static_cast<uint32_t>(ids.size()),
+                        static_cast<uint32_t>(strings.size()), 0};
+
+  std::ofstream os(filename, std::ios::binary);
+  if (!os) {
+    SHERPA_ONNX_LOGE("Failed to open %s for writing", filename.c_str());
+    return false;
+  }
+
+  os.write(kMagic, kMagicSize);
+  os.write(reinterpret_cast<const char *>(header), sizeof(header));
+  os.write(reinterpret_cast<const char *>(word_offsets.data()),
+           word_offsets.size() * sizeof(uint32_t));
+  os.write(reinterpret_cast<const char *>(id_offsets.data()),
+           id_offsets.size() * sizeof(uint32_t));
+  os.write(reinterpret_cast<const char *>(ids.data()),
+           ids.size() * sizeof(int32_t));
+  os.write(strings.data(), strings.size());
+
+  if (!os) {
+    SHERPA_ONNX_LOGE("Failed to write %s", filename.c_str());
+    return false;
+  }
+
+  return true;
+}
+
+bool CompileLexicon(const std::string &lexicon, const std::string &tokens,
+                    const std::string &output) {
+  std::ifstream tokens_is(tokens, std::ios::binary);
+  if (!tokens_is) {
+    SHERPA_ONNX_LOGE("Failed to open %s", tokens.c_str());
+    return false;
+  }
+  auto token2id = ReadTokens(tokens_is);
+
+  std::ifstream lexicon_is(lexicon);
+  if (!lexicon_is) {
+    SHERPA_ONNX_LOGE("Failed to open %s", lexicon.c_str());
+    return false;
+  }
+
+  if (BinaryLexicon::IsBinaryLexicon(lexicon_is)) {
+    SHERPA_ONNX_LOGE("%s is already a binary lexicon", lexicon.c_str());
+    return false;
+  }
+
+  return WriteBinaryLexicon(ReadLexicon(lexicon_is, token2id), output);
+}
+
+bool CompileTokens(const std::string &tokens, const std::string &output) {
+  std::ifstream is(tokens, std::ios::binary);
+  if (!is) {
+    SHERPA_ONNX_LOGE("Failed to open %s", tokens.c_str());
+    return false;
+  }
+
+  std::unordered_map<int32_t, std::string> id2token;
+  auto token2id = ReadTokens(is, &id2token);
+
+  for (const auto &p : token2id) {
+    const auto &t = id2token.at(p.second);
+    if (t != p.first) {
+      SHERPA_ONNX_LOGE(
+          "Tokens '%s' and '%s' share the ID %d, which is not supported by "
+          "the binary format. Please use %s directly.",
+          p.first.c_str(), t.c_str(), p.second, tokens.c_str());
+      return false;
+    }
+  }
+
+  // A token can have several IDs. The first one is the one in token2id.
+  std::unordered_map<std::string, std::vector<int32_t>> token2ids;
+  for (const auto &p : token2id) {
+    token2ids[p.first].push_back(p.second);
+  }
+
+  std::vector<std::pair<int32_t, const std::string *>> id_token;
+  id_token.reserve(id2token.size());
+  for (const auto &p : id2token) {
+    id_token.emplace_back(p.first, &p.second);
+  }
+  std::sort(id_token.begin(), id_token.end());
+
+  for (const auto &p : id_token) {
+    auto &ids = token2ids[*p.second];
+    if (ids[0] != p.first) {
+      ids.push_back(p.first);
+    }
+  }
+
+  return WriteBinaryLexicon(token2ids, output);
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,153 @@
+// sherpa-onnx/csrc/binary-lexicon.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_BINARY_LEXICON_H_
+#define SHERPA_ONNX_CSRC_BINARY_LEXICON_H_
+
+#include <cstddef>
+#include <cstdint>
+#include <istream>
+#include <memory>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include "sherpa-onnx/csrc/file-utils.h"
+
+namespace sherpa_onnx {
+
+/** A read-only map from words to token IDs in a compact binary format.
+ *
+ * It is generated from lexicon.txt (or tokens.txt) by
+ * `sherpa-onnx compile-lexicon` (or `sherpa-onnx compile-tokens`) and
+ * is used directly from the memory-mapped file, so loading it costs
+ * almost nothing compared to parsing a text file with 100k+ lines.
+ *
+ * Layout (little-endian):
+ *
+ *   char magic[8]                        "SOLEXv01"
+ *   uint32_t num_words
+ *   uint32_t num_ids
+ *   uint32_t num_string_bytes
+ *   uint32_t reserved                    0
+ *   uint32_t word_offsets[num_words + 1]
+ *   uint32_t id_offsets[num_words + 1]
+ *   int32_t ids[num_ids]
+ *   char strings[num_string_bytes]
+ *
+ * Word i is strings[word_offsets[i]:word_offsets[i+1]] and its token IDs
+ * are ids[id_offsets[i]:id_offsets[i+1]]. Words are sorted in byte order.
+ */
+class BinaryLexicon {
+ public:
+  // Return true if data starts with the magic of a binary lexicon
+  static bool IsBinaryLexicon(const char *data, size_t size);
+
+  // The read position of the stream is not changed
+  static bool IsBinaryLexicon(std::istream &is);
+
+  // Abort if the file is not a valid binary lexicon
+  explicit BinaryLexicon(MappedFile file);
+  explicit BinaryLexicon(std::vector<char> buffer);
+
+  BinaryLexicon(const BinaryLexicon &) = delete;
+  BinaryLexicon &operator=(const BinaryLexicon &) = delete;
+
+  int32_t NumWords() const { return num_words_; }
+
+  // Return a pointer to the token IDs of the given word and save the
+  // number of IDs in num_ids. Return nullptr if the word is not found.
+  const int32_t *Find(const std::string &word, int32_t *num_ids) const;
+
+  // Return the i-th word. 0 <= i < NumWords()
+  std::string Word(int32_t i) const;
+  const int32_t *Ids(int32_t i, int32_t *num_ids) const;
+
+ private:
+  void Init(const char *data, size_t size);
+
+ private:
+  // Either file_ or buffer_ holds the data
+  MappedFile file_;
+  std::vector<char> buffer_;
+
+  int32_t num_words_ = 0;
+  const uint32_t *word_offsets_ = nullptr;
+  const uint32_t *id_offsets_ = nullptr;
+  const int32_t *ids_ = nullptr;
+  const char *strings_ = nullptr;
+};
+
+/** Token IDs of words, read from either lexicon.txt or a binary lexicon.
+ *
+ * It is used by the frontends that accept both formats, e.g., Lexicon and
+ * JiebaLexicon.
+ */
+class LexiconTable {
+ public:
+  /**
+   * @param buf Content of lexicon.txt or of a binary lexicon. The format is
+   *            detected from the magic bytes.
+   * @param token2id Map from tokens to IDs. It is used only for
+   *                 lexicon.txt.
+   */
+  void Init(MappedFile buf,
+            const std::unordered_map<std::string, int32_t> &token2id);
+
+  void Init(std::vector<char> buf,
+            const std::unordered_map<std::string, int32_t> &token2id);
+
+  // Return a pointer to the token IDs of the given word and save the
+  // number of IDs in num_ids. Return nullptr if the word is not found.
+  const int32_t *Find(const std::string &word, int32_t *num_ids) const;
+
+ private:
+  template <typename Buffer>
+  void InitImpl(Buffer buf,
+                const std::unordered_map<std::string, int32_t> &token2id);
+
+ private:
+  // lexicon.txt is saved in word2ids_
+  std::unordered_map<std::string, std::vector<int32_t>> word2ids_;
+
+  // Used instead of word2ids_ if lexicon.txt has been compiled
+  std::unique_ptr<BinaryLexicon> binary_lexicon_;
+};
+
+/** Read lexicon.txt.
+ *
+ * Each line contains a word followed by its tokens. Words are converted to
+ * lowercase. Lines with tokens that are not in token2id are skipped and
+ * only the first entry of a duplicated word is kept.
+ */
+std::unordered_map<std::string, std::vector<int32_t>> ReadLexicon(
+    std::istream &is, const std::unordered_map<std::string, int32_t> &token2id);
+
+// Return false if the file cannot be written
+bool WriteBinaryLexicon(
+    const std::unordered_map<std::string, std::vector<int32_t>> &word2ids,
+    const std::string &filename);
+
+/** Convert lexicon.txt to a binary lexicon.
+ *
+ * @param lexicon Path to lexicon.txt
+ * @param tokens Path to tokens.txt. Token IDs in the binary lexicon
+ *               are looked up from it.
+ * @param output Path to the output file
+ * @return Return false on error.
+ */
+bool CompileLexicon(const std::string &lexicon, const std::string &tokens,
+                    const std::string &output);
+
+/** Convert tokens.txt to the binary format.
+ *
+ * ReadTokens() detects the binary format automatically, so the output can
+ * be used in place of tokens.txt.
+ *
+ * @return Return false on error, e.g., if two tokens share the same ID.
+ */
+bool CompileTokens(const std::string &tokens, const std::string &output);
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_BINARY_LEXICON_H_
@@ -0,0 +1,209 @@
+// sherpa-onnx/csrc/ctc-fst-nbest-decoder-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/ctc-fst-nbest-decoder.h"
+
+#include <algorithm>
+#include <cmath>
+#include <map>
+#include <numeric>
+#include <random>
+#include <utility>
+#include <vector>
+
+#include "fst/fstlib.h"
+#include "gtest/gtest.h"
+
+namespace sherpa_onnx {
+
+// Return the best score of each token sequence by enumerating
+// all alignments
+static std::map<std::vector<int64_t>, float> BruteForce(
+    const std::vector<float> &log_probs, int32_t num_frames,
+    int32_t vocab_size) {
+  std::map<std::vector<int64_t>, float> ans;
+
+  std::vector<int32_t> labels(num_frames, 0);
+  while (true) {
+    std::vector<int64_t> tokens;
+    float score = 0;
+    int32_t prev = -1;
+    for (int32_t t = 0; t != num_frames; ++t) {
+      score += log_probs[t * vocab_size + labels[t]];
+      if (labels[t] != 0 && labels[t] != prev) {
+        tokens.push_back(labels[t]);
+      }
+      prev = labels[t];
+    }
+
+    auto it = ans.find(tokens);
+    if (it == ans.end()) {
+      ans.emplace(tokens, score);
+    } else {
+      it->second = std::max(it->second, score);
+    }
+
+    int32_t t = 0;
+    while (t != num_frames && ++labels[t] == vocab_size) {
+      labels[t] = 0;
+      ++t;
+    }
+
+    if (t == num_frames) {
+      break;
+    }
+  }
+
+  return ans;
+}
+
+static float Total(const CtcFstNbestResult &r) {
+  return std::accumulate(r.ys_probs.begin(), r.ys_probs.end(), 0.0f) +
+         std::accumulate(r.graph_scores.begin(), r.graph_scores.end(), 0.0f);
+}
+
+TEST(CtcFstNbestDecoder, CompareWithBruteForce) {
+  int32_t vocab_size = 3;
+  int32_t num_frames = 5;
+
+  // A graph accepting any label sequence
+  fst::StdVectorFst graph;
+  auto s = graph.AddState();
+  graph.SetStart(s);
+  graph.SetFinal(s, fst::TropicalWeight::One());
+  for (int32_t i = 1; i <= vocab_size; ++i) {
+    graph.AddArc(s, fst::StdArc(i, 0, fst::TropicalWeight::One(), s));
+  }
+
+  std::mt19937 gen(20250101);
+  std::uniform_real_distribution<float> dist(0.1, 1);
+
+  for (int32_t n = 0; n != 10; ++n) {
+    std::vector<float> log_probs(num_frames * vocab_size);
+    for (int32_t t = 0; t != num_frames; ++t) {
+      float *p = log_probs.data() + t * vocab_size;
+      std::generate(p, p + vocab_size, [&]() { return dist(gen); });
+      float sum = std::accumulate(p, p + vocab_size, 0.0f);
+      for (int32_t i = 0; i != vocab_size; ++i) {
+        p[i] = std::log(p[i] / sum);
+      }
+    }
+
+    auto expected = BruteForce(log_probs, num_frames, vocab_size);
+    std::vector<std::pair<float, std::vector<int64_t>>> sorted;
+    for (const auto &it : expected) {
+      sorted.emplace_back(it.second, it.first);
+    }
+    std::sort(sorted.begin(), sorted.end(),
+              [](const auto &a, const auto &b) { return a.first > b.first; });
+
+    // There are fewer than 100 token sequences, so nothing is pruned
+    // and the result is exact.
+    CtcFstNbestDecoder decoder(graph, 100, 1000, 0, 1000);
+    decoder.InitDecoding();
+    // Decode it in two chunks
+    decoder.AdvanceDecoding(log_probs.data(), 2, vocab_size);
+    decoder.AdvanceDecoding(log_probs.data() + 2 * vocab_size, num_frames - 2,
+                            vocab_size);
+    EXPECT_EQ(decoder.NumFramesDecoded(), num_frames);
+    ASSERT_TRUE(decoder.ReachedFinal());
+
+    auto results = decoder.GetNbest();
+    ASSERT_EQ(results.size(), sorted.size());
+
+    for (int32_t i = 0; i != results.size(); ++i) {
+      const auto &r = results[i];
+      EXPECT_EQ(r.tokens, sorted[i].second);
+      EXPECT_EQ(r.timestamps.size(), r.tokens.size());
+      ASSERT_EQ(r.ys_probs.size(), r.tokens.size());
+      ASSERT_EQ(r.graph_scores.size(), r.tokens.size());
+      if (!r.tokens.empty()) {
+        EXPECT_NEAR(Total(r), sorted[i].first, 1e-4);
+      }
+    }
+
+    // With a smaller nbest, sequences are dropped at each state, so the
+    // paths found are not always the N best ones. The best path is still
+    // found and the scores are those of real alignments.
+    int32_t nbest = 4;
+    CtcFstNbestDecoder small(graph, nbest, 1000, 0, 1000);
+    small.InitDecoding();
+    small.AdvanceDecoding(log_probs.data(), num_frames, vocab_size);
+
+    results = small.GetNbest();
+    ASSERT_EQ(results.size(), nbest);
+    EXPECT_EQ(results[0].tokens, sorted[0].second);
+
+    for (int32_t i = 0; i != nbest; ++i) {
+      const auto &r = results[i];
+      if (i > 0) {
+        EXPECT_GE(Total(results[i - 1]), Total(r));
+      }
+
+      if (!r.tokens.empty()) {
+        EXPECT_LE(Total(r), expected[r.tokens] + 1e-4);
+      }
+    }
+  }
+}
+
+TEST(CtcFstNbestDecoder, WordsAndScores) {
+  // Token IDs: 0 blank, 1 a, 2 b. Word IDs: 1 A, 2 B.
+  // Input labels are token IDs plus 1.
+  fst::StdVectorFst graph;
+  auto s0 = graph.AddState();
+  auto s1 = graph.AddState();
+  auto s2 = graph.AddState();
+  graph.SetStart(s0);
+  graph.SetFinal(s0, 0.3);
+
+  graph.AddArc(s0, fst::StdArc(1, 0, 0, s0));
+  graph.AddArc(s0, fst::StdArc(2, 1, 0.5, s1));
+  graph.AddArc(s0, fst::StdArc(3, 2, 1.0, s2));
+  graph.AddArc(s1, fst::StdArc(2, 0, 0, s1));
+  graph.AddArc(s1, fst::StdArc(0, 0, 0.1, s0));
+  graph.AddArc(s2, fst::StdArc(3, 0, 0, s2));
+  graph.AddArc(s2, fst::StdArc(0, 0, 0.2, s0));
+
+  // blank, a, b
+  std::vector<float> probs = {
+      0.1, 0.7, 0.2,  //
+      0.8, 0.1, 0.1,  //
+      0.1, 0.3, 0.6,  //
+  };
+  std::vector<float> log_probs(probs.size());
+  std::transform(probs.begin(), probs.end(), log_probs.begin(),
+                 [](float p) { return std::log(p); });
+
+  CtcFstNbestDecoder decoder(graph, 3, 100);
+  decoder.InitDecoding();
+  decoder.AdvanceDecoding(log_probs.data(), 3, 3);
+  ASSERT_TRUE(decoder.ReachedFinal());
+
+  auto results = decoder.GetNbest();
+  ASSERT_EQ(results.size(), 3);
+
+  const auto &r = results[0];
+  EXPECT_EQ(r.tokens, (std::vector<int64_t>{1, 2}));
+  EXPECT_EQ(r.words, (std::vector<int32_t>{1, 2}));
+  EXPECT_EQ(r.timestamps, (std::vector<int32_t>{0, 2}));
+  EXPECT_EQ(r.num_trailing_blanks, 0);
+
+  ASSERT_EQ(r.ys_probs.size(), 2);
+  EXPECT_NEAR(r.ys_probs[0], std::log(0.7f) + std::log(0.8f), 1e-5);
+  EXPECT_NEAR(r.ys_probs[1], std::log(0.6f), 1e-5);
+
+  // The final weight is counted for the last token
+  ASSERT_EQ(r.graph_scores.size(), 2);
+  EXPECT_NEAR(r.graph_scores[0], -0.6, 1e-5);
+  EXPECT_NEAR(r.graph_scores[1], -1.5, 1e-5);
+
+  for (int32_t i = 1; i != results.size(); ++i) {
+    EXPECT_NE(results[i].tokens, results[0].tokens);
+    EXPECT_EQ(results[i].words.size(), results[i].tokens.size());
+    EXPECT_GE(Total(results[i - 1]), Total(results[i]));
+  }
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,350 @@
+// sherpa-onnx/csrc/ctc-fst-nbest-decoder.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/ctc-fst-nbest-decoder.h"
+
+#include <algorithm>
+#include <functional>
+#include <limits>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+namespace sherpa_onnx {
+
+// Append x to the hash h of a sequence
+static uint64_t HashAppend(uint64_t h, uint64_t x) {
+  // splitmix64
+  uint64_t z = h ^ (x + 0x9e3779b97f4a7c15ULL + (h << 6) + (h >> 2));
+  z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9ULL;
+  z = (z ^ (z >> 27)) * 0x94d049bb133111ebULL;
+  return z ^ (z >> 31);
+}
+
+CtcFstNbestDecoder::CtcFstNbestDecoder(const fst::Fst<fst::StdArc> &fst,
+                                       int32_t nbest, int32_t max_active,
+                                       int32_t blank_id, float beam)
+    : fst_(fst),
+      nbest_(std::max(nbest, 1)),
+      max_active_(max_active),
+      blank_id_(blank_id),
+      beam_(beam) {}
+
+void CtcFstNbestDecoder::InitDecoding() {
+  cur_.clear();
+  next_.clear();
+  traces_.clear();
+  num_frames_decoded_ = 0;
+
+  auto start = fst_.Start();
+  if (start == fst::kNoStateId) {
+    return;
+  }
+
+  Hyp h;
+  h.state = start;
+  cur_[start].push_back(h);
+
+  ProcessNonemitting(-std::numeric_limits<float>::infinity());
+}
+
+void CtcFstNbestDecoder::AdvanceDecoding(const float *log_probs,
+                                         int32_t num_frames,
+                                         int32_t vocab_size) {
+  for (int32_t f = 0; f != num_frames && !cur_.empty(); ++f) {
+    const float *p = log_probs + f * vocab_size;
+
+    float best = -std::numeric_limits<float>::infinity();
+
+    next_.clear();
+    for (const auto &it : cur_) {
+      for (fst::ArcIterator<fst::Fst<fst::StdArc>> aiter(fst_, it.first);
+           !aiter.Done(); aiter.Next()) {
+        const auto &arc = aiter.Value();
+        if (arc.ilabel == 0 || arc.ilabel > vocab_size) {
+          continue;
+        }
+
+        float log_prob = p[arc.ilabel - 1];
+        for (const auto &h : it.second) {
+          float score = h.Score() - arc.weight.Value() + log_prob;
+          if (Expand(h, arc, log_prob, num_frames_decoded_, best - beam_,
+                     &next_, nullptr)) {
+            best = std::max(best, score);
+          }
+        }
+      }
+    }
+
+    std::swap(cur_, next_);
+    num_frames_decoded_ += 1;
+
+    ProcessNonemitting(Prune());
+  }
+}
+
+bool CtcFstNbestDecoder::ReachedFinal() const {
+  for (const auto &it : cur_) {
+    if (fst_.Final(it.first) != fst::StdArc::Weight::Zero()) {
+      return true;
+    }
+  }
+
+  return false;
+}
+
+std::vector<CtcFstNbestResult> CtcFstNbestDecoder::GetNbest() const {
+  // Keep the best hypothesis of each sequence
+  std::unordered_map<uint64_t, Hyp> best;
+  for (const auto &it : cur_) {
+    auto final_weight = fst_.Final(it.first);
+    if (final_weight == fst::StdArc::Weight::Zero()) {
+      continue;
+    }
+
+    for (auto h : it.second) {
+      h.graph_score -= final_weight.Value();
+
+      auto p = best.find(h.key);
+      if (p == best.end()) {
+        best.emplace(h.key, h);
+      } else if (h.Score() > p->second.Score()) {
+        p->second = h;
+      }
+    }
+  }
+
+  std::vector<Hyp> hyps;
+  hyps.reserve(best.size());
+  for (const auto &it : best) {
+    hyps.push_back(it.second);
+  }
+
+  std::sort(hyps.begin(), hyps.end(),
+            [](const Hyp &a, const Hyp &b) { return a.Score() > b.Score(); });
+
+  if (static_cast<int32_t>(hyps.size()) > nbest_) {
+    hyps.resize(nbest_);
+  }
+
+  std::vector<CtcFstNbestResult> ans;
+  ans.reserve(hyps.size());
+
+  std::vector<const Trace *> path;
+  for (const auto &h : hyps) {
+    path.clear();
+    for (int32_t i = h.trace; i != -1; i = traces_[i].prev) {
+      path.push_back(&traces_[i]);
+    }
+    std::reverse(path.begin(), path.end());
+
+    CtcFstNbestResult r;
+    r.num_trailing_blanks = h.num_trailing_blanks;
+
+    // Scores of the path before each token
+    std::vector<float> ys_probs;
+    std::vector<float> graph_scores;
+
+    for (const auto *t : path) {
+      if (t->token != -1) {
+        r.tokens.push_back(t->token);
+        r.timestamps.push_back(t->frame);
+        ys_probs.push_back(t->ys_prob);
+        graph_scores.push_back(t->graph_score);
+      }
+
+      if (t->word != 0) {
+        r.words.push_back(t->word);
+      }
+    }
+
+    // The score of a token covers its frames up to the next token.
+    // Frames before the first token are counted for the first token.
+    int32_t num_tokens = r.tokens.size();
+    if (num_tokens > 0) {
+      ys_probs.push_back(h.ys_prob);
+      graph_scores.push_back(h.graph_score);
+      ys_probs[0] = 0;
+      graph_scores[0] = 0;
+
+      r.ys_probs.resize(num_tokens);
+      r.graph_scores.resize(num_tokens);
+      for (int32_t i = 0; i != num_tokens; ++i) {
+        r.ys_probs[i] = ys_probs[i + 1] - ys_probs[i];
+        r.graph_scores[i] = graph_scores[i + 1] - graph_scores[i];
+      }
+    }
+
+    ans.push_back(std::move(r));
+  }
+
+  return ans;
+}
+
+bool CtcFstNbestDecoder::Expand(const Hyp &h, const fst::StdArc &arc,
+                                float log_prob, int32_t frame, float cutoff,
+                                HypMap *hyps, std::vector<Hyp> *added) {
+  Hyp n = h;
+  n.state = arc.nextstate;
+  // The weight of an arc is a cost, i.e., a negative score
+  n.graph_score -= arc.weight.Value();
+
+  int32_t token = -1;
+  if (arc.ilabel != 0) {
+    // -1 here since the input labels are incremented during graph
+    // construction
+    int32_t i = arc.ilabel - 1;
+
+    n.ys_prob += log_prob;
+
+    if (i == blank_id_) {
+      n.num_trailing_blanks += 1;
+    } else {
+      n.num_trailing_blanks = 0;
+      if (arc.ilabel != h.prev_label) {
+        token = i;
+      }
+    }
+
+    n.prev_label = arc.ilabel;
+  }
+
+  if (n.Score() < cutoff) {
+    return false;
+  }
+
+  int32_t word = arc.olabel;
+
+  // Tokens and words are hashed differently so that their IDs do not clash
+  if (token != -1) {
+    n.key = HashAppend(n.key, static_cast<uint64_t>(token) << 1);
+  }
+
+  if (word != 0) {
+    n.key = HashAppend(n.key, (static_cast<uint64_t>(word) << 1) | 1);
+  }
+
+  auto &v = (*hyps)[n.state];
+
+  // A sequence may have two hypotheses at a state: one ending with a blank
+  // and one ending with its last token. They are kept apart since only the
+  // latter merges a repeated token. The limit nbest_ is on the number of
+  // sequences.
+  auto it = std::find_if(v.begin(), v.end(), [&n](const Hyp &x) {
+    return x.key == n.key && x.prev_label == n.prev_label;
+  });
+
+  if (it != v.end()) {
+    if (n.Score() <= it->Score()) {
+      return false;
+    }
+  } else if (std::none_of(v.begin(), v.end(),
+                          [&n](const Hyp &x) { return x.key == n.key; })) {
+    // Best score of each sequence at this state
+    std::unordered_map<uint64_t, float> scores;
+    for (const auto &x : v) {
+      auto p = scores.emplace(x.key, x.Score());
+      if (!p.second) {
+        p.first->second = std::max(p.first->second, x.Score());
+      }
+    }
+
+    if (static_cast<int32_t>(scores.size()) >= nbest_) {
+      auto worst = std::min_element(
+          scores.begin(), scores.end(),
+          [](const auto &a, const auto &b) { return a.second < b.second; });
+
+      if (n.Score() <= worst->second) {
+        return false;
+      }
+
+      uint64_t key = worst->first;
+      v.erase(std::remove_if(v.begin(), v.end(),
+                             [key](const Hyp &x) { return x.key == key; }),
+              v.end());
+    }
+
+    it = v.end();
+  }
+
+  if (token != -1 || word != 0) {
+    traces_.push_back({h.trace, token, word, frame, h.ys_prob, h.graph_score});
+    n.trace = static_cast<int32_t>(traces_.size()) - 1;
+  }
+
+  if (it == v.end()) {
+    v.push_back(n);
+  } else {
+    *it = n;
+  }
+
+  if (added) {
+    added->push_back(n);
+  }
+
+  return true;
+}
+
+void CtcFstNbestDecoder::ProcessNonemitting(float cutoff) {
+  std::vector<Hyp> queue;
+  for (const auto &it : cur_) {
+    queue.insert(queue.end(), it.second.begin(), it.second.end());
+  }
+
+  while (!queue.empty()) {
+    Hyp h = queue.back();
+    queue.pop_back();
+
+    for (fst::ArcIterator<fst::Fst<fst::StdArc>> aiter(fst_, h.state);
+         !aiter.Done(); aiter.Next()) {
+      const auto &arc = aiter.Value();
+      if (arc.ilabel != 0) {
+        continue;
+      }
+
+      Expand(h, arc, 0, num_frames_decoded_, cutoff, &cur_, &queue);
+    }
+  }
+}
+
+float CtcFstNbestDecoder::Prune() {
+  std::vector<float> scores;
+  scores.reserve(cur_.size());
+
+  float best = -std::numeric_limits<float>::infinity();
+  for (const auto &it : cur_) {
+    float s = -std::numeric_limits<float>::infinity();
+    for (const auto &h : it.second) {
+      s = std::max(s, h.Score());
+    }
+    scores.push_back(s);
+    best = std::max(best, s);
+  }
+
+  float cutoff = best - beam_;
+
+  if (max_active_ > 0 && static_cast<int32_t>(scores.size()) > max_active_) {
+    std::nth_element(scores.begin(), scores.begin() + max_active_ - 1,
+                     scores.end(), std::greater<float>());
+    cutoff = std::max(cutoff, scores[max_active_ - 1]);
+  }
+
+  for (auto it = cur_.begin(); it != cur_.end();) {
+    auto &v = it->second;
+    v.erase(
+        std::remove_if(v.begin(), v.end(),
+                       [cutoff](const Hyp &h) { return h.Score() < cutoff; }),
+        v.end());
+
+    if (v.empty()) {
+      it = cur_.erase(it);
+    } else {
+      ++it;
+    }
+  }
+
+  return cutoff;
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,157 @@
+// sherpa-onnx/csrc/ctc-fst-nbest-decoder.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_CSRC_CTC_FST_NBEST_DECODER_H_
+#define SHERPA_ONNX_CSRC_CTC_FST_NBEST_DECODER_H_
+
+#include <cstdint>
+#include <unordered_map>
+#include <vector>
+
+#include "fst/fst.h"
+
+namespace sherpa_onnx {
+
+struct CtcFstNbestResult {
+  /// The decoded token IDs
+  std::vector<int64_t> tokens;
+
+  /// The decoded word IDs, i.e., the non-epsilon output labels of the path
+  std::vector<int32_t> words;
+
+  /// timestamps[i] contains the frame index where tokens[i] is decoded
+  std::vector<int32_t> timestamps;
+
+  /// ys_probs[i] and graph_scores[i] are the sums of the log-probs from the
+  /// model and the scores from the graph over the frames of tokens[i].
+  /// See OfflineCtcDecoderResult for details.
+  std::vector<float> ys_probs;
+  std::vector<float> graph_scores;
+
+  /// Number of blank frames at the end of the path
+  int32_t num_trailing_blanks = 0;
+};
+
+/** Search a CTC graph, e.g., H.fst, HL.fst or HLG.fst, for the N best paths.
+ *
+ * It is a Viterbi beam search like kaldi_decoder::FasterDecoder, but each
+ * state of the graph keeps up to `nbest` hypotheses with different token or
+ * word sequences instead of only the best one. Alignments of the same
+ * sequence are merged and only the best one is kept.
+ *
+ * Input labels of the graph are token IDs plus 1; 0 is epsilon.
+ */
+class CtcFstNbestDecoder {
+ public:
+  /**
+   * @param fst The decoding graph. It must outlive this object.
+   * @param nbest Number of paths to keep for each state of the graph and
+   *              to return from GetNbest().
+   * @param max_active Max number of active states of the graph per frame.
+   * @param blank_id ID of the blank token.
+   * @param beam Hypotheses whose scores are worse than the best one by more
+   *             than this are pruned.
+   */
+  CtcFstNbestDecoder(const fst::Fst<fst::StdArc> &fst, int32_t nbest,
+                     int32_t max_active, int32_t blank_id = 0, float beam = 16);
+
+  // Start decoding a new utterance
+  void InitDecoding();
+
+  /**
+   * @param log_probs A 2-D array of shape (num_frames, vocab_size) in row
+   *                  major containing the log-probs of the next frames.
+   */
+  void AdvanceDecoding(const float *log_probs, int32_t num_frames,
+                       int32_t vocab_size);
+
+  // Number of frames decoded since InitDecoding()
+  int32_t NumFramesDecoded() const { return num_frames_decoded_; }
+
+  // True if an active state is a final state of the graph
+  bool ReachedFinal() const;
+
+  /** Return up to `nbest` paths ending in a final state, best first.
+   * It is empty if ReachedFinal() is false.
+   */
+  std::vector<CtcFstNbestResult> GetNbest() const;
+
+ private:
+  // A decoded token, or a word output on an arc that does not start a
+  // new token
+  struct Trace {
+    // Index of the previous trace in traces_; -1 if there is none
+    int32_t prev;
+
+    // -1 if this trace contains only a word
+    int32_t token;
+
+    // 0 if there is no word
+    int32_t word;
+    int32_t frame;
+
+    // Scores of the path before the arc of this trace
+    float ys_prob;
+    float graph_score;
+  };
+
+  struct Hyp {
+    int32_t state;
+
+    // Index of the last trace in traces_; -1 if there is none
+    int32_t trace = -1;
+
+    // The input label of the last arc that consumed a frame; -1 if none.
+    // It is used to merge repeated tokens.
+    int32_t prev_label = -1;
+    int32_t num_trailing_blanks = 0;
+
+    // Hash of the token and word sequences
+    uint64_t key = 0;
+
+    float ys_prob = 0;
+    float graph_score = 0;
+
+    float Score() const { return ys_prob + graph_score; }
+  };
+
+  using HypMap = std::unordered_map<int32_t, std::vector<Hyp>>;
+
+  // Follow the arc from the given hypothesis and add the result to `hyps`.
+  //
+  // @param log_prob Log-prob of the input label of the arc. Unused for
+  //                 epsilon arcs.
+  // @param frame Index of the frame consumed by the arc
+  // @param cutoff Hypotheses whose scores are below it are not added
+  // @param added If not null, the new hypothesis is appended to it on
+  //              success
+  // @return Return true if the new hypothesis is added.
+  bool Expand(const Hyp &h, const fst::StdArc &arc, float log_prob,
+              int32_t frame, float cutoff, HypMap *hyps,
+              std::vector<Hyp> *added);
+
+  // Add epsilon arcs of the hypotheses in cur_
+  void ProcessNonemitting(float cutoff);
+
+  // Keep at most max_active_ states of cur_. Return the cutoff score.
+  float Prune();
+
+ private:
+  const fst::Fst<fst::StdArc> &fst_;
+  int32_t nbest_;
+  int32_t max_active_;
+  int32_t blank_id_;
+  float beam_;
+
+  int32_t num_frames_decoded_ = 0;
+
+  HypMap cur_;
+  HypMap next_;
+
+  std::vector<Trace> traces_;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_CTC_FST_NBEST_DECODER_H_
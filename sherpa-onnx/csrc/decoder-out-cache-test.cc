@@ -0,0 +1,159 @@
+// sherpa-onnx/csrc/decoder-out-cache-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/decoder-out-cache.h"
+
+#include <array>
+#include <utility>
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace sherpa_onnx {
+
+static constexpr int32_t kDim = 3;
+
+// A fake decoder. Its output for the context (a, b) is
+// [a, b, 10 * a + b]
+class FakeDecoder {
+ public:
+  Ort::Value operator()(Ort::Value decoder_input) {
+    auto shape = decoder_input.GetTensorTypeAndShapeInfo().GetShape();
+    ++num_calls;
+    num_rows += shape[0];
+
+    std::array<int64_t, 2> out_shape{shape[0], kDim};
+    Ort::Value ans = Ort::Value::CreateTensor<float>(
+        allocator, out_shape.data(), out_shape.size());
+
+    const int64_t *p = decoder_input.GetTensorData<int64_t>();
+    float *q = ans.GetTensorMutableData<float>();
+    for (int32_t i = 0; i != shape[0]; ++i, p += 2, q += kDim) {
+      q[0] = p[0];
+      q[1] = p[1];
+      q[2] = 10 * p[0] + p[1];
+    }
+    return ans;
+  }
+
+  Ort::AllocatorWithDefaultOptions allocator;
+  int32_t num_calls = 0;
+  int32_t num_rows = 0;
+};
+
+static void Check(const std::vector<Hypothesis> &hyps,
+                  const Ort::Value &decoder_out) {
+  auto shape = decoder_out.GetTensorTypeAndShapeInfo().GetShape();
+  ASSERT_EQ(shape.size(), 2);
+  ASSERT_EQ(shape[0], hyps.size());
+  ASSERT_EQ(shape[1], kDim);
+
+  const float *p = decoder_out.GetTensorData<float>();
+  for (const auto &h : hyps) {
+    int64_t a = h.ys[h.ys.size() - 2];
+    int64_t b = h.ys.back();
+    EXPECT_EQ(p[0], a);
+    EXPECT_EQ(p[1], b);
+    EXPECT_EQ(p[2], 10 * a + b);
+    p += kDim;
+  }
+}
+
+TEST(DecoderOutCache, DeduplicateAndReuse) {
+  FakeDecoder decoder;
+  auto run_decoder = [&decoder](Ort::Value x) {
+    return decoder(std::move(x));
+  };
+
+  DecoderOutCache cache;
+  std::vector<Hypothesis> hyps = {
+      {{-1, 0, 3, 5}, 0}, {{-1, 0, 5}, 0}, {{-1, 0, 2, 5}, 0}, {{3, 5}, 0}};
+
+  auto out = cache.Run(decoder.allocator, hyps, 2, run_decoder);
+  Check(hyps, out);
+  EXPECT_EQ(decoder.num_calls, 1);
+  EXPECT_EQ(decoder.num_rows, 3);  // (3, 5) is computed only once
+  EXPECT_EQ(cache.Size(), 3);
+
+  // All contexts are cached
+  std::vector<Hypothesis> hyps2 = {{{0, 5}, 0}, {{1, 3, 5}, 0}};
+  out = cache.Run(decoder.allocator, hyps2, 2, run_decoder);
+  Check(hyps2, out);
+  EXPECT_EQ(decoder.num_calls, 1);
+
+  // Only (5, 7) is computed
+  std::vector<Hypothesis> hyps3 = {{{2, 5}, 0}, {{5, 7}, 0}};
+  out = cache.Run(decoder.allocator, hyps3, 2, run_decoder);
+  Check(hyps3, out);
+  EXPECT_EQ(decoder.num_calls, 2);
+  EXPECT_EQ(decoder.num_rows, 4);
+  EXPECT_EQ(cache.Size(), 4);
+}
+
+TEST(DecoderOutCache, Evict) {
+  FakeDecoder decoder;
+  auto run_decoder = [&decoder](Ort::Value x) {
+    return decoder(std::move(x));
+  };
+
+  DecoderOutCache cache(2);
+  std::vector<Hypothesis> hyps = {{{1, 2}, 0}, {{3, 4}, 0}};
+  Check(hyps, cache.Run(decoder.allocator, hyps, 2, run_decoder));
+
+  // (1, 2) is used more recently than (3, 4)
+  std::vector<Hypothesis> hyps2 = {{{1, 2}, 0}};
+  Check(hyps2, cache.Run(decoder.allocator, hyps2, 2, run_decoder));
+  EXPECT_EQ(decoder.num_calls, 1);
+
+  // (3, 4) is evicted
+  std::vector<Hypothesis> hyps3 = {{{5, 6}, 0}};
+  Check(hyps3, cache.Run(decoder.allocator, hyps3, 2, run_decoder));
+  EXPECT_EQ(decoder.num_calls, 2);
+  EXPECT_EQ(cache.Size(), 2);
+
+  Check(hyps2, cache.Run(decoder.allocator, hyps2, 2, run_decoder));
+  EXPECT_EQ(decoder.num_calls, 2);
+
+  Check(hyps, cache.Run(decoder.allocator, hyps, 2, run_decoder));
+  EXPECT_EQ(decoder.num_calls, 3);
+  EXPECT_EQ(decoder.num_rows, 4);
+}
+
+TEST(DecoderOutCache, Disabled) {
+  FakeDecoder decoder;
+  auto run_decoder = [&decoder](Ort::Value x) {
+    return decoder(std::move(x));
+  };
+
+  DecoderOutCache cache(0);
+  std::vector<Hypothesis> hyps = {{{1, 2}, 0}, {{3, 4}, 0}};
+  Check(hyps, cache.Run(decoder.allocator, hyps, 2, run_decoder));
+  Check(hyps, cache.Run(decoder.allocator, hyps, 2, run_decoder));
+  EXPECT_EQ(decoder.num_calls, 2);
+  EXPECT_EQ(cache.Size(), 0);
+}
+
+TEST(Hypotheses, MergeSameTokens) {
+  Hypothesis a({-1, 0, 3}, -1);
+  Hypothesis b({-1, 0}, -2);
+  b.Key();  // hash is updated incrementally after push_back
+  b.ys.push_back(3);
+  EXPECT_EQ(a.Key(), b.Key());
+
+  Hypotheses hyps;
+  hyps.Add(a);
+  hyps.Add(b);
+  hyps.Add({{-1, 0, 4}, -3});
+  EXPECT_EQ(hyps.Size(), 2);
+
+  // Key is recomputed after ys is replaced
+  b.SetYs({-1, 0});
+  EXPECT_EQ(b.Key(), Hypothesis({-1, 0}, 0).Key());
+
+  b.SetYs({-1, 0, 4});
+  EXPECT_EQ(b.Key(), Hypothesis({-1, 0, 4}, 0).Key());
+  EXPECT_NE(b.Key(), a.Key());
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,194 @@
+// sherpa-onnx/csrc/decoder-out-cache.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/decoder-out-cache.h"
+
+#include <algorithm>
+#include <array>
+#include <utility>
+
+namespace sherpa_onnx {
+
+static uint64_t HashContext(const int64_t *context, int32_t context_size) {
+  uint64_t h = kTokenHashSeed;
+  for (int32_t i = 0; i != context_size; ++i) {
+    h = HashToken(h, context[i]);
+  }
+  return h;
+}
+
+Ort::Value DecoderOutCache::Run(
+    OrtAllocator *allocator, const std::vector<Hypothesis> &hyps,
+    int32_t context_size,
+    const std::function<Ort::Value(Ort::Value)> &run_decoder) {
+  int32_t num_hyps = static_cast<int32_t>(hyps.size());
+
+  std::vector<const int64_t *> contexts(num_hyps);
+  std::vector<uint64_t> keys(num_hyps);
+  for (int32_t i = 0; i != num_hyps; ++i) {
+    contexts[i] = hyps[i].ys.data() + hyps[i].ys.size() - context_size;
+    keys[i] = HashContext(contexts[i], context_size);
+  }
+
+  // rows[i] is the cached decoder_out of hyps[i]. If it is not cached,
+  // miss_index[i] is the row of hyps[i] in the decoder input.
+  std::vector<Row> rows(num_hyps);
+  std::vector<int32_t> miss_index(num_hyps, -1);
+
+  // The first hyp of each miss
+  std::vector<int32_t> misses;
+
+  std::vector<int64_t> row_shape;
+
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    row_shape = row_shape_;
+
+    std::unordered_map<uint64_t, int32_t> key_to_miss;
+    for (int32_t i = 0; i != num_hyps; ++i) {
+      if (capacity_ > 0) {
+        rows[i] = Get(keys[i], contexts[i], context_size);
+        if (rows[i]) {
+          continue;
+        }
+      }
+
+      auto it = key_to_miss.find(keys[i]);
+      if (it != key_to_miss.end() &&
+          std::equal(contexts[i], contexts[i] + context_size,
+                     contexts[misses[it->second]])) {
+        miss_index[i] = it->second;
+        continue;
+      }
+
+      miss_index[i] = static_cast<int32_t>(misses.size());
+      key_to_miss.emplace(keys[i], miss_index[i]);
+      misses.push_back(i);
+    }
+  }
+
+  int32_t num_misses = static_cast<int32_t>(misses.size());
+
+  Ort::Value decoder_out{nullptr};
+  int64_t row_size = 1;
+
+  if (num_misses > 0) {
+    std::array<int64_t, 2> shape{num_misses, context_size};
+    Ort::Value decoder_input = Ort::Value::CreateTensor<int64_t>(
+        allocator, shape.data(), shape.size());
+    int64_t *p = decoder_input.GetTensorMutableData<int64_t>();
+    for (auto i : misses) {
+      std::copy(contexts[i], contexts[i] + context_size, p);
+      p += context_size;
+    }
+
+    decoder_out = run_decoder(std::move(decoder_input));
+
+    auto out_shape = decoder_out.GetTensorTypeAndShapeInfo().GetShape();
+    row_shape.assign(out_shape.begin() + 1, out_shape.end());
+    for (auto d : row_shape) {
+      row_size *= d;
+    }
+
+    if (capacity_ > 0) {
+      const float *src = decoder_out.GetTensorData<float>();
+
+      std::lock_guard<std::mutex> lock(mutex_);
+      row_shape_ = row_shape;
+      for (int32_t k = 0; k != num_misses; ++k) {
+        const float *begin = src + k * row_size;
+        int32_t i = misses[k];
+        Put(keys[i], contexts[i], context_size,
+            std::make_shared<const std::vector<float>>(begin,
+                                                       begin + row_size));
+      }
+    }
+
+    if (num_misses == num_hyps) {
+      // no hits and no duplicates; decoder_out can be returned as it is
+      return decoder_out;
+    }
+  } else {
+    for (auto d : row_shape) {
+      row_size *= d;
+    }
+  }
+
+  std::vector<int64_t> ans_shape;
+  ans_shape.reserve(row_shape.size() + 1);
+  ans_shape.push_back(num_hyps);
+  ans_shape.insert(ans_shape.end(), row_shape.begin(), row_shape.end());
+
+  Ort::Value ans = Ort::Value::CreateTensor<float>(allocator, ans_shape.data(),
+                                                   ans_shape.size());
+  float *dst = ans.GetTensorMutableData<float>();
+  const float *src =
+      num_misses > 0 ? decoder_out.GetTensorData<float>() : nullptr;
+
+  for (int32_t i = 0; i != num_hyps; ++i, dst += row_size) {
+    if (rows[i]) {
+      std::copy(rows[i]->begin(), rows[i]->end(), dst);
+    } else {
+      const float *begin = src + miss_index[i] * row_size;
+      std::copy(begin, begin + row_size, dst);
+    }
+  }
+
+  return ans;
+}
+
+int32_t DecoderOutCache::Size() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return static_cast<int32_t>(entries_.size());
+}
+
+void DecoderOutCache::Clear() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  entries_.clear();
+  index_.clear();
+}
+
+DecoderOutCache::Row DecoderOutCache::Get(uint64_t key, const int64_t *context,
+                                          int32_t context_size) {
+  auto it = index_.find(key);
+  if (it == index_.end()) {
+    return nullptr;
+  }
+
+  const auto &entry = *it->second;
+  if (static_cast<int32_t>(entry.context.size()) != context_size ||
+      !std::equal(entry.context.begin(), entry.context.end(), context)) {
+    // hash collision
+    return nullptr;
+  }
+
+  entries_.splice(entries_.begin(), entries_, it->second);
+
+  return entry.decoder_out;
+}
+
+void DecoderOutCache::Put(uint64_t key, const int64_t *context,
+                          int32_t context_size, Row decoder_out) {
+  auto it = index_.find(key);
+  if (it != index_.end()) {
+    // Either another thread has added it or it is a hash collision.
+    // In both cases, we replace the existing entry.
+    auto &entry = *it->second;
+    entry.context.assign(context, context + context_size);
+    entry.decoder_out = std::move(decoder_out);
+    entries_.splice(entries_.begin(), entries_, it->second);
+    return;
+  }
+
+  entries_.push_front(
+      {key, {context, context + context_size}, std::move(decoder_out)});
+  index_.emplace(key, entries_.begin());
+
+  if (static_cast<int32_t>(entries_.size()) > capacity_) {
+    index_.erase(entries_.back().key);
+    entries_.pop_back();
+  }
+}
+
+}  // namespace sherpa_onnx
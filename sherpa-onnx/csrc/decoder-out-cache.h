@@ -0,0 +1,89 @@
+// sherpa-onnx/csrc/decoder-out-cache.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_DECODER_OUT_CACHE_H_
+#define SHERPA_ONNX_CSRC_DECODER_OUT_CACHE_H_
+
+#include <cstdint>
+#include <functional>
+#include <list>
+#include <memory>
+#include <mutex>  // NOLINT
+#include <unordered_map>
+#include <vector>
+
+#include "onnxruntime_cxx_api.h"  // NOLINT
+#include "sherpa-onnx/csrc/hypothesis.h"
+
+namespace sherpa_onnx {
+
+// An LRU cache for the output of a stateless transducer decoder.
+//
+// The output of a stateless decoder depends only on the last context_size
+// tokens of a hypothesis. During modified beam search, many hyps share
+// the same context, both within a frame and across frames, so the cache
+// maps a context to its decoder_out and the decoder model is run only
+// for contexts that have not been seen recently.
+//
+// It is safe to call Run() from multiple threads.
+class DecoderOutCache {
+ public:
+  // @param capacity Max number of contexts in the cache. If it is 0, the
+  //                 cache is disabled.
+  explicit DecoderOutCache(int32_t capacity = 1024) : capacity_(capacity) {}
+
+  /** Compute decoder_out for the given hyps.
+   *
+   * @param allocator  Allocator for the returned tensor.
+   * @param hyps  The decoder input of hyps[i] is the last context_size
+   *              tokens of hyps[i].ys.
+   * @param context_size  Context size of the decoder.
+   * @param run_decoder  It is called at most once with a tensor of shape
+   *                     (N, context_size) containing the contexts that are
+   *                     not in the cache, without duplicates, and returns
+   *                     the decoder_out of shape (N, ...).
+   *
+   * @return Return a tensor of shape (hyps.size(), ...) that is equal to
+   *         run_decoder(decoder_input of all hyps).
+   */
+  Ort::Value Run(OrtAllocator *allocator, const std::vector<Hypothesis> &hyps,
+                 int32_t context_size,
+                 const std::function<Ort::Value(Ort::Value)> &run_decoder);
+
+  int32_t Size() const;
+
+  void Clear();
+
+ private:
+  using Row = std::shared_ptr<const std::vector<float>>;
+
+  struct Entry {
+    uint64_t key;
+    std::vector<int64_t> context;
+    Row decoder_out;
+  };
+
+  // Return nullptr if the context is not in the cache.
+  // Must be called with mutex_ held.
+  Row Get(uint64_t key, const int64_t *context, int32_t context_size);
+
+  // Must be called with mutex_ held.
+  void Put(uint64_t key, const int64_t *context, int32_t context_size,
+           Row decoder_out);
+
+ private:
+  int32_t capacity_;
+
+  mutable std::mutex mutex_;
+
+  // Most recently used entries are at the front
+  std::list<Entry> entries_;
+  std::unordered_map<uint64_t, std::list<Entry>::iterator> index_;
+
+  // Shape of decoder_out without the batch dim
+  std::vector<int64_t> row_shape_;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_DECODER_OUT_CACHE_H_
@@ -79,6 +79,19 @@ class FeatureExtractor::Impl {
     }
   }
 
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) {
+    // If normalize_samples is false, the extractor expects samples in the
+    // range [-32768, 32767], which is exactly what we are given
+    float scale = config_.normalize_samples ? 1.0f / 32768 : 1.0f;
+
+    std::vector<float> buf(n);
+    for (int32_t i = 0; i != n; ++i) {
+      buf[i] = waveform[i] * scale;
+    }
+    AcceptWaveformImpl(sampling_rate, buf.data(), n);
+  }
+
   void AcceptWaveformImpl(int32_t sampling_rate, const float *waveform,
                           int32_t n) {
     std::lock_guard<std::mutex> lock(mutex_);
@@ -344,6 +357,12 @@ void FeatureExtractor::AcceptWaveform(int32_t sampling_rate,
   impl_->AcceptWaveform(sampling_rate, waveform, n);
 }
 
+void FeatureExtractor::AcceptWaveform(int32_t sampling_rate,
+                                      const int16_t *waveform,
+                                      int32_t n) const {
+  impl_->AcceptWaveform(sampling_rate, waveform, n);
+}
+
 void FeatureExtractor::InputFinished() const { impl_->InputFinished(); }
 
 int32_t FeatureExtractor::NumFramesReady() const {
@@ -104,6 +104,13 @@ class FeatureExtractor {
   void AcceptWaveform(int32_t sampling_rate, const float *waveform,
                       int32_t n) const;
 
+  /**
+     Same as the above one except that the input is 16-bit PCM, i.e., in
+     the range [-32768, 32767]. The samples are scaled inside.
+   */
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) const;
+
   /**
    * InputFinished() tells the class you won't be providing any
    * more waveform.  This will help flush out the last frame or two
@@ -8,6 +8,16 @@
 #include <memory>
 #include <sstream>
 #include <string>
+#include <utility>
+
+#if defined(_WIN32)
+#include <Windows.h>
+#elif !defined(__EMSCRIPTEN__)
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
 
 #include "sherpa-onnx/csrc/macros.h"
 
@@ -24,10 +34,127 @@ void AssertFileExists(const std::string &filename) {
   }
 }
 
-std::vector<char> ReadFile(const std::string &filename) {
-  std::ifstream input(filename, std::ios::binary);
-  std::vector<char> buffer(std::istreambuf_iterator<char>(input), {});
-  return buffer;
+#if defined(_WIN32)
+static bool MapFile(const std::string &filename, char **data, size_t *size,
+                    void **mapping) {
+  HANDLE file = CreateFileA(filename.c_str(), GENERIC_READ, FILE_SHARE_READ,
+                            nullptr, OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL,
+                            nullptr);
+  if (file == INVALID_HANDLE_VALUE) {
+    return false;
+  }
+
+  LARGE_INTEGER file_size;
+  if (!GetFileSizeEx(file, &file_size) || file_size.QuadPart == 0) {
+    CloseHandle(file);
+    return false;
+  }
+
+  HANDLE m = CreateFileMappingA(file, nullptr, PAGE_READONLY, 0, 0, nullptr);
+  CloseHandle(file);
+  if (!m) {
+    return false;
+  }
+
+  void *p = MapViewOfFile(m, FILE_MAP_READ, 0, 0, 0);
+  if (!p) {
+    CloseHandle(m);
+    return false;
+  }
+
+  *data = static_cast<char *>(p);
+  *size = static_cast<size_t>(file_size.QuadPart);
+  *mapping = m;
+  return true;
+}
+#elif !defined(__EMSCRIPTEN__)
+static bool MapFile(const std::string &filename, char **data, size_t *size) {
+  int fd = open(filename.c_str(), O_RDONLY);
+  if (fd == -1) {
+    return false;
+  }
+
+  struct stat st;
+  if (fstat(fd, &st) != 0 || !S_ISREG(st.st_mode) || st.st_size == 0) {
+    close(fd);
+    return false;
+  }
+
+  void *p = mmap(nullptr, st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+  close(fd);
+  if (p == MAP_FAILED) {
+    return false;
+  }
+
+  *data = static_cast<char *>(p);
+  *size = static_cast<size_t>(st.st_size);
+  return true;
+}
+#endif
+
+MappedFile::MappedFile(const std::string &filename) {
+#if defined(_WIN32)
+  mapped_ = MapFile(filename, &data_, &size_, &mapping_);
+#elif !defined(__EMSCRIPTEN__)
+  mapped_ = MapFile(filename, &data_, &size_);
+#endif
+
+  if (!mapped_) {
+    std::ifstream input(filename, std::ios::binary);
+    buffer_ = std::vector<char>(std::istreambuf_iterator<char>(input), {});
+    data_ = buffer_.data();
+    size_ = buffer_.size();
+  }
+}
+
+MappedFile::~MappedFile() { Unmap(); }
+
+MappedFile::MappedFile(MappedFile &&other) noexcept {
+  *this = std::move(other);
+}
+
+MappedFile &MappedFile::operator=(MappedFile &&other) noexcept {
+  if (this == &other) {
+    return *this;
+  }
+
+  Unmap();
+
+  buffer_ = std::move(other.buffer_);
+  mapped_ = other.mapped_;
+  data_ = mapped_ ? other.data_ : buffer_.data();
+  size_ = other.size_;
+#if defined(_WIN32)
+  mapping_ = other.mapping_;
+  other.mapping_ = nullptr;
+#endif
+
+  other.data_ = nullptr;
+  other.size_ = 0;
+  other.mapped_ = false;
+
+  return *this;
+}
+
+void MappedFile::Unmap() {
+  if (mapped_) {
+#if defined(_WIN32)
+    UnmapViewOfFile(data_);
+    CloseHandle(mapping_);
+    mapping_ = nullptr;
+#elif !defined(__EMSCRIPTEN__)
+    munmap(data_, size_);
+#endif
+  }
+
+  data_ = nullptr;
+  size_ = 0;
+  mapped_ = false;
+  buffer_.clear();
+}
+
+MappedFile ReadFile(const std::string &filename) {
+  return MappedFile(filename);
 }
 
 #if __ANDROID_API__ >= 9
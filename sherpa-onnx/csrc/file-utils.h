@@ -5,6 +5,7 @@
 #ifndef SHERPA_ONNX_CSRC_FILE_UTILS_H_
 #define SHERPA_ONNX_CSRC_FILE_UTILS_H_
 
+#include <cstddef>
 #include <fstream>
 #include <string>
 #include <vector>
@@ -33,7 +34,53 @@ bool FileExists(const std::string &filename);
  */
 void AssertFileExists(const std::string &filename);
 
-std::vector<char> ReadFile(const std::string &filename);
+/** Read-only content of a file.
+ *
+ * On Linux, macOS and Windows, the file is memory-mapped instead of being
+ * copied into memory, so that reading a large model costs only the page
+ * cache and the pages can be shared among processes. If mapping fails,
+ * e.g., for an empty file, the content is read into a buffer.
+ *
+ * The memory returned by data() must not be modified.
+ */
+class MappedFile {
+ public:
+  MappedFile() = default;
+  explicit MappedFile(const std::string &filename);
+  ~MappedFile();
+
+  MappedFile(const MappedFile &) = delete;
+  MappedFile &operator=(const MappedFile &) = delete;
+
+  MappedFile(MappedFile &&other) noexcept;
+  MappedFile &operator=(MappedFile &&other) noexcept;
+
+  // It is non-const since onnxruntime accepts only void * for model data.
+  char *data() const { return data_; }
+  size_t size() const { return size_; }
+  bool empty() const { return size_ == 0; }
+
+  const char *begin() const { return data_; }
+  const char *end() const { return data_ + size_; }
+
+ private:
+  void Unmap();
+
+ private:
+  char *data_ = nullptr;
+  size_t size_ = 0;
+
+  // Used when the file is not mapped
+  std::vector<char> buffer_;
+
+  bool mapped_ = false;
+#if defined(_WIN32)
+  void *mapping_ = nullptr;
+#endif
+};
+
+// Return an empty buffer if the file cannot be read
+MappedFile ReadFile(const std::string &filename);
 
 #if __ANDROID_API__ >= 9
 std::vector<char> ReadFile(AAssetManager *mgr, const std::string &filename);
@@ -10,10 +10,9 @@ namespace sherpa_onnx {
 
 // This function is copied from kaldi.
 //
-// @param filename Path to a StdVectorFst or StdConstFst graph
 // @return The caller should free the returned pointer using `delete` to
 //         avoid memory leak.
-fst::Fst<fst::StdArc> *ReadGraph(const std::string &filename) {
+fst::Fst<fst::StdArc> *ReadGraph(const std::string &filename, bool use_mmap) {
   // read decoding network FST
   std::ifstream is(filename, std::ios::binary);
   if (!is.good()) {
@@ -31,6 +30,19 @@ fst::Fst<fst::StdArc> *ReadGraph(const std::string &filename) {
   }
   fst::FstReadOptions ropts("<unspecified>", &hdr);
 
+  if (use_mmap) {
+    if (hdr.FstType() == "const") {
+      // The file is mapped by its name, so the real name is needed here
+      ropts.source = filename;
+      ropts.mode = fst::FstReadOptions::MAP;
+    } else {
+      SHERPA_ONNX_LOGE(
+          "Only a const FST can be memory-mapped. Given: %s. Read it into "
+          "memory instead",
+          hdr.FstType().c_str());
+    }
+  }
+
   fst::Fst<fst::StdArc> *decode_fst = nullptr;
 
   if (hdr.FstType() == "vector") {
@@ -11,8 +11,11 @@
 
 namespace sherpa_onnx {
 
-fst::Fst<fst::StdArc> *ReadGraph(const std::string &filename);
-
+// @param filename Path to a StdVectorFst or StdConstFst graph
+// @param use_mmap true to memory-map a StdConstFst graph instead of reading
+//                 it. It is ignored for a StdVectorFst graph.
+fst::Fst<fst::StdArc> *ReadGraph(const std::string &filename,
+                                 bool use_mmap = false);
 }
 
 #endif  // SHERPA_ONNX_CSRC_FST_UTILS_H_
@@ -13,8 +13,13 @@ namespace sherpa_onnx {
 void Hypotheses::Add(Hypothesis hyp) {
   auto key = hyp.Key();
   auto it = hyps_dict_.find(key);
+  while (it != hyps_dict_.end() && it->second.ys != hyp.ys) {
+    // hash collision
+    it = hyps_dict_.find(++key);
+  }
+
   if (it == hyps_dict_.end()) {
-    hyps_dict_[key] = std::move(hyp);
+    hyps_dict_.emplace(key, std::move(hyp));
   } else {
     it->second.log_prob = LogAdd<double>()(it->second.log_prob, hyp.log_prob);
   }
@@ -7,12 +7,13 @@
 #ifndef SHERPA_ONNX_CSRC_HYPOTHESIS_H_
 #define SHERPA_ONNX_CSRC_HYPOTHESIS_H_
 
+#include <cstdint>
+#include <memory>
 #include <sstream>
 #include <string>
 #include <unordered_map>
 #include <utility>
 #include <vector>
-#include <memory>
 
 #include "onnxruntime_cxx_api.h"  // NOLINT
 #include "sherpa-onnx/csrc/context-graph.h"
@@ -22,6 +23,14 @@
 
 namespace sherpa_onnx {
 
+constexpr uint64_t kTokenHashSeed = 0xcbf29ce484222325ull;
+
+// Combine the hash h of a token sequence with the next token.
+inline uint64_t HashToken(uint64_t h, int64_t token) {
+  return h ^ (static_cast<uint64_t>(token) + 0x9e3779b97f4a7c15ull + (h << 6) +
+              (h >> 2));
+}
+
 struct Hypothesis {
   // The predicted tokens so far. Newly predicated tokens are appended.
   std::vector<int64_t> ys;
@@ -81,25 +90,45 @@ struct Hypothesis {
 
   double TotalLogProb() const { return log_prob + lm_log_prob; }
 
-  // If two Hypotheses have the same `Key`, then they contain
-  // the same token sequence.
-  std::string Key() const {
-    // TODO(fangjun): Use a hash function?
+  // A hash of ys. If two Hypotheses contain the same token sequence,
+  // they have the same `Key`. Different token sequences may collide, so
+  // please compare ys if the keys are equal.
+  //
+  // The hash is computed incrementally: tokens that have been hashed are
+  // not visited again, so appending a token to ys of a copied hypothesis
+  // costs O(1). Appending with ys.push_back() is the only direct change
+  // of ys that keeps the hash valid; use SetYs() to replace ys.
+  uint64_t Key() const {
+    for (; ys_hash_len < ys.size(); ++ys_hash_len) {
+      ys_hash = HashToken(ys_hash, ys[ys_hash_len]);
+    }
+
+    return ys_hash;
+  }
+
+  // Replace ys and invalidate the hash cached by Key()
+  void SetYs(std::vector<int64_t> new_ys) {
+    ys = std::move(new_ys);
+    ys_hash = kTokenHashSeed;
+    ys_hash_len = 0;
+  }
+
+  // For debugging
+  std::string ToString() const {
     std::ostringstream os;
+    os << "(";
     std::string sep;
     for (auto i : ys) {
       os << sep << i;
       sep = "-";
     }
+    os << ", " << log_prob << ")";
     return os.str();
   }
 
-  // For debugging
-  std::string ToString() const {
-    std::ostringstream os;
-    os << "(" << Key() << ", " << log_prob << ")";
-    return os.str();
-  }
+  // Hash of ys[0:ys_hash_len]. Used only by Key().
+  mutable uint64_t ys_hash = kTokenHashSeed;
+  mutable size_t ys_hash_len = 0;
 };
 
 class Hypotheses {
@@ -108,13 +137,10 @@ class Hypotheses {
 
   explicit Hypotheses(std::vector<Hypothesis> hyps) {
     for (auto &h : hyps) {
-      hyps_dict_[h.Key()] = std::move(h);
+      Add(std::move(h));
     }
   }
 
-  explicit Hypotheses(std::unordered_map<std::string, Hypothesis> hyps_dict)
-      : hyps_dict_(std::move(hyps_dict)) {}
-
   // Add hyp to this object. If it already exists, its log_prob
   // is updated with the given hyp using log-sum-exp.
   void Add(Hypothesis hyp);
@@ -158,7 +184,9 @@ class Hypotheses {
   }
 
  private:
-  using Map = std ::unordered_map<std::string, Hypothesis>;
+  // Key of a hyp is its Hypothesis::Key(). If two different token sequences
+  // have the same hash, the latter one is stored with the next free key.
+  using Map = std::unordered_map<uint64_t, Hypothesis>;
   Map hyps_dict_;
 };
 
@@ -0,0 +1,82 @@
+// sherpa-onnx/csrc/index-select-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/index-select.h"
+
+#include <numeric>
+
+#include "gtest/gtest.h"
+
+namespace sherpa_onnx {
+
+TEST(IndexSelect, Dim0) {
+  Ort::AllocatorWithDefaultOptions allocator;
+  std::array<int64_t, 2> shape{4, 3};
+  Ort::Value v =
+      Ort::Value::CreateTensor<float>(allocator, shape.data(), shape.size());
+  float *p = v.GetTensorMutableData<float>();
+  std::iota(p, p + shape[0] * shape[1], 0);
+
+  std::vector<int32_t> indexes = {3, 1};
+  auto ans = IndexSelect(allocator, &v, 0, indexes);
+
+  auto ans_shape = ans.GetTensorTypeAndShapeInfo().GetShape();
+  ASSERT_EQ(ans_shape.size(), 2);
+  EXPECT_EQ(ans_shape[0], 2);
+  EXPECT_EQ(ans_shape[1], 3);
+
+  const float *q = ans.GetTensorData<float>();
+  for (int32_t i = 0; i != static_cast<int32_t>(indexes.size()); ++i) {
+    for (int32_t k = 0; k != shape[1]; ++k) {
+      EXPECT_EQ(q[i * shape[1] + k], p[indexes[i] * shape[1] + k]);
+    }
+  }
+}
+
+TEST(IndexSelect, Dim1) {
+  Ort::AllocatorWithDefaultOptions allocator;
+  std::array<int64_t, 4> shape{2, 5, 3, 2};
+  Ort::Value v =
+      Ort::Value::CreateTensor<float>(allocator, shape.data(), shape.size());
+  float *p = v.GetTensorMutableData<float>();
+  std::iota(p, p + shape[0] * shape[1] * shape[2] * shape[3], 0);
+
+  std::vector<int32_t> indexes = {0, 2, 4};
+  auto ans = IndexSelect(allocator, &v, 1, indexes);
+
+  auto ans_shape = ans.GetTensorTypeAndShapeInfo().GetShape();
+  ASSERT_EQ(ans_shape.size(), 4);
+  EXPECT_EQ(ans_shape[0], 2);
+  EXPECT_EQ(ans_shape[1], 3);
+  EXPECT_EQ(ans_shape[2], 3);
+  EXPECT_EQ(ans_shape[3], 2);
+
+  int32_t trailing = shape[2] * shape[3];
+  const float *q = ans.GetTensorData<float>();
+  for (int32_t i = 0; i != shape[0]; ++i) {
+    for (int32_t j = 0; j != static_cast<int32_t>(indexes.size()); ++j) {
+      for (int32_t k = 0; k != trailing; ++k) {
+        EXPECT_EQ(*q, p[(i * shape[1] + indexes[j]) * trailing + k]);
+        ++q;
+      }
+    }
+  }
+}
+
+TEST(IndexSelect, Int64) {
+  Ort::AllocatorWithDefaultOptions allocator;
+  std::array<int64_t, 1> shape{5};
+  Ort::Value v =
+      Ort::Value::CreateTensor<int64_t>(allocator, shape.data(), shape.size());
+  int64_t *p = v.GetTensorMutableData<int64_t>();
+  std::iota(p, p + shape[0], 10);
+
+  auto ans = IndexSelect<int64_t>(allocator, &v, 0, {4, 0, 4});
+  const int64_t *q = ans.GetTensorData<int64_t>();
+  EXPECT_EQ(q[0], 14);
+  EXPECT_EQ(q[1], 10);
+  EXPECT_EQ(q[2], 14);
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,70 @@
+// sherpa-onnx/csrc/index-select.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/index-select.h"
+
+#include <algorithm>
+#include <cassert>
+#include <functional>
+#include <numeric>
+#include <vector>
+
+#include "onnxruntime_cxx_api.h"  // NOLINT
+
+namespace sherpa_onnx {
+
+template <typename T /*= float*/>
+Ort::Value IndexSelect(OrtAllocator *allocator, const Ort::Value *value,
+                       int32_t dim, const std::vector<int32_t> &indexes) {
+  std::vector<int64_t> shape = value->GetTensorTypeAndShapeInfo().GetShape();
+  assert(dim >= 0);
+  assert(dim < static_cast<int32_t>(shape.size()));
+
+  int32_t n = static_cast<int32_t>(shape[dim]);
+
+  std::vector<int64_t> ans_shape = shape;
+  ans_shape[dim] = static_cast<int64_t>(indexes.size());
+
+  Ort::Value ans = Ort::Value::CreateTensor<T>(allocator, ans_shape.data(),
+                                               ans_shape.size());
+
+  auto leading_size = static_cast<int64_t>(std::accumulate(
+      shape.begin(), shape.begin() + dim, 1, std::multiplies<int64_t>()));
+
+  auto trailing_size = static_cast<int64_t>(std::accumulate(
+      shape.begin() + dim + 1, shape.end(), 1, std::multiplies<int64_t>()));
+
+  const T *src = value->GetTensorData<T>();
+  T *dst = ans.GetTensorMutableData<T>();
+
+  for (int64_t i = 0; i != leading_size; ++i) {
+    for (auto k : indexes) {
+      assert(k >= 0 && k < n);
+      const T *p = src + k * trailing_size;
+      std::copy(p, p + trailing_size, dst);
+      dst += trailing_size;
+    }
+    src += n * trailing_size;
+  }
+
+  return ans;
+}
+
+template Ort::Value IndexSelect<float>(OrtAllocator *allocator,
+                                       const Ort::Value *value, int32_t dim,
+                                       const std::vector<int32_t> &indexes);
+
+template Ort::Value IndexSelect<int32_t>(OrtAllocator *allocator,
+                                         const Ort::Value *value, int32_t dim,
+                                         const std::vector<int32_t> &indexes);
+
+template Ort::Value IndexSelect<int64_t>(OrtAllocator *allocator,
+                                         const Ort::Value *value, int32_t dim,
+                                         const std::vector<int32_t> &indexes);
+
+template Ort::Value IndexSelect<bool>(OrtAllocator *allocator,
+                                      const Ort::Value *value, int32_t dim,
+                                      const std::vector<int32_t> &indexes);
+
+}  // namespace sherpa_onnx
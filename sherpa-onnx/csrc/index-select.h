@@ -0,0 +1,32 @@
+// sherpa-onnx/csrc/index-select.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_INDEX_SELECT_H_
+#define SHERPA_ONNX_CSRC_INDEX_SELECT_H_
+
+#include <vector>
+
+#include "onnxruntime_cxx_api.h"  // NOLINT
+
+namespace sherpa_onnx {
+
+/** It is similar to torch.index_select().
+ *
+ * It is used, e.g., to remove finished sequences from the states of
+ * a batched decoder.
+ *
+ * @param allocator Allocator to allocate space for the returned tensor
+ * @param value  The tensor to select from
+ * @param dim  The dim along which to select
+ * @param indexes  Indexes into value.shape[dim]. It can contain duplicates.
+ *
+ * @return Return a tensor of the same shape as value except that
+ *         ans.shape[dim] is indexes.size()
+ */
+template <typename T = float>
+Ort::Value IndexSelect(OrtAllocator *allocator, const Ort::Value *value,
+                       int32_t dim, const std::vector<int32_t> &indexes);
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_INDEX_SELECT_H_
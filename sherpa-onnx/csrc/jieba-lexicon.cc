@@ -19,6 +19,7 @@
 #include "rawfile/raw_file_manager.h"
 #endif
 
+#include "sherpa-onnx/csrc/binary-lexicon.h"
 #include "sherpa-onnx/csrc/file-utils.h"
 #include "sherpa-onnx/csrc/jieba.h"
 #include "sherpa-onnx/csrc/macros.h"
@@ -44,14 +45,11 @@ class JiebaLexicon::Impl {
     jieba_ = InitJieba(dict_dir);
 
     {
-      std::ifstream is(tokens);
+      std::ifstream is(tokens, std::ios::binary);
       InitTokens(is);
     }
 
-    {
-      std::ifstream is(lexicon);
-      InitLexicon(is);
-    }
+    word2ids_.Init(ReadFile(lexicon), token2id_);
   }
 
   template <typename Manager>
@@ -67,11 +65,7 @@ class JiebaLexicon::Impl {
       InitTokens(is);
     }
 
-    {
-      auto buf = ReadFile(mgr, lexicon);
-      std::istrstream is(buf.data(), buf.size());
-      InitLexicon(is);
-    }
+    word2ids_.Init(ReadFile(mgr, lexicon), token2id_);
   }
 
   std::vector<TokenIDs> ConvertTextToTokenIds(const std::string &text) const {
@@ -187,9 +181,15 @@ class JiebaLexicon::Impl {
   }
 
  private:
+  // Return nullptr if the word is not in the lexicon
+  const int32_t *FindWord(const std::string &w, int32_t *num_ids) const {
+    return word2ids_.Find(w, num_ids);
+  }
+
   std::vector<int32_t> ConvertWordToIds(const std::string &w) const {
-    if (word2ids_.count(w)) {
-      return word2ids_.at(w);
+    int32_t num_ids = 0;
+    if (const int32_t *ids = FindWord(w, &num_ids)) {
+      return {ids, ids + num_ids};
     }
 
     if (token2id_.count(w)) {
@@ -200,9 +200,9 @@ class JiebaLexicon::Impl {
 
     std::vector<std::string> words = SplitUtf8(w);
     for (const auto &word : words) {
-      if (word2ids_.count(word)) {
-        auto ids = ConvertWordToIds(word);
-        ans.insert(ans.end(), ids.begin(), ids.end());
+      int32_t num_ids = 0;
+      if (const int32_t *ids = FindWord(word, &num_ids)) {
+        ans.insert(ans.end(), ids, ids + num_ids);
       }
     }
 
@@ -236,52 +236,9 @@ class JiebaLexicon::Impl {
     }
   }
 
-  void InitLexicon(std::istream &is) {
-    std::string word;
-    std::vector<std::string> token_list;
-    std::string line;
-    std::string phone;
-    int32_t line_num = 0;
-
-    while (std::getline(is, line)) {
-      ++line_num;
-
-      std::istringstream iss(line);
-
-      token_list.clear();
-
-      iss >> word;
-      ToLowerCase(&word);
-
-      if (word2ids_.count(word)) {
-#if __OHOS__
-        SHERPA_ONNX_LOGE(
-            "Duplicated word: %{public}s at line %{public}d:%{public}s. Ignore "
-            "it.",
-            word.c_str(), line_num, line.c_str());
-#else
-        SHERPA_ONNX_LOGE("Duplicated word: %s at line %d:%s. Ignore it.",
-                         word.c_str(), line_num, line.c_str());
-#endif
-        continue;
-      }
-
-      while (iss >> phone) {
-        token_list.push_back(std::move(phone));
-      }
-
-      std::vector<int32_t> ids = ConvertTokensToIds(token2id_, token_list);
-      if (ids.empty()) {
-        continue;
-      }
-
-      word2ids_.insert({std::move(word), std::move(ids)});
-    }
-  }
-
  private:
-  // lexicon.txt is saved in word2ids_
-  std::unordered_map<std::string, std::vector<int32_t>> word2ids_;
+  // lexicon.txt or its binary form
+  LexiconTable word2ids_;
 
   // tokens.txt is saved in token2id_
   std::unordered_map<std::string, int32_t> token2id_;
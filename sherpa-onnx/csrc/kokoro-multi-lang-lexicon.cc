@@ -403,7 +403,7 @@ class KokoroMultiLangLexicon::Impl {
   }
 
   void InitTokens(const std::string &tokens) {
-    std::ifstream is(tokens);
+    std::ifstream is(tokens, std::ios::binary);
     InitTokens(is);
   }
 
@@ -0,0 +1,55 @@
+// sherpa-onnx/csrc/length-buckets-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/length-buckets.h"
+
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace sherpa_onnx {
+
+TEST(LengthBuckets, NoLimit) {
+  std::vector<int32_t> lengths = {200, 2800, 300, 2000};
+  auto buckets = SplitIntoLengthBuckets(lengths.data(), lengths.size(), 1, 0);
+
+  ASSERT_EQ(buckets.size(), 1);
+  EXPECT_EQ(buckets[0], (std::vector<int32_t>{1, 3, 2, 0}));
+}
+
+TEST(LengthBuckets, MaxPaddingRatio) {
+  std::vector<int32_t> lengths = {200, 2800, 300, 2600};
+  auto buckets =
+      SplitIntoLengthBuckets(lengths.data(), lengths.size(), 0.2, 0);
+
+  // (2800 * 2 - 5400) / 5600 < 0.2
+  // (300 * 2 - 500) / 600 < 0.2
+  ASSERT_EQ(buckets.size(), 2);
+  EXPECT_EQ(buckets[0], (std::vector<int32_t>{1, 3}));
+  EXPECT_EQ(buckets[1], (std::vector<int32_t>{2, 0}));
+}
+
+TEST(LengthBuckets, MaxFramesPerBatch) {
+  std::vector<int32_t> lengths = {100, 100, 100, 100, 100};
+  auto buckets =
+      SplitIntoLengthBuckets(lengths.data(), lengths.size(), 1, 250);
+
+  ASSERT_EQ(buckets.size(), 3);
+  EXPECT_EQ(buckets[0], (std::vector<int32_t>{0, 1}));
+  EXPECT_EQ(buckets[1], (std::vector<int32_t>{2, 3}));
+  EXPECT_EQ(buckets[2], (std::vector<int32_t>{4}));
+}
+
+TEST(LengthBuckets, TooLong) {
+  // An item longer than max_frames_per_batch is put into its own bucket
+  std::vector<int32_t> lengths = {10, 1000};
+  auto buckets =
+      SplitIntoLengthBuckets(lengths.data(), lengths.size(), 1, 100);
+
+  ASSERT_EQ(buckets.size(), 2);
+  EXPECT_EQ(buckets[0], (std::vector<int32_t>{1}));
+  EXPECT_EQ(buckets[1], (std::vector<int32_t>{0}));
+}
+
+}  // namespace sherpa_onnx
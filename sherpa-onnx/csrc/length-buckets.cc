@@ -0,0 +1,62 @@
+// sherpa-onnx/csrc/length-buckets.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/length-buckets.h"
+
+#include <algorithm>
+#include <numeric>
+#include <vector>
+
+namespace sherpa_onnx {
+
+std::vector<std::vector<int32_t>> SplitIntoLengthBuckets(
+    const int32_t *lengths, int32_t n, float max_padding_ratio,
+    int32_t max_frames_per_batch) {
+  std::vector<int32_t> indexes(n);
+  std::iota(indexes.begin(), indexes.end(), 0);
+
+  std::stable_sort(
+      indexes.begin(), indexes.end(),
+      [lengths](int32_t a, int32_t b) { return lengths[a] > lengths[b]; });
+
+  std::vector<std::vector<int32_t>> ans;
+
+  int64_t max_len = 0;
+  int64_t sum = 0;
+
+  for (auto i : indexes) {
+    int64_t len = lengths[i];
+
+    if (!ans.empty()) {
+      // lengths are sorted in descending order, so max_len is the length
+      // of the first item in the current bucket
+      int64_t num_items = ans.back().size() + 1;
+      int64_t total = max_len * num_items;
+
+      bool ok = true;
+      if (max_padding_ratio < 1 && total > 0 &&
+          static_cast<float>(total - sum - len) / total > max_padding_ratio) {
+        ok = false;
+      }
+
+      if (max_frames_per_batch > 0 && total > max_frames_per_batch) {
+        ok = false;
+      }
+
+      if (ok) {
+        ans.back().push_back(i);
+        sum += len;
+        continue;
+      }
+    }
+
+    ans.push_back({i});
+    max_len = len;
+    sum = len;
+  }
+
+  return ans;
+}
+
+}  // namespace sherpa_onnx
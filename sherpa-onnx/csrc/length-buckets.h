@@ -0,0 +1,37 @@
+// sherpa-onnx/csrc/length-buckets.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_LENGTH_BUCKETS_H_
+#define SHERPA_ONNX_CSRC_LENGTH_BUCKETS_H_
+
+#include <cstdint>
+#include <vector>
+
+namespace sherpa_onnx {
+
+/** Split items into buckets of similar lengths so that each bucket can be
+ * padded and run as a batch without wasting too much computation on padding.
+ *
+ * Items are sorted by length in descending order and a bucket is filled
+ * greedily until adding the next item would violate one of the limits.
+ * A bucket always contains at least one item.
+ *
+ * @param lengths Pointer to a 1-D array of size n, e.g., number of feature
+ *                frames of each stream.
+ * @param n Number of items.
+ * @param max_padding_ratio  Max ratio of padded frames to the total number of
+ *                           frames, i.e., max_len * size, in a bucket. A value
+ *                           >= 1 disables this limit.
+ * @param max_frames_per_batch  Max value of max_len * size in a bucket. A
+ *                              value <= 0 disables this limit.
+ *
+ * @return Return a list of buckets. Each bucket contains indexes into
+ *         lengths. Buckets are sorted by length in descending order.
+ */
+std::vector<std::vector<int32_t>> SplitIntoLengthBuckets(
+    const int32_t *lengths, int32_t n, float max_padding_ratio,
+    int32_t max_frames_per_batch);
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_LENGTH_BUCKETS_H_
@@ -78,22 +78,6 @@ static std::vector<std::string> ProcessHeteronyms(
   return ans;
 }
 
-std::vector<int32_t> ConvertTokensToIds(
-    const std::unordered_map<std::string, int32_t> &token2id,
-    const std::vector<std::string> &tokens) {
-  std::vector<int32_t> ids;
-  ids.reserve(tokens.size());
-  for (const auto &s : tokens) {
-    if (!token2id.count(s)) {
-      return {};
-    }
-    int32_t id = token2id.at(s);
-    ids.push_back(id);
-  }
-
-  return ids;
-}
-
 Lexicon::Lexicon(const std::string &lexicon, const std::string &tokens,
                  const std::string &punctuations, const std::string &language,
                  bool debug /*= false*/)
@@ -101,14 +85,11 @@ Lexicon::Lexicon(const std::string &lexicon, const std::string &tokens,
   InitLanguage(language);
 
   {
-    std::ifstream is(tokens);
+    std::ifstream is(tokens, std::ios::binary);
     InitTokens(is);
   }
 
-  {
-    std::ifstream is(lexicon);
-    InitLexicon(is);
-  }
+  word2ids_.Init(ReadFile(lexicon), token2id_);
 
   InitPunctuations(punctuations);
 }
@@ -127,11 +108,7 @@ Lexicon::Lexicon(Manager *mgr, const std::string &lexicon,
     InitTokens(is);
   }
 
-  {
-    auto buf = ReadFile(mgr, lexicon);
-    std::istrstream is(buf.data(), buf.size());
-    InitLexicon(is);
-  }
+  word2ids_.Init(ReadFile(mgr, lexicon), token2id_);
 
   InitPunctuations(punctuations);
 }
@@ -236,14 +213,14 @@ std::vector<TokenIDs> Lexicon::ConvertTextToTokenIdsChinese(
       continue;
     }
 
-    if (!word2ids_.count(w)) {
+    int32_t num_ids = 0;
+    const int32_t *token_ids = FindWord(w, &num_ids);
+    if (!token_ids) {
       SHERPA_ONNX_LOGE("OOV %s. Ignore it!", w.c_str());
       continue;
     }
 
-    const auto &token_ids = word2ids_.at(w);
-    this_sentence.insert(this_sentence.end(), token_ids.begin(),
-                         token_ids.end());
+    this_sentence.insert(this_sentence.end(), token_ids, token_ids + num_ids);
     if (blank != -1) {
       this_sentence.push_back(blank);
     }
@@ -313,14 +290,14 @@ std::vector<TokenIDs> Lexicon::ConvertTextToTokenIdsNotChinese(
       continue;
     }
 
-    if (!word2ids_.count(w)) {
+    int32_t num_ids = 0;
+    const int32_t *token_ids = FindWord(w, &num_ids);
+    if (!token_ids) {
       SHERPA_ONNX_LOGE("OOV %s. Ignore it!", w.c_str());
       continue;
     }
 
-    const auto &token_ids = word2ids_.at(w);
-    this_sentence.insert(this_sentence.end(), token_ids.begin(),
-                         token_ids.end());
+    this_sentence.insert(this_sentence.end(), token_ids, token_ids + num_ids);
     this_sentence.push_back(blank);
   }
 
@@ -336,6 +313,10 @@ std::vector<TokenIDs> Lexicon::ConvertTextToTokenIdsNotChinese(
   return ans;
 }
 
+const int32_t *Lexicon::FindWord(const std::string &w, int32_t *num_ids) const {
+  return word2ids_.Find(w, num_ids);
+}
+
 void Lexicon::InitTokens(std::istream &is) { token2id_ = ReadTokens(is); }
 
 void Lexicon::InitLanguage(const std::string &_lang) {
@@ -351,38 +332,6 @@ void Lexicon::InitLanguage(const std::string &_lang) {
   }
 }
 
-void Lexicon::InitLexicon(std::istream &is) {
-  std::string word;
-  std::vector<std::string> token_list;
-  std::string line;
-  std::string phone;
-
-  while (std::getline(is, line)) {
-    std::istringstream iss(line);
-
-    token_list.clear();
-
-    iss >> word;
-    ToLowerCase(&word);
-
-    if (word2ids_.count(word)) {
-      SHERPA_ONNX_LOGE("Duplicated word: %s. Ignore it.", word.c_str());
-      continue;
-    }
-
-    while (iss >> phone) {
-      token_list.push_back(std::move(phone));
-    }
-
-    std::vector<int32_t> ids = ConvertTokensToIds(token2id_, token_list);
-    if (ids.empty()) {
-      continue;
-    }
-
-    word2ids_.insert({std::move(word), std::move(ids)});
-  }
-}
-
 void Lexicon::InitPunctuations(const std::string &punctuations) {
   std::vector<std::string> punctuation_list;
   SplitStringToVector(punctuations, " ", false, &punctuation_list);
@@ -13,6 +13,7 @@
 #include <unordered_set>
 #include <vector>
 
+#include "sherpa-onnx/csrc/binary-lexicon.h"
 #include "sherpa-onnx/csrc/offline-tts-frontend.h"
 
 namespace sherpa_onnx {
@@ -41,9 +42,11 @@ class Lexicon : public OfflineTtsFrontend {
   std::vector<TokenIDs> ConvertTextToTokenIdsChinese(
       const std::string &text) const;
 
+  // Return nullptr if the word is not in the lexicon
+  const int32_t *FindWord(const std::string &w, int32_t *num_ids) const;
+
   void InitLanguage(const std::string &lang);
   void InitTokens(std::istream &is);
-  void InitLexicon(std::istream &is);
   void InitPunctuations(const std::string &punctuations);
 
  private:
@@ -54,7 +57,9 @@ class Lexicon : public OfflineTtsFrontend {
   };
 
  private:
-  std::unordered_map<std::string, std::vector<int32_t>> word2ids_;
+  // lexicon.txt or its binary form
+  LexiconTable word2ids_;
+
   std::unordered_set<std::string> punctuations_;
   std::unordered_map<std::string, int32_t> token2id_;
   Language language_ = Language::kUnknown;
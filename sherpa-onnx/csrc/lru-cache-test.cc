@@ -0,0 +1,75 @@
+// sherpa-onnx/csrc/lru-cache-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/lru-cache.h"
+
+#include <memory>
+#include <string>
+#include <thread>  // NOLINT
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace sherpa_onnx {
+
+TEST(LruCache, GetAndPut) {
+  LruCache<const std::string> cache(2);
+  EXPECT_EQ(cache.Get("a"), nullptr);
+
+  cache.Put("a", std::make_shared<const std::string>("1"));
+  cache.Put("b", std::make_shared<const std::string>("2"));
+  ASSERT_NE(cache.Get("a"), nullptr);
+  EXPECT_EQ(*cache.Get("a"), "1");
+
+  // b is evicted since a is used more recently
+  cache.Put("c", std::make_shared<const std::string>("3"));
+  EXPECT_EQ(cache.Get("b"), nullptr);
+  EXPECT_EQ(*cache.Get("c"), "3");
+
+  auto stats = cache.Stats();
+  EXPECT_EQ(stats.hits, 3);
+  EXPECT_EQ(stats.misses, 2);
+  EXPECT_EQ(stats.size, 2);
+  EXPECT_EQ(stats.capacity, 2);
+  EXPECT_FLOAT_EQ(stats.HitRate(), 0.6);
+
+  cache.Clear();
+  stats = cache.Stats();
+  EXPECT_EQ(stats.hits, 0);
+  EXPECT_EQ(stats.misses, 0);
+  EXPECT_EQ(stats.size, 0);
+  EXPECT_EQ(cache.Get("a"), nullptr);
+}
+
+TEST(LruCache, Disabled) {
+  LruCache<const std::string> cache(0);
+  cache.Put("a", std::make_shared<const std::string>("1"));
+  EXPECT_EQ(cache.Get("a"), nullptr);
+  EXPECT_EQ(cache.Stats().size, 0);
+}
+
+TEST(LruCache, MultiThreads) {
+  LruCache<const std::string> cache(8);
+  std::vector<std::thread> threads;
+  for (int32_t t = 0; t != 4; ++t) {
+    threads.emplace_back([&cache, t]() {
+      for (int32_t i = 0; i != 1000; ++i) {
+        std::string key = std::to_string((i + t) % 16);
+        if (!cache.Get(key)) {
+          cache.Put(key, std::make_shared<const std::string>(key));
+        }
+      }
+    });
+  }
+
+  for (auto &t : threads) {
+    t.join();
+  }
+
+  auto stats = cache.Stats();
+  EXPECT_EQ(stats.size, 8);
+  EXPECT_EQ(stats.hits + stats.misses, 4000);
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,137 @@
+// sherpa-onnx/csrc/lru-cache.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_LRU_CACHE_H_
+#define SHERPA_ONNX_CSRC_LRU_CACHE_H_
+
+#include <cstdint>
+#include <list>
+#include <memory>
+#include <mutex>  // NOLINT
+#include <sstream>
+#include <string>
+#include <string_view>
+#include <unordered_map>
+#include <utility>
+
+namespace sherpa_onnx {
+
+struct LruCacheStats {
+  int64_t hits = 0;
+  int64_t misses = 0;
+
+  // Number of entries in the cache
+  int32_t size = 0;
+  int32_t capacity = 0;
+
+  float HitRate() const {
+    int64_t n = hits + misses;
+    return n > 0 ? static_cast<float>(hits) / n : 0;
+  }
+
+  std::string ToString() const {
+    std::ostringstream os;
+    os << "LruCacheStats(";
+    os << "hits=" << hits << ", ";
+    os << "misses=" << misses << ", ";
+    os << "size=" << size << ", ";
+    os << "capacity=" << capacity << ", ";
+    os << "hit_rate=" << HitRate() << ")";
+    return os.str();
+  }
+};
+
+// A thread-safe LRU cache with string keys.
+//
+// Values are shared with the caller. Use a const T, e.g.,
+// LruCache<const std::string>, if values must not be modified after they
+// are put into the cache.
+template <typename T>
+class LruCache {
+ public:
+  using ValuePtr = std::shared_ptr<T>;
+
+  // @param capacity Max number of entries in the cache. If it is 0, the
+  //                 cache is disabled.
+  explicit LruCache(int32_t capacity) : capacity_(capacity) {}
+
+  int32_t Capacity() const { return capacity_; }
+
+  // Return nullptr if the key is not in the cache
+  ValuePtr Get(const std::string &key) {
+    if (capacity_ <= 0) {
+      return nullptr;
+    }
+
+    std::lock_guard<std::mutex> lock(mutex_);
+    auto it = index_.find(key);
+    if (it == index_.end()) {
+      ++misses_;
+      return nullptr;
+    }
+
+    ++hits_;
+    entries_.splice(entries_.begin(), entries_, it->second);
+    return it->second->second;
+  }
+
+  void Put(const std::string &key, ValuePtr value) {
+    if (capacity_ <= 0) {
+      return;
+    }
+
+    std::lock_guard<std::mutex> lock(mutex_);
+    auto it = index_.find(key);
+    if (it != index_.end()) {
+      it->second->second = std::move(value);
+      entries_.splice(entries_.begin(), entries_, it->second);
+      return;
+    }
+
+    entries_.emplace_front(key, std::move(value));
+    index_.emplace(entries_.front().first, entries_.begin());
+
+    if (static_cast<int32_t>(entries_.size()) > capacity_) {
+      index_.erase(entries_.back().first);
+      entries_.pop_back();
+    }
+  }
+
+  // Remove all entries and reset the statistics
+  void Clear() {
+    std::lock_guard<std::mutex> lock(mutex_);
+    index_.clear();
+    entries_.clear();
+    hits_ = 0;
+    misses_ = 0;
+  }
+
+  LruCacheStats Stats() const {
+    std::lock_guard<std::mutex> lock(mutex_);
+    LruCacheStats ans;
+    ans.hits = hits_;
+    ans.misses = misses_;
+    ans.size = static_cast<int32_t>(entries_.size());
+    ans.capacity = capacity_;
+    return ans;
+  }
+
+ private:
+  int32_t capacity_;
+
+  mutable std::mutex mutex_;
+
+  // Most recently used entries are at the front
+  std::list<std::pair<std::string, ValuePtr>> entries_;
+
+  // Keys point to the strings in entries_
+  std::unordered_map<std::string_view, typename decltype(entries_)::iterator>
+      index_;
+
+  int64_t hits_ = 0;
+  int64_t misses_ = 0;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_LRU_CACHE_H_
@@ -37,7 +37,7 @@ class MeloTtsLexicon::Impl {
     jieba_ = InitJieba(dict_dir);
 
     {
-      std::ifstream is(tokens);
+      std::ifstream is(tokens, std::ios::binary);
       InitTokens(is);
     }
 
@@ -51,7 +51,7 @@ class MeloTtsLexicon::Impl {
        const OfflineTtsVitsModelMetaData &meta_data, bool debug)
       : meta_data_(meta_data), debug_(debug) {
     {
-      std::ifstream is(tokens);
+      std::ifstream is(tokens, std::ios::binary);
       InitTokens(is);
     }
 
@@ -0,0 +1,407 @@
+// sherpa-onnx/csrc/multi-stream-voice-activity-detector.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/multi-stream-voice-activity-detector.h"
+
+#include <algorithm>
+#include <deque>
+#include <memory>
+#include <mutex>  // NOLINT
+#include <utility>
+#include <vector>
+
+#if __ANDROID_API__ >= 9
+#include "android/asset_manager.h"
+#include "android/asset_manager_jni.h"
+#endif
+
+#if __OHOS__
+#include "rawfile/raw_file_manager.h"
+#endif
+
+#include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/vad-model.h"
+#include "sherpa-onnx/csrc/vad-trigger.h"
+
+namespace sherpa_onnx {
+
+namespace {
+
+// It is given to the VoiceActivityDetector of a stream. Instead of running
+// the model in IsSpeech(), it uses the probabilities computed in a batch by
+// MultiStreamVoiceActivityDetector::Process().
+//
+// It uses the same VadTrigger as SileroVadModel and TenVadModel to decide
+// whether a window is speech.
+class VadStreamModel : public VadModel {
+ public:
+  VadStreamModel(std::shared_ptr<VadModel> model, const VadModelConfig &config)
+      : model_(std::move(model)), sample_rate_(config.sample_rate) {
+    if (!config.silero_vad.model.empty()) {
+      threshold_ = config.silero_vad.threshold;
+      min_silence_samples_ =
+          sample_rate_ * config.silero_vad.min_silence_duration;
+      min_speech_samples_ =
+          sample_rate_ * config.silero_vad.min_speech_duration;
+    } else {
+      threshold_ = config.ten_vad.threshold;
+      min_silence_samples_ = sample_rate_ * config.ten_vad.min_silence_duration;
+      min_speech_samples_ = sample_rate_ * config.ten_vad.min_speech_duration;
+    }
+
+    Reset();
+  }
+
+  void Reset() override {
+    state_ = model_->CreateState();
+    probs_.clear();
+
+    trigger_.Reset();
+  }
+
+  bool IsSpeech(const float * /*samples*/, int32_t /*n*/) override {
+    if (probs_.empty()) {
+      SHERPA_ONNX_LOGE("No speech probability is available");
+      SHERPA_ONNX_EXIT(-1);
+    }
+
+    float prob = probs_.front();
+    probs_.pop_front();
+
+    return trigger_.IsSpeech(prob, threshold_, model_->WindowShift(),
+                             min_speech_samples_, min_silence_samples_);
+  }
+
+  float Compute(const float *samples, int32_t n) override {
+    if (n != WindowSize()) {
+      SHERPA_ONNX_LOGE("n: %d != window_size: %d", n, WindowSize());
+      SHERPA_ONNX_EXIT(-1);
+    }
+
+    float prob = 0;
+    VadModelState *s = state_.get();
+    model_->ComputeBatch(samples, 1, &s, &prob);
+    return prob;
+  }
+
+  int32_t WindowSize() const override { return model_->WindowSize(); }
+
+  int32_t WindowShift() const override { return model_->WindowShift(); }
+
+  int32_t MinSilenceDurationSamples() const override {
+    return min_silence_samples_;
+  }
+
+  int32_t MinSpeechDurationSamples() const override {
+    return min_speech_samples_;
+  }
+
+  void SetMinSilenceDuration(float s) override {
+    min_silence_samples_ = sample_rate_ * s;
+  }
+
+  void SetThreshold(float threshold) override { threshold_ = threshold; }
+
+  VadModelState *GetState() { return state_.get(); }
+
+  void AcceptProb(float prob) { probs_.push_back(prob); }
+
+ private:
+  std::shared_ptr<VadModel> model_;
+  std::unique_ptr<VadModelState> state_;
+
+  // probabilities of windows that have been computed but not yet
+  // consumed by IsSpeech()
+  std::deque<float> probs_;
+
+  int32_t sample_rate_;
+  float threshold_;
+  int32_t min_silence_samples_;
+  int32_t min_speech_samples_;
+
+  VadTrigger trigger_;
+};
+
+}  // namespace
+
+class VadStream::Impl {
+ public:
+  Impl(std::shared_ptr<VadModel> model, const VadModelConfig &config,
+       float buffer_size_in_seconds) {
+    auto m = std::make_unique<VadStreamModel>(std::move(model), config);
+    model_ = m.get();
+
+    vad_ = std::make_unique<VoiceActivityDetector>(std::move(m), config,
+                                                   buffer_size_in_seconds);
+  }
+
+  void AcceptWaveform(const float *samples, int32_t n) {
+    if (n <= 0) {
+      return;
+    }
+
+    samples_.insert(samples_.end(), samples, samples + n);
+    chunk_sizes_.push_back(n);
+  }
+
+  void AcceptWaveform(const int16_t *samples, int32_t n) {
+    if (n <= 0) {
+      return;
+    }
+
+    samples_.reserve(samples_.size() + n);
+    for (int32_t i = 0; i != n; ++i) {
+      samples_.push_back(samples[i] / 32768.0f);
+    }
+    chunk_sizes_.push_back(n);
+  }
+
+  // Number of windows that can be computed from the buffered samples
+  int32_t NumWindows() const {
+    int32_t window_size = model_->WindowSize();
+    int32_t window_shift = model_->WindowShift();
+
+    int32_t n = static_cast<int32_t>(samples_.size());
+    if (n < window_size) {
+      return 0;
+    }
+
+    return (n - window_size) / window_shift + 1;
+  }
+
+  // Return a pointer to the i-th window
+  const float *GetWindow(int32_t i) const {
+    return samples_.data() + i * model_->WindowShift();
+  }
+
+  VadModelState *GetState() { return model_->GetState(); }
+
+  void AcceptProb(float prob) { model_->AcceptProb(prob); }
+
+  // Feed the buffered samples to the VAD. It must be called after the
+  // probabilities of all windows have been passed to AcceptProb().
+  void ProcessBufferedSamples(int32_t num_windows) {
+    // samples_ contains the samples kept inside vad_ followed by the
+    // samples of the pending chunks
+    int32_t offset =
+        static_cast<int32_t>(samples_.size()) - num_pending_samples();
+
+    for (auto n : chunk_sizes_) {
+      vad_->AcceptWaveform(samples_.data() + offset, n);
+      offset += n;
+    }
+    chunk_sizes_.clear();
+
+    samples_.erase(samples_.begin(),
+                   samples_.begin() + num_windows * model_->WindowShift());
+  }
+
+  VoiceActivityDetector *GetVad() { return vad_.get(); }
+
+  const VoiceActivityDetector *GetVad() const { return vad_.get(); }
+
+  void Reset() {
+    vad_->Reset();
+    samples_.clear();
+    chunk_sizes_.clear();
+  }
+
+ private:
+  int32_t num_pending_samples() const {
+    int32_t ans = 0;
+    for (auto n : chunk_sizes_) {
+      ans += n;
+    }
+    return ans;
+  }
+
+ private:
+  // Owned by vad_
+  VadStreamModel *model_ = nullptr;
+  std::unique_ptr<VoiceActivityDetector> vad_;
+
+  std::vector<float> samples_;
+
+  // Sizes of chunks received by AcceptWaveform() since the last call of
+  // ProcessBufferedSamples(). They are passed to vad_ one by one so that
+  // the result is the same as calling VoiceActivityDetector::AcceptWaveform()
+  // directly.
+  std::vector<int32_t> chunk_sizes_;
+};
+
+VadStream::VadStream(std::unique_ptr<Impl> impl) : impl_(std::move(impl)) {}
+
+VadStream::~VadStream() = default;
+
+void VadStream::AcceptWaveform(const float *samples, int32_t n) {
+  impl_->AcceptWaveform(samples, n);
+}
+
+void VadStream::AcceptWaveform(const int16_t *samples, int32_t n) {
+  impl_->AcceptWaveform(samples, n);
+}
+
+bool VadStream::Empty() const { return impl_->GetVad()->Empty(); }
+
+void VadStream::Pop() { impl_->GetVad()->Pop(); }
+
+void VadStream::Clear() { impl_->GetVad()->Clear(); }
+
+const SpeechSegment &VadStream::Front() const {
+  return impl_->GetVad()->Front();
+}
+
+bool VadStream::IsSpeechDetected() const {
+  return impl_->GetVad()->IsSpeechDetected();
+}
+
+SpeechSegment VadStream::CurrentSpeechSegment() const {
+  return impl_->GetVad()->CurrentSpeechSegment();
+}
+
+const SpeechSegment &VadStream::CurrentSpeechSegmentRef() const {
+  return impl_->GetVad()->CurrentSpeechSegmentRef();
+}
+
+std::vector<float> VadStream::GetNewSpeechSamples() {
+  return impl_->GetVad()->GetNewSpeechSamples();
+}
+
+void VadStream::Reset() { impl_->Reset(); }
+
+void VadStream::Flush() { impl_->GetVad()->Flush(); }
+
+class MultiStreamVoiceActivityDetector::Impl {
+ public:
+  Impl(const VadModelConfig &config, float buffer_size_in_seconds)
+      : model_(VadModel::Create(config)),
+        config_(config),
+        buffer_size_in_seconds_(buffer_size_in_seconds) {}
+
+  template <typename Manager>
+  Impl(Manager *mgr, const VadModelConfig &config,
+       float buffer_size_in_seconds)
+      : model_(VadModel::Create(mgr, config)),
+        config_(config),
+        buffer_size_in_seconds_(buffer_size_in_seconds) {}
+
+  std::unique_ptr<VadStream> CreateStream() const {
+    auto impl = std::make_unique<VadStream::Impl>(model_, config_,
+                                                  buffer_size_in_seconds_);
+    return std::unique_ptr<VadStream>(new VadStream(std::move(impl)));
+  }
+
+  bool IsReady(const VadStream *s) const {
+    return s->impl_->NumWindows() > 0;
+  }
+
+  void Process(VadStream **ss, int32_t n) const {
+    std::vector<int32_t> num_windows(n);
+    int32_t max_num_windows = 0;
+    for (int32_t i = 0; i != n; ++i) {
+      num_windows[i] = ss[i]->impl_->NumWindows();
+      max_num_windows = std::max(max_num_windows, num_windows[i]);
+    }
+
+    int32_t window_size = model_->WindowSize();
+
+    std::vector<float> samples;
+    std::vector<VadModelState *> states;
+    std::vector<VadStream::Impl *> streams;
+    std::vector<float> probs;
+
+    // In the r-th round, we run the r-th window of each stream in a batch
+    for (int32_t r = 0; r != max_num_windows; ++r) {
+      samples.clear();
+      states.clear();
+      streams.clear();
+
+      for (int32_t i = 0; i != n; ++i) {
+        if (r >= num_windows[i]) {
+          continue;
+        }
+
+        auto s = ss[i]->impl_.get();
+        const float *p = s->GetWindow(r);
+
+        samples.insert(samples.end(), p, p + window_size);
+        states.push_back(s->GetState());
+        streams.push_back(s);
+      }
+
+      int32_t batch_size = static_cast<int32_t>(streams.size());
+      probs.resize(batch_size);
+
+      {
+        std::lock_guard<std::mutex> lock(mutex_);
+        model_->ComputeBatch(samples.data(), batch_size, states.data(),
+                             probs.data());
+      }
+
+      for (int32_t i = 0; i != batch_size; ++i) {
+        streams[i]->AcceptProb(probs[i]);
+      }
+    }
+
+    for (int32_t i = 0; i != n; ++i) {
+      ss[i]->impl_->ProcessBufferedSamples(num_windows[i]);
+    }
+  }
+
+  const VadModelConfig &GetConfig() const { return config_; }
+
+ private:
+  std::shared_ptr<VadModel> model_;
+  VadModelConfig config_;
+  float buffer_size_in_seconds_;
+
+  // The model is shared by all streams and its session is not
+  // re-entrant in all providers
+  mutable std::mutex mutex_;
+};
+
+MultiStreamVoiceActivityDetector::MultiStreamVoiceActivityDetector(
+    const VadModelConfig &config, float buffer_size_in_seconds /*= 60*/)
+    : impl_(std::make_unique<Impl>(config, buffer_size_in_seconds)) {}
+
+template <typename Manager>
+MultiStreamVoiceActivityDetector::MultiStreamVoiceActivityDetector(
+    Manager *mgr, const VadModelConfig &config,
+    float buffer_size_in_seconds /*= 60*/)
+    : impl_(std::make_unique<Impl>(mgr, config, buffer_size_in_seconds)) {}
+
+MultiStreamVoiceActivityDetector::~MultiStreamVoiceActivityDetector() =
+    default;
+
+std::unique_ptr<VadStream> MultiStreamVoiceActivityDetector::CreateStream()
+    const {
+  return impl_->CreateStream();
+}
+
+bool MultiStreamVoiceActivityDetector::IsReady(const VadStream *s) const {
+  return impl_->IsReady(s);
+}
+
+void MultiStreamVoiceActivityDetector::Process(VadStream **ss,
+                                               int32_t n) const {
+  impl_->Process(ss, n);
+}
+
+const VadModelConfig &MultiStreamVoiceActivityDetector::GetConfig() const {
+  return impl_->GetConfig();
+}
+
+#if __ANDROID_API__ >= 9
+template MultiStreamVoiceActivityDetector::MultiStreamVoiceActivityDetector(
+    AAssetManager *mgr, const VadModelConfig &config,
+    float buffer_size_in_seconds = 60);
+#endif
+
+#if __OHOS__
+template MultiStreamVoiceActivityDetector::MultiStreamVoiceActivityDetector(
+    NativeResourceManager *mgr, const VadModelConfig &config,
+    float buffer_size_in_seconds = 60);
+#endif
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,108 @@
+// sherpa-onnx/csrc/multi-stream-voice-activity-detector.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_MULTI_STREAM_VOICE_ACTIVITY_DETECTOR_H_
+#define SHERPA_ONNX_CSRC_MULTI_STREAM_VOICE_ACTIVITY_DETECTOR_H_
+
+#include <memory>
+#include <vector>
+
+#include "sherpa-onnx/csrc/vad-model-config.h"
+#include "sherpa-onnx/csrc/voice-activity-detector.h"
+
+namespace sherpa_onnx {
+
+class MultiStreamVoiceActivityDetector;
+
+// VAD state of a single audio stream, e.g., a single client of a server.
+//
+// Samples passed to AcceptWaveform() are buffered and are processed only
+// when MultiStreamVoiceActivityDetector::Process() is called. Apart from
+// that, it behaves the same as a VoiceActivityDetector that is fed with
+// the same samples.
+class VadStream {
+ public:
+  ~VadStream();
+
+  void AcceptWaveform(const float *samples, int32_t n);
+
+  // Same as the above one except that the input is 16-bit PCM, i.e.,
+  // in the range [-32768, 32767]. The samples are scaled inside.
+  void AcceptWaveform(const int16_t *samples, int32_t n);
+
+  bool Empty() const;
+  void Pop();
+  void Clear();
+
+  // It is an error to call Front() if Empty() returns true.
+  //
+  // The returned reference is valid until the next call to any
+  // methods of this stream or MultiStreamVoiceActivityDetector::Process().
+  const SpeechSegment &Front() const;
+
+  bool IsSpeechDetected() const;
+
+  // It is empty if IsSpeechDetected() returns false
+  SpeechSegment CurrentSpeechSegment() const;
+
+  // See VoiceActivityDetector::CurrentSpeechSegmentRef()
+  const SpeechSegment &CurrentSpeechSegmentRef() const;
+
+  // See VoiceActivityDetector::GetNewSpeechSamples()
+  std::vector<float> GetNewSpeechSamples();
+
+  void Reset();
+
+  // At the end of the utterance, you can invoke this method so that
+  // the last speech segment can be detected.
+  //
+  // Please call MultiStreamVoiceActivityDetector::Process() before this
+  // method. Samples that have not been processed are discarded.
+  void Flush();
+
+ private:
+  friend class MultiStreamVoiceActivityDetector;
+
+  class Impl;
+  explicit VadStream(std::unique_ptr<Impl> impl);
+
+  std::unique_ptr<Impl> impl_;
+};
+
+// A voice activity detector that shares a single model among many streams.
+//
+// Windows from different streams are run in a single batch if the model
+// supports it, so it is much cheaper than creating a VoiceActivityDetector
+// for each stream.
+class MultiStreamVoiceActivityDetector {
+ public:
+  explicit MultiStreamVoiceActivityDetector(const VadModelConfig &config,
+                                            float buffer_size_in_seconds = 60);
+
+  template <typename Manager>
+  MultiStreamVoiceActivityDetector(Manager *mgr, const VadModelConfig &config,
+                                   float buffer_size_in_seconds = 60);
+
+  ~MultiStreamVoiceActivityDetector();
+
+  std::unique_ptr<VadStream> CreateStream() const;
+
+  // Return true if the stream has enough samples for at least one window
+  bool IsReady(const VadStream *s) const;
+
+  // Run the model on all buffered windows of the given streams.
+  //
+  // It is safe to call this method from multiple threads as long as
+  // a stream is not passed to two calls at the same time.
+  void Process(VadStream **ss, int32_t n) const;
+
+  const VadModelConfig &GetConfig() const;
+
+ private:
+  class Impl;
+  std::unique_ptr<Impl> impl_;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_MULTI_STREAM_VOICE_ACTIVITY_DETECTOR_H_
@@ -114,8 +114,8 @@ class OfflineCanaryModel::Impl {
     return {std::move(logits), std::move(output_decoder_states)};
   }
 
-  std::vector<Ort::Value> GetInitialDecoderStates() {
-    std::array<int64_t, 3> shape{1, 0, 1024};
+  std::vector<Ort::Value> GetInitialDecoderStates(int32_t batch_size) {
+    std::array<int64_t, 3> shape{batch_size, 0, 1024};
 
     std::vector<Ort::Value> ans;
     ans.reserve(6);
@@ -137,8 +137,8 @@ class OfflineCanaryModel::Impl {
 
  private:
   void InitEncoder(void *model_data, size_t model_data_length) {
-    encoder_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    encoder_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(encoder_sess_.get(), &encoder_input_names_,
                   &encoder_input_names_ptr_);
@@ -179,8 +179,8 @@ class OfflineCanaryModel::Impl {
   }
 
   void InitDecoder(void *model_data, size_t model_data_length) {
-    decoder_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    decoder_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(decoder_sess_.get(), &decoder_input_names_,
                   &decoder_input_names_ptr_);
@@ -236,8 +236,9 @@ OfflineCanaryModel::ForwardDecoder(Ort::Value tokens,
                                std::move(encoder_states), std::move(enc_mask));
 }
 
-std::vector<Ort::Value> OfflineCanaryModel::GetInitialDecoderStates() const {
-  return impl_->GetInitialDecoderStates();
+std::vector<Ort::Value> OfflineCanaryModel::GetInitialDecoderStates(
+    int32_t batch_size /*= 1*/) const {
+  return impl_->GetInitialDecoderStates(batch_size);
 }
 
 OrtAllocator *OfflineCanaryModel::Allocator() const {
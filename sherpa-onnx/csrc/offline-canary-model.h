@@ -60,8 +60,10 @@ class OfflineCanaryModel {
       Ort::Value tokens, std::vector<Ort::Value> decoder_states,
       Ort::Value encoder_states, Ort::Value enc_mask) const;
 
-  // The return value can be used as input for ForwardDecoder()
-  std::vector<Ort::Value> GetInitialDecoderStates() const;
+  // The return value can be used as input for ForwardDecoder().
+  // Each state is a 3-D tensor of shape (batch_size, 0, 1024).
+  std::vector<Ort::Value> GetInitialDecoderStates(
+      int32_t batch_size = 1) const;
 
   /** Return an allocator for allocating memory
    */
@@ -26,6 +26,28 @@ struct OfflineCtcDecoderResult {
   ///
   /// tokens.size() == timestamps.size()
   std::vector<int32_t> timestamps;
+
+  /// Scores of the path when an HLG, HL, or H graph is used.
+  /// They are empty for greedy search decoding.
+  ///
+  /// ys_probs[i] and graph_scores[i] are the sums of the log-probs from the
+  /// model and the scores from the graph over the frames of tokens[i],
+  /// i.e., from the frame where tokens[i] is decoded up to the frame before
+  /// tokens[i+1]. Frames before tokens[0] are counted for tokens[0].
+  ///
+  /// ys_probs.size() == graph_scores.size() == tokens.size()
+  std::vector<float> ys_probs;
+  std::vector<float> graph_scores;
+
+  /// scale * (LM log prob) of the tokens. It is set only if the N best
+  /// paths are rescored with an LM.
+  float lm_log_prob = 0;
+
+  /// The N best paths, best first, when an HLG, HL, or H graph is used with
+  /// nbest > 1. The fields above are copied from nbest[0]. Paths are
+  /// ranked by the sum of ys_probs, graph_scores and lm_log_prob.
+  /// Their own nbest is empty.
+  std::vector<OfflineCtcDecoderResult> nbest;
 };
 
 class OfflineCtcDecoder {
@@ -17,7 +17,10 @@ std::string OfflineCtcFstDecoderConfig::ToString() const {
 
   os << "OfflineCtcFstDecoderConfig(";
   os << "graph=\"" << graph << "\", ";
-  os << "max_active=" << max_active << ")";
+  os << "max_active=" << max_active << ", ";
+  os << "num_threads=" << num_threads << ", ";
+  os << "use_mmap=" << (use_mmap ? "True" : "False") << ", ";
+  os << "nbest=" << nbest << ")";
 
   return os.str();
 }
@@ -30,6 +33,19 @@ void OfflineCtcFstDecoderConfig::Register(ParseOptions *po) {
 
   p.Register("max-active", &max_active,
              "Decoder max active states.  Larger->slower; more accurate");
+
+  p.Register("num-threads", &num_threads,
+             "Number of threads to search the graph for utterances of a "
+             "batch");
+
+  p.Register("use-mmap", &use_mmap,
+             "true to memory-map the graph so that processes share it. "
+             "The graph has to be a ConstFst");
+
+  p.Register("nbest", &nbest,
+             "Number of paths to return. If it is larger than 1, the N best "
+             "paths are returned in the result and are rescored with the LM "
+             "given by --lm if any");
 }
 
 bool OfflineCtcFstDecoderConfig::Validate() const {
@@ -37,6 +53,17 @@ bool OfflineCtcFstDecoderConfig::Validate() const {
     SHERPA_ONNX_LOGE("graph: '%s' does not exist", graph.c_str());
     return false;
   }
+
+  if (num_threads < 1) {
+    SHERPA_ONNX_LOGE("num_threads: %d should be >= 1", num_threads);
+    return false;
+  }
+
+  if (nbest < 1) {
+    SHERPA_ONNX_LOGE("nbest: %d should be >= 1", nbest);
+    return false;
+  }
+
   return true;
 }
 
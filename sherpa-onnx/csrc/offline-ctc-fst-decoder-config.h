@@ -16,10 +16,28 @@ struct OfflineCtcFstDecoderConfig {
   std::string graph;
   int32_t max_active = 3000;
 
+  // Number of threads to search the graph for utterances of a batch
+  int32_t num_threads = 1;
+
+  // true to memory-map the graph instead of reading it into memory.
+  // Processes that map the same graph share its pages. Only graphs in
+  // ConstFst format can be mapped.
+  bool use_mmap = false;
+
+  // Number of paths to return. If it is larger than 1, the N best paths
+  // are kept in the result. They are rescored with the LM if an LM is given.
+  int32_t nbest = 1;
+
   OfflineCtcFstDecoderConfig() = default;
 
-  OfflineCtcFstDecoderConfig(const std::string &graph, int32_t max_active)
-      : graph(graph), max_active(max_active) {}
+  OfflineCtcFstDecoderConfig(const std::string &graph, int32_t max_active,
+                             int32_t num_threads = 1, bool use_mmap = false,
+                             int32_t nbest = 1)
+      : graph(graph),
+        max_active(max_active),
+        num_threads(num_threads),
+        use_mmap(use_mmap),
+        nbest(nbest) {}
 
   std::string ToString() const;
 
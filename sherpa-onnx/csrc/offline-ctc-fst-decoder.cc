@@ -4,13 +4,16 @@
 
 #include "sherpa-onnx/csrc/offline-ctc-fst-decoder.h"
 
+#include <algorithm>
+#include <numeric>
 #include <string>
 #include <utility>
+#include <vector>
 
 #include "fst/fstlib.h"
 #include "kaldi-decoder/csrc/decodable-ctc.h"
 #include "kaldi-decoder/csrc/eigen.h"
-#include "kaldi-decoder/csrc/faster-decoder.h"
+#include "sherpa-onnx/csrc/ctc-fst-nbest-decoder.h"
 #include "sherpa-onnx/csrc/fst-utils.h"
 #include "sherpa-onnx/csrc/macros.h"
 
@@ -48,22 +51,45 @@ static OfflineCtcDecoderResult DecodeOne(kaldi_decoder::FasterDecoder *decoder,
 
   int32_t blank_id = 0;
 
+  // Scores of the frames of the last decoded token. Frames before the
+  // first token are also counted for the first token.
+  float ys_prob = 0;
+  float graph_score = 0;
+
   for (int32_t t = 0, prev = -1; decoded.NumArcs(cur_state) == 1; ++t) {
     fst::ArcIterator<fst::Fst<fst::LatticeArc>> iter(decoded, cur_state);
     const auto &arc = iter.Value();
 
     cur_state = arc.nextstate;
 
+    // The weight of an arc contains costs, i.e., negative scores
+    float arc_ys_prob = -arc.weight.Value2();
+    float arc_graph_score = -arc.weight.Value1();
+
     if (arc.ilabel == prev) {
+      ys_prob += arc_ys_prob;
+      graph_score += arc_graph_score;
       continue;
     }
 
     // 0 is epsilon here
     if (arc.ilabel == 0 || arc.ilabel == blank_id + 1) {
+      ys_prob += arc_ys_prob;
+      graph_score += arc_graph_score;
       prev = arc.ilabel;
       continue;
     }
 
+    if (!r.tokens.empty()) {
+      r.ys_probs.push_back(ys_prob);
+      r.graph_scores.push_back(graph_score);
+      ys_prob = 0;
+      graph_score = 0;
+    }
+
+    ys_prob += arc_ys_prob;
+    graph_score += arc_graph_score;
+
     // -1 here since the input labels are incremented during graph
     // construction
     r.tokens.push_back(arc.ilabel - 1);
@@ -75,12 +101,91 @@ static OfflineCtcDecoderResult DecodeOne(kaldi_decoder::FasterDecoder *decoder,
     prev = arc.ilabel;
   }
 
+  if (!r.tokens.empty()) {
+    r.ys_probs.push_back(ys_prob);
+    r.graph_scores.push_back(graph_score - decoded.Final(cur_state).Value1());
+  }
+
+  return r;
+}
+
+/**
+ * Like DecodeOne() but return the N best paths.
+ *
+ * @param fst The decoding graph.
+ * @param config Its nbest and max_active are used.
+ * @param p Pointer to a 2-d array of shape (num_frames, vocab_size)
+ * @param num_frames Number of rows in the 2-d array.
+ * @param vocab_size Number of columns in the 2-d array.
+ * @return Return the best path. Its nbest contains the N best paths.
+ */
+static OfflineCtcDecoderResult DecodeNbest(
+    const fst::Fst<fst::StdArc> &fst, const OfflineCtcFstDecoderConfig &config,
+    const float *p, int32_t num_frames, int32_t vocab_size) {
+  OfflineCtcDecoderResult r;
+
+  CtcFstNbestDecoder decoder(fst, config.nbest, config.max_active);
+  decoder.InitDecoding();
+  decoder.AdvanceDecoding(p, num_frames, vocab_size);
+
+  if (!decoder.ReachedFinal()) {
+    SHERPA_ONNX_LOGE("Not reached final!");
+    return r;
+  }
+
+  auto paths = decoder.GetNbest();
+  r.nbest.reserve(paths.size());
+  for (auto &path : paths) {
+    OfflineCtcDecoderResult h;
+    h.tokens = std::move(path.tokens);
+    h.words = std::move(path.words);
+    h.timestamps = std::move(path.timestamps);
+    h.ys_probs = std::move(path.ys_probs);
+    h.graph_scores = std::move(path.graph_scores);
+    r.nbest.push_back(std::move(h));
+  }
+
+  if (!r.nbest.empty()) {
+    auto nbest = std::move(r.nbest);
+    r = nbest[0];
+    r.nbest = std::move(nbest);
+  }
+
   return r;
 }
 
 OfflineCtcFstDecoder::OfflineCtcFstDecoder(
-    const OfflineCtcFstDecoderConfig &config)
-    : config_(config), fst_(ReadGraph(config_.graph)) {}
+    const OfflineCtcFstDecoderConfig &config, OfflineLM *lm, float lm_scale)
+    : config_(config),
+      lm_(lm),
+      lm_scale_(lm_scale),
+      fst_(ReadGraph(config_.graph, config_.use_mmap)) {
+  if (config_.num_threads > 1) {
+    pool_ = std::make_unique<ThreadPool>(config_.num_threads);
+  }
+}
+
+std::unique_ptr<kaldi_decoder::FasterDecoder>
+OfflineCtcFstDecoder::GetDecoder() {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (!decoders_.empty()) {
+      auto decoder = std::move(decoders_.back());
+      decoders_.pop_back();
+      return decoder;
+    }
+  }
+
+  kaldi_decoder::FasterDecoderOptions opts;
+  opts.max_active = config_.max_active;
+  return std::make_unique<kaldi_decoder::FasterDecoder>(*fst_, opts);
+}
+
+void OfflineCtcFstDecoder::PutDecoder(
+    std::unique_ptr<kaldi_decoder::FasterDecoder> decoder) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  decoders_.push_back(std::move(decoder));
+}
 
 std::vector<OfflineCtcDecoderResult> OfflineCtcFstDecoder::Decode(
     Ort::Value log_probs, Ort::Value log_probs_length) {
@@ -97,23 +202,80 @@ std::vector<OfflineCtcDecoderResult> OfflineCtcFstDecoder::Decode(
 
   assert(shape[0] == length_shape[0]);
 
-  kaldi_decoder::FasterDecoderOptions opts;
-  opts.max_active = config_.max_active;
-  kaldi_decoder::FasterDecoder faster_decoder(*fst_, opts);
-
   const float *start = log_probs.GetTensorData<float>();
+  const int64_t *num_frames = log_probs_length.GetTensorData<int64_t>();
 
-  std::vector<OfflineCtcDecoderResult> ans;
-  ans.reserve(batch_size);
+  std::vector<OfflineCtcDecoderResult> ans(batch_size);
 
-  for (int32_t i = 0; i != batch_size; ++i) {
+  auto decode = [&](int32_t i) {
     const float *p = start + i * T * vocab_size;
-    int32_t num_frames = log_probs_length.GetTensorData<int64_t>()[i];
-    auto r = DecodeOne(&faster_decoder, p, num_frames, vocab_size);
-    ans.push_back(std::move(r));
+    if (config_.nbest > 1) {
+      ans[i] = DecodeNbest(*fst_, config_, p, num_frames[i], vocab_size);
+      return;
+    }
+
+    auto decoder = GetDecoder();
+    ans[i] = DecodeOne(decoder.get(), p, num_frames[i], vocab_size);
+    PutDecoder(std::move(decoder));
+  };
+
+  if (pool_ && batch_size > 1) {
+    pool_->ParallelFor(batch_size, decode);
+  } else {
+    for (int32_t i = 0; i != batch_size; ++i) {
+      decode(i);
+    }
+  }
+
+  if (lm_ && config_.nbest > 1) {
+    Rescore(&ans);
   }
 
   return ans;
 }
 
+void OfflineCtcFstDecoder::Rescore(
+    std::vector<OfflineCtcDecoderResult> *results) const {
+  // Rescore the paths of all utterances in a single batch
+  std::vector<std::vector<int64_t>> token_seqs;
+  for (const auto &r : *results) {
+    for (const auto &h : r.nbest) {
+      token_seqs.push_back(h.tokens);
+    }
+  }
+
+  if (token_seqs.empty()) {
+    return;
+  }
+
+  auto lm_scores = lm_->ComputeLMScore(lm_scale_, token_seqs);
+
+  auto score = [](const OfflineCtcDecoderResult &h) {
+    return std::accumulate(h.ys_probs.begin(), h.ys_probs.end(), 0.0f) +
+           std::accumulate(h.graph_scores.begin(), h.graph_scores.end(), 0.0f) +
+           h.lm_log_prob;
+  };
+
+  int32_t k = 0;
+  for (auto &r : *results) {
+    if (r.nbest.empty()) {
+      continue;
+    }
+
+    for (auto &h : r.nbest) {
+      h.lm_log_prob = lm_scores[k++];
+    }
+
+    std::stable_sort(r.nbest.begin(), r.nbest.end(),
+                     [&score](const OfflineCtcDecoderResult &a,
+                              const OfflineCtcDecoderResult &b) {
+                       return score(a) > score(b);
+                     });
+
+    auto nbest = std::move(r.nbest);
+    r = nbest[0];
+    r.nbest = std::move(nbest);
+  }
+}
+
 }  // namespace sherpa_onnx
@@ -6,26 +6,59 @@
 #define SHERPA_ONNX_CSRC_OFFLINE_CTC_FST_DECODER_H_
 
 #include <memory>
+#include <mutex>  // NOLINT
 #include <vector>
 
 #include "fst/fst.h"
+#include "kaldi-decoder/csrc/faster-decoder.h"
 #include "sherpa-onnx/csrc/offline-ctc-decoder.h"
 #include "sherpa-onnx/csrc/offline-ctc-fst-decoder-config.h"
+#include "sherpa-onnx/csrc/offline-lm.h"
 #include "sherpa-onnx/csrc/parse-options.h"
+#include "sherpa-onnx/csrc/thread-pool.h"
 
 namespace sherpa_onnx {
 
 class OfflineCtcFstDecoder : public OfflineCtcDecoder {
  public:
-  explicit OfflineCtcFstDecoder(const OfflineCtcFstDecoderConfig &config);
+  /**
+   * @param config The decoder config.
+   * @param lm If not null, the N best paths are rescored with it when
+   *           config.nbest > 1. It must outlive this object.
+   * @param lm_scale Scale of the LM scores.
+   */
+  explicit OfflineCtcFstDecoder(const OfflineCtcFstDecoderConfig &config,
+                                OfflineLM *lm = nullptr, float lm_scale = 0);
 
   std::vector<OfflineCtcDecoderResult> Decode(
       Ort::Value log_probs, Ort::Value log_probs_length) override;
 
+ private:
+  // Return a decoder that is not used by other threads. It creates a new
+  // one if all existing decoders are in use.
+  std::unique_ptr<kaldi_decoder::FasterDecoder> GetDecoder();
+
+  // Return a decoder from GetDecoder() so that it can be reused
+  void PutDecoder(std::unique_ptr<kaldi_decoder::FasterDecoder> decoder);
+
+  // Rerank the N best paths of each result with scores from lm_
+  void Rescore(std::vector<OfflineCtcDecoderResult> *results) const;
+
  private:
   OfflineCtcFstDecoderConfig config_;
+  OfflineLM *lm_;  // not owned
+  float lm_scale_;
 
   std::unique_ptr<fst::Fst<fst::StdArc>> fst_;
+
+  // Decoders that are not in use. They are created once and reused to
+  // avoid allocating their internal buffers for every utterance.
+  std::mutex mutex_;
+  std::vector<std::unique_ptr<kaldi_decoder::FasterDecoder>> decoders_;
+
+  // Search the graph for utterances of a batch in parallel.
+  // It is nullptr if config_.num_threads is 1
+  std::unique_ptr<ThreadPool> pool_;
 };
 
 }  // namespace sherpa_onnx
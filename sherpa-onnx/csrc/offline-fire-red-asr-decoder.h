@@ -27,12 +27,15 @@ class OfflineFireRedAsrDecoder {
    *                              (num_decoder_layers, N, T, d_model).
    * @param n_layer_cross_v       A 4-D tensor of shape
    *                              (num_decoder_layers, N, T, d_model).
+   * @param num_feature_frames    A vector of size `N` containing the number
+   *                              of feature frames of each utterance,
+   *                              excluding paddings.
    *
    * @return Return a vector of size `N` containing the decoded results.
    */
   virtual std::vector<OfflineFireRedAsrDecoderResult> Decode(
       Ort::Value n_layer_cross_k, Ort::Value n_layer_cross_v,
-      int32_t num_feature_frames) = 0;
+      const std::vector<int32_t> &num_feature_frames) = 0;
 };
 
 }  // namespace sherpa_onnx
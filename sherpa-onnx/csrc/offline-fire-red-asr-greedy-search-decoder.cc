@@ -5,45 +5,75 @@
 #include "sherpa-onnx/csrc/offline-fire-red-asr-greedy-search-decoder.h"
 
 #include <algorithm>
+#include <array>
 #include <tuple>
 #include <utility>
+#include <vector>
 
+#include "sherpa-onnx/csrc/index-select.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/onnx-utils.h"
 
 namespace sherpa_onnx {
 
-// Note: this functions works only for batch size == 1 at present
 std::vector<OfflineFireRedAsrDecoderResult>
-OfflineFireRedAsrGreedySearchDecoder::Decode(Ort::Value cross_k,
-                                             Ort::Value cross_v,
-                                             int32_t num_feature_frames) {
+OfflineFireRedAsrGreedySearchDecoder::Decode(
+    Ort::Value cross_k, Ort::Value cross_v,
+    const std::vector<int32_t> &num_feature_frames) {
   const auto &meta_data = model_->GetModelMetadata();
 
-  auto memory_info =
-      Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+  int32_t batch_size =
+      static_cast<int32_t>(cross_k.GetTensorTypeAndShapeInfo().GetShape()[1]);
 
-  // For multilingual models, initial_tokens contains [sot, language, task]
-  //   - language is English by default
-  //   - task is transcribe by default
-  //
-  // For non-multilingual models, initial_tokens contains [sot]
-  std::array<int64_t, 2> token_shape = {1, 1};
-  int64_t token = meta_data.sos_id;
+  if (static_cast<int32_t>(num_feature_frames.size()) != batch_size) {
+    SHERPA_ONNX_LOGE("Expect %d entries in num_feature_frames. Given: %d",
+                     batch_size,
+                     static_cast<int32_t>(num_feature_frames.size()));
+    SHERPA_ONNX_EXIT(-1);
+  }
+
+  std::vector<OfflineFireRedAsrDecoderResult> ans(batch_size);
+
+  std::vector<int32_t> num_possible_tokens(batch_size);
+
+  // Indexes into the batch of utterances that are still being decoded.
+  // All of them share the same offset, so they are decoded in lockstep.
+  std::vector<int32_t> active;
+  active.reserve(batch_size);
+
+  for (int32_t b = 0; b != batch_size; ++b) {
+    // assume at most 6 tokens per second
+    num_possible_tokens[b] = std::min<int32_t>(num_feature_frames[b] / 100 * 6,
+                                               meta_data.max_len / 2);
+
+    if (num_possible_tokens[b] > 0) {
+      active.push_back(b);
+    }
+  }
+
+  if (active.empty()) {
+    return ans;
+  }
+
+  if (static_cast<int32_t>(active.size()) != batch_size) {
+    cross_k = IndexSelect(model_->Allocator(), &cross_k, 1, active);
+    cross_v = IndexSelect(model_->Allocator(), &cross_v, 1, active);
+  }
 
-  int32_t batch_size = 1;
+  std::array<int64_t, 2> token_shape = {static_cast<int64_t>(active.size()), 1};
 
-  Ort::Value tokens = Ort::Value::CreateTensor(
-      memory_info, &token, 1, token_shape.data(), token_shape.size());
+  Ort::Value tokens = Ort::Value::CreateTensor<int64_t>(
+      model_->Allocator(), token_shape.data(), token_shape.size());
+  std::fill_n(tokens.GetTensorMutableData<int64_t>(), active.size(),
+              meta_data.sos_id);
 
   std::array<int64_t, 1> offset_shape{1};
   Ort::Value offset = Ort::Value::CreateTensor<int64_t>(
       model_->Allocator(), offset_shape.data(), offset_shape.size());
   *(offset.GetTensorMutableData<int64_t>()) = 0;
 
-  std::vector<OfflineFireRedAsrDecoderResult> ans(1);
-
-  auto self_kv_cache = model_->GetInitialSelfKVCache();
+  auto self_kv_cache =
+      model_->GetInitialSelfKVCache(static_cast<int32_t>(active.size()));
 
   std::tuple<Ort::Value, Ort::Value, Ort::Value, Ort::Value, Ort::Value,
              Ort::Value>
@@ -54,13 +84,8 @@ OfflineFireRedAsrGreedySearchDecoder::Decode(Ort::Value cross_k,
                      std::move(cross_v),
                      std::move(offset)};
 
-  // assume at most 6 tokens per second
-  int32_t num_possible_tokens = num_feature_frames / 100 * 6;
-  num_possible_tokens =
-      std::min<int32_t>(num_possible_tokens, meta_data.max_len / 2);
-
-  for (int32_t i = 0; i < num_possible_tokens; ++i) {
-    decoder_out = model_->ForwardDecoder(View(&tokens),
+  while (true) {
+    decoder_out = model_->ForwardDecoder(std::move(tokens),
                                          std::move(std::get<1>(decoder_out)),
                                          std::move(std::get<2>(decoder_out)),
                                          std::move(std::get<3>(decoder_out)),
@@ -73,15 +98,55 @@ OfflineFireRedAsrGreedySearchDecoder::Decode(Ort::Value cross_k,
     auto logits_shape = logits.GetTensorTypeAndShapeInfo().GetShape();
     int32_t vocab_size = logits_shape[2];
 
-    int32_t max_token_id = static_cast<int32_t>(std::distance(
-        p_logits, std::max_element(p_logits, p_logits + vocab_size)));
-    if (max_token_id == meta_data.eos_id) {
+    // Positions in active of utterances that need to be run with the decoder
+    std::vector<int32_t> keep;
+    keep.reserve(active.size());
+
+    std::vector<int64_t> next_tokens;
+    next_tokens.reserve(active.size());
+
+    for (int32_t i = 0; i != static_cast<int32_t>(active.size()); ++i) {
+      int32_t b = active[i];
+      const float *p = p_logits + i * logits_shape[1] * vocab_size;
+
+      int32_t max_token_id = static_cast<int32_t>(
+          std::distance(p, std::max_element(p, p + vocab_size)));
+      if (max_token_id == meta_data.eos_id) {
+        continue;
+      }
+
+      auto &hyp = ans[b].tokens;
+      hyp.push_back(max_token_id);
+
+      if (static_cast<int32_t>(hyp.size()) < num_possible_tokens[b]) {
+        keep.push_back(i);
+        next_tokens.push_back(max_token_id);
+      }
+    }
+
+    if (keep.empty()) {
       break;
     }
 
-    ans[0].tokens.push_back(max_token_id);
+    if (keep.size() != active.size()) {
+      // Remove finished utterances from the decoder states
+      for (auto *v : {&std::get<1>(decoder_out), &std::get<2>(decoder_out),
+                      &std::get<3>(decoder_out), &std::get<4>(decoder_out)}) {
+        *v = IndexSelect(model_->Allocator(), v, 1, keep);
+      }
+
+      std::vector<int32_t> new_active(keep.size());
+      for (int32_t i = 0; i != static_cast<int32_t>(keep.size()); ++i) {
+        new_active[i] = active[keep[i]];
+      }
+      active = std::move(new_active);
+    }
 
-    token = max_token_id;
+    token_shape[0] = static_cast<int64_t>(next_tokens.size());
+    tokens = Ort::Value::CreateTensor<int64_t>(
+        model_->Allocator(), token_shape.data(), token_shape.size());
+    std::copy(next_tokens.begin(), next_tokens.end(),
+              tokens.GetTensorMutableData<int64_t>());
 
     // increment offset
     *(std::get<5>(decoder_out).GetTensorMutableData<int64_t>()) += 1;
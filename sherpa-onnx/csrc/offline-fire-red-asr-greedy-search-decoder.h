@@ -19,7 +19,7 @@ class OfflineFireRedAsrGreedySearchDecoder : public OfflineFireRedAsrDecoder {
 
   std::vector<OfflineFireRedAsrDecoderResult> Decode(
       Ort::Value cross_k, Ort::Value cross_v,
-      int32_t num_feature_frames) override;
+      const std::vector<int32_t> &num_feature_frames) override;
 
  private:
   OfflineFireRedAsrModel *model_;  // not owned
@@ -99,8 +99,7 @@ class OfflineFireRedAsrModel::Impl {
         std::move(decoder_input[4]), std::move(decoder_input[5])};
   }
 
-  std::pair<Ort::Value, Ort::Value> GetInitialSelfKVCache() {
-    int32_t batch_size = 1;
+  std::pair<Ort::Value, Ort::Value> GetInitialSelfKVCache(int32_t batch_size) {
     std::array<int64_t, 5> shape{meta_data_.num_decoder_layers, batch_size,
                                  meta_data_.max_len, meta_data_.num_head,
                                  meta_data_.head_dim};
@@ -130,8 +129,8 @@ class OfflineFireRedAsrModel::Impl {
 
  private:
   void InitEncoder(void *model_data, size_t model_data_length) {
-    encoder_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    encoder_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(encoder_sess_.get(), &encoder_input_names_,
                   &encoder_input_names_ptr_);
@@ -167,8 +166,8 @@ class OfflineFireRedAsrModel::Impl {
   }
 
   void InitDecoder(void *model_data, size_t model_data_length) {
-    decoder_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    decoder_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(decoder_sess_.get(), &decoder_input_names_,
                   &decoder_input_names_ptr_);
@@ -231,8 +230,9 @@ OfflineFireRedAsrModel::ForwardDecoder(Ort::Value tokens,
 }
 
 std::pair<Ort::Value, Ort::Value>
-OfflineFireRedAsrModel::GetInitialSelfKVCache() const {
-  return impl_->GetInitialSelfKVCache();
+OfflineFireRedAsrModel::GetInitialSelfKVCache(
+    int32_t batch_size /*= 1*/) const {
+  return impl_->GetInitialSelfKVCache(batch_size);
 }
 
 OrtAllocator *OfflineFireRedAsrModel::Allocator() const {
@@ -73,8 +73,11 @@ class OfflineFireRedAsrModel {
    *                       (num_decoder_layers, N, max_len, num_head, head_dim).
    *  - n_layer_self_v_cache A 5-D tensor of shape
    *                       (num_decoder_layers, N, max_len, num_head, head_dim).
+   *
+   * where N is batch_size.
    */
-  std::pair<Ort::Value, Ort::Value> GetInitialSelfKVCache() const;
+  std::pair<Ort::Value, Ort::Value> GetInitialSelfKVCache(
+      int32_t batch_size = 1) const;
 
   const OfflineFireRedAsrModelMetaData &GetModelMetadata() const;
 
@@ -32,48 +32,54 @@ std::unique_ptr<OfflineLM> OfflineLM::Create(Manager *mgr,
   return std::make_unique<OfflineRnnLM>(mgr, config);
 }
 
-void OfflineLM::ComputeLMScore(float scale, int32_t context_size,
-                               std::vector<Hypotheses> *hyps) {
+Ort::Value OfflineLM::ComputeNegativeLogLike(
+    const std::vector<std::pair<const int64_t *, int32_t>> &seqs) {
   // compute the max token seq so that we know how much space to allocate
-  int32_t max_token_seq = 0;
-  int32_t num_hyps = 0;
+  int32_t max_token_seq = 1;
+  int32_t num_seqs = seqs.size();
 
-  // we subtract context_size below since each token sequence is prepended
-  // with context_size blanks
-  for (const auto &h : *hyps) {
-    num_hyps += h.Size();
-    for (const auto &t : h) {
-      max_token_seq =
-          std::max<int32_t>(max_token_seq, t.second.ys.size() - context_size);
-    }
+  for (const auto &seq : seqs) {
+    max_token_seq = std::max<int32_t>(max_token_seq, seq.second);
   }
 
   Ort::AllocatorWithDefaultOptions allocator;
-  std::array<int64_t, 2> x_shape{num_hyps, max_token_seq};
+  std::array<int64_t, 2> x_shape{num_seqs, max_token_seq};
   Ort::Value x = Ort::Value::CreateTensor<int64_t>(allocator, x_shape.data(),
                                                    x_shape.size());
 
-  std::array<int64_t, 1> x_lens_shape{num_hyps};
+  std::array<int64_t, 1> x_lens_shape{num_seqs};
   Ort::Value x_lens = Ort::Value::CreateTensor<int64_t>(
       allocator, x_lens_shape.data(), x_lens_shape.size());
 
   int64_t *p = x.GetTensorMutableData<int64_t>();
-  std::fill(p, p + num_hyps * max_token_seq, 0);
+  std::fill(p, p + num_seqs * max_token_seq, 0);
 
   int64_t *p_lens = x_lens.GetTensorMutableData<int64_t>();
 
+  for (const auto &seq : seqs) {
+    std::copy(seq.first, seq.first + seq.second, p);
+    *p_lens = seq.second;
+
+    p += max_token_seq;
+    ++p_lens;
+  }
+
+  return Rescore(std::move(x), std::move(x_lens));
+}
+
+void OfflineLM::ComputeLMScore(float scale, int32_t context_size,
+                               std::vector<Hypotheses> *hyps) {
+  // we subtract context_size below since each token sequence is prepended
+  // with context_size blanks
+  std::vector<std::pair<const int64_t *, int32_t>> seqs;
   for (const auto &h : *hyps) {
     for (const auto &t : h) {
       const auto &ys = t.second.ys;
-      int32_t len = ys.size() - context_size;
-      std::copy(ys.begin() + context_size, ys.end(), p);
-      *p_lens = len;
-
-      p += max_token_seq;
-      ++p_lens;
+      seqs.emplace_back(ys.data() + context_size, ys.size() - context_size);
     }
   }
-  auto negative_loglike = Rescore(std::move(x), std::move(x_lens));
+
+  auto negative_loglike = ComputeNegativeLogLike(seqs);
   const float *p_nll = negative_loglike.GetTensorData<float>();
   // We scale LODR scale with LM scale to replicate Icefall code
   auto lodr_scale = config_.lodr_scale * scale;
@@ -90,6 +96,35 @@ void OfflineLM::ComputeLMScore(float scale, int32_t context_size,
   }
 }
 
+std::vector<float> OfflineLM::ComputeLMScore(
+    float scale, const std::vector<std::vector<int64_t>> &token_seqs) {
+  std::vector<std::pair<const int64_t *, int32_t>> seqs;
+  seqs.reserve(token_seqs.size());
+  for (const auto &tokens : token_seqs) {
+    seqs.emplace_back(tokens.data(), tokens.size());
+  }
+
+  auto negative_loglike = ComputeNegativeLogLike(seqs);
+  const float *p_nll = negative_loglike.GetTensorData<float>();
+
+  std::vector<float> ans(token_seqs.size());
+
+  auto lodr_scale = config_.lodr_scale * scale;
+  for (int32_t i = 0; i != static_cast<int32_t>(ans.size()); ++i) {
+    // Use -scale here since we want to change negative loglike to loglike.
+    ans[i] = -scale * p_nll[i];
+
+    if (lodr_fst_ != nullptr) {
+      Hypothesis hyp;
+      hyp.ys = token_seqs[i];
+      lodr_fst_->ComputeScore(lodr_scale, &hyp, 0);
+      ans[i] += hyp.log_prob;
+    }
+  }
+
+  return ans;
+}
+
 #if __ANDROID_API__ >= 9
 template std::unique_ptr<OfflineLM> OfflineLM::Create(
     AAssetManager *mgr, const OfflineLMConfig &config);
@@ -6,6 +6,7 @@
 #define SHERPA_ONNX_CSRC_OFFLINE_LM_H_
 
 #include <memory>
+#include <utility>
 #include <vector>
 
 #include "onnxruntime_cxx_api.h"  // NOLINT
@@ -56,6 +57,23 @@ class OfflineLM {
   void ComputeLMScore(float scale, int32_t context_size,
                       std::vector<Hypotheses> *hyps);
 
+  // Compute the LM scores of token sequences, e.g., the N best paths from
+  // CTC decoding with an HLG graph.
+  //
+  // @param scale LM scale
+  // @param token_seqs token_seqs[i] contains the token IDs of the i-th
+  //                   sequence
+  // @return Return scale * (LM log prob) of each sequence. LODR scores are
+  //         included if LODR is used.
+  std::vector<float> ComputeLMScore(
+      float scale, const std::vector<std::vector<int64_t>> &token_seqs);
+
+ private:
+  // Call Rescore() above with token sequences given by
+  // (pointer to the tokens, number of tokens)
+  Ort::Value ComputeNegativeLogLike(
+      const std::vector<std::pair<const int64_t *, int32_t>> &seqs);
+
  private:
   std::unique_ptr<LodrFst> lodr_fst_;
   float lodr_scale_;
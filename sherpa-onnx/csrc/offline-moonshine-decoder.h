@@ -23,10 +23,13 @@ class OfflineMoonshineDecoder {
   /** Run beam search given the output from the moonshine encoder model.
    *
    * @param encoder_out A 3-D tensor of shape (batch_size, T, dim)
+   * @param num_frames A vector of size `batch_size` containing the number of
+   *                   valid frames of each utterance in encoder_out. It is
+   *                   used to limit the number of decoded tokens.
    * @return Return a vector of size `N` containing the decoded results.
    */
   virtual std::vector<OfflineMoonshineDecoderResult> Decode(
-      Ort::Value encoder_out) = 0;
+      Ort::Value encoder_out, const std::vector<int32_t> &num_frames) = 0;
 };
 
 }  // namespace sherpa_onnx
@@ -5,44 +5,57 @@
 #include "sherpa-onnx/csrc/offline-moonshine-greedy-search-decoder.h"
 
 #include <algorithm>
+#include <array>
+#include <numeric>
 #include <utility>
+#include <vector>
 
+#include "sherpa-onnx/csrc/index-select.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/onnx-utils.h"
 
 namespace sherpa_onnx {
 
 std::vector<OfflineMoonshineDecoderResult>
-OfflineMoonshineGreedySearchDecoder::Decode(Ort::Value encoder_out) {
+OfflineMoonshineGreedySearchDecoder::Decode(
+    Ort::Value encoder_out, const std::vector<int32_t> &num_frames) {
   auto encoder_out_shape = encoder_out.GetTensorTypeAndShapeInfo().GetShape();
-  if (encoder_out_shape[0] != 1) {
-    SHERPA_ONNX_LOGE("Support only batch size == 1. Given: %d\n",
-                     static_cast<int32_t>(encoder_out_shape[0]));
-    return {};
+  int32_t batch_size = static_cast<int32_t>(encoder_out_shape[0]);
+
+  if (static_cast<int32_t>(num_frames.size()) != batch_size) {
+    SHERPA_ONNX_LOGE("Expect %d entries in num_frames. Given: %d", batch_size,
+                     static_cast<int32_t>(num_frames.size()));
+    SHERPA_ONNX_EXIT(-1);
   }
 
   auto memory_info =
       Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
 
-  // encoder_out_shape[1] * 384 is the number of audio samples
-  // 16000 is the sample rate
-  //
-  //
-  // 384 is from the moonshine paper
-  int32_t max_len =
-      static_cast<int32_t>(encoder_out_shape[1] * 384 / 16000.0 * 6);
+  std::vector<int32_t> max_len(batch_size);
+  for (int32_t b = 0; b != batch_size; ++b) {
+    // num_frames[b] * 384 is the number of audio samples
+    // 16000 is the sample rate
+    //
+    //
+    // 384 is from the moonshine paper
+    max_len[b] = static_cast<int32_t>(num_frames[b] * 384 / 16000.0 * 6);
+  }
 
   int32_t sos = 1;
   int32_t eos = 2;
+
+  // All sequences in the batch share the same seq_len, so they are decoded
+  // in lockstep
   int32_t seq_len = 1;
 
-  std::vector<int32_t> tokens;
+  std::vector<int32_t> tokens(batch_size, sos);
 
-  std::array<int64_t, 2> token_shape = {1, 1};
+  std::array<int64_t, 2> token_shape = {batch_size, 1};
   int64_t seq_len_shape = 1;
 
-  Ort::Value token_tensor = Ort::Value::CreateTensor(
-      memory_info, &sos, 1, token_shape.data(), token_shape.size());
+  Ort::Value token_tensor =
+      Ort::Value::CreateTensor(memory_info, tokens.data(), tokens.size(),
+                               token_shape.data(), token_shape.size());
 
   Ort::Value seq_len_tensor =
       Ort::Value::CreateTensor(memory_info, &seq_len, 1, &seq_len_shape, 1);
@@ -55,20 +68,71 @@ OfflineMoonshineGreedySearchDecoder::Decode(Ort::Value encoder_out) {
 
   int32_t vocab_size = logits.GetTensorTypeAndShapeInfo().GetShape()[2];
 
-  for (int32_t i = 0; i != max_len; ++i) {
-    const float *p = logits.GetTensorData<float>();
+  std::vector<OfflineMoonshineDecoderResult> ans(batch_size);
+
+  // Indexes into the batch of sequences that are still being decoded.
+  // logits and states contain only these sequences.
+  std::vector<int32_t> active(batch_size);
+  std::iota(active.begin(), active.end(), 0);
+
+  while (true) {
+    const float *p_logits = logits.GetTensorData<float>();
+
+    // Positions in active of sequences to run with the decoder
+    std::vector<int32_t> keep;
+    keep.reserve(active.size());
+    tokens.clear();
+
+    for (int32_t i = 0; i != static_cast<int32_t>(active.size()); ++i) {
+      int32_t b = active[i];
+      auto &hyp = ans[b].tokens;
+
+      if (static_cast<int32_t>(hyp.size()) >= max_len[b]) {
+        continue;
+      }
+
+      const float *p = p_logits + i * vocab_size;
 
-    int32_t max_token_id = static_cast<int32_t>(
-        std::distance(p, std::max_element(p, p + vocab_size)));
-    if (max_token_id == eos) {
+      int32_t max_token_id = static_cast<int32_t>(
+          std::distance(p, std::max_element(p, p + vocab_size)));
+
+      if (max_token_id == eos) {
+        continue;
+      }
+
+      hyp.push_back(max_token_id);
+
+      if (static_cast<int32_t>(hyp.size()) < max_len[b]) {
+        keep.push_back(i);
+        tokens.push_back(max_token_id);
+      }
+    }
+
+    if (keep.empty()) {
       break;
     }
-    tokens.push_back(max_token_id);
+
+    if (keep.size() != active.size()) {
+      // Remove finished sequences
+      encoder_out = IndexSelect(model_->Allocator(), &encoder_out, 0, keep);
+      for (auto &s : states) {
+        s = IndexSelect(model_->Allocator(), &s, 0, keep);
+      }
+
+      std::vector<int32_t> new_active(keep.size());
+      for (int32_t i = 0; i != static_cast<int32_t>(keep.size()); ++i) {
+        new_active[i] = active[keep[i]];
+      }
+      active = std::move(new_active);
+    }
 
     seq_len += 1;
 
-    token_tensor = Ort::Value::CreateTensor(
-        memory_info, &tokens.back(), 1, token_shape.data(), token_shape.size());
+    token_shape[0] = static_cast<int64_t>(tokens.size());
+
+    token_tensor =
+        Ort::Value::CreateTensor(memory_info, tokens.data(), tokens.size(),
+                                 token_shape.data(), token_shape.size());
 
     seq_len_tensor =
         Ort::Value::CreateTensor(memory_info, &seq_len, 1, &seq_len_shape, 1);
@@ -84,10 +148,7 @@ OfflineMoonshineGreedySearchDecoder::Decode(Ort::Value encoder_out) {
         std::move(tmp_states));
   }
 
-  OfflineMoonshineDecoderResult ans;
-  ans.tokens = std::move(tokens);
-
-  return {ans};
+  return ans;
 }
 
 }  // namespace sherpa_onnx
@@ -18,7 +18,7 @@ class OfflineMoonshineGreedySearchDecoder : public OfflineMoonshineDecoder {
       : model_(model) {}
 
   std::vector<OfflineMoonshineDecoderResult> Decode(
-      Ort::Value encoder_out) override;
+      Ort::Value encoder_out, const std::vector<int32_t> &num_frames) override;
 
  private:
   OfflineMoonshineModel *model_;  // not owned
@@ -168,8 +168,8 @@ class OfflineMoonshineModel::Impl {
 
  private:
   void InitPreprocessor(void *model_data, size_t model_data_length) {
-    preprocessor_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    preprocessor_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(preprocessor_sess_.get(), &preprocessor_input_names_,
                   &preprocessor_input_names_ptr_);
@@ -179,8 +179,8 @@ class OfflineMoonshineModel::Impl {
   }
 
   void InitEncoder(void *model_data, size_t model_data_length) {
-    encoder_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    encoder_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(encoder_sess_.get(), &encoder_input_names_,
                   &encoder_input_names_ptr_);
@@ -190,8 +190,8 @@ class OfflineMoonshineModel::Impl {
   }
 
   void InitUnCachedDecoder(void *model_data, size_t model_data_length) {
-    uncached_decoder_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    uncached_decoder_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(uncached_decoder_sess_.get(), &uncached_decoder_input_names_,
                   &uncached_decoder_input_names_ptr_);
@@ -202,8 +202,8 @@ class OfflineMoonshineModel::Impl {
   }
 
   void InitCachedDecoder(void *model_data, size_t model_data_length) {
-    cached_decoder_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    cached_decoder_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(cached_decoder_sess_.get(), &cached_decoder_input_names_,
                   &cached_decoder_input_names_ptr_);
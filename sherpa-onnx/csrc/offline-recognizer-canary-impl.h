@@ -6,12 +6,15 @@
 #define SHERPA_ONNX_CSRC_OFFLINE_RECOGNIZER_CANARY_IMPL_H_
 
 #include <algorithm>
+#include <array>
 #include <ios>
 #include <memory>
+#include <numeric>
 #include <string>
 #include <utility>
 #include <vector>
 
+#include "sherpa-onnx/csrc/index-select.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/offline-canary-model.h"
 #include "sherpa-onnx/csrc/offline-recognizer-impl.h"
@@ -48,61 +51,107 @@ class OfflineRecognizerCanaryImpl : public OfflineRecognizerImpl {
   }
 
   void DecodeStreams(OfflineStream **ss, int32_t n) const override {
-    for (int32_t i = 0; i < n; ++i) {
-      DecodeStream(ss[i]);
+    if (n <= 0) {
+      return;
     }
-  }
 
-  void DecodeStream(OfflineStream *s) const {
     auto meta = model_->GetModelMetadata();
-    auto enc_out = RunEncoder(s);
+    auto enc_out = RunEncoder(ss, n);
     Ort::Value enc_states = std::move(enc_out[0]);
     Ort::Value enc_mask = std::move(enc_out[2]);
-    // enc_out[1] is discarded
+    const int64_t *enc_len = enc_out[1].GetTensorData<int64_t>();
+
+    int32_t eos = symbol_table_["<|endoftext|>"];
+
+    // num_tokens[i] is the max number of tokens for the i-th utterance
+    std::vector<int32_t> num_tokens(n);
+    for (int32_t i = 0; i != n; ++i) {
+      int32_t num_feature_frames = enc_len[i] * meta.subsampling_factor;
+
+      // Assume 30 tokens per second. It is to avoid the following for loop
+      // running indefinitely.
+      num_tokens[i] = static_cast<int32_t>(num_feature_frames / 100.0 * 30) + 1;
+    }
+
+    // All utterances share the same prompt
     std::vector<int32_t> decoder_input = GetInitialDecoderInput();
-    auto decoder_states = model_->GetInitialDecoderStates();
+    auto decoder_states = model_->GetInitialDecoderStates(n);
     Ort::Value logits{nullptr};
 
-    for (int32_t i = 0; i < decoder_input.size(); ++i) {
+    int32_t num_prompt_tokens = static_cast<int32_t>(decoder_input.size());
+    for (int32_t i = 0; i != num_prompt_tokens; ++i) {
+      std::vector<int32_t> tokens(n, decoder_input[i]);
       std::tie(logits, decoder_states) =
-          RunDecoder(decoder_input[i], i, std::move(decoder_states),
-                     View(&enc_states), View(&enc_mask));
+          RunDecoder(tokens, i, std::move(decoder_states), View(&enc_states),
+                     View(&enc_mask));
     }
 
-    int32_t max_token_id = GetMaxTokenId(&logits);
-    int32_t eos = symbol_table_["<|endoftext|>"];
+    std::vector<std::vector<int32_t>> hyps(n);
+    for (int32_t i = 0; i != n; ++i) {
+      hyps[i].push_back(GetMaxTokenId(&logits, i));
+    }
 
-    int32_t num_feature_frames =
-        enc_states.GetTensorTypeAndShapeInfo().GetShape()[1] *
-        meta.subsampling_factor;
+    // Indexes into the batch of utterances that are still being decoded.
+    // They share the same position, so they are decoded in lockstep.
+    std::vector<int32_t> active(n);
+    std::iota(active.begin(), active.end(), 0);
+
+    for (int32_t i = 1;; ++i) {
+      // Positions in active of utterances to run with the decoder
+      std::vector<int32_t> keep;
+      keep.reserve(active.size());
+
+      for (int32_t k = 0; k != static_cast<int32_t>(active.size()); ++k) {
+        int32_t b = active[k];
+        if (hyps[b].back() != eos && i <= num_tokens[b]) {
+          keep.push_back(k);
+        }
+      }
 
-    std::vector<int32_t> tokens = {max_token_id};
+      if (keep.empty()) {
+        break;
+      }
 
-    // Assume 30 tokens per second. It is to avoid the following for loop
-    // running indefinitely.
-    int32_t num_tokens =
-        static_cast<int32_t>(num_feature_frames / 100.0 * 30) + 1;
+      if (keep.size() != active.size()) {
+        // Remove finished utterances
+        enc_states = IndexSelect(model_->Allocator(), &enc_states, 0, keep);
+        enc_mask = IndexSelect<bool>(model_->Allocator(), &enc_mask, 0, keep);
+        for (auto &s : decoder_states) {
+          s = IndexSelect(model_->Allocator(), &s, 0, keep);
+        }
+
+        std::vector<int32_t> new_active(keep.size());
+        for (int32_t k = 0; k != static_cast<int32_t>(keep.size()); ++k) {
+          new_active[k] = active[keep[k]];
+        }
+        active = std::move(new_active);
+      }
 
-    for (int32_t i = 1; i <= num_tokens; ++i) {
-      if (tokens.back() == eos) {
-        break;
+      std::vector<int32_t> tokens(active.size());
+      for (int32_t k = 0; k != static_cast<int32_t>(active.size()); ++k) {
+        tokens[k] = hyps[active[k]].back();
       }
 
       std::tie(logits, decoder_states) =
-          RunDecoder(tokens.back(), i, std::move(decoder_states),
-                     View(&enc_states), View(&enc_mask));
-      tokens.push_back(GetMaxTokenId(&logits));
+          RunDecoder(tokens, i, std::move(decoder_states), View(&enc_states),
+                     View(&enc_mask));
+
+      for (int32_t k = 0; k != static_cast<int32_t>(active.size()); ++k) {
+        hyps[active[k]].push_back(GetMaxTokenId(&logits, k));
+      }
     }
 
-    // remove the last eos token
-    tokens.pop_back();
+    for (int32_t i = 0; i != n; ++i) {
+      // remove the last eos token
+      hyps[i].pop_back();
 
-    auto r = Convert(tokens);
+      auto r = Convert(hyps[i]);
 
-    r.text = ApplyInverseTextNormalization(std::move(r.text));
-    r.text = ApplyHomophoneReplacer(std::move(r.text));
+      r.text = ApplyInverseTextNormalization(std::move(r.text));
+      r.text = ApplyHomophoneReplacer(std::move(r.text));
 
-    s->SetResult(r);
+      ss[i]->SetResult(r);
+    }
   }
 
   OfflineRecognizerConfig GetConfig() const override { return config_; }
@@ -136,10 +185,12 @@ class OfflineRecognizerCanaryImpl : public OfflineRecognizerImpl {
     return r;
   }
 
-  int32_t GetMaxTokenId(Ort::Value *logits) const {
-    // logits is of shape (1, 1, vocab_size)
+  // Return the argmax of the i-th row of the logits
+  int32_t GetMaxTokenId(Ort::Value *logits, int32_t i) const {
+    // logits is of shape (N, 1, vocab_size)
     auto meta = model_->GetModelMetadata();
-    const float *p_logits = logits->GetTensorData<float>();
+    const float *p_logits =
+        logits->GetTensorData<float>() + i * meta.vocab_size;
 
     int32_t max_token_id = static_cast<int32_t>(std::distance(
         p_logits, std::max_element(p_logits, p_logits + meta.vocab_size)));
@@ -147,40 +198,58 @@ class OfflineRecognizerCanaryImpl : public OfflineRecognizerImpl {
     return max_token_id;
   }
 
-  std::vector<Ort::Value> RunEncoder(OfflineStream *s) const {
+  std::vector<Ort::Value> RunEncoder(OfflineStream **ss, int32_t n) const {
     auto memory_info =
         Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
 
     int32_t feat_dim = config_.feat_config.feature_dim;
-    std::vector<float> f = s->GetFrames();
 
-    int32_t num_frames = f.size() / feat_dim;
+    std::vector<std::vector<float>> features(n);
+    std::vector<int64_t> x_length(n);
+    int64_t max_num_frames = 0;
 
-    std::array<int64_t, 3> shape = {1, num_frames, feat_dim};
+    for (int32_t i = 0; i != n; ++i) {
+      features[i] = ss[i]->GetFrames();
+      x_length[i] = features[i].size() / feat_dim;
+      max_num_frames = std::max(max_num_frames, x_length[i]);
+    }
+
+    // Padded frames are masked out inside the encoder
+    std::vector<float> f(n * max_num_frames * feat_dim);
+    for (int32_t i = 0; i != n; ++i) {
+      std::copy(features[i].begin(), features[i].end(),
+                f.begin() + i * max_num_frames * feat_dim);
+    }
+
+    std::array<int64_t, 3> shape = {n, max_num_frames, feat_dim};
 
     Ort::Value x = Ort::Value::CreateTensor(memory_info, f.data(), f.size(),
                                             shape.data(), shape.size());
 
-    int64_t x_length_scalar = num_frames;
-    std::array<int64_t, 1> x_length_shape = {1};
-    Ort::Value x_length =
-        Ort::Value::CreateTensor(memory_info, &x_length_scalar, 1,
+    std::array<int64_t, 1> x_length_shape = {n};
+    Ort::Value x_length_tensor =
+        Ort::Value::CreateTensor(memory_info, x_length.data(), x_length.size(),
                                  x_length_shape.data(), x_length_shape.size());
-    return model_->ForwardEncoder(std::move(x), std::move(x_length));
+    return model_->ForwardEncoder(std::move(x), std::move(x_length_tensor));
   }
 
+  // All tokens share the same pos
   std::pair<Ort::Value, std::vector<Ort::Value>> RunDecoder(
-      int32_t token, int32_t pos, std::vector<Ort::Value> decoder_states,
-      Ort::Value enc_states, Ort::Value enc_mask) const {
-    auto memory_info =
-        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
-
-    std::array<int64_t, 2> shape = {1, 2};
-    std::array<int32_t, 2> _decoder_input = {token, pos};
-
-    Ort::Value decoder_input = Ort::Value::CreateTensor(
-        memory_info, _decoder_input.data(), _decoder_input.size(), shape.data(),
-        shape.size());
+      const std::vector<int32_t> &tokens, int32_t pos,
+      std::vector<Ort::Value> decoder_states, Ort::Value enc_states,
+      Ort::Value enc_mask) const {
+    int32_t batch_size = static_cast<int32_t>(tokens.size());
+    std::array<int64_t, 2> shape = {batch_size, 2};
+
+    Ort::Value decoder_input = Ort::Value::CreateTensor<int32_t>(
+        model_->Allocator(), shape.data(), shape.size());
+
+    int32_t *p = decoder_input.GetTensorMutableData<int32_t>();
+    for (auto t : tokens) {
+      p[0] = t;
+      p[1] = pos;
+      p += 2;
+    }
 
     return model_->ForwardDecoder(std::move(decoder_input),
                                   std::move(decoder_states),
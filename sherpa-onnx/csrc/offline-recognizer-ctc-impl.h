@@ -16,9 +16,11 @@
 #include "sherpa-onnx/csrc/offline-ctc-fst-decoder.h"
 #include "sherpa-onnx/csrc/offline-ctc-greedy-search-decoder.h"
 #include "sherpa-onnx/csrc/offline-ctc-model.h"
+#include "sherpa-onnx/csrc/offline-lm.h"
 #include "sherpa-onnx/csrc/offline-recognizer-impl.h"
 #include "sherpa-onnx/csrc/pad-sequence.h"
 #include "sherpa-onnx/csrc/symbol-table.h"
+#include "sherpa-onnx/csrc/thread-pool.h"
 
 namespace sherpa_onnx {
 
@@ -29,6 +31,8 @@ static OfflineRecognitionResult Convert(const OfflineCtcDecoderResult &src,
   OfflineRecognitionResult r;
   r.tokens.reserve(src.tokens.size());
   r.timestamps.reserve(src.timestamps.size());
+  r.ys_probs.reserve(src.ys_probs.size());
+  r.graph_scores.reserve(src.graph_scores.size());
 
   std::string text;
 
@@ -51,6 +55,11 @@ static OfflineRecognitionResult Convert(const OfflineCtcDecoderResult &src,
     }
 
     r.tokens.push_back(std::move(sym));
+
+    if (!src.ys_probs.empty()) {
+      r.ys_probs.push_back(src.ys_probs[i]);
+      r.graph_scores.push_back(src.graph_scores[i]);
+    }
   }
 
   if (sym_table.IsByteBpe()) {
@@ -66,6 +75,13 @@ static OfflineRecognitionResult Convert(const OfflineCtcDecoderResult &src,
   }
 
   r.words = std::move(src.words);
+  r.lm_log_prob = src.lm_log_prob;
+
+  r.nbest.reserve(src.nbest.size());
+  for (const auto &h : src.nbest) {
+    r.nbest.push_back(
+        Convert(h, sym_table, frame_shift_ms, subsampling_factor));
+  }
 
   return r;
 }
@@ -149,8 +165,13 @@ class OfflineRecognizerCtcImpl : public OfflineRecognizerImpl {
     if (!config_.ctc_fst_decoder_config.graph.empty()) {
       // TODO(fangjun): Support android to read the graph from
       // asset_manager
+      if (config_.ctc_fst_decoder_config.nbest > 1 &&
+          !config_.lm_config.model.empty()) {
+        lm_ = OfflineLM::Create(config_.lm_config);
+      }
+
       decoder_ = std::make_unique<OfflineCtcFstDecoder>(
-          config_.ctc_fst_decoder_config);
+          config_.ctc_fst_decoder_config, lm_.get(), config_.lm_config.scale);
     } else if (config_.decoding_method == "greedy_search") {
       if (!symbol_table_.Contains("<blk>") &&
           !symbol_table_.Contains("<eps>") &&
@@ -178,6 +199,10 @@ class OfflineRecognizerCtcImpl : public OfflineRecognizerImpl {
                        config_.decoding_method.c_str());
       SHERPA_ONNX_EXIT(-1);
     }
+
+    if (!model_->SupportBatchProcessing() && config_.num_decode_workers > 1) {
+      pool_ = std::make_unique<ThreadPool>(config_.num_decode_workers);
+    }
   }
 
   std::unique_ptr<OfflineStream> CreateStream() const override {
@@ -188,6 +213,11 @@ class OfflineRecognizerCtcImpl : public OfflineRecognizerImpl {
     if (!model_->SupportBatchProcessing() || (n == 1)) {
       // If the model does not support batch process,
       // we process each stream independently.
+      if (pool_ && n > 1) {
+        pool_->ParallelFor(n, [this, ss](int32_t i) { DecodeStream(ss[i]); });
+        return;
+      }
+
       for (int32_t i = 0; i != n; ++i) {
         DecodeStream(ss[i]);
       }
@@ -244,8 +274,7 @@ class OfflineRecognizerCtcImpl : public OfflineRecognizerImpl {
     for (int32_t i = 0; i != n; ++i) {
       auto r = Convert(results[i], symbol_table_, frame_shift_ms,
                        model_->SubsamplingFactor());
-      r.text = ApplyInverseTextNormalization(std::move(r.text));
-      r.text = ApplyHomophoneReplacer(std::move(r.text));
+      PostProcess(&r);
       ss[i]->SetResult(r);
     }
   }
@@ -283,16 +312,32 @@ class OfflineRecognizerCtcImpl : public OfflineRecognizerImpl {
 
     auto r = Convert(results[0], symbol_table_, frame_shift_ms,
                      model_->SubsamplingFactor());
-    r.text = ApplyInverseTextNormalization(std::move(r.text));
-    r.text = ApplyHomophoneReplacer(std::move(r.text));
+    PostProcess(&r);
     s->SetResult(r);
   }
 
+  // Apply inverse text normalization and homophone replacement to the text
+  // of the result and of its N best results
+  void PostProcess(OfflineRecognitionResult *r) const {
+    r->text = ApplyInverseTextNormalization(std::move(r->text));
+    r->text = ApplyHomophoneReplacer(std::move(r->text));
+
+    for (auto &h : r->nbest) {
+      PostProcess(&h);
+    }
+  }
+
  private:
   OfflineRecognizerConfig config_;
   SymbolTable symbol_table_;
   std::unique_ptr<OfflineCtcModel> model_;
+
+  // Used only to rescore the N best paths from OfflineCtcFstDecoder
+  std::unique_ptr<OfflineLM> lm_;
   std::unique_ptr<OfflineCtcDecoder> decoder_;
+
+  // Used only if the model does not support batch processing
+  std::unique_ptr<ThreadPool> pool_;
 };
 
 }  // namespace sherpa_onnx
@@ -6,12 +6,14 @@
 #define SHERPA_ONNX_CSRC_OFFLINE_RECOGNIZER_FIRE_RED_ASR_IMPL_H_
 
 #include <algorithm>
+#include <array>
 #include <cmath>
 #include <memory>
 #include <string>
 #include <utility>
 #include <vector>
 
+#include "sherpa-onnx/csrc/length-buckets.h"
 #include "sherpa-onnx/csrc/offline-fire-red-asr-decoder.h"
 #include "sherpa-onnx/csrc/offline-fire-red-asr-greedy-search-decoder.h"
 #include "sherpa-onnx/csrc/offline-fire-red-asr-model.h"
@@ -89,44 +91,81 @@ class OfflineRecognizerFireRedAsrImpl : public OfflineRecognizerImpl {
   }
 
   void DecodeStreams(OfflineStream **ss, int32_t n) const override {
-    // batch decoding is not implemented yet
+    if (n <= 0) {
+      return;
+    }
+
+    int32_t feat_dim = ss[0]->FeatureDim();
+
+    std::vector<std::vector<float>> features(n);
+    std::vector<int32_t> num_frames(n);
+
     for (int32_t i = 0; i != n; ++i) {
-      DecodeStream(ss[i]);
+      features[i] = ss[i]->GetFrames();
+      ApplyCMVN(&features[i]);
+
+      num_frames[i] = static_cast<int32_t>(features[i].size() / feat_dim);
+    }
+
+    // The decoder has no cross-attention mask and would attend to padded
+    // encoder frames, so only utterances with the same number of frames
+    // are put into the same batch.
+    auto buckets = SplitIntoLengthBuckets(num_frames.data(), n, 0, 0);
+
+    for (const auto &b : buckets) {
+      DecodeBatch(ss, b, &features, num_frames[b[0]]);
     }
   }
 
   OfflineRecognizerConfig GetConfig() const override { return config_; }
 
  private:
-  void DecodeStream(OfflineStream *s) const {
+  // Run the encoder and the decoder on the given streams in a single batch.
+  //
+  // @param ss All streams passed to DecodeStreams()
+  // @param indexes Indexes into ss of the streams in this batch
+  // @param features features[i] contains the normalized features of ss[i].
+  //                 The ones used by this batch are cleared.
+  // @param num_frames Number of feature frames of each stream in this batch
+  void DecodeBatch(OfflineStream **ss, const std::vector<int32_t> &indexes,
+                   std::vector<std::vector<float>> *features,
+                   int32_t num_frames) const {
     auto memory_info =
         Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
 
-    int32_t feat_dim = s->FeatureDim();
-    std::vector<float> f = s->GetFrames();
-    ApplyCMVN(&f);
+    int32_t batch_size = static_cast<int32_t>(indexes.size());
+    int32_t feat_dim = ss[indexes[0]]->FeatureDim();
 
-    int64_t num_frames = f.size() / feat_dim;
+    std::vector<float> f;
+    f.reserve(batch_size * num_frames * feat_dim);
+    for (auto i : indexes) {
+      f.insert(f.end(), (*features)[i].begin(), (*features)[i].end());
+      (*features)[i] = {};
+    }
 
-    std::array<int64_t, 3> shape{1, num_frames, feat_dim};
+    std::array<int64_t, 3> shape{batch_size, num_frames, feat_dim};
 
     Ort::Value x = Ort::Value::CreateTensor(memory_info, f.data(), f.size(),
                                             shape.data(), shape.size());
 
-    int64_t len_shape = 1;
-    Ort::Value x_len =
-        Ort::Value::CreateTensor(memory_info, &num_frames, 1, &len_shape, 1);
+    std::vector<int64_t> x_len_data(batch_size, num_frames);
+    int64_t len_shape = batch_size;
+    Ort::Value x_len = Ort::Value::CreateTensor(
+        memory_info, x_len_data.data(), x_len_data.size(), &len_shape, 1);
 
     auto cross_kv = model_->ForwardEncoder(std::move(x), std::move(x_len));
 
-    auto results = decoder_->Decode(std::move(cross_kv.first),
-                                    std::move(cross_kv.second), num_frames);
+    auto results =
+        decoder_->Decode(std::move(cross_kv.first), std::move(cross_kv.second),
+                         std::vector<int32_t>(batch_size, num_frames));
 
-    auto r = Convert(results[0], symbol_table_);
+    for (int32_t k = 0; k != batch_size; ++k) {
+      auto r = Convert(results[k], symbol_table_);
 
-    r.text = ApplyInverseTextNormalization(std::move(r.text));
-    r.text = ApplyHomophoneReplacer(std::move(r.text));
-    s->SetResult(r);
+      r.text = ApplyInverseTextNormalization(std::move(r.text));
+      r.text = ApplyHomophoneReplacer(std::move(r.text));
+      ss[indexes[k]]->SetResult(r);
+    }
   }
 
   void ApplyCMVN(std::vector<float> *v) const {
@@ -39,6 +39,17 @@ class OfflineRecognizerImpl {
     exit(-1);
   }
 
+  virtual std::unique_ptr<OfflineStream> CreateStream(
+      ContextGraphPtr context_graph) const {
+    SHERPA_ONNX_LOGE("Only transducer models support contextual biasing.");
+    exit(-1);
+  }
+
+  virtual ContextGraphPtr CompileHotwords(const std::string &hotwords) const {
+    SHERPA_ONNX_LOGE("Only transducer models support contextual biasing.");
+    exit(-1);
+  }
+
   virtual std::unique_ptr<OfflineStream> CreateStream() const = 0;
 
   virtual void DecodeStreams(OfflineStream **ss, int32_t n) const = 0;
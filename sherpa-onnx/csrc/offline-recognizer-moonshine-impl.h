@@ -6,12 +6,15 @@
 #define SHERPA_ONNX_CSRC_OFFLINE_RECOGNIZER_MOONSHINE_IMPL_H_
 
 #include <algorithm>
+#include <array>
 #include <cmath>
 #include <memory>
 #include <string>
 #include <utility>
 #include <vector>
 
+#include "sherpa-onnx/csrc/cat.h"
+#include "sherpa-onnx/csrc/length-buckets.h"
 #include "sherpa-onnx/csrc/offline-model-config.h"
 #include "sherpa-onnx/csrc/offline-moonshine-decoder.h"
 #include "sherpa-onnx/csrc/offline-moonshine-greedy-search-decoder.h"
@@ -83,55 +86,108 @@ class OfflineRecognizerMoonshineImpl : public OfflineRecognizerImpl {
   }
 
   void DecodeStreams(OfflineStream **ss, int32_t n) const override {
-    // batch decoding is not implemented yet
-    for (int32_t i = 0; i != n; ++i) {
-      DecodeStream(ss[i]);
+    if (n <= 0) {
+      return;
     }
-  }
-
-  OfflineRecognizerConfig GetConfig() const override { return config_; }
 
- private:
-  void DecodeStream(OfflineStream *s) const {
     auto memory_info =
         Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
 
-    std::vector<float> audio = s->GetFrames();
+    int32_t total_samples = 0;
 
     try {
-      std::array<int64_t, 2> shape{1, static_cast<int64_t>(audio.size())};
+      // The preprocessor is run on each utterance separately so that we
+      // know the exact number of frames of each of them.
+      std::vector<Ort::Value> features;
+      features.reserve(n);
 
-      Ort::Value audio_tensor = Ort::Value::CreateTensor(
-          memory_info, audio.data(), audio.size(), shape.data(), shape.size());
+      std::vector<int32_t> features_len(n);
 
-      Ort::Value features =
-          model_->ForwardPreprocessor(std::move(audio_tensor));
+      for (int32_t i = 0; i != n; ++i) {
+        std::vector<float> audio = ss[i]->GetFrames();
+        total_samples += static_cast<int32_t>(audio.size());
 
-      int32_t features_len = features.GetTensorTypeAndShapeInfo().GetShape()[1];
+        std::array<int64_t, 2> shape{1, static_cast<int64_t>(audio.size())};
 
-      int64_t features_shape = 1;
+        Ort::Value audio_tensor =
+            Ort::Value::CreateTensor(memory_info, audio.data(), audio.size(),
+                                     shape.data(), shape.size());
 
-      Ort::Value features_len_tensor = Ort::Value::CreateTensor(
-          memory_info, &features_len, 1, &features_shape, 1);
+        features.push_back(
+            model_->ForwardPreprocessor(std::move(audio_tensor)));
 
-      Ort::Value encoder_out = model_->ForwardEncoder(
-          std::move(features), std::move(features_len_tensor));
+        features_len[i] = static_cast<int32_t>(
+            features.back().GetTensorTypeAndShapeInfo().GetShape()[1]);
+      }
 
-      auto results = decoder_->Decode(std::move(encoder_out));
+      // The decoder has no cross-attention mask and would attend to padded
+      // encoder frames, so only utterances with the same number of frames
+      // are put into the same batch.
+      auto buckets = SplitIntoLengthBuckets(features_len.data(), n, 0, 0);
 
-      auto r = Convert(results[0], symbol_table_);
-      r.text = ApplyInverseTextNormalization(std::move(r.text));
-      r.text = ApplyHomophoneReplacer(std::move(r.text));
-      s->SetResult(r);
+      for (const auto &b : buckets) {
+        DecodeBatch(ss, b, &features, features_len[b[0]]);
+      }
     } catch (const Ort::Exception &ex) {
       SHERPA_ONNX_LOGE(
           "\n\nCaught exception:\n\n%s\n\nReturn an empty result. Number of "
-          "audio samples: %d",
-          ex.what(), static_cast<int32_t>(audio.size()));
+          "utterances: %d. Number of audio samples: %d",
+          ex.what(), n, total_samples);
       return;
     }
   }
 
+  OfflineRecognizerConfig GetConfig() const override { return config_; }
+
+ private:
+  // Run the encoder and the decoder on the given streams in a single batch.
+  //
+  // @param ss All streams passed to DecodeStreams()
+  // @param indexes Indexes into ss of the streams in this batch
+  // @param features features[i] is the preprocessor output of ss[i]. The
+  //                 ones used by this batch are moved out.
+  // @param num_frames Number of frames of each stream in this batch
+  void DecodeBatch(OfflineStream **ss, const std::vector<int32_t> &indexes,
+                   std::vector<Ort::Value> *features,
+                   int32_t num_frames) const {
+    int32_t batch_size = static_cast<int32_t>(indexes.size());
+
+    Ort::Value batched_features{nullptr};
+    if (batch_size == 1) {
+      batched_features = std::move((*features)[indexes[0]]);
+    } else {
+      std::vector<const Ort::Value *> features_pointer(batch_size);
+      for (int32_t k = 0; k != batch_size; ++k) {
+        features_pointer[k] = &(*features)[indexes[k]];
+      }
+
+      // All of them have shape (1, num_frames, dim)
+      batched_features = Cat(model_->Allocator(), features_pointer, 0);
+    }
+
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    std::vector<int32_t> features_len(batch_size, num_frames);
+    std::array<int64_t, 1> features_len_shape{batch_size};
+
+    Ort::Value features_len_tensor = Ort::Value::CreateTensor(
+        memory_info, features_len.data(), features_len.size(),
+        features_len_shape.data(), features_len_shape.size());
+
+    Ort::Value encoder_out = model_->ForwardEncoder(
+        std::move(batched_features), std::move(features_len_tensor));
+
+    auto results = decoder_->Decode(std::move(encoder_out), features_len);
+
+    for (int32_t k = 0; k != batch_size; ++k) {
+      auto r = Convert(results[k], symbol_table_);
+      r.text = ApplyInverseTextNormalization(std::move(r.text));
+      r.text = ApplyHomophoneReplacer(std::move(r.text));
+      ss[indexes[k]]->SetResult(r);
+    }
+  }
+
  private:
   OfflineRecognizerConfig config_;
   SymbolTable symbol_table_;
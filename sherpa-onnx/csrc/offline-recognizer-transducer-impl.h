@@ -16,6 +16,7 @@
 
 #include "sherpa-onnx/csrc/context-graph.h"
 #include "sherpa-onnx/csrc/log.h"
+#include "sherpa-onnx/csrc/lru-cache.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/offline-recognizer-impl.h"
 #include "sherpa-onnx/csrc/offline-recognizer.h"
@@ -148,8 +149,12 @@ class OfflineRecognizerTransducerImpl : public OfflineRecognizerImpl {
     }
   }
 
-  std::unique_ptr<OfflineStream> CreateStream(
-      const std::string &hotwords) const override {
+  ContextGraphPtr CompileHotwords(const std::string &hotwords) const override {
+    auto context_graph = hotwords_cache_.Get(hotwords);
+    if (context_graph) {
+      return context_graph;
+    }
+
     auto hws = std::regex_replace(hotwords, std::regex("/"), "\n");
     std::istringstream is(hws);
     std::vector<std::vector<int32_t>> current;
@@ -180,8 +185,20 @@ class OfflineRecognizerTransducerImpl : public OfflineRecognizerImpl {
       // Do nothing.
     }
 
-    auto context_graph = std::make_shared<ContextGraph>(
+    context_graph = std::make_shared<ContextGraph>(
         current, config_.hotwords_score, current_scores);
+    hotwords_cache_.Put(hotwords, context_graph);
+
+    return context_graph;
+  }
+
+  std::unique_ptr<OfflineStream> CreateStream(
+      const std::string &hotwords) const override {
+    return CreateStream(CompileHotwords(hotwords));
+  }
+
+  std::unique_ptr<OfflineStream> CreateStream(
+      ContextGraphPtr context_graph) const override {
     return std::make_unique<OfflineStream>(config_.feat_config, context_graph);
   }
 
@@ -297,6 +314,12 @@ class OfflineRecognizerTransducerImpl : public OfflineRecognizerImpl {
   std::vector<std::vector<int32_t>> hotwords_;
   std::vector<float> boost_scores_;
   ContextGraphPtr hotwords_graph_;
+
+  // Up to 100 compiled graphs of hotwords passed to CreateStream(), keyed
+  // by the hotwords text. A graph is not modified after it is built, so it
+  // can be shared by streams decoded in different threads.
+  mutable LruCache<ContextGraph> hotwords_cache_{100};
+
   std::unique_ptr<ssentencepiece::Ssentencepiece> bpe_encoder_;
   std::unique_ptr<OfflineTransducerModel> model_;
   std::unique_ptr<OfflineTransducerDecoder> decoder_;
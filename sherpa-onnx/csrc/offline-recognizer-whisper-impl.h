@@ -6,6 +6,7 @@
 #define SHERPA_ONNX_CSRC_OFFLINE_RECOGNIZER_WHISPER_IMPL_H_
 
 #include <algorithm>
+#include <array>
 #include <cmath>
 #include <memory>
 #include <string>
@@ -66,39 +67,13 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
   }
 
   void DecodeStreams(OfflineStream **ss, int32_t n) const override {
-    // batch decoding is not implemented yet
-    for (int32_t i = 0; i != n; ++i) {
-      DecodeStream(ss[i]);
+    if (n <= 0) {
+      return;
     }
-  }
-
-  void SetConfig(const OfflineRecognizerConfig &config) override {
-    config_.model_config.whisper = config.model_config.whisper;
-  }
-
-  OfflineRecognizerConfig GetConfig() const override { return config_; }
 
- private:
-  void DecodeStream(OfflineStream *s) const {
     decoder_->SetConfig(config_.model_config.whisper);
 
     int32_t max_num_frames = 3000;
-    auto memory_info =
-        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
-
-    int32_t feat_dim = s->FeatureDim();
-    std::vector<float> f = s->GetFrames();
-    int32_t num_frames = f.size() / feat_dim;
-
-    // we use 50 here so that there will be some zero tail paddings
-    if (num_frames >= max_num_frames - 50) {
-      SHERPA_ONNX_LOGE(
-          "Only waves less than 30 seconds are supported. We process only the "
-          "first 30 seconds and discard the remaining data");
-      num_frames = max_num_frames - 50;
-    }
-
-    model_->NormalizeFeatures(f.data(), num_frames, feat_dim);
 
     // note that 1000 is an experience-value.
     // You can replace 1000 by other values, say, 100.
@@ -111,19 +86,47 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
       tail_padding_frames = config_.model_config.whisper.tail_paddings;
     }
 
-    int32_t actual_frames =
-        std::min(num_frames + tail_padding_frames, max_num_frames);
+    int32_t feat_dim = model_->FeatureDim();
+
+    std::vector<std::vector<float>> features(n);
+    std::vector<int32_t> num_frames(n);
 
-    std::array<int64_t, 3> shape{1, actual_frames, feat_dim};
+    // All utterances in a batch are padded to the same number of frames.
+    // Each of them has at least tail_padding_frames paddings.
+    int32_t actual_frames = 0;
+
+    for (int32_t i = 0; i != n; ++i) {
+      features[i] = ss[i]->GetFrames();
+      num_frames[i] = features[i].size() / feat_dim;
+
+      // we use 50 here so that there will be some zero tail paddings
+      if (num_frames[i] >= max_num_frames - 50) {
+        SHERPA_ONNX_LOGE(
+            "Only waves less than 30 seconds are supported. We process only "
+            "the first 30 seconds and discard the remaining data");
+        num_frames[i] = max_num_frames - 50;
+      }
+
+      model_->NormalizeFeatures(features[i].data(), num_frames[i], feat_dim);
+
+      actual_frames = std::max(
+          actual_frames,
+          std::min(num_frames[i] + tail_padding_frames, max_num_frames));
+    }
+
+    std::array<int64_t, 3> shape{n, actual_frames, feat_dim};
 
     Ort::Value mel = Ort::Value::CreateTensor<float>(
         model_->Allocator(), shape.data(), shape.size());
 
     float *p_mel = mel.GetTensorMutableData<float>();
-    std::copy(f.data(), f.data() + num_frames * feat_dim, p_mel);
+    std::fill_n(p_mel, n * actual_frames * feat_dim, 0);
 
-    std::fill_n(p_mel + num_frames * feat_dim,
-                (actual_frames - num_frames) * feat_dim, 0);
+    for (int32_t i = 0; i != n; ++i) {
+      std::copy(features[i].data(),
+                features[i].data() + num_frames[i] * feat_dim,
+                p_mel + i * actual_frames * feat_dim);
+    }
 
     mel = Transpose12(model_->Allocator(), &mel);
 
@@ -133,19 +136,28 @@ class OfflineRecognizerWhisperImpl : public OfflineRecognizerImpl {
       auto results = decoder_->Decode(std::move(cross_kv.first),
                                       std::move(cross_kv.second), num_frames);
 
-      auto r = Convert(results[0], symbol_table_);
-      s->SetResult(r);
+      for (int32_t i = 0; i != n; ++i) {
+        auto r = Convert(results[i], symbol_table_);
+        ss[i]->SetResult(r);
+      }
     } catch (const Ort::Exception &ex) {
       SHERPA_ONNX_LOGE(
           "\n\nCaught exception:\n\n%s\n\nReturn an empty result. Number of "
-          "input frames: %d, Current tail "
+          "utterances: %d, number of input frames: %d, Current tail "
           "paddings: %d. If you see a lot of such exceptions, please consider "
           "using a larger --whisper-tail-paddings",
-          ex.what(), num_frames, tail_padding_frames);
+          ex.what(), n, *std::max_element(num_frames.begin(), num_frames.end()),
+          tail_padding_frames);
       return;
     }
   }
 
+  void SetConfig(const OfflineRecognizerConfig &config) override {
+    config_.model_config.whisper = config.model_config.whisper;
+  }
+
+  OfflineRecognizerConfig GetConfig() const override { return config_; }
+
  private:
   OfflineRecognitionResult Convert(const OfflineWhisperDecoderResult &src,
                                    const SymbolTable &sym_table) const {
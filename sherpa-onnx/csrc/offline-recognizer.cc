@@ -5,6 +5,8 @@
 #include "sherpa-onnx/csrc/offline-recognizer.h"
 
 #include <memory>
+#include <utility>
+#include <vector>
 
 #if __ANDROID_API__ >= 9
 #include "android/asset_manager.h"
@@ -16,6 +18,7 @@
 #endif
 
 #include "sherpa-onnx/csrc/file-utils.h"
+#include "sherpa-onnx/csrc/length-buckets.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/offline-lm-config.h"
 #include "sherpa-onnx/csrc/offline-recognizer-impl.h"
@@ -65,6 +68,12 @@ void OfflineRecognizerConfig::Register(ParseOptions *po) {
       "rule-fars", &rule_fars,
       "If not empty, it specifies fst archives for inverse text normalization. "
       "If there are multiple archives, they are separated by a comma.");
+
+  po->Register(
+      "num-decode-workers", &num_decode_workers,
+      "Number of threads to decode streams in parallel in DecodeStreams() "
+      "for CTC models that do not support batch processing, e.g., "
+      "WeNet CTC models");
 }
 
 bool OfflineRecognizerConfig::Validate() const {
@@ -93,6 +102,12 @@ bool OfflineRecognizerConfig::Validate() const {
     return false;
   }
 
+  if (!ctc_fst_decoder_config.graph.empty() &&
+      ctc_fst_decoder_config.nbest > 1 && !lm_config.model.empty() &&
+      !lm_config.Validate()) {
+    return false;
+  }
+
   if (!hotwords_file.empty() && !FileExists(hotwords_file)) {
     SHERPA_ONNX_LOGE("--hotwords-file: '%s' does not exist",
                      hotwords_file.c_str());
@@ -126,6 +141,12 @@ bool OfflineRecognizerConfig::Validate() const {
     return false;
   }
 
+  if (num_decode_workers < 1) {
+    SHERPA_ONNX_LOGE("num_decode_workers should be >= 1. Given: %d",
+                     num_decode_workers);
+    return false;
+  }
+
   return model_config.Validate();
 }
 
@@ -144,7 +165,8 @@ std::string OfflineRecognizerConfig::ToString() const {
   os << "blank_penalty=" << blank_penalty << ", ";
   os << "rule_fsts=\"" << rule_fsts << "\", ";
   os << "rule_fars=\"" << rule_fars << "\", ";
-  os << "hr=" << hr.ToString() << ")";
+  os << "hr=" << hr.ToString() << ", ";
+  os << "num_decode_workers=" << num_decode_workers << ")";
 
   return os.str();
 }
@@ -164,6 +186,16 @@ std::unique_ptr<OfflineStream> OfflineRecognizer::CreateStream(
   return impl_->CreateStream(hotwords);
 }
 
+ContextGraphPtr OfflineRecognizer::CompileHotwords(
+    const std::string &hotwords) const {
+  return impl_->CompileHotwords(hotwords);
+}
+
+std::unique_ptr<OfflineStream> OfflineRecognizer::CreateStream(
+    ContextGraphPtr hotwords) const {
+  return impl_->CreateStream(std::move(hotwords));
+}
+
 std::unique_ptr<OfflineStream> OfflineRecognizer::CreateStream() const {
   return impl_->CreateStream();
 }
@@ -172,6 +204,33 @@ void OfflineRecognizer::DecodeStreams(OfflineStream **ss, int32_t n) const {
   impl_->DecodeStreams(ss, n);
 }
 
+void OfflineRecognizer::DecodeStreams(OfflineStream **ss, int32_t n,
+                                      float max_padding_ratio,
+                                      int32_t max_frames_per_batch) const {
+  if ((max_padding_ratio >= 1 && max_frames_per_batch <= 0) || n <= 1) {
+    impl_->DecodeStreams(ss, n);
+    return;
+  }
+
+  std::vector<int32_t> lengths(n);
+  for (int32_t i = 0; i != n; ++i) {
+    lengths[i] = ss[i]->NumFramesReady();
+  }
+
+  auto buckets = SplitIntoLengthBuckets(lengths.data(), n, max_padding_ratio,
+                                        max_frames_per_batch);
+
+  std::vector<OfflineStream *> batch;
+  for (const auto &b : buckets) {
+    batch.clear();
+    for (auto i : b) {
+      batch.push_back(ss[i]);
+    }
+
+    impl_->DecodeStreams(batch.data(), batch.size());
+  }
+}
+
 void OfflineRecognizer::SetConfig(const OfflineRecognizerConfig &config) {
   impl_->SetConfig(config);
 }
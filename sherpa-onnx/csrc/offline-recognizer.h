@@ -43,6 +43,10 @@ struct OfflineRecognizerConfig {
   std::string rule_fars;
   HomophoneReplacerConfig hr;
 
+  // Number of threads to decode streams in parallel for CTC models that
+  // do not support batch processing
+  int32_t num_decode_workers = 1;
+
   // only greedy_search is implemented
   // TODO(fangjun): Implement modified_beam_search
 
@@ -54,7 +58,8 @@ struct OfflineRecognizerConfig {
       const std::string &decoding_method, int32_t max_active_paths,
       const std::string &hotwords_file, float hotwords_score,
       float blank_penalty, const std::string &rule_fsts,
-      const std::string &rule_fars, const HomophoneReplacerConfig &hr)
+      const std::string &rule_fars, const HomophoneReplacerConfig &hr,
+      int32_t num_decode_workers = 1)
       : feat_config(feat_config),
         model_config(model_config),
         lm_config(lm_config),
@@ -66,7 +71,8 @@ struct OfflineRecognizerConfig {
         blank_penalty(blank_penalty),
         rule_fsts(rule_fsts),
         rule_fars(rule_fars),
-        hr(hr) {}
+        hr(hr),
+        num_decode_workers(num_decode_workers) {}
 
   void Register(ParseOptions *po);
   bool Validate() const;
@@ -100,6 +106,21 @@ class OfflineRecognizer {
   std::unique_ptr<OfflineStream> CreateStream(
       const std::string &hotwords) const;
 
+  /** Compile the given hotwords into a context graph.
+   *
+   * The result can be passed to CreateStream() to create streams that
+   * share the same graph. Compiled graphs are also cached inside the
+   * recognizer, so calling it again with the same hotwords is cheap.
+   *
+   * @param hotwords  See the above CreateStream().
+   */
+  ContextGraphPtr CompileHotwords(const std::string &hotwords) const;
+
+  /** Create a stream for decoding with hotwords compiled by
+   * CompileHotwords().
+   */
+  std::unique_ptr<OfflineStream> CreateStream(ContextGraphPtr hotwords) const;
+
   /** Decode a single stream
    *
    * @param s The stream to decode.
@@ -116,6 +137,25 @@ class OfflineRecognizer {
    */
   void DecodeStreams(OfflineStream **ss, int32_t n) const;
 
+  /** Decode a list of streams in batches of similar lengths.
+   *
+   * Streams are sorted by the number of feature frames and split into
+   * buckets, see SplitIntoLengthBuckets(). Each bucket is decoded as a
+   * separate batch so that short streams are not padded to the length of
+   * the longest stream. The result of each stream is stored in the stream
+   * itself, as in the above method.
+   *
+   * @param ss Pointer to an array of streams.
+   * @param n  Size of the input array.
+   * @param max_padding_ratio  Max ratio of padded frames in a batch.
+   *                           A value >= 1 disables this limit.
+   * @param max_frames_per_batch  Max value of num_streams * max_num_frames
+   *                              in a batch. A value <= 0 disables this
+   *                              limit.
+   */
+  void DecodeStreams(OfflineStream **ss, int32_t n, float max_padding_ratio,
+                     int32_t max_frames_per_batch) const;
+
   /** Onnxruntime Session objects are not affected by this method.
    * The exact behavior can be defined by a specific recognizer impl.
    * For instance, for the whisper recognizer, you can retrieve the language and
@@ -86,22 +86,10 @@ class OfflineSourceSeparationSpleeterImpl : public OfflineSourceSeparationImpl {
 
     Eigen::VectorXf x = (real.array().square() + imag.array().square()).sqrt();
 
-    auto memory_info =
-        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
-
-    std::array<int64_t, 4> x_shape{2, num_frames / 512, 512, 1024};
-    Ort::Value x_tensor = Ort::Value::CreateTensor(
-        memory_info, &x[0], x.size(), x_shape.data(), x_shape.size());
-
-    Ort::Value vocals_spec_tensor = model_.RunVocals(View(&x_tensor));
-    Ort::Value accompaniment_spec_tensor =
-        model_.RunAccompaniment(std::move(x_tensor));
-
-    Eigen::VectorXf vocals_spec = Eigen::Map<Eigen::VectorXf>(
-        vocals_spec_tensor.GetTensorMutableData<float>(), x.size());
+    Eigen::VectorXf vocals_spec(x.size());
+    Eigen::VectorXf accompaniment_spec(x.size());
 
-    Eigen::VectorXf accompaniment_spec = Eigen::Map<Eigen::VectorXf>(
-        accompaniment_spec_tensor.GetTensorMutableData<float>(), x.size());
+    RunModel(x, num_frames / 512, &vocals_spec, &accompaniment_spec);
 
     Eigen::VectorXf sum_spec = vocals_spec.array().square() +
                                accompaniment_spec.array().square() + 1e-10;
@@ -144,6 +132,59 @@ class OfflineSourceSeparationSpleeterImpl : public OfflineSourceSeparationImpl {
   }
 
  private:
+  /** Run the model on config.num_chunks_per_run chunks at a time.
+   *
+   * @param x Magnitude of shape (2, num_chunks, 512, 1024)
+   * @param num_chunks Number of chunks in x
+   * @param vocals_spec Output. Of the same shape as x.
+   * @param accompaniment_spec Output. Of the same shape as x.
+   */
+  void RunModel(const Eigen::VectorXf &x, int32_t num_chunks,
+                Eigen::VectorXf *vocals_spec,
+                Eigen::VectorXf *accompaniment_spec) const {
+    constexpr int32_t kChunkSize = 512 * 1024;
+    int32_t batch_size = std::min(config_.num_chunks_per_run, num_chunks);
+
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    Eigen::VectorXf buf(2 * batch_size * kChunkSize);
+
+    for (int32_t begin = 0; begin < num_chunks; begin += batch_size) {
+      int32_t n = std::min(batch_size, num_chunks - begin);
+
+      // x is of shape (2, num_chunks, 512, 1024). Select
+      // x[:, begin:begin+n]
+      for (int32_t c = 0; c != 2; ++c) {
+        buf.segment(c * n * kChunkSize, n * kChunkSize) =
+            x.segment((c * num_chunks + begin) * kChunkSize, n * kChunkSize);
+      }
+
+      std::array<int64_t, 4> x_shape{2, n, 512, 1024};
+      Ort::Value x_tensor =
+          Ort::Value::CreateTensor(memory_info, &buf[0], 2 * n * kChunkSize,
+                                   x_shape.data(), x_shape.size());
+
+      Ort::Value vocals = model_.RunVocals(View(&x_tensor));
+      Ort::Value accompaniment = model_.RunAccompaniment(std::move(x_tensor));
+
+      const float *p_vocals = vocals.GetTensorData<float>();
+      const float *p_accompaniment = accompaniment.GetTensorData<float>();
+
+      for (int32_t c = 0; c != 2; ++c) {
+        vocals_spec->segment((c * num_chunks + begin) * kChunkSize,
+                             n * kChunkSize) =
+            Eigen::Map<const Eigen::VectorXf>(p_vocals + c * n * kChunkSize,
+                                              n * kChunkSize);
+
+        accompaniment_spec->segment((c * num_chunks + begin) * kChunkSize,
+                                    n * kChunkSize) =
+            Eigen::Map<const Eigen::VectorXf>(
+                p_accompaniment + c * n * kChunkSize, n * kChunkSize);
+      }
+    }
+  }
+
   // spec is of shape (2, num_chunks, 512, 1024)
   std::vector<float> ProcessSpec(const Eigen::VectorXf &spec,
                                  const knf::StftResult &stft,
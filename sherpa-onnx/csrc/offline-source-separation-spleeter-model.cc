@@ -81,8 +81,8 @@ class OfflineSourceSeparationSpleeterModel::Impl {
 
  private:
   void InitVocals(void *model_data, size_t model_data_length) {
-    vocals_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    vocals_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(vocals_sess_.get(), &vocals_input_names_,
                   &vocals_input_names_ptr_);
@@ -135,8 +135,8 @@ class OfflineSourceSeparationSpleeterModel::Impl {
   }
 
   void InitAccompaniment(void *model_data, size_t model_data_length) {
-    accompaniment_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    accompaniment_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(accompaniment_sess_.get(), &accompaniment_input_names_,
                   &accompaniment_input_names_ptr_);
@@ -35,58 +35,51 @@ class OfflineSourceSeparationUvrImpl : public OfflineSourceSeparationImpl {
       const OfflineSourceSeparationInput &_input) const override {
     auto input = Resample(_input, config_.model.debug);
 
-    auto chunks_ch0 = SplitIntoChunks(input.samples.data[0]);
+    const auto &samples_ch0 = input.samples.data[0];
 
-    std::vector<std::vector<float>> chunks_ch1;
-    if (input.samples.data.size() > 1) {
-      chunks_ch1 = SplitIntoChunks(input.samples.data[1]);
-    }
+    // For mono input, the same samples are used for both channels
+    const auto &samples_ch1 =
+        input.samples.data.size() > 1 ? input.samples.data[1] : samples_ch0;
 
-    std::vector<float> samples_ch0;
-    std::vector<float> samples_ch1;
+    int32_t num_samples = static_cast<int32_t>(samples_ch0.size());
 
-    for (int32_t i = 0; i != static_cast<int32_t>(chunks_ch0.size()); ++i) {
-      bool is_first_chunk = (i == 0);
-      bool is_last_chunk = (i == static_cast<int32_t>(chunks_ch0.size()) - 1);
+    // The output of each chunk is written to the final buffers as soon as
+    // it is available, so that intermediate results do not grow with
+    // the length of the input
+    std::vector<float> vocals_ch0(num_samples);
+    std::vector<float> vocals_ch1(num_samples);
+    std::vector<float> non_vocals_ch0(num_samples);
+    std::vector<float> non_vocals_ch1(num_samples);
 
-      auto s = ProcessChunk(
-          chunks_ch0[i],
-          chunks_ch1.empty() ? std::vector<float>{} : chunks_ch1[i],
-          is_first_chunk, is_last_chunk);
+    auto chunks = SplitIntoChunks(num_samples);
+    int32_t num_chunks = static_cast<int32_t>(chunks.size());
+    int32_t batch_size = config_.num_chunks_per_run;
 
-      samples_ch0.insert(samples_ch0.end(), s.first.begin(), s.first.end());
-      samples_ch1.insert(samples_ch1.end(), s.second.begin(), s.second.end());
-    }
+    int32_t offset = 0;
+    for (int32_t begin = 0; begin < num_chunks; begin += batch_size) {
+      int32_t end = std::min(begin + batch_size, num_chunks);
+
+      auto vocals = ProcessChunks(samples_ch0, samples_ch1, chunks, begin, end);
+
+      for (const auto &v : vocals) {
+        int32_t n = std::min<int32_t>(v.first.size(), num_samples - offset);
+
+        Eigen::Map<Eigen::VectorXf>(vocals_ch0.data() + offset, n) =
+            Eigen::Map<const Eigen::VectorXf>(v.first.data(), n);
+
+        Eigen::Map<Eigen::VectorXf>(vocals_ch1.data() + offset, n) =
+            Eigen::Map<const Eigen::VectorXf>(v.second.data(), n);
+
+        Eigen::Map<Eigen::VectorXf>(non_vocals_ch0.data() + offset, n) =
+            Eigen::Map<const Eigen::VectorXf>(samples_ch0.data() + offset, n) -
+            Eigen::Map<const Eigen::VectorXf>(v.first.data(), n);
+
+        Eigen::Map<Eigen::VectorXf>(non_vocals_ch1.data() + offset, n) =
+            Eigen::Map<const Eigen::VectorXf>(samples_ch1.data() + offset, n) -
+            Eigen::Map<const Eigen::VectorXf>(v.second.data(), n);
 
-    auto &vocals_ch0 = samples_ch0;
-    auto &vocals_ch1 = samples_ch1;
-
-    std::vector<float> non_vocals_ch0(vocals_ch0.size());
-    std::vector<float> non_vocals_ch1(vocals_ch1.size());
-
-    Eigen::Map<Eigen::VectorXf>(non_vocals_ch0.data(), non_vocals_ch0.size()) =
-        Eigen::Map<Eigen::VectorXf>(input.samples.data[0].data(),
-                                    input.samples.data[0].size())
-            .array() -
-        Eigen::Map<Eigen::VectorXf>(vocals_ch0.data(), vocals_ch0.size())
-            .array();
-
-    if (input.samples.data.size() > 1) {
-      Eigen::Map<Eigen::VectorXf>(non_vocals_ch1.data(),
-                                  non_vocals_ch1.size()) =
-          Eigen::Map<Eigen::VectorXf>(input.samples.data[1].data(),
-                                      input.samples.data[1].size())
-              .array() -
-          Eigen::Map<Eigen::VectorXf>(vocals_ch1.data(), vocals_ch1.size())
-              .array();
-    } else {
-      Eigen::Map<Eigen::VectorXf>(non_vocals_ch1.data(),
-                                  non_vocals_ch1.size()) =
-          Eigen::Map<Eigen::VectorXf>(input.samples.data[0].data(),
-                                      input.samples.data[0].size())
-              .array() -
-          Eigen::Map<Eigen::VectorXf>(vocals_ch1.data(), vocals_ch1.size())
-              .array();
+        offset += n;
+      }
     }
 
     OfflineSourceSeparationOutput ans;
@@ -114,28 +107,47 @@ class OfflineSourceSeparationUvrImpl : public OfflineSourceSeparationImpl {
   }
 
  private:
-  std::pair<std::vector<float>, std::vector<float>> ProcessChunk(
-      const std::vector<float> &chunk_ch0, const std::vector<float> &chunk_ch1,
-      bool is_first_chunk, bool is_last_chunk) const {
-    int32_t pad0 = 0;
+  using RowMajorMatrixXf =
+      Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>;
+
+  // Separate chunks [begin, end) in a single model run.
+  //
+  // Return the vocals of channel 0 and channel 1 for each chunk.
+  std::vector<std::pair<std::vector<float>, std::vector<float>>> ProcessChunks(
+      const std::vector<float> &samples_ch0,
+      const std::vector<float> &samples_ch1,
+      const std::vector<std::pair<int32_t, int32_t>> &chunks, int32_t begin,
+      int32_t end) const {
+    const auto &meta_ = model_.GetMetaData();
 
-    auto stft_results_ch0 = ComputeStft(chunk_ch0, &pad0);
+    int32_t n = end - begin;
+    int32_t dim_f = meta_.dim_f;
+    int32_t dim_t = meta_.dim_t;
 
-    int32_t pad1 = pad0;
-    std::vector<knf::StftResult> stft_results_ch1;
+    std::vector<int32_t> pads(n);
+    std::vector<std::vector<knf::StftResult>> stft_results_ch0(n);
+    std::vector<std::vector<knf::StftResult>> stft_results_ch1(n);
 
-    if (!chunk_ch1.empty()) {
-      stft_results_ch1 = ComputeStft(chunk_ch1, &pad1);
-    } else {
-      stft_results_ch1 = stft_results_ch0;
-    }
+    int32_t num_segments = 0;
+    for (int32_t k = 0; k != n; ++k) {
+      int32_t start = chunks[begin + k].first;
+      int32_t num_samples = chunks[begin + k].second - start;
 
-    const auto &meta_ = model_.GetMetaData();
+      stft_results_ch0[k] =
+          ComputeStft(samples_ch0.data() + start, num_samples, &pads[k]);
 
-    int32_t num_frames = stft_results_ch0[0].num_frames;
-    int32_t dim_f = meta_.dim_f;
-    int32_t dim_t = meta_.dim_t;
-    int32_t n_fft_bin = meta_.n_fft / 2 + 1;
+      if (&samples_ch1 == &samples_ch0) {
+        stft_results_ch1[k] = stft_results_ch0[k];
+      } else {
+        int32_t pad = 0;
+        stft_results_ch1[k] =
+            ComputeStft(samples_ch1.data() + start, num_samples, &pad);
+      }
+
+      num_segments += static_cast<int32_t>(stft_results_ch0[k].size());
+    }
+
+    int32_t num_frames = stft_results_ch0[0][0].num_frames;
     if (num_frames != dim_t) {
       SHERPA_ONNX_LOGE("num_frames(%d) != dim_t(%d)", num_frames, dim_t);
       SHERPA_ONNX_EXIT(-1);
@@ -143,55 +155,22 @@ class OfflineSourceSeparationUvrImpl : public OfflineSourceSeparationImpl {
 
     // the first 2: number of channels
     // the second 2: real and image
-    std::vector<float> x(stft_results_ch0.size() * 2 * 2 * dim_f * dim_t);
+    std::vector<float> x(num_segments * 2 * 2 * dim_f * dim_t);
     float *px = x.data();
 
-    for (int32_t i = 0; i != static_cast<int32_t>(stft_results_ch0.size());
-         ++i) {
-      const auto &ch0 = stft_results_ch0[i];
-      const auto &ch1 = stft_results_ch1[i];
-
-      const float *p_real_ch0 = ch0.real.data();
-      const float *p_imag_ch0 = ch0.imag.data();
-
-      const float *p_real_ch1 = ch1.real.data();
-      const float *p_imag_ch1 = ch1.imag.data();
-
-      for (int32_t j = 0; j != dim_f; ++j) {
-        for (int32_t k = 0; k != num_frames; ++k) {
-          *px = p_real_ch0[k * n_fft_bin + j];
-          ++px;
-        }
-      }
-
-      for (int32_t j = 0; j != dim_f; ++j) {
-        for (int32_t k = 0; k != num_frames; ++k) {
-          *px = p_imag_ch0[k * n_fft_bin + j];
-          ++px;
-        }
-      }
-
-      for (int32_t j = 0; j != dim_f; ++j) {
-        for (int32_t k = 0; k != num_frames; ++k) {
-          *px = p_real_ch1[k * n_fft_bin + j];
-          ++px;
-        }
+    for (int32_t k = 0; k != n; ++k) {
+      for (int32_t i = 0; i != static_cast<int32_t>(stft_results_ch0[k].size());
+           ++i) {
+        px = Pack(stft_results_ch0[k][i], px);
+        px = Pack(stft_results_ch1[k][i], px);
       }
-
-      for (int32_t j = 0; j != dim_f; ++j) {
-        for (int32_t k = 0; k != num_frames; ++k) {
-          *px = p_imag_ch1[k * n_fft_bin + j];
-          ++px;
-        }
-      }
-    }  // for (int32_t i = 0; i !=
+    }
 
     auto memory_info =
         Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
 
-    std::array<int64_t, 4> x_shape{
-        static_cast<int32_t>(stft_results_ch0.size()) * 4 / meta_.dim_c,
-        meta_.dim_c, dim_f, dim_t};
+    std::array<int64_t, 4> x_shape{num_segments * 4 / meta_.dim_c, meta_.dim_c,
+                                   dim_f, dim_t};
 
     Ort::Value x_tensor = Ort::Value::CreateTensor(
         memory_info, x.data(), x.size(), x_shape.data(), x_shape.size());
@@ -200,63 +179,84 @@ class OfflineSourceSeparationUvrImpl : public OfflineSourceSeparationImpl {
 
     const float *p_spec = spec.GetTensorData<float>();
 
-    for (int32_t i = 0; i != static_cast<int32_t>(stft_results_ch0.size());
-         ++i) {
-      auto &ch0 = stft_results_ch0[i];
-      auto &ch1 = stft_results_ch1[i];
-
-      float *p_real_ch0 = ch0.real.data();
-      float *p_imag_ch0 = ch0.imag.data();
+    std::vector<std::pair<std::vector<float>, std::vector<float>>> ans;
+    ans.reserve(n);
 
-      float *p_real_ch1 = ch1.real.data();
-      float *p_imag_ch1 = ch1.imag.data();
-
-      for (int32_t j = 0; j != dim_f; ++j) {
-        for (int32_t k = 0; k != num_frames; ++k) {
-          p_real_ch0[k * n_fft_bin + j] = *p_spec;
-          ++p_spec;
-        }
+    for (int32_t k = 0; k != n; ++k) {
+      for (int32_t i = 0; i != static_cast<int32_t>(stft_results_ch0[k].size());
+           ++i) {
+        p_spec = Unpack(p_spec, &stft_results_ch0[k][i]);
+        p_spec = Unpack(p_spec, &stft_results_ch1[k][i]);
       }
 
-      for (int32_t j = 0; j != dim_f; ++j) {
-        for (int32_t k = 0; k != num_frames; ++k) {
-          p_imag_ch0[k * n_fft_bin + j] = *p_spec;
-          ++p_spec;
-        }
-      }
+      bool is_first_chunk = (begin + k == 0);
+      bool is_last_chunk =
+          (begin + k == static_cast<int32_t>(chunks.size()) - 1);
 
-      for (int32_t j = 0; j != dim_f; ++j) {
-        for (int32_t k = 0; k != num_frames; ++k) {
-          p_real_ch1[k * n_fft_bin + j] = *p_spec;
-          ++p_spec;
-        }
-      }
+      auto samples_ch0 = ComputeInverseStft(stft_results_ch0[k], pads[k],
+                                            is_first_chunk, is_last_chunk);
 
-      for (int32_t j = 0; j != dim_f; ++j) {
-        for (int32_t k = 0; k != num_frames; ++k) {
-          p_imag_ch1[k * n_fft_bin + j] = *p_spec;
-          ++p_spec;
-        }
-      }
+      auto samples_ch1 = ComputeInverseStft(stft_results_ch1[k], pads[k],
+                                            is_first_chunk, is_last_chunk);
 
-      for (int32_t k = 0; k != num_frames; ++k) {
-        for (int32_t j = dim_f; j != n_fft_bin; ++j) {
-          p_real_ch0[k * n_fft_bin + j] = 0;
-          p_real_ch1[k * n_fft_bin + j] = 0;
+      ans.emplace_back(std::move(samples_ch0), std::move(samples_ch1));
 
-          p_imag_ch0[k * n_fft_bin + j] = 0;
-          p_imag_ch1[k * n_fft_bin + j] = 0;
-        }
-      }
+      // Free the memory as early as possible
+      stft_results_ch0[k] = {};
+      stft_results_ch1[k] = {};
     }
 
-    auto samples_ch0 = ComputeInverseStft(stft_results_ch0, pad0,
-                                          is_first_chunk, is_last_chunk);
+    return ans;
+  }
+
+  // Copy the first dim_f bins of the real and imaginary parts of a segment
+  // to p, each of which is transposed to shape (dim_f, dim_t).
+  //
+  // Return the address after the copied data.
+  float *Pack(const knf::StftResult &r, float *p) const {
+    const auto &meta_ = model_.GetMetaData();
+    int32_t dim_f = meta_.dim_f;
+    int32_t dim_t = meta_.dim_t;
+    int32_t n_fft_bin = meta_.n_fft / 2 + 1;
+
+    Eigen::Map<const RowMajorMatrixXf> real(r.real.data(), dim_t, n_fft_bin);
+    Eigen::Map<const RowMajorMatrixXf> imag(r.imag.data(), dim_t, n_fft_bin);
+
+    Eigen::Map<RowMajorMatrixXf>(p, dim_f, dim_t) =
+        real.leftCols(dim_f).transpose();
+    p += dim_f * dim_t;
+
+    Eigen::Map<RowMajorMatrixXf>(p, dim_f, dim_t) =
+        imag.leftCols(dim_f).transpose();
+    p += dim_f * dim_t;
+
+    return p;
+  }
+
+  // It is the inverse operation of Pack(). Bins after the first dim_f bins
+  // are set to 0.
+  //
+  // Return the address after the used data.
+  const float *Unpack(const float *p, knf::StftResult *r) const {
+    const auto &meta_ = model_.GetMetaData();
+    int32_t dim_f = meta_.dim_f;
+    int32_t dim_t = meta_.dim_t;
+    int32_t n_fft_bin = meta_.n_fft / 2 + 1;
+
+    Eigen::Map<RowMajorMatrixXf> real(r->real.data(), dim_t, n_fft_bin);
+    Eigen::Map<RowMajorMatrixXf> imag(r->imag.data(), dim_t, n_fft_bin);
+
+    real.leftCols(dim_f) =
+        Eigen::Map<const RowMajorMatrixXf>(p, dim_f, dim_t).transpose();
+    real.rightCols(n_fft_bin - dim_f).setZero();
+    p += dim_f * dim_t;
 
-    auto samples_ch1 = ComputeInverseStft(stft_results_ch1, pad1,
-                                          is_first_chunk, is_last_chunk);
+    imag.leftCols(dim_f) =
+        Eigen::Map<const RowMajorMatrixXf>(p, dim_f, dim_t).transpose();
+    imag.rightCols(n_fft_bin - dim_f).setZero();
+    p += dim_f * dim_t;
 
-    return {std::move(samples_ch0), std::move(samples_ch1)};
+    return p;
   }
 
   std::vector<float> ComputeInverseStft(
@@ -293,18 +293,18 @@ class OfflineSourceSeparationUvrImpl : public OfflineSourceSeparationImpl {
     return {ans.begin() + start, ans.begin() + end};
   }
 
-  std::vector<knf::StftResult> ComputeStft(const std::vector<float> &chunk,
+  std::vector<knf::StftResult> ComputeStft(const float *chunk,
+                                           int32_t num_samples,
                                            int32_t *pad) const {
     const auto &meta_ = model_.GetMetaData();
 
-    int32_t num_samples = static_cast<int32_t>(chunk.size());
     int32_t trim = meta_.n_fft / 2;
     int32_t chunk_size = meta_.hop_length * (meta_.dim_t - 1);
     int32_t gen_size = chunk_size - 2 * trim;
     *pad = gen_size - num_samples % gen_size;
 
-    std::vector<float> samples(trim + chunk.size() + *pad + trim);
-    std::copy(chunk.begin(), chunk.end(), samples.begin() + trim);
+    std::vector<float> samples(trim + num_samples + *pad + trim);
+    std::copy(chunk, chunk + num_samples, samples.begin() + trim);
 
     auto stft_config = GetStftConfig();
     knf::Stft stft(stft_config);
@@ -319,11 +319,13 @@ class OfflineSourceSeparationUvrImpl : public OfflineSourceSeparationImpl {
     return stft_results;
   }
 
-  std::vector<std::vector<float>> SplitIntoChunks(
-      const std::vector<float> &samples) const {
-    std::vector<std::vector<float>> ans;
+  // Return the [start, end) of each chunk. Neighboring chunks overlap
+  // by 2 * margin samples.
+  std::vector<std::pair<int32_t, int32_t>> SplitIntoChunks(
+      int32_t num_samples) const {
+    std::vector<std::pair<int32_t, int32_t>> ans;
 
-    if (samples.empty()) {
+    if (num_samples == 0) {
       return ans;
     }
 
@@ -332,26 +334,24 @@ class OfflineSourceSeparationUvrImpl : public OfflineSourceSeparationImpl {
 
     int32_t chunk_size = meta_.num_chunks * meta_.sample_rate;
 
-    if (static_cast<int32_t>(samples.size()) < chunk_size) {
-      chunk_size = samples.size();
+    if (num_samples < chunk_size) {
+      chunk_size = num_samples;
     }
 
     if (margin > chunk_size) {
       margin = chunk_size;
     }
 
-    for (int32_t i = 0; i < static_cast<int32_t>(samples.size());
-         i += chunk_size) {
+    for (int32_t i = 0; i < num_samples; i += chunk_size) {
       int32_t start = std::max<int32_t>(0, i - margin);
-      int32_t end = std::min<int32_t>(i + chunk_size + margin,
-                                      static_cast<int32_t>(samples.size()));
+      int32_t end = std::min<int32_t>(i + chunk_size + margin, num_samples);
       if (start >= end) {
         break;
       }
 
-      ans.emplace_back(samples.begin() + start, samples.begin() + end);
+      ans.emplace_back(start, end);
 
-      if (end == static_cast<int32_t>(samples.size())) {
+      if (end == num_samples) {
         break;
       }
     }
@@ -6,6 +6,7 @@
 
 #include <memory>
 
+#include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/offline-source-separation-impl.h"
 
 #if __ANDROID_API__ >= 9
@@ -21,9 +22,20 @@ namespace sherpa_onnx {
 
 void OfflineSourceSeparationConfig::Register(ParseOptions *po) {
   model.Register(po);
+
+  po->Register("num-chunks-per-run", &num_chunks_per_run,
+               "Number of chunks that are processed in a single model run. "
+               "A larger value gives a higher throughput at the cost of "
+               "more memory.");
 }
 
 bool OfflineSourceSeparationConfig::Validate() const {
+  if (num_chunks_per_run < 1) {
+    SHERPA_ONNX_LOGE("--num-chunks-per-run should be >= 1. Given: %d",
+                     num_chunks_per_run);
+    return false;
+  }
+
   return model.Validate();
 }
 
@@ -31,7 +43,8 @@ std::string OfflineSourceSeparationConfig::ToString() const {
   std::ostringstream os;
 
   os << "OfflineSourceSeparationConfig(";
-  os << "model=" << model.ToString() << ")";
+  os << "model=" << model.ToString() << ", ";
+  os << "num_chunks_per_run=" << num_chunks_per_run << ")";
 
   return os.str();
 }
@@ -17,11 +17,21 @@ namespace sherpa_onnx {
 struct OfflineSourceSeparationConfig {
   OfflineSourceSeparationModelConfig model;
 
+  // Number of chunks that are processed in a single model run.
+  // For UVR, a chunk contains meta_data.num_chunks seconds of audio.
+  // For spleeter, a chunk contains 512 STFT frames.
+  //
+  // A larger value gives a higher throughput at the cost of more memory.
+  // Memory usage does not grow with the length of the input apart from
+  // the input and output samples.
+  int32_t num_chunks_per_run = 1;
+
   OfflineSourceSeparationConfig() = default;
 
   explicit OfflineSourceSeparationConfig(
-      const OfflineSourceSeparationModelConfig &model)
-      : model(model) {}
+      const OfflineSourceSeparationModelConfig &model,
+      int32_t num_chunks_per_run = 1)
+      : model(model), num_chunks_per_run(num_chunks_per_run) {}
 
   void Register(ParseOptions *po);
 
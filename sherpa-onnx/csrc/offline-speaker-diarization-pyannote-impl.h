@@ -5,6 +5,7 @@
 #define SHERPA_ONNX_CSRC_OFFLINE_SPEAKER_DIARIZATION_PYANNOTE_IMPL_H_
 
 #include <algorithm>
+#include <array>
 #include <cmath>
 #include <memory>
 #include <unordered_map>
@@ -17,6 +18,7 @@
 #include "sherpa-onnx/csrc/offline-speaker-diarization-impl.h"
 #include "sherpa-onnx/csrc/offline-speaker-segmentation-pyannote-model.h"
 #include "sherpa-onnx/csrc/speaker-embedding-extractor.h"
+#include "sherpa-onnx/csrc/thread-pool.h"
 
 namespace sherpa_onnx {
 
@@ -61,6 +63,7 @@ class OfflineSpeakerDiarizationPyannoteImpl
       const OfflineSpeakerDiarizationConfig &config)
       : config_(config),
         segmentation_model_(config_.segmentation),
+        pool_(std::make_unique<ThreadPool>(config_.segmentation_num_workers)),
         embedding_extractor_(config_.embedding),
         clustering_(std::make_unique<FastClustering>(config_.clustering)) {
     Init();
@@ -71,6 +74,7 @@ class OfflineSpeakerDiarizationPyannoteImpl
       Manager *mgr, const OfflineSpeakerDiarizationConfig &config)
       : config_(config),
         segmentation_model_(mgr, config_.segmentation),
+        pool_(std::make_unique<ThreadPool>(config_.segmentation_num_workers)),
         embedding_extractor_(mgr, config_.embedding),
         clustering_(std::make_unique<FastClustering>(config_.clustering)) {
     Init();
@@ -247,42 +251,95 @@ class OfflineSpeakerDiarizationPyannoteImpl
       return {};
     }
 
+    // Start of each window. The last window is padded with zeros if it
+    // goes past the end of the audio.
+    std::vector<const float *> windows;
+    std::vector<float> last_window;
+
     if (n <= window_size) {
-      std::vector<float> buf(window_size);
-      // NOTE: buf is zero initialized by default
+      last_window.resize(window_size);
+      // NOTE: last_window is zero initialized by default
 
-      std::copy(audio, audio + n, buf.data());
+      std::copy(audio, audio + n, last_window.data());
+      windows.push_back(last_window.data());
+    } else {
+      int32_t num_chunks = (n - window_size) / window_shift + 1;
+      bool has_last_chunk = ((n - window_size) % window_shift) > 0;
 
-      Matrix2D m = ProcessChunk(buf.data());
+      windows.reserve(num_chunks + has_last_chunk);
 
-      ans.push_back(std::move(m));
+      const float *p = audio;
+      for (int32_t i = 0; i != num_chunks; ++i, p += window_shift) {
+        windows.push_back(p);
+      }
 
-      return ans;
+      if (has_last_chunk) {
+        last_window.resize(window_size);
+        std::copy(p, audio + n, last_window.data());
+        windows.push_back(last_window.data());
+      }
     }
 
-    int32_t num_chunks = (n - window_size) / window_shift + 1;
-    bool has_last_chunk = ((n - window_size) % window_shift) > 0;
+    int32_t num_windows = static_cast<int32_t>(windows.size());
+    ans.resize(num_windows);
 
-    ans.reserve(num_chunks + has_last_chunk);
+    int32_t batch_size = segmentation_model_.SupportBatchProcessing()
+                             ? config_.segmentation_batch_size
+                             : 1;
+    int32_t num_batches = (num_windows + batch_size - 1) / batch_size;
 
-    const float *p = audio;
+    // Each batch writes its results to its own slots in ans, so the order
+    // of the windows is kept no matter which thread runs it.
+    pool_->ParallelFor(num_batches, [&](int32_t b) {
+      int32_t start = b * batch_size;
+      int32_t this_batch_size = std::min(batch_size, num_windows - start);
+      ProcessChunks(windows.data() + start, this_batch_size,
+                    ans.data() + start);
+    });
 
-    for (int32_t i = 0; i != num_chunks; ++i, p += window_shift) {
-      Matrix2D m = ProcessChunk(p);
+    return ans;
+  }
 
-      ans.push_back(std::move(m));
+  // Run the segmentation model on n windows in a single call.
+  //
+  // @param windows windows[i] points to the start of the i-th window
+  // @param n Number of windows
+  // @param out Output array of size n. out[i] is for windows[i]
+  void ProcessChunks(const float *const *windows, int32_t n,
+                     Matrix2D *out) const {
+    if (n == 1) {
+      out[0] = ProcessChunk(windows[0]);
+      return;
     }
 
-    if (has_last_chunk) {
-      std::vector<float> buf(window_size);
-      std::copy(p, audio + n, buf.data());
-
-      Matrix2D m = ProcessChunk(buf.data());
+    const auto &meta_data = segmentation_model_.GetModelMetaData();
+    int32_t window_size = meta_data.window_size;
 
-      ans.push_back(std::move(m));
+    std::vector<float> buf(n * window_size);
+    for (int32_t i = 0; i != n; ++i) {
+      std::copy(windows[i], windows[i] + window_size,
+                buf.data() + i * window_size);
     }
 
-    return ans;
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    std::array<int64_t, 3> shape = {n, 1, window_size};
+
+    Ort::Value x = Ort::Value::CreateTensor(memory_info, buf.data(), buf.size(),
+                                            shape.data(), shape.size());
+
+    Ort::Value y = segmentation_model_.Forward(std::move(x));
+    std::vector<int64_t> y_shape = y.GetTensorTypeAndShapeInfo().GetShape();
+
+    const float *p = y.GetTensorData<float>();
+    for (int32_t i = 0; i != n; ++i) {
+      Matrix2D m(y_shape[1], y_shape[2]);
+      std::copy(p, p + m.size(), &m(0, 0));
+      p += m.size();
+
+      out[i] = std::move(m);
+    }
   }
 
   Matrix2D ProcessChunk(const float *p) const {
@@ -475,40 +532,58 @@ class OfflineSpeakerDiarizationPyannoteImpl
 
     auto IsNaNWrapper = [](float f) -> bool { return std::isnan(f); };
 
+    int32_t num_segments = static_cast<int32_t>(sample_indexes.size());
+    int32_t batch_size = config_.embedding_batch_size;
+
+    std::vector<std::unique_ptr<OnlineStream>> streams;
+    std::vector<OnlineStream *> ss;
+
     int32_t k = 0;
     int32_t cur_row_index = 0;
-    for (const auto &v : sample_indexes) {
-      auto stream = embedding_extractor_.CreateStream();
-      for (const auto &p : v) {
-        int32_t end = (p.second <= n) ? p.second : n;
-        int32_t num_samples = end - p.first;
-
-        if (num_samples > 0) {
-          stream->AcceptWaveform(sample_rate, audio + p.first, num_samples);
+    while (k < num_segments) {
+      int32_t this_batch_size = std::min(batch_size, num_segments - k);
+
+      streams.clear();
+      ss.clear();
+      for (int32_t i = 0; i != this_batch_size; ++i) {
+        auto stream = embedding_extractor_.CreateStream();
+        for (const auto &p : sample_indexes[k + i]) {
+          int32_t end = (p.second <= n) ? p.second : n;
+          int32_t num_samples = end - p.first;
+
+          if (num_samples > 0) {
+            stream->AcceptWaveform(sample_rate, audio + p.first, num_samples);
+          }
         }
-      }
 
-      stream->InputFinished();
-      if (!embedding_extractor_.IsReady(stream.get())) {
-        SHERPA_ONNX_LOGE(
-            "This segment is too short, which should not happen since we have "
-            "already filtered short segments");
-        SHERPA_ONNX_EXIT(-1);
+        stream->InputFinished();
+        if (!embedding_extractor_.IsReady(stream.get())) {
+          SHERPA_ONNX_LOGE(
+              "This segment is too short, which should not happen since we "
+              "have already filtered short segments");
+          SHERPA_ONNX_EXIT(-1);
+        }
+
+        ss.push_back(stream.get());
+        streams.push_back(std::move(stream));
       }
 
-      std::vector<float> embedding = embedding_extractor_.Compute(stream.get());
+      std::vector<std::vector<float>> embeddings =
+          embedding_extractor_.Compute(ss.data(), this_batch_size);
 
-      if (std::none_of(embedding.begin(), embedding.end(), IsNaNWrapper)) {
-        // a valid embedding
-        std::copy(embedding.begin(), embedding.end(), &ans(cur_row_index, 0));
-        cur_row_index += 1;
-        valid_indexes->push_back(k);
-      }
+      for (const auto &embedding : embeddings) {
+        if (std::none_of(embedding.begin(), embedding.end(), IsNaNWrapper)) {
+          // a valid embedding
+          std::copy(embedding.begin(), embedding.end(), &ans(cur_row_index, 0));
+          cur_row_index += 1;
+          valid_indexes->push_back(k);
+        }
 
-      k += 1;
+        k += 1;
 
-      if (callback) {
-        callback(k, ans.rows(), callback_arg);
+        if (callback) {
+          callback(k, ans.rows(), callback_arg);
+        }
       }
     }
 
@@ -739,6 +814,10 @@ class OfflineSpeakerDiarizationPyannoteImpl
  private:
   OfflineSpeakerDiarizationConfig config_;
   OfflineSpeakerSegmentationPyannoteModel segmentation_model_;
+
+  // Runs batches of the segmentation model
+  std::unique_ptr<ThreadPool> pool_;
+
   SpeakerEmbeddingExtractor embedding_extractor_;
   std::unique_ptr<FastClustering> clustering_;
   Matrix2DInt32 powerset_mapping_;
@@ -38,6 +38,19 @@ void OfflineSpeakerDiarizationConfig::Register(ParseOptions *po) {
                "if the gap between to segments of the same speaker is less "
                "than this value, then these two segments are merged into a "
                "single segment. We do it recursively.");
+
+  po->Register("embedding-batch-size", &embedding_batch_size,
+               "Number of segments to compute speaker embeddings for in a "
+               "single batch. Larger values use more memory.");
+
+  po->Register("segmentation-batch-size", &segmentation_batch_size,
+               "Number of sliding windows to run the segmentation model on "
+               "in a single batch. Larger values use more memory.");
+
+  po->Register("segmentation-num-workers", &segmentation_num_workers,
+               "Number of threads to run batches of the segmentation model "
+               "in parallel. The total number of threads is this value times "
+               "--segmentation.num-threads");
 }
 
 bool OfflineSpeakerDiarizationConfig::Validate() const {
@@ -63,6 +76,24 @@ bool OfflineSpeakerDiarizationConfig::Validate() const {
     return false;
   }
 
+  if (embedding_batch_size < 1) {
+    SHERPA_ONNX_LOGE("embedding_batch_size %d is less than 1",
+                     embedding_batch_size);
+    return false;
+  }
+
+  if (segmentation_batch_size < 1) {
+    SHERPA_ONNX_LOGE("segmentation_batch_size %d is less than 1",
+                     segmentation_batch_size);
+    return false;
+  }
+
+  if (segmentation_num_workers < 1) {
+    SHERPA_ONNX_LOGE("segmentation_num_workers %d is less than 1",
+                     segmentation_num_workers);
+    return false;
+  }
+
   return true;
 }
 
@@ -74,7 +105,10 @@ std::string OfflineSpeakerDiarizationConfig::ToString() const {
   os << "embedding=" << embedding.ToString() << ", ";
   os << "clustering=" << clustering.ToString() << ", ";
   os << "min_duration_on=" << min_duration_on << ", ";
-  os << "min_duration_off=" << min_duration_off << ")";
+  os << "min_duration_off=" << min_duration_off << ", ";
+  os << "embedding_batch_size=" << embedding_batch_size << ", ";
+  os << "segmentation_batch_size=" << segmentation_batch_size << ", ";
+  os << "segmentation_num_workers=" << segmentation_num_workers << ")";
 
   return os.str();
 }
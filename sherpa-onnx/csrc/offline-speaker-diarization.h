@@ -29,18 +29,34 @@ struct OfflineSpeakerDiarizationConfig {
   // We do this recursively.
   float min_duration_off = 0.5;  // in seconds
 
+  // Number of segments to compute speaker embeddings for in a single call
+  // of the embedding extractor
+  int32_t embedding_batch_size = 1;
+
+  // Number of sliding windows to run the segmentation model on in a single
+  // call. It is ignored if the model does not support batch processing.
+  int32_t segmentation_batch_size = 1;
+
+  // Number of threads to run batches of the segmentation model in parallel.
+  // The threads are created once, together with the diarization engine.
+  int32_t segmentation_num_workers = 1;
+
   OfflineSpeakerDiarizationConfig() = default;
 
   OfflineSpeakerDiarizationConfig(
       const OfflineSpeakerSegmentationModelConfig &segmentation,
       const SpeakerEmbeddingExtractorConfig &embedding,
       const FastClusteringConfig &clustering, float min_duration_on,
-      float min_duration_off)
+      float min_duration_off, int32_t embedding_batch_size = 1,
+      int32_t segmentation_batch_size = 1, int32_t segmentation_num_workers = 1)
       : segmentation(segmentation),
         embedding(embedding),
         clustering(clustering),
         min_duration_on(min_duration_on),
-        min_duration_off(min_duration_off) {}
+        min_duration_off(min_duration_off),
+        embedding_batch_size(embedding_batch_size),
+        segmentation_batch_size(segmentation_batch_size),
+        segmentation_num_workers(segmentation_num_workers) {}
 
   void Register(ParseOptions *po);
   bool Validate() const;
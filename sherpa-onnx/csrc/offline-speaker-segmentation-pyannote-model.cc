@@ -49,6 +49,8 @@ class OfflineSpeakerSegmentationPyannoteModel::Impl {
     return meta_data_;
   }
 
+  bool SupportBatchProcessing() const { return support_batch_processing_; }
+
   Ort::Value Forward(Ort::Value x) {
     auto out = sess_->Run({}, input_names_ptr_.data(), &x, 1,
                           output_names_ptr_.data(), output_names_ptr_.size());
@@ -58,13 +60,16 @@ class OfflineSpeakerSegmentationPyannoteModel::Impl {
 
  private:
   void Init(void *model_data, size_t model_data_length) {
-    sess_ = std::make_unique<Ort::Session>(env_, model_data, model_data_length,
-                                           sess_opts_);
+    sess_ = CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(sess_.get(), &input_names_, &input_names_ptr_);
 
     GetOutputNames(sess_.get(), &output_names_, &output_names_ptr_);
 
+    std::vector<int64_t> x_shape =
+        sess_->GetInputTypeInfo(0).GetTensorTypeAndShapeInfo().GetShape();
+    support_batch_processing_ = !x_shape.empty() && x_shape[0] < 0;
+
     // get meta data
     Ort::ModelMetadata meta_data = sess_->GetModelMetadata();
     if (config_.debug) {
@@ -109,6 +114,8 @@ class OfflineSpeakerSegmentationPyannoteModel::Impl {
   std::vector<const char *> output_names_ptr_;
 
   OfflineSpeakerSegmentationPyannoteModelMetaData meta_data_;
+
+  bool support_batch_processing_ = false;
 };
 
 OfflineSpeakerSegmentationPyannoteModel::
@@ -130,6 +137,10 @@ OfflineSpeakerSegmentationPyannoteModel::GetModelMetaData() const {
   return impl_->GetModelMetaData();
 }
 
+bool OfflineSpeakerSegmentationPyannoteModel::SupportBatchProcessing() const {
+  return impl_->SupportBatchProcessing();
+}
+
 Ort::Value OfflineSpeakerSegmentationPyannoteModel::Forward(
     Ort::Value x) const {
   return impl_->Forward(std::move(x));
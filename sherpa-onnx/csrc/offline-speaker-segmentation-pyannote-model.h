@@ -26,6 +26,9 @@ class OfflineSpeakerSegmentationPyannoteModel {
   const OfflineSpeakerSegmentationPyannoteModelMetaData &GetModelMetaData()
       const;
 
+  // Return true if the model accepts inputs with batch size > 1
+  bool SupportBatchProcessing() const;
+
   /**
    * @param x A 3-D float tensor of shape (batch_size, 1, num_samples)
    * @return Return a float tensor of
@@ -4,6 +4,7 @@
 
 #include "sherpa-onnx/csrc/offline-speech-denoiser-gtcrn-model.h"
 
+#include <algorithm>
 #include <memory>
 #include <string>
 #include <utility>
@@ -18,10 +19,12 @@
 #include "rawfile/raw_file_manager.h"
 #endif
 
+#include "sherpa-onnx/csrc/cat.h"
 #include "sherpa-onnx/csrc/file-utils.h"
 #include "sherpa-onnx/csrc/onnx-utils.h"
 #include "sherpa-onnx/csrc/session.h"
 #include "sherpa-onnx/csrc/text-utils.h"
+#include "sherpa-onnx/csrc/unbind.h"
 
 namespace sherpa_onnx {
 
@@ -101,10 +104,54 @@ class OfflineSpeechDenoiserGtcrnModel::Impl {
     return {std::move(out[0]), std::move(next_states)};
   }
 
+  bool SupportBatchProcessing() const { return !state_batch_dims_.empty(); }
+
+  States StackStates(std::vector<States> states) {
+    if (states.size() == 1) {
+      return std::move(states[0]);
+    }
+
+    int32_t batch_size = static_cast<int32_t>(states.size());
+    int32_t num_states = static_cast<int32_t>(states[0].size());
+
+    std::vector<const Ort::Value *> buf(batch_size);
+
+    States ans;
+    ans.reserve(num_states);
+    for (int32_t i = 0; i != num_states; ++i) {
+      for (int32_t n = 0; n != batch_size; ++n) {
+        buf[n] = &states[n][i];
+      }
+      ans.push_back(Cat(allocator_, buf, state_batch_dims_[i]));
+    }
+
+    return ans;
+  }
+
+  std::vector<States> UnStackStates(States states) {
+    if (!SupportBatchProcessing()) {
+      std::vector<States> ans(1);
+      ans[0] = std::move(states);
+      return ans;
+    }
+
+    int32_t batch_size =
+        states[0].GetTensorTypeAndShapeInfo().GetShape()[state_batch_dims_[0]];
+
+    std::vector<States> ans(batch_size);
+    for (int32_t i = 0; i != static_cast<int32_t>(states.size()); ++i) {
+      auto v = Unbind(allocator_, &states[i], state_batch_dims_[i]);
+      for (int32_t n = 0; n != batch_size; ++n) {
+        ans[n].push_back(std::move(v[n]));
+      }
+    }
+
+    return ans;
+  }
+
  private:
   void Init(void *model_data, size_t model_data_length) {
-    sess_ = std::make_unique<Ort::Session>(env_, model_data, model_data_length,
-                                           sess_opts_);
+    sess_ = CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(sess_.get(), &input_names_, &input_names_ptr_);
 
@@ -157,6 +204,31 @@ class OfflineSpeechDenoiserGtcrnModel::Impl {
     SHERPA_ONNX_READ_META_DATA_VEC(meta_.tra_cache_shape, "tra_cache_shape");
     SHERPA_ONNX_READ_META_DATA_VEC(meta_.inter_cache_shape,
                                    "inter_cache_shape");
+
+    InitStateBatchDims();
+  }
+
+  // Exported models usually have a fixed batch size of 1. If the input
+  // and each state have exactly one dynamic dim, it is the batch dim.
+  void InitStateBatchDims() {
+    std::vector<int64_t> x_shape =
+        sess_->GetInputTypeInfo(0).GetTensorTypeAndShapeInfo().GetShape();
+    if (x_shape.empty() || x_shape[0] != -1) {
+      return;
+    }
+
+    std::vector<int32_t> dims;
+    for (size_t i = 1; i < input_names_.size(); ++i) {
+      std::vector<int64_t> shape =
+          sess_->GetInputTypeInfo(i).GetTensorTypeAndShapeInfo().GetShape();
+      if (std::count(shape.begin(), shape.end(), -1) != 1) {
+        return;
+      }
+      dims.push_back(static_cast<int32_t>(
+          std::find(shape.begin(), shape.end(), -1) - shape.begin()));
+    }
+
+    state_batch_dims_ = std::move(dims);
   }
 
  private:
@@ -174,6 +246,10 @@ class OfflineSpeechDenoiserGtcrnModel::Impl {
 
   std::vector<std::string> output_names_;
   std::vector<const char *> output_names_ptr_;
+
+  // state_batch_dims_[i] is the batch dim of the i-th state.
+  // Empty if the model does not support batch processing.
+  std::vector<int32_t> state_batch_dims_;
 };
 
 OfflineSpeechDenoiserGtcrnModel::~OfflineSpeechDenoiserGtcrnModel() = default;
@@ -197,6 +273,20 @@ OfflineSpeechDenoiserGtcrnModel::Run(Ort::Value x, States states) const {
   return impl_->Run(std::move(x), std::move(states));
 }
 
+bool OfflineSpeechDenoiserGtcrnModel::SupportBatchProcessing() const {
+  return impl_->SupportBatchProcessing();
+}
+
+OfflineSpeechDenoiserGtcrnModel::States
+OfflineSpeechDenoiserGtcrnModel::StackStates(std::vector<States> states) const {
+  return impl_->StackStates(std::move(states));
+}
+
+std::vector<OfflineSpeechDenoiserGtcrnModel::States>
+OfflineSpeechDenoiserGtcrnModel::UnStackStates(States states) const {
+  return impl_->UnStackStates(std::move(states));
+}
+
 const OfflineSpeechDenoiserGtcrnModelMetaData &
 OfflineSpeechDenoiserGtcrnModel::GetMetaData() const {
   return impl_->GetMetaData();
@@ -28,8 +28,31 @@ class OfflineSpeechDenoiserGtcrnModel {
 
   States GetInitStates() const;
 
+  /** Run the model on one STFT frame per stream.
+   *
+   * @param x A tensor of shape (batch_size, n_fft/2+1, 1, 2)
+   * @param states Batched states. See StackStates().
+   *
+   * @return Return the enhanced frames, of the same shape as x, and the
+   *         next states.
+   */
   std::pair<Ort::Value, States> Run(Ort::Value x, States states) const;
 
+  // Return true if the batch dim of the input and the states is dynamic,
+  // so that frames from several streams can be processed in one call.
+  bool SupportBatchProcessing() const;
+
+  /** Stack the states of several streams into a batch.
+   *
+   * It is the inverse operation of `UnStackStates`.
+   *
+   * @param states states[i] contains the states of the i-th stream.
+   */
+  States StackStates(std::vector<States> states) const;
+
+  // ans[i] contains the states of the i-th stream
+  std::vector<States> UnStackStates(States states) const;
+
   const OfflineSpeechDenoiserGtcrnModelMetaData &GetMetaData() const;
 
  private:
@@ -154,6 +154,19 @@ class OfflineStream::Impl {
     }
   }
 
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) {
+    // If normalize_samples is false, the extractor expects samples in the
+    // range [-32768, 32767], which is exactly what we are given
+    float scale = config_.normalize_samples ? 1.0f / 32768 : 1.0f;
+
+    std::vector<float> buf(n);
+    for (int32_t i = 0; i != n; ++i) {
+      buf[i] = waveform[i] * scale;
+    }
+    AcceptWaveformImpl(sampling_rate, buf.data(), n);
+  }
+
   void AcceptWaveformImpl(int32_t sampling_rate, const float *waveform,
                           int32_t n) {
     if (sampling_rate != config_.sampling_rate) {
@@ -214,6 +227,16 @@ class OfflineStream::Impl {
     return mfcc_ ? mfcc_opts_.num_ceps : opts_.mel_opts.num_bins;
   }
 
+  int32_t NumFramesReady() const {
+    if (is_moonshine_) {
+      return samples_.size();
+    }
+
+    return fbank_  ? fbank_->NumFramesReady()
+           : mfcc_ ? mfcc_->NumFramesReady()
+                   : whisper_fbank_->NumFramesReady();
+  }
+
   std::vector<float> GetFrames() const {
     if (is_moonshine_) {
       return samples_;
@@ -346,8 +369,17 @@ void OfflineStream::AcceptWaveform(int32_t sampling_rate, const float *waveform,
   impl_->AcceptWaveform(sampling_rate, waveform, n);
 }
 
+void OfflineStream::AcceptWaveform(int32_t sampling_rate,
+                                   const int16_t *waveform, int32_t n) const {
+  impl_->AcceptWaveform(sampling_rate, waveform, n);
+}
+
 int32_t OfflineStream::FeatureDim() const { return impl_->FeatureDim(); }
 
+int32_t OfflineStream::NumFramesReady() const {
+  return impl_->NumFramesReady();
+}
+
 std::vector<float> OfflineStream::GetFrames() const {
   return impl_->GetFrames();
 }
@@ -40,6 +40,24 @@ struct OfflineRecognitionResult {
 
   std::vector<int32_t> words;
 
+  /// Scores of each token. They are empty if the decoding method does not
+  /// provide them. Currently, only CTC decoding with an HLG, HL, or H graph
+  /// provides them.
+  ///
+  /// ys_probs[i] is the log-prob from the model and graph_scores[i] is the
+  /// score from the graph for tokens[i].
+  std::vector<float> ys_probs;
+  std::vector<float> graph_scores;
+
+  /// scale * (LM log prob) of the tokens. It is set only if the N best
+  /// paths from CTC decoding with a graph are rescored with an LM.
+  float lm_log_prob = 0;
+
+  /// The N best results, best first. It is not empty only for CTC decoding
+  /// with an HLG, HL, or H graph and ctc_fst_decoder_config.nbest > 1.
+  /// The fields above are those of nbest[0].
+  std::vector<OfflineRecognitionResult> nbest;
+
   std::string AsJsonString() const;
 };
 
@@ -77,12 +95,25 @@ class OfflineStream {
   void AcceptWaveform(int32_t sampling_rate, const float *waveform,
                       int32_t n) const;
 
+  /**
+     Same as the above one except that the input is 16-bit PCM, i.e., in
+     the range [-32768, 32767]. The samples are scaled inside.
+   */
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) const;
+
   /// Return feature dim of this extractor.
   ///
   /// Note: if it is Moonshine, then it returns the number of audio samples
   /// currently received.
   int32_t FeatureDim() const;
 
+  // Return the number of feature frames of this stream.
+  //
+  // Note: if it is Moonshine, then it returns the number of audio samples
+  // currently received.
+  int32_t NumFramesReady() const;
+
   // Get all the feature frames of this stream in a 1-D array, which is
   // flattened from a 2-D array of shape (num_frames, feat_dim).
   std::vector<float> GetFrames() const;
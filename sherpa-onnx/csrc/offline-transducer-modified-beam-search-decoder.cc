@@ -83,10 +83,13 @@ OfflineTransducerModifiedBeamSearchDecoder::Decode(
     cur.clear();
     cur.reserve(n);
 
-    auto decoder_input = model_->BuildDecoderInput(prev, num_hyps);
     // decoder_input shape: (num_hyps, context_size)
-
-    auto decoder_out = model_->RunDecoder(std::move(decoder_input));
+    // The decoder is run only for contexts that are not in the cache
+    auto decoder_out = decoder_out_cache_.Run(
+        model_->Allocator(), prev, context_size,
+        [this](Ort::Value decoder_input) {
+          return model_->RunDecoder(std::move(decoder_input));
+        });
     // decoder_out is (num_hyps, joiner_dim)
 
     cur_encoder_out =
@@ -7,6 +7,7 @@
 
 #include <vector>
 
+#include "sherpa-onnx/csrc/decoder-out-cache.h"
 #include "sherpa-onnx/csrc/offline-lm.h"
 #include "sherpa-onnx/csrc/offline-transducer-decoder.h"
 #include "sherpa-onnx/csrc/offline-transducer-model.h"
@@ -40,6 +41,9 @@ class OfflineTransducerModifiedBeamSearchDecoder
   float lm_scale_;  // used only when lm_ is not nullptr
   int32_t unk_id_;
   float blank_penalty_;
+
+  // Shared by all hyps of all streams
+  DecoderOutCache decoder_out_cache_;
 };
 
 }  // namespace sherpa_onnx
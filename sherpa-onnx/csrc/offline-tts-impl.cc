@@ -4,7 +4,15 @@
 
 #include "sherpa-onnx/csrc/offline-tts-impl.h"
 
+#include <algorithm>
+#include <condition_variable>  // NOLINT
+#include <deque>
+#include <limits>
 #include <memory>
+#include <mutex>  // NOLINT
+#include <string>
+#include <thread>  // NOLINT
+#include <utility>
 #include <vector>
 
 #if __ANDROID_API__ >= 9
@@ -16,10 +24,12 @@
 #include "rawfile/raw_file_manager.h"
 #endif
 
+#include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/offline-tts-kitten-impl.h"
 #include "sherpa-onnx/csrc/offline-tts-kokoro-impl.h"
 #include "sherpa-onnx/csrc/offline-tts-matcha-impl.h"
 #include "sherpa-onnx/csrc/offline-tts-vits-impl.h"
+#include "sherpa-onnx/csrc/text-utils.h"
 
 namespace sherpa_onnx {
 
@@ -35,6 +45,274 @@ std::vector<int64_t> OfflineTtsImpl::AddBlank(const std::vector<int64_t> &x,
   return buffer;
 }
 
+std::shared_ptr<const std::vector<TokenIDs>>
+OfflineTtsImpl::ConvertSentenceToTokenIds(const OfflineTtsFrontend &frontend,
+                                          const std::string &sentence,
+                                          const std::string &voice) const {
+  if (frontend_cache_.Capacity() <= 0) {
+    return std::make_shared<const std::vector<TokenIDs>>(
+        frontend.ConvertTextToTokenIds(sentence, voice));
+  }
+
+  std::string key = voice;
+  key.push_back('\0');
+  key.append(sentence);
+
+  auto ans = frontend_cache_.Get(key);
+  if (ans) {
+    return ans;
+  }
+
+  ans = std::make_shared<const std::vector<TokenIDs>>(
+      frontend.ConvertTextToTokenIds(sentence, voice));
+  if (!ans->empty()) {
+    frontend_cache_.Put(key, ans);
+  }
+
+  return ans;
+}
+
+namespace {
+
+// Token IDs that are produced by the frontend and wait for synthesis.
+// Each TokenIDs is a sentence of the model.
+class TokenIdsQueue {
+ public:
+  // @param capacity Push() waits while the queue has at least so many
+  //                 sentences.
+  // @param num_texts Number of texts that are passed to the frontend.
+  TokenIdsQueue(int32_t capacity, int32_t num_texts)
+      : capacity_(capacity), num_texts_(num_texts) {}
+
+  // Add the token IDs of a text. Return false if the consumer has stopped.
+  bool Push(const std::vector<TokenIDs> &token_ids) {
+    std::unique_lock<std::mutex> lock(mutex_);
+    not_full_.wait(lock, [this]() {
+      return stopped_ || static_cast<int32_t>(queue_.size()) < capacity_;
+    });
+
+    if (stopped_) {
+      return false;
+    }
+
+    for (const auto &t : token_ids) {
+      if (!t.tokens.empty()) {
+        queue_.push_back(t);
+        ++num_produced_;
+      }
+    }
+    ++num_texts_done_;
+
+    not_empty_.notify_all();
+    return true;
+  }
+
+  // Called by the producer after all texts are pushed
+  void Finish() {
+    std::lock_guard<std::mutex> lock(mutex_);
+    finished_ = true;
+    not_empty_.notify_all();
+  }
+
+  // Called by the consumer if it does not need more sentences
+  void Stop() {
+    std::lock_guard<std::mutex> lock(mutex_);
+    stopped_ = true;
+    not_full_.notify_all();
+  }
+
+  // Wait until n sentences are available or the producer has finished.
+  // Return an empty vector if there are no more sentences.
+  std::vector<TokenIDs> Pop(int32_t n) {
+    std::unique_lock<std::mutex> lock(mutex_);
+    not_empty_.wait(lock, [this, n]() {
+      return finished_ || static_cast<int32_t>(queue_.size()) >= n;
+    });
+
+    n = std::min(n, static_cast<int32_t>(queue_.size()));
+    std::vector<TokenIDs> ans(std::make_move_iterator(queue_.begin()),
+                              std::make_move_iterator(queue_.begin() + n));
+    queue_.erase(queue_.begin(), queue_.begin() + n);
+
+    not_full_.notify_all();
+    return ans;
+  }
+
+  // Return the fraction of sentences that have been synthesized. The total
+  // number of sentences is estimated from the texts that have been
+  // converted until the producer has finished.
+  float Progress(int32_t num_consumed) const {
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (num_produced_ == 0) {
+      return 0;
+    }
+
+    float total = num_produced_;
+    if (!finished_ && num_texts_done_ > 0) {
+      total = total * num_texts_ / num_texts_done_;
+    }
+
+    return std::min(num_consumed / total, 1.0f);
+  }
+
+ private:
+  int32_t capacity_;
+  int32_t num_texts_;
+
+  mutable std::mutex mutex_;
+  std::condition_variable not_full_;
+  std::condition_variable not_empty_;
+
+  std::deque<TokenIDs> queue_;
+  int32_t num_produced_ = 0;
+  int32_t num_texts_done_ = 0;
+  bool finished_ = false;
+  bool stopped_ = false;
+};
+
+}  // namespace
+
+GeneratedAudio OfflineTtsImpl::Synthesize(
+    const OfflineTtsFrontend &frontend, const std::string &text,
+    const std::string &voice, int32_t batch_size,
+    const std::function<GeneratedAudio(std::vector<TokenIDs>)> &process,
+    GeneratedAudioCallback callback) const {
+  // SplitSentences() may split where the frontend does not, e.g., after
+  // "Mr.", which changes the generated audio. So the text is only split,
+  // to cache sentences separately, if the cache is enabled.
+  std::vector<std::string> texts;
+  if (frontend_cache_.Capacity() > 0) {
+    texts = SplitSentences(text);
+  } else {
+    texts.push_back(text);
+  }
+  int32_t num_texts = static_cast<int32_t>(texts.size());
+
+  if (batch_size <= 0) {
+    batch_size = std::numeric_limits<int32_t>::max();
+  }
+
+  // Batches are synthesized in rounds. Batches of a round are synthesized
+  // in parallel if this is not called from a loop of the pool, e.g., from
+  // OfflineTts::GenerateBatch().
+  bool nested = pool_->InParallelFor();
+  int32_t num_workers = nested ? 1 : pool_->NumThreads();
+
+  // The frontend runs in a separate thread, so that it converts the
+  // following texts while the current batches are synthesized. It is not
+  // used if all sentences are synthesized in a single batch.
+  bool overlap = !nested && num_texts > 1 &&
+                 batch_size != std::numeric_limits<int32_t>::max();
+
+  int32_t capacity = std::numeric_limits<int32_t>::max();
+  if (overlap) {
+    capacity = static_cast<int32_t>(std::min<int64_t>(
+        2 * static_cast<int64_t>(num_workers) * batch_size, capacity));
+  }
+
+  TokenIdsQueue queue(capacity, num_texts);
+
+  auto produce = [&]() {
+    for (const auto &t : texts) {
+      if (!queue.Push(*ConvertSentenceToTokenIds(frontend, t, voice))) {
+        return;
+      }
+    }
+    queue.Finish();
+  };
+
+  std::thread producer;
+  if (overlap) {
+    producer = std::thread(produce);
+  } else {
+    produce();
+  }
+
+  GeneratedAudio ans;
+  int32_t num_consumed = 0;
+  int32_t num_batches = 0;
+
+  std::vector<std::vector<TokenIDs>> batches;
+  std::vector<GeneratedAudio> results;
+  std::vector<int32_t> sizes;
+
+  bool stopped = false;
+  while (!stopped) {
+    batches.clear();
+    for (int32_t i = 0; i != num_workers; ++i) {
+      auto batch = queue.Pop(batch_size);
+      if (batch.empty()) {
+        break;
+      }
+      batches.push_back(std::move(batch));
+    }
+
+    if (batches.empty()) {
+      break;
+    }
+
+    int32_t n = static_cast<int32_t>(batches.size());
+    num_batches += n;
+
+    sizes.resize(n);
+    results.resize(n);
+    for (int32_t i = 0; i != n; ++i) {
+      sizes[i] = static_cast<int32_t>(batches[i].size());
+    }
+
+    pool_->ParallelFor(
+        n, [&](int32_t i) { results[i] = process(std::move(batches[i])); });
+
+    for (int32_t i = 0; i != n; ++i) {
+      const auto &audio = results[i];
+      num_consumed += sizes[i];
+
+      ans.sample_rate = audio.sample_rate;
+      ans.samples.insert(ans.samples.end(), audio.samples.begin(),
+                         audio.samples.end());
+
+      // Caution(fangjun): audio is freed when the callback returns, so users
+      // should copy the data if they want to access the data after
+      // the callback returns to avoid segmentation fault.
+      if (callback && !callback(audio.samples.data(), audio.samples.size(),
+                                queue.Progress(num_consumed))) {
+        stopped = true;
+        break;
+      }
+    }
+  }
+
+  queue.Stop();
+  if (producer.joinable()) {
+    producer.join();
+  }
+
+  if (num_batches == 0) {
+#if __OHOS__
+    SHERPA_ONNX_LOGE("Failed to convert '%{public}s' to token IDs",
+                     text.c_str());
+#else
+    SHERPA_ONNX_LOGE("Failed to convert '%s' to token IDs", text.c_str());
+#endif
+    return {};
+  }
+
+  if (debug_) {
+#if __OHOS__
+    SHERPA_ONNX_LOGE(
+        "Number of sentences: %{public}d. Number of batches: %{public}d. "
+        "Batch size: %{public}d",
+        num_consumed, num_batches, batch_size);
+#else
+    SHERPA_ONNX_LOGE(
+        "Number of sentences: %d. Number of batches: %d. Batch size: %d",
+        num_consumed, num_batches, batch_size);
+#endif
+  }
+
+  return ans;
+}
+
 std::unique_ptr<OfflineTtsImpl> OfflineTtsImpl::Create(
     const OfflineTtsConfig &config) {
   if (!config.model.vits.model.empty()) {
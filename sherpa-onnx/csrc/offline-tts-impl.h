@@ -5,16 +5,25 @@
 #ifndef SHERPA_ONNX_CSRC_OFFLINE_TTS_IMPL_H_
 #define SHERPA_ONNX_CSRC_OFFLINE_TTS_IMPL_H_
 
+#include <functional>
 #include <memory>
 #include <string>
 #include <vector>
 
+#include "sherpa-onnx/csrc/lru-cache.h"
+#include "sherpa-onnx/csrc/offline-tts-frontend.h"
 #include "sherpa-onnx/csrc/offline-tts.h"
+#include "sherpa-onnx/csrc/thread-pool.h"
 
 namespace sherpa_onnx {
 
 class OfflineTtsImpl {
  public:
+  explicit OfflineTtsImpl(const OfflineTtsConfig &config)
+      : frontend_cache_(config.frontend_cache_size),
+        pool_(std::make_unique<ThreadPool>(config.num_workers)),
+        debug_(config.model.debug) {}
+
   virtual ~OfflineTtsImpl() = default;
 
   static std::unique_ptr<OfflineTtsImpl> Create(const OfflineTtsConfig &config);
@@ -36,6 +45,66 @@ class OfflineTtsImpl {
 
   std::vector<int64_t> AddBlank(const std::vector<int64_t> &x,
                                 int32_t blank_id = 0) const;
+
+  LruCacheStats FrontendCacheStats() const { return frontend_cache_.Stats(); }
+
+  void ClearFrontendCache() const { frontend_cache_.Clear(); }
+
+  // It has config.num_workers threads. It is shared by all requests of
+  // OfflineTts::GenerateBatch() and all batches of a long text.
+  ThreadPool *GetThreadPool() const { return pool_.get(); }
+
+ protected:
+  /** Convert the text to token IDs and synthesize them batch by batch.
+   *
+   * If the frontend cache is enabled, see
+   * OfflineTtsConfig::frontend_cache_size, the text is split into sentences
+   * with SplitSentences(). Each of them is passed to the frontend separately
+   * and the result is cached, so that sentences shared by different texts
+   * are converted only once. Otherwise, the whole text is passed to the
+   * frontend, as before.
+   *
+   * If the text is split and there is more than one batch, the frontend
+   * runs in a separate thread and converts the following sentences while
+   * the current batches are synthesized.
+   *
+   * Up to config.num_workers batches are synthesized at the same time with
+   * the thread pool. If it is called from an iteration of the pool, e.g.,
+   * for a request of OfflineTts::GenerateBatch(), the frontend and batches
+   * run one by one in the current thread.
+   *
+   * @param frontend The frontend of the model.
+   * @param text The normalized text.
+   * @param voice It is passed to the frontend.
+   * @param batch_size Max number of sentences, i.e., TokenIDs from the
+   *                   frontend, in a batch. If it is <= 0, all sentences
+   *                   are in a single batch.
+   * @param process process(token_ids) returns the audio of a batch. If
+   *                config.num_workers > 1, it is called from multiple
+   *                threads at the same time.
+   * @param callback If not empty, it is called in the current thread with
+   *                 the audio of each batch in order. If it returns 0,
+   *                 the remaining batches are not synthesized.
+   * @return Return the audio of all processed batches.
+   */
+  GeneratedAudio Synthesize(
+      const OfflineTtsFrontend &frontend, const std::string &text,
+      const std::string &voice, int32_t batch_size,
+      const std::function<GeneratedAudio(std::vector<TokenIDs>)> &process,
+      GeneratedAudioCallback callback) const;
+
+ private:
+  std::shared_ptr<const std::vector<TokenIDs>> ConvertSentenceToTokenIds(
+      const OfflineTtsFrontend &frontend, const std::string &sentence,
+      const std::string &voice) const;
+
+ private:
+  // Key: voice and sentence
+  mutable LruCache<const std::vector<TokenIDs>> frontend_cache_;
+
+  std::unique_ptr<ThreadPool> pool_;
+
+  bool debug_ = false;
 };
 
 }  // namespace sherpa_onnx
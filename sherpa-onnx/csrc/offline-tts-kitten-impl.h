@@ -6,6 +6,7 @@
 
 #include <iomanip>
 #include <ios>
+#include <iterator>
 #include <memory>
 #include <string>
 #include <strstream>
@@ -29,7 +30,8 @@ namespace sherpa_onnx {
 class OfflineTtsKittenImpl : public OfflineTtsImpl {
  public:
   explicit OfflineTtsKittenImpl(const OfflineTtsConfig &config)
-      : config_(config),
+      : OfflineTtsImpl(config),
+        config_(config),
         model_(std::make_unique<OfflineTtsKittenModel>(config.model)) {
     InitFrontend();
 
@@ -85,7 +87,8 @@ class OfflineTtsKittenImpl : public OfflineTtsImpl {
 
   template <typename Manager>
   OfflineTtsKittenImpl(Manager *mgr, const OfflineTtsConfig &config)
-      : config_(config),
+      : OfflineTtsImpl(config),
+        config_(config),
         model_(std::make_unique<OfflineTtsKittenModel>(mgr, config.model)) {
     InitFrontend(mgr);
 
@@ -219,30 +222,6 @@ class OfflineTtsKittenImpl : public OfflineTtsImpl {
       }
     }
 
-    std::vector<TokenIDs> token_ids =
-        frontend_->ConvertTextToTokenIds(text, meta_data.voice);
-
-    if (token_ids.empty() ||
-        (token_ids.size() == 1 && token_ids[0].tokens.empty())) {
-#if __OHOS__
-      SHERPA_ONNX_LOGE("Failed to convert '%{public}s' to token IDs",
-                       text.c_str());
-#else
-      SHERPA_ONNX_LOGE("Failed to convert '%s' to token IDs", text.c_str());
-#endif
-      return {};
-    }
-
-    std::vector<std::vector<int64_t>> x;
-
-    x.reserve(token_ids.size());
-
-    for (auto &i : token_ids) {
-      x.push_back(std::move(i.tokens));
-    }
-
-    int32_t x_size = static_cast<int32_t>(x.size());
-
     if (config_.max_num_sentences != 1) {
 #if __OHOS__
       SHERPA_ONNX_LOGE(
@@ -256,74 +235,23 @@ class OfflineTtsKittenImpl : public OfflineTtsImpl {
 #endif
     }
 
-    // the input text is too long, we process sentences within it in batches
-    // to avoid OOM. Batch size is config_.max_num_sentences
-    std::vector<std::vector<int64_t>> batch_x;
+    const std::string &voice = meta_data.voice;
 
-    int32_t batch_size = 1;
-    batch_x.reserve(batch_size);
-    int32_t num_batches = x_size / batch_size;
+    // Sentences are synthesized one by one
+    return Synthesize(
+        *frontend_, text, voice, 1,
+        [&](std::vector<TokenIDs> token_ids) {
+          std::vector<std::vector<int64_t>> x;
 
-    if (config_.model.debug) {
-#if __OHOS__
-      SHERPA_ONNX_LOGE(
-          "Split it into %{public}d batches. batch size: "
-          "%{public}d. Number of sentences: %{public}d",
-          num_batches, batch_size, x_size);
-#else
-      SHERPA_ONNX_LOGE(
-          "Split it into %d batches. batch size: %d. Number "
-          "of sentences: %d",
-          num_batches, batch_size, x_size);
-#endif
-    }
-
-    GeneratedAudio ans;
-
-    int32_t should_continue = 1;
-
-    int32_t k = 0;
-
-    for (int32_t b = 0; b != num_batches && should_continue; ++b) {
-      batch_x.clear();
-      for (int32_t i = 0; i != batch_size; ++i, ++k) {
-        batch_x.push_back(std::move(x[k]));
-      }
-
-      auto audio = Process(batch_x, sid, speed);
-      ans.sample_rate = audio.sample_rate;
-      ans.samples.insert(ans.samples.end(), audio.samples.begin(),
-                         audio.samples.end());
-      if (callback) {
-        should_continue = callback(audio.samples.data(), audio.samples.size(),
-                                   (b + 1) * 1.0 / num_batches);
-        // Caution(fangjun): audio is freed when the callback returns, so users
-        // should copy the data if they want to access the data after
-        // the callback returns to avoid segmentation fault.
-      }
-    }
-
-    batch_x.clear();
-    while (k < static_cast<int32_t>(x.size()) && should_continue) {
-      batch_x.push_back(std::move(x[k]));
-
-      ++k;
-    }
+          x.reserve(token_ids.size());
 
-    if (!batch_x.empty()) {
-      auto audio = Process(batch_x, sid, speed);
-      ans.sample_rate = audio.sample_rate;
-      ans.samples.insert(ans.samples.end(), audio.samples.begin(),
-                         audio.samples.end());
-      if (callback) {
-        callback(audio.samples.data(), audio.samples.size(), 1.0);
-        // Caution(fangjun): audio is freed when the callback returns, so users
-        // should copy the data if they want to access the data after
-        // the callback returns to avoid segmentation fault.
-      }
-    }
+          for (auto &i : token_ids) {
+            x.push_back(std::move(i.tokens));
+          }
 
-    return ans;
+          return Process(x, sid, speed);
+        },
+        std::move(callback));
   }
 
  private:
@@ -104,8 +104,7 @@ class OfflineTtsKokoroModel::Impl {
  private:
   void Init(void *model_data, size_t model_data_length, const char *voices_data,
             size_t voices_data_length) {
-    sess_ = std::make_unique<Ort::Session>(env_, model_data, model_data_length,
-                                           sess_opts_);
+    sess_ = CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(sess_.get(), &input_names_, &input_names_ptr_);
 
@@ -4,6 +4,7 @@
 #ifndef SHERPA_ONNX_CSRC_OFFLINE_TTS_MATCHA_IMPL_H_
 #define SHERPA_ONNX_CSRC_OFFLINE_TTS_MATCHA_IMPL_H_
 
+#include <iterator>
 #include <memory>
 #include <string>
 #include <strstream>
@@ -31,7 +32,8 @@ namespace sherpa_onnx {
 class OfflineTtsMatchaImpl : public OfflineTtsImpl {
  public:
   explicit OfflineTtsMatchaImpl(const OfflineTtsConfig &config)
-      : config_(config),
+      : OfflineTtsImpl(config),
+        config_(config),
         model_(std::make_unique<OfflineTtsMatchaModel>(config.model)),
         vocoder_(Vocoder::Create(config.model)) {
     InitFrontend();
@@ -88,7 +90,8 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
 
   template <typename Manager>
   OfflineTtsMatchaImpl(Manager *mgr, const OfflineTtsConfig &config)
-      : config_(config),
+      : OfflineTtsImpl(config),
+        config_(config),
         model_(std::make_unique<OfflineTtsMatchaModel>(mgr, config.model)),
         vocoder_(Vocoder::Create(mgr, config.model)) {
     InitFrontend(mgr);
@@ -209,110 +212,22 @@ class OfflineTtsMatchaImpl : public OfflineTtsImpl {
       }
     }
 
-    std::vector<TokenIDs> token_ids =
-        frontend_->ConvertTextToTokenIds(text, meta_data.voice);
-
-    if (token_ids.empty() ||
-        (token_ids.size() == 1 && token_ids[0].tokens.empty())) {
-#if __OHOS__
-      SHERPA_ONNX_LOGE("Failed to convert '%{public}s' to token IDs",
-                       text.c_str());
-#else
-      SHERPA_ONNX_LOGE("Failed to convert '%s' to token IDs", text.c_str());
-#endif
-      return {};
-    }
-
-    std::vector<std::vector<int64_t>> x;
-
-    x.reserve(token_ids.size());
-
-    for (auto &i : token_ids) {
-      x.push_back(std::move(i.tokens));
-    }
-
-    for (auto &k : x) {
-      k = AddBlank(k, meta_data.pad_id);
-    }
-
-    int32_t x_size = static_cast<int32_t>(x.size());
-
-    if (config_.max_num_sentences <= 0 || x_size <= config_.max_num_sentences) {
-      auto ans = Process(x, sid, speed);
-      if (callback) {
-        callback(ans.samples.data(), ans.samples.size(), 1.0);
-      }
-      return ans;
-    }
-
-    // the input text is too long, we process sentences within it in batches
+    // If the text is too long, we process sentences within it in batches
     // to avoid OOM. Batch size is config_.max_num_sentences
-    std::vector<std::vector<int64_t>> batch_x;
+    return Synthesize(
+        *frontend_, text, meta_data.voice, config_.max_num_sentences,
+        [&](std::vector<TokenIDs> token_ids) {
+          std::vector<std::vector<int64_t>> x;
 
-    int32_t batch_size = config_.max_num_sentences;
-    batch_x.reserve(config_.max_num_sentences);
-    int32_t num_batches = x_size / batch_size;
+          x.reserve(token_ids.size());
 
-    if (config_.model.debug) {
-#if __OHOS__
-      SHERPA_ONNX_LOGE(
-          "Text is too long. Split it into %{public}d batches. batch size: "
-          "%{public}d. Number of sentences: %{public}d",
-          num_batches, batch_size, x_size);
-#else
-      SHERPA_ONNX_LOGE(
-          "Text is too long. Split it into %d batches. batch size: %d. Number "
-          "of sentences: %d",
-          num_batches, batch_size, x_size);
-#endif
-    }
-
-    GeneratedAudio ans;
+          for (auto &i : token_ids) {
+            x.push_back(AddBlank(i.tokens, meta_data.pad_id));
+          }
 
-    int32_t should_continue = 1;
-
-    int32_t k = 0;
-
-    for (int32_t b = 0; b != num_batches && should_continue; ++b) {
-      batch_x.clear();
-      for (int32_t i = 0; i != batch_size; ++i, ++k) {
-        batch_x.push_back(std::move(x[k]));
-      }
-
-      auto audio = Process(batch_x, sid, speed);
-      ans.sample_rate = audio.sample_rate;
-      ans.samples.insert(ans.samples.end(), audio.samples.begin(),
-                         audio.samples.end());
-      if (callback) {
-        should_continue = callback(audio.samples.data(), audio.samples.size(),
-                                   (b + 1) * 1.0 / num_batches);
-        // Caution(fangjun): audio is freed when the callback returns, so users
-        // should copy the data if they want to access the data after
-        // the callback returns to avoid segmentation fault.
-      }
-    }
-
-    batch_x.clear();
-    while (k < static_cast<int32_t>(x.size()) && should_continue) {
-      batch_x.push_back(std::move(x[k]));
-
-      ++k;
-    }
-
-    if (!batch_x.empty()) {
-      auto audio = Process(batch_x, sid, speed);
-      ans.sample_rate = audio.sample_rate;
-      ans.samples.insert(ans.samples.end(), audio.samples.begin(),
-                         audio.samples.end());
-      if (callback) {
-        callback(audio.samples.data(), audio.samples.size(), 1.0);
-        // Caution(fangjun): audio is freed when the callback returns, so users
-        // should copy the data if they want to access the data after
-        // the callback returns to avoid segmentation fault.
-      }
-    }
-
-    return ans;
+          return Process(x, sid, speed);
+        },
+        std::move(callback));
   }
 
  private:
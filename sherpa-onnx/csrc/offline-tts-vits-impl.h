@@ -4,6 +4,7 @@
 #ifndef SHERPA_ONNX_CSRC_OFFLINE_TTS_VITS_IMPL_H_
 #define SHERPA_ONNX_CSRC_OFFLINE_TTS_VITS_IMPL_H_
 
+#include <iterator>
 #include <memory>
 #include <string>
 #include <strstream>
@@ -30,7 +31,8 @@ namespace sherpa_onnx {
 class OfflineTtsVitsImpl : public OfflineTtsImpl {
  public:
   explicit OfflineTtsVitsImpl(const OfflineTtsConfig &config)
-      : config_(config),
+      : OfflineTtsImpl(config),
+        config_(config),
         model_(std::make_unique<OfflineTtsVitsModel>(config.model)) {
     InitFrontend();
 
@@ -86,7 +88,8 @@ class OfflineTtsVitsImpl : public OfflineTtsImpl {
 
   template <typename Manager>
   OfflineTtsVitsImpl(Manager *mgr, const OfflineTtsConfig &config)
-      : config_(config),
+      : OfflineTtsImpl(config),
+        config_(config),
         model_(std::make_unique<OfflineTtsVitsModel>(mgr, config.model)) {
     InitFrontend(mgr);
 
@@ -206,132 +209,45 @@ class OfflineTtsVitsImpl : public OfflineTtsImpl {
       }
     }
 
-    std::vector<TokenIDs> token_ids =
-        frontend_->ConvertTextToTokenIds(text, meta_data.voice);
-
-    if (token_ids.empty() ||
-        (token_ids.size() == 1 && token_ids[0].tokens.empty())) {
-      SHERPA_ONNX_LOGE("Failed to convert %s to token IDs", text.c_str());
-      return {};
-    }
-
-    std::vector<std::vector<int64_t>> x;
-    std::vector<std::vector<int64_t>> tones;
-
-    x.reserve(token_ids.size());
-
-    for (auto &i : token_ids) {
-      x.push_back(std::move(i.tokens));
-    }
-
-    if (!token_ids[0].tones.empty()) {
-      tones.reserve(token_ids.size());
-      for (auto &i : token_ids) {
-        tones.push_back(std::move(i.tones));
-      }
-    }
-
     // TODO(fangjun): add blank inside the frontend, not here
-    if (meta_data.add_blank && config_.model.vits.data_dir.empty() &&
-        meta_data.frontend != "characters") {
-      for (auto &k : x) {
-        k = AddBlank(k);
-      }
-
-      for (auto &k : tones) {
-        k = AddBlank(k);
-      }
-    }
-
-    int32_t x_size = static_cast<int32_t>(x.size());
-
-    if (config_.max_num_sentences <= 0 || x_size <= config_.max_num_sentences) {
-      auto ans = Process(x, tones, sid, speed);
-      if (callback) {
-        callback(ans.samples.data(), ans.samples.size(), 1.0);
-      }
-      return ans;
-    }
+    bool add_blank = meta_data.add_blank &&
+                     config_.model.vits.data_dir.empty() &&
+                     meta_data.frontend != "characters";
 
-    // the input text is too long, we process sentences within it in batches
+    // If the text is too long, we process sentences within it in batches
     // to avoid OOM. Batch size is config_.max_num_sentences
-    std::vector<std::vector<int64_t>> batch_x;
-    std::vector<std::vector<int64_t>> batch_tones;
-
-    int32_t batch_size = config_.max_num_sentences;
-    batch_x.reserve(config_.max_num_sentences);
-    batch_tones.reserve(config_.max_num_sentences);
-    int32_t num_batches = x_size / batch_size;
-
-    if (config_.model.debug) {
-#if __OHOS__
-      SHERPA_ONNX_LOGE(
-          "Text is too long. Split it into %{public}d batches. batch size: "
-          "%{public}d. Number of sentences: %{public}d",
-          num_batches, batch_size, x_size);
-#else
-      SHERPA_ONNX_LOGE(
-          "Text is too long. Split it into %d batches. batch size: %d. Number "
-          "of sentences: %d",
-          num_batches, batch_size, x_size);
-#endif
-    }
-
-    GeneratedAudio ans;
-
-    int32_t should_continue = 1;
-
-    int32_t k = 0;
-
-    for (int32_t b = 0; b != num_batches && should_continue; ++b) {
-      batch_x.clear();
-      batch_tones.clear();
-      for (int32_t i = 0; i != batch_size; ++i, ++k) {
-        batch_x.push_back(std::move(x[k]));
-
-        if (!tones.empty()) {
-          batch_tones.push_back(std::move(tones[k]));
-        }
-      }
-
-      auto audio = Process(batch_x, batch_tones, sid, speed);
-      ans.sample_rate = audio.sample_rate;
-      ans.samples.insert(ans.samples.end(), audio.samples.begin(),
-                         audio.samples.end());
-      if (callback) {
-        should_continue = callback(audio.samples.data(), audio.samples.size(),
-                                   (b + 1) * 1.0 / num_batches);
-        // Caution(fangjun): audio is freed when the callback returns, so users
-        // should copy the data if they want to access the data after
-        // the callback returns to avoid segmentation fault.
-      }
-    }
-
-    batch_x.clear();
-    batch_tones.clear();
-    while (k < static_cast<int32_t>(x.size()) && should_continue) {
-      batch_x.push_back(std::move(x[k]));
-      if (!tones.empty()) {
-        batch_tones.push_back(std::move(tones[k]));
-      }
-
-      ++k;
-    }
-
-    if (!batch_x.empty()) {
-      auto audio = Process(batch_x, batch_tones, sid, speed);
-      ans.sample_rate = audio.sample_rate;
-      ans.samples.insert(ans.samples.end(), audio.samples.begin(),
-                         audio.samples.end());
-      if (callback) {
-        callback(audio.samples.data(), audio.samples.size(), 1.0);
-        // Caution(fangjun): audio is freed when the callback returns, so users
-        // should copy the data if they want to access the data after
-        // the callback returns to avoid segmentation fault.
-      }
-    }
-
-    return ans;
+    return Synthesize(
+        *frontend_, text, meta_data.voice, config_.max_num_sentences,
+        [&](std::vector<TokenIDs> token_ids) {
+          std::vector<std::vector<int64_t>> x;
+          std::vector<std::vector<int64_t>> tones;
+
+          x.reserve(token_ids.size());
+
+          for (auto &i : token_ids) {
+            x.push_back(std::move(i.tokens));
+          }
+
+          if (!token_ids[0].tones.empty()) {
+            tones.reserve(token_ids.size());
+            for (auto &i : token_ids) {
+              tones.push_back(std::move(i.tones));
+            }
+          }
+
+          if (add_blank) {
+            for (auto &k : x) {
+              k = AddBlank(k);
+            }
+
+            for (auto &k : tones) {
+              k = AddBlank(k);
+            }
+          }
+
+          return Process(x, tones, sid, speed);
+        },
+        std::move(callback));
   }
 
  private:
@@ -4,9 +4,12 @@
 
 #include "sherpa-onnx/csrc/offline-tts.h"
 
+#include <algorithm>
 #include <cmath>
+#include <memory>
 #include <string>
 #include <utility>
+#include <vector>
 
 #if __ANDROID_API__ >= 9
 #include "android/asset_manager.h"
@@ -115,6 +118,21 @@ void OfflineTtsConfig::Register(ParseOptions *po) {
   po->Register("tts-silence-scale", &silence_scale,
                "Duration of the pause is scaled by this number. So a smaller "
                "value leads to a shorter pause.");
+
+  po->Register("tts-num-workers", &num_workers,
+               "Number of batches of sentences, or requests of a batch, that "
+               "are synthesized in parallel. Audio of the first batch is "
+               "available before the whole text is synthesized. Each worker "
+               "uses --num-threads threads.");
+
+  po->Register("tts-frontend-cache-size", &frontend_cache_size,
+               "Max number of normalized sentences whose token IDs are cached. "
+               "If it is positive, the text is split into sentences before "
+               "the frontend. 0 disables the cache.");
+
+  po->Register("tts-audio-cache-size", &audio_cache_size,
+               "Max number of generated audios that are cached. The key is "
+               "(text, sid, speed). 0 disables the cache.");
 }
 
 bool OfflineTtsConfig::Validate() const {
@@ -145,6 +163,24 @@ bool OfflineTtsConfig::Validate() const {
     return false;
   }
 
+  if (num_workers < 1) {
+    SHERPA_ONNX_LOGE("--tts-num-workers should be >= 1. Given: %d",
+                     num_workers);
+    return false;
+  }
+
+  if (frontend_cache_size < 0) {
+    SHERPA_ONNX_LOGE("--tts-frontend-cache-size should be >= 0. Given: %d",
+                     frontend_cache_size);
+    return false;
+  }
+
+  if (audio_cache_size < 0) {
+    SHERPA_ONNX_LOGE("--tts-audio-cache-size should be >= 0. Given: %d",
+                     audio_cache_size);
+    return false;
+  }
+
   return model.Validate();
 }
 
@@ -156,23 +192,75 @@ std::string OfflineTtsConfig::ToString() const {
   os << "rule_fsts=\"" << rule_fsts << "\", ";
   os << "rule_fars=\"" << rule_fars << "\", ";
   os << "max_num_sentences=" << max_num_sentences << ", ";
-  os << "silence_scale=" << silence_scale << ")";
+  os << "silence_scale=" << silence_scale << ", ";
+  os << "num_workers=" << num_workers << ", ";
+  os << "frontend_cache_size=" << frontend_cache_size << ", ";
+  os << "audio_cache_size=" << audio_cache_size << ")";
 
   return os.str();
 }
 
 OfflineTts::OfflineTts(const OfflineTtsConfig &config)
-    : impl_(OfflineTtsImpl::Create(config)) {}
+    : impl_(OfflineTtsImpl::Create(config)),
+      audio_cache_(config.audio_cache_size) {}
 
 template <typename Manager>
 OfflineTts::OfflineTts(Manager *mgr, const OfflineTtsConfig &config)
-    : impl_(OfflineTtsImpl::Create(mgr, config)) {}
+    : impl_(OfflineTtsImpl::Create(mgr, config)),
+      audio_cache_(config.audio_cache_size) {}
 
 OfflineTts::~OfflineTts() = default;
 
+static std::string AudioCacheKey(const std::string &text, int64_t sid,
+                                 float speed) {
+  std::string key = text;
+  key.push_back('\0');
+  key.append(reinterpret_cast<const char *>(&sid), sizeof(sid));
+  key.append(reinterpret_cast<const char *>(&speed), sizeof(speed));
+  return key;
+}
+
 GeneratedAudio OfflineTts::Generate(
     const std::string &text, int64_t sid /*=0*/, float speed /*= 1.0*/,
     GeneratedAudioCallback callback /*= nullptr*/) const {
+  if (audio_cache_.Capacity() <= 0) {
+    return GenerateImpl(text, sid, speed, std::move(callback));
+  }
+
+  std::string key = AudioCacheKey(text, sid, speed);
+  auto cached = audio_cache_.Get(key);
+  if (cached) {
+    if (callback) {
+      callback(cached->samples.data(),
+               static_cast<int32_t>(cached->samples.size()), 1.0);
+    }
+    return *cached;
+  }
+
+  // Partial audio is not cached if the callback stops the generation
+  bool stopped = false;
+  if (callback) {
+    callback = [&stopped, callback = std::move(callback)](
+                   const float *samples, int32_t n, float progress) {
+      int32_t ans = callback(samples, n, progress);
+      if (ans == 0) {
+        stopped = true;
+      }
+      return ans;
+    };
+  }
+
+  GeneratedAudio audio = GenerateImpl(text, sid, speed, std::move(callback));
+  if (!stopped && !audio.samples.empty()) {
+    audio_cache_.Put(key, std::make_shared<const GeneratedAudio>(audio));
+  }
+
+  return audio;
+}
+
+GeneratedAudio OfflineTts::GenerateImpl(const std::string &text, int64_t sid,
+                                        float speed,
+                                        GeneratedAudioCallback callback) const {
 #if !defined(_WIN32)
   return impl_->Generate(text, sid, speed, std::move(callback));
 #else
@@ -196,10 +284,39 @@ GeneratedAudio OfflineTts::Generate(
 #endif
 }
 
+std::vector<GeneratedAudio> OfflineTts::GenerateBatch(
+    const std::vector<OfflineTtsRequest> &requests) const {
+  int32_t n = static_cast<int32_t>(requests.size());
+  std::vector<GeneratedAudio> ans(n);
+
+  // Requests are usually short, so they are distributed to workers one
+  // by one. Batches of a request are synthesized in the worker thread of
+  // the request; see OfflineTtsImpl::Synthesize().
+  impl_->GetThreadPool()->ParallelFor(n, [&](int32_t i) {
+    const auto &r = requests[i];
+    ans[i] = Generate(r.text, r.sid, r.speed);
+  });
+
+  return ans;
+}
+
 int32_t OfflineTts::SampleRate() const { return impl_->SampleRate(); }
 
 int32_t OfflineTts::NumSpeakers() const { return impl_->NumSpeakers(); }
 
+LruCacheStats OfflineTts::FrontendCacheStats() const {
+  return impl_->FrontendCacheStats();
+}
+
+LruCacheStats OfflineTts::AudioCacheStats() const {
+  return audio_cache_.Stats();
+}
+
+void OfflineTts::ClearCache() const {
+  impl_->ClearFrontendCache();
+  audio_cache_.Clear();
+}
+
 #if __ANDROID_API__ >= 9
 template OfflineTts::OfflineTts(AAssetManager *mgr,
                                 const OfflineTtsConfig &config);
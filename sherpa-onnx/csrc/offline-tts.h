@@ -10,6 +10,7 @@
 #include <string>
 #include <vector>
 
+#include "sherpa-onnx/csrc/lru-cache.h"
 #include "sherpa-onnx/csrc/offline-tts-model-config.h"
 #include "sherpa-onnx/csrc/parse-options.h"
 
@@ -37,15 +38,41 @@ struct OfflineTtsConfig {
   // the duration of the new interval is old_duration * silence_scale.
   float silence_scale = 0.2;
 
+  // Number of threads in the thread pool of the engine. Up to num_workers
+  // batches of sentences of a long text, or requests of GenerateBatch(),
+  // are synthesized at the same time. The callback receives the first
+  // batch as soon as the first num_workers batches are ready, before the
+  // remaining ones are synthesized. Each worker uses model.num_threads
+  // threads.
+  int32_t num_workers = 1;
+
+  // Max number of sentences whose token IDs are cached. The text is split
+  // into sentences after normalization with rule_fsts and rule_fars, so the
+  // lexicon lookup and phonemization are skipped for sentences that are
+  // seen recently, even if they are part of a different text. The split
+  // is not the same as the one of the frontend, e.g., "Mr. Smith" becomes
+  // two sentences, so the pauses between sentences may change.
+  // 0 disables the cache and the whole text is passed to the frontend.
+  int32_t frontend_cache_size = 0;
+
+  // Max number of generated audios that are cached. The key is
+  // (text, sid, speed). 0 disables the cache.
+  int32_t audio_cache_size = 0;
+
   OfflineTtsConfig() = default;
   OfflineTtsConfig(const OfflineTtsModelConfig &model,
                    const std::string &rule_fsts, const std::string &rule_fars,
-                   int32_t max_num_sentences, float silence_scale)
+                   int32_t max_num_sentences, float silence_scale,
+                   int32_t num_workers = 1, int32_t frontend_cache_size = 0,
+                   int32_t audio_cache_size = 0)
       : model(model),
         rule_fsts(rule_fsts),
         rule_fars(rule_fars),
         max_num_sentences(max_num_sentences),
-        silence_scale(silence_scale) {}
+        silence_scale(silence_scale),
+        num_workers(num_workers),
+        frontend_cache_size(frontend_cache_size),
+        audio_cache_size(audio_cache_size) {}
 
   void Register(ParseOptions *po);
   bool Validate() const;
@@ -63,6 +90,12 @@ struct GeneratedAudio {
   GeneratedAudio ScaleSilence(float scale) const;
 };
 
+struct OfflineTtsRequest {
+  std::string text;
+  int64_t sid = 0;
+  float speed = 1.0;
+};
+
 class OfflineTtsImpl;
 
 // If the callback returns 0, then it stop generating
@@ -90,11 +123,20 @@ class OfflineTts {
   //                 after the callback is returned, so the caller should not
   //                 keep a reference to it. The caller can copy the data if
   //                 he/she wants to access the samples after the callback
-  //                 returns. The callback is called in the current thread.
+  //                 returns. The callback is called in the current thread
+  //                 and batches are passed to it in order, even if they are
+  //                 synthesized in parallel; see config.num_workers.
   GeneratedAudio Generate(const std::string &text, int64_t sid = 0,
                           float speed = 1.0,
                           GeneratedAudioCallback callback = nullptr) const;
 
+  // Generate audio for a batch of requests, e.g., from different clients.
+  //
+  // Up to config.num_workers requests are synthesized at the same time.
+  // ans[i] is the audio for requests[i].
+  std::vector<GeneratedAudio> GenerateBatch(
+      const std::vector<OfflineTtsRequest> &requests) const;
+
   // Return the sample rate of the generated audio
   int32_t SampleRate() const;
 
@@ -102,8 +144,25 @@ class OfflineTts {
   // If it supports only a single speaker, then it return 0 or 1.
   int32_t NumSpeakers() const;
 
+  // Statistics of the cache for token IDs. See config.frontend_cache_size
+  LruCacheStats FrontendCacheStats() const;
+
+  // Statistics of the cache for generated audios.
+  // See config.audio_cache_size
+  LruCacheStats AudioCacheStats() const;
+
+  // Remove all entries from both caches and reset their statistics
+  void ClearCache() const;
+
+ private:
+  GeneratedAudio GenerateImpl(const std::string &text, int64_t sid, float speed,
+                              GeneratedAudioCallback callback) const;
+
  private:
   std::unique_ptr<OfflineTtsImpl> impl_;
+
+  // Key: text, sid and speed
+  mutable LruCache<const GeneratedAudio> audio_cache_;
 };
 
 }  // namespace sherpa_onnx
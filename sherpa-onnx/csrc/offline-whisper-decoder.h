@@ -29,12 +29,15 @@ class OfflineWhisperDecoder {
    *                              (n_text_layer, N, n_audio_ctx, n_text_state).
    * @param n_layer_cross_v       A 4-D tensor of shape
    *                              (n_text_layer, N, n_audio_ctx, n_text_state).
+   * @param num_feature_frames    A vector of size `N` containing the number
+   *                              of feature frames of each utterance,
+   *                              excluding paddings.
    *
    * @return Return a vector of size `N` containing the decoded results.
    */
   virtual std::vector<OfflineWhisperDecoderResult> Decode(
       Ort::Value n_layer_cross_k, Ort::Value n_layer_cross_v,
-      int32_t num_feature_frames) = 0;
+      const std::vector<int32_t> &num_feature_frames) = 0;
 
   virtual void SetConfig(const OfflineWhisperModelConfig &config) = 0;
 };
@@ -5,24 +5,59 @@
 #include "sherpa-onnx/csrc/offline-whisper-greedy-search-decoder.h"
 
 #include <algorithm>
+#include <array>
+#include <numeric>
 #include <utility>
+#include <vector>
 
+#include "sherpa-onnx/csrc/index-select.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/onnx-utils.h"
 
 namespace sherpa_onnx {
 
+// Return the index of the max element of each row of the last
+// position of the logits.
+//
+// @param logits A 3-D tensor of shape (N, num_words, vocab_size)
+static std::vector<int64_t> GetMaxTokenIds(const Ort::Value &logits) {
+  auto logits_shape = logits.GetTensorTypeAndShapeInfo().GetShape();
+  int32_t batch_size = static_cast<int32_t>(logits_shape[0]);
+  int32_t num_words = static_cast<int32_t>(logits_shape[1]);
+  int32_t vocab_size = static_cast<int32_t>(logits_shape[2]);
+
+  const float *p_logits = logits.GetTensorData<float>();
+
+  std::vector<int64_t> ans(batch_size);
+  for (int32_t b = 0; b != batch_size; ++b) {
+    const float *p_start =
+        p_logits + (b * num_words + num_words - 1) * vocab_size;
+
+    ans[b] = static_cast<int64_t>(std::distance(
+        p_start, std::max_element(p_start, p_start + vocab_size)));
+  }
+
+  return ans;
+}
+
 void OfflineWhisperGreedySearchDecoder::SetConfig(
     const OfflineWhisperModelConfig &config) {
   config_ = config;
 }
 
 std::vector<OfflineWhisperDecoderResult>
-OfflineWhisperGreedySearchDecoder::Decode(Ort::Value cross_k,
-                                          Ort::Value cross_v,
-                                          int32_t num_feature_frames) {
-  auto memory_info =
-      Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+OfflineWhisperGreedySearchDecoder::Decode(
+    Ort::Value cross_k, Ort::Value cross_v,
+    const std::vector<int32_t> &num_feature_frames) {
+  int32_t batch_size =
+      static_cast<int32_t>(cross_k.GetTensorTypeAndShapeInfo().GetShape()[1]);
+
+  if (static_cast<int32_t>(num_feature_frames.size()) != batch_size) {
+    SHERPA_ONNX_LOGE("Expect %d entries in num_feature_frames. Given: %d",
+                     batch_size,
+                     static_cast<int32_t>(num_feature_frames.size()));
+    exit(-1);
+  }
 
   // For multilingual models, initial_tokens contains [sot, language, task]
   //   - language is English by default
@@ -31,6 +66,9 @@ OfflineWhisperGreedySearchDecoder::Decode(Ort::Value cross_k,
   // For non-multilingual models, initial_tokens contains [sot]
   std::vector<int64_t> initial_tokens = model_->GetInitialTokens();
 
+  // language of each utterance in the batch
+  std::vector<int32_t> lang_ids;
+
   if (model_->IsMultiLingual()) {
     if (!config_.language.empty()) {
       const auto &lang2id = model_->GetLang2ID();
@@ -40,15 +78,9 @@ OfflineWhisperGreedySearchDecoder::Decode(Ort::Value cross_k,
         exit(-1);
       }
 
-      int32_t lang_id = lang2id.at(config_.language);
-
-      // 0: sot, 1: lang_id, 2: task, 3: no_timestamps
-      initial_tokens[1] = lang_id;
+      lang_ids.resize(batch_size, lang2id.at(config_.language));
     } else {
-      int32_t lang_id = model_->DetectLanguage(cross_k, cross_v);
-
-      // 0: sot, 1: lang_id, 2: task, 3: no_timestamps
-      initial_tokens[1] = lang_id;
+      lang_ids = model_->DetectLanguages(cross_k, cross_v);
     }
 
     if (config_.task == "translate") {
@@ -63,20 +95,31 @@ OfflineWhisperGreedySearchDecoder::Decode(Ort::Value cross_k,
 
   initial_tokens.push_back(model_->NoTimeStampsToken());
 
-  int32_t batch_size = 1;
-  std::array<int64_t, 2> token_shape{
-      batch_size, static_cast<int64_t>(initial_tokens.size())};
+  int32_t num_initial_tokens = static_cast<int32_t>(initial_tokens.size());
+
+  std::array<int64_t, 2> token_shape{batch_size, num_initial_tokens};
+
+  Ort::Value tokens = Ort::Value::CreateTensor<int64_t>(
+      model_->Allocator(), token_shape.data(), token_shape.size());
+
+  int64_t *p_tokens = tokens.GetTensorMutableData<int64_t>();
+  for (int32_t b = 0; b != batch_size; ++b) {
+    std::copy(initial_tokens.begin(), initial_tokens.end(), p_tokens);
+
+    if (!lang_ids.empty()) {
+      // 0: sot, 1: lang_id, 2: task, 3: no_timestamps
+      p_tokens[1] = lang_ids[b];
+    }
 
-  Ort::Value tokens = Ort::Value::CreateTensor(
-      memory_info, initial_tokens.data(), initial_tokens.size(),
-      token_shape.data(), token_shape.size());
+    p_tokens += num_initial_tokens;
+  }
 
   std::array<int64_t, 1> offset_shape{1};
   Ort::Value offset = Ort::Value::CreateTensor<int64_t>(
       model_->Allocator(), offset_shape.data(), offset_shape.size());
   *(offset.GetTensorMutableData<int64_t>()) = 0;
 
-  auto self_kv_cache = model_->GetInitialSelfKVCache();
+  auto self_kv_cache = model_->GetInitialSelfKVCache(batch_size);
 
   auto decoder_out = model_->ForwardDecoder(
       std::move(tokens), std::move(self_kv_cache.first),
@@ -84,40 +127,74 @@ OfflineWhisperGreedySearchDecoder::Decode(Ort::Value cross_k,
       std::move(offset));
 
   *(std::get<5>(decoder_out).GetTensorMutableData<int64_t>()) =
-      initial_tokens.size();
+      num_initial_tokens;
 
-  const auto &logits = std::get<0>(decoder_out);
-  const float *p_logits = logits.GetTensorData<float>();
+  // max_token_ids[i] is the predicted token of active[i]
+  std::vector<int64_t> max_token_ids = GetMaxTokenIds(std::get<0>(decoder_out));
 
-  auto logits_shape = logits.GetTensorTypeAndShapeInfo().GetShape();
-  int32_t vocab_size = logits_shape[2];
+  int32_t n_text_ctx = model_->TextCtx();
 
-  const float *p_start = p_logits + (logits_shape[1] - 1) * vocab_size;
+  std::vector<int32_t> num_possible_tokens(batch_size);
+  for (int32_t b = 0; b != batch_size; ++b) {
+    // assume at most 6 tokens per second
+    num_possible_tokens[b] =
+        std::min<int32_t>(num_feature_frames[b] / 100 * 6, n_text_ctx / 2);
+  }
 
-  int32_t max_token_id = static_cast<int32_t>(
-      std::distance(p_start, std::max_element(p_start, p_start + vocab_size)));
+  std::vector<std::vector<int32_t>> predicted_tokens(batch_size);
 
-  int32_t n_text_ctx = model_->TextCtx();
+  // Indexes into the batch of utterances that are still being decoded.
+  // All of them share the same offset, so they are decoded in lockstep.
+  std::vector<int32_t> active(batch_size);
+  std::iota(active.begin(), active.end(), 0);
+
+  while (true) {
+    // Positions in active of utterances that need to be run with the decoder
+    std::vector<int32_t> keep;
+    keep.reserve(active.size());
+
+    for (int32_t i = 0; i != static_cast<int32_t>(active.size()); ++i) {
+      int32_t b = active[i];
+      auto &hyp = predicted_tokens[b];
+
+      if (static_cast<int32_t>(hyp.size()) >= num_possible_tokens[b] ||
+          max_token_ids[i] == model_->EOT()) {
+        continue;
+      }
 
-  std::vector<int32_t> predicted_tokens;
+      hyp.push_back(max_token_ids[i]);
 
-  // assume at most 6 tokens per second
-  int32_t num_possible_tokens = num_feature_frames / 100 * 6;
-  num_possible_tokens = std::min<int32_t>(num_possible_tokens, n_text_ctx / 2);
+      if (static_cast<int32_t>(hyp.size()) < num_possible_tokens[b]) {
+        keep.push_back(i);
+      }
+    }
 
-  for (int32_t i = 0; i < num_possible_tokens; ++i) {
-    if (max_token_id == model_->EOT()) {
+    if (keep.empty()) {
       break;
     }
 
-    predicted_tokens.push_back(max_token_id);
+    if (keep.size() != active.size()) {
+      // Remove finished utterances from the decoder states
+      for (auto *v : {&std::get<1>(decoder_out), &std::get<2>(decoder_out),
+                      &std::get<3>(decoder_out), &std::get<4>(decoder_out)}) {
+        *v = IndexSelect(model_->Allocator(), v, 1, keep);
+      }
+
+      std::vector<int32_t> new_active(keep.size());
+      for (int32_t i = 0; i != static_cast<int32_t>(keep.size()); ++i) {
+        new_active[i] = active[keep[i]];
+      }
+      active = std::move(new_active);
+    }
 
-    std::array<int64_t, 2> token_shape{1, 1};
+    std::array<int64_t, 2> token_shape{static_cast<int64_t>(active.size()), 1};
     Ort::Value tokens = Ort::Value::CreateTensor<int64_t>(
         model_->Allocator(), token_shape.data(), token_shape.size());
 
     int64_t *p_tokens = tokens.GetTensorMutableData<int64_t>();
-    p_tokens[0] = max_token_id;
+    for (int32_t i = 0; i != static_cast<int32_t>(keep.size()); ++i) {
+      p_tokens[i] = max_token_ids[keep[i]];
+    }
 
     decoder_out = model_->ForwardDecoder(std::move(tokens),
                                          std::move(std::get<1>(decoder_out)),
@@ -134,23 +211,19 @@ OfflineWhisperGreedySearchDecoder::Decode(Ort::Value cross_k,
       break;
     }
 
-    const auto &logits = std::get<0>(decoder_out);
-    const float *p_logits = logits.GetTensorData<float>();
-
-    max_token_id = static_cast<int64_t>(std::distance(
-        p_logits, std::max_element(p_logits, p_logits + vocab_size)));
+    max_token_ids = GetMaxTokenIds(std::get<0>(decoder_out));
   }
 
-  std::vector<OfflineWhisperDecoderResult> ans(1);
+  std::vector<OfflineWhisperDecoderResult> ans(batch_size);
 
   const auto &id2lang = model_->GetID2Lang();
-  if (id2lang.count(initial_tokens[1])) {
-    ans[0].lang = id2lang.at(initial_tokens[1]);
-  } else {
-    ans[0].lang = "";
-  }
+  for (int32_t b = 0; b != batch_size; ++b) {
+    if (!lang_ids.empty() && id2lang.count(lang_ids[b])) {
+      ans[b].lang = id2lang.at(lang_ids[b]);
+    }
 
-  ans[0].tokens = std::move(predicted_tokens);
+    ans[b].tokens = std::move(predicted_tokens[b]);
+  }
 
   return ans;
 }
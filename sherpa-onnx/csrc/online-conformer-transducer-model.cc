@@ -80,8 +80,8 @@ OnlineConformerTransducerModel::OnlineConformerTransducerModel(
 
 void OnlineConformerTransducerModel::InitEncoder(void *model_data,
                                                  size_t model_data_length) {
-  encoder_sess_ = std::make_unique<Ort::Session>(env_, model_data,
-                                                 model_data_length, sess_opts_);
+  encoder_sess_ =
+      CreateSession(env_, model_data, model_data_length, sess_opts_);
 
   GetInputNames(encoder_sess_.get(), &encoder_input_names_,
                 &encoder_input_names_ptr_);
@@ -114,8 +114,8 @@ void OnlineConformerTransducerModel::InitEncoder(void *model_data,
 
 void OnlineConformerTransducerModel::InitDecoder(void *model_data,
                                                  size_t model_data_length) {
-  decoder_sess_ = std::make_unique<Ort::Session>(env_, model_data,
-                                                 model_data_length, sess_opts_);
+  decoder_sess_ =
+      CreateSession(env_, model_data, model_data_length, sess_opts_);
 
   GetInputNames(decoder_sess_.get(), &decoder_input_names_,
                 &decoder_input_names_ptr_);
@@ -143,8 +143,7 @@ void OnlineConformerTransducerModel::InitDecoder(void *model_data,
 
 void OnlineConformerTransducerModel::InitJoiner(void *model_data,
                                                 size_t model_data_length) {
-  joiner_sess_ = std::make_unique<Ort::Session>(env_, model_data,
-                                                model_data_length, sess_opts_);
+  joiner_sess_ = CreateSession(env_, model_data, model_data_length, sess_opts_);
 
   GetInputNames(joiner_sess_.get(), &joiner_input_names_,
                 &joiner_input_names_ptr_);
@@ -10,6 +10,7 @@
 
 #include "kaldi-decoder/csrc/faster-decoder.h"
 #include "onnxruntime_cxx_api.h"  // NOLINT
+#include "sherpa-onnx/csrc/ctc-fst-nbest-decoder.h"
 
 namespace sherpa_onnx {
 
@@ -34,7 +35,24 @@ struct OnlineCtcDecoderResult {
   /// tokens.size() == timestamps.size()
   std::vector<int32_t> timestamps;
 
+  /// Scores of the path when an HLG, HL, or H graph is used.
+  /// They are empty for greedy search decoding.
+  ///
+  /// ys_probs[i] and graph_scores[i] are the sums of the log-probs from the
+  /// model and the scores from the graph over the frames of tokens[i],
+  /// i.e., from the frame where tokens[i] is decoded up to the frame before
+  /// tokens[i+1]. Frames before tokens[0] are counted for tokens[0].
+  ///
+  /// ys_probs.size() == graph_scores.size() == tokens.size()
+  std::vector<float> ys_probs;
+  std::vector<float> graph_scores;
+
   int32_t num_trailing_blanks = 0;
+
+  /// The N best paths, best first, when an HLG, HL, or H graph is used with
+  /// nbest > 1. The fields above are copied from nbest[0].
+  /// Their own nbest is empty.
+  std::vector<OnlineCtcDecoderResult> nbest;
 };
 
 class OnlineCtcDecoder {
@@ -58,6 +76,10 @@ class OnlineCtcDecoder {
       const {
     return nullptr;
   }
+
+  virtual std::unique_ptr<CtcFstNbestDecoder> CreateNbestDecoder() const {
+    return nullptr;
+  }
 };
 
 }  // namespace sherpa_onnx
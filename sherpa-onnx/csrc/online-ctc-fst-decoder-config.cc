@@ -17,7 +17,8 @@ std::string OnlineCtcFstDecoderConfig::ToString() const {
 
   os << "OnlineCtcFstDecoderConfig(";
   os << "graph=\"" << graph << "\", ";
-  os << "max_active=" << max_active << ")";
+  os << "max_active=" << max_active << ", ";
+  os << "nbest=" << nbest << ")";
 
   return os.str();
 }
@@ -27,6 +28,10 @@ void OnlineCtcFstDecoderConfig::Register(ParseOptions *po) {
 
   po->Register("ctc-max-active", &max_active,
                "Decoder max active states.  Larger->slower; more accurate");
+
+  po->Register("ctc-nbest", &nbest,
+               "Number of paths to return. If it is larger than 1, the N best "
+               "paths are returned in the result");
 }
 
 bool OnlineCtcFstDecoderConfig::Validate() const {
@@ -34,6 +39,12 @@ bool OnlineCtcFstDecoderConfig::Validate() const {
     SHERPA_ONNX_LOGE("graph: '%s' does not exist", graph.c_str());
     return false;
   }
+
+  if (nbest < 1) {
+    SHERPA_ONNX_LOGE("nbest: %d should be >= 1", nbest);
+    return false;
+  }
+
   return true;
 }
 
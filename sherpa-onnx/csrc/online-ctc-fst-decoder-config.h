@@ -16,10 +16,15 @@ struct OnlineCtcFstDecoderConfig {
   std::string graph;
   int32_t max_active = 3000;
 
+  // Number of paths to return. If it is larger than 1, the N best paths
+  // are kept in the result.
+  int32_t nbest = 1;
+
   OnlineCtcFstDecoderConfig() = default;
 
-  OnlineCtcFstDecoderConfig(const std::string &graph, int32_t max_active)
-      : graph(graph), max_active(max_active) {}
+  OnlineCtcFstDecoderConfig(const std::string &graph, int32_t max_active,
+                            int32_t nbest = 1)
+      : graph(graph), max_active(max_active), nbest(nbest) {}
 
   std::string ToString() const;
 
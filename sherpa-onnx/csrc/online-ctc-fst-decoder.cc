@@ -27,9 +27,86 @@ OnlineCtcFstDecoder::OnlineCtcFstDecoder(
 
 std::unique_ptr<kaldi_decoder::FasterDecoder>
 OnlineCtcFstDecoder::CreateFasterDecoder() const {
+  if (config_.nbest > 1) {
+    // CreateNbestDecoder() is used instead
+    return nullptr;
+  }
+
   return std::make_unique<kaldi_decoder::FasterDecoder>(*fst_, options_);
 }
 
+std::unique_ptr<CtcFstNbestDecoder> OnlineCtcFstDecoder::CreateNbestDecoder()
+    const {
+  if (config_.nbest <= 1) {
+    return nullptr;
+  }
+
+  return std::make_unique<CtcFstNbestDecoder>(*fst_, config_.nbest,
+                                              config_.max_active, blank_id_);
+}
+
+// Compute the scores of each token in the best path. Tokens are found in
+// the same way as in DecodeOne() below.
+//
+// @param best_path A linear FST returned by FasterDecoder::GetBestPath()
+// @param blank_id ID of the blank token
+// @param result Its ys_probs and graph_scores are set on return.
+static void ComputeTokenScores(const fst::VectorFst<fst::LatticeArc> &best_path,
+                               int32_t blank_id,
+                               OnlineCtcDecoderResult *result) {
+  std::vector<float> ys_probs;
+  std::vector<float> graph_scores;
+
+  if (best_path.NumStates() == 0) {
+    result->ys_probs.clear();
+    result->graph_scores.clear();
+    return;
+  }
+
+  // Scores of the frames of the last decoded token. Frames before the
+  // first token are also counted for the first token.
+  float ys_prob = 0;
+  float graph_score = 0;
+
+  int32_t num_tokens = 0;
+  int32_t prev_id = -1;
+  auto cur_state = best_path.Start();
+  while (best_path.NumArcs(cur_state) == 1) {
+    fst::ArcIterator<fst::Fst<fst::LatticeArc>> iter(best_path, cur_state);
+    const auto &arc = iter.Value();
+    cur_state = arc.nextstate;
+
+    // 0 is epsilon here and it does not consume a frame
+    int32_t i = arc.ilabel - 1;
+    if (arc.ilabel != 0 && i != blank_id && i != prev_id) {
+      // A new token starts from this frame
+      if (num_tokens > 0) {
+        ys_probs.push_back(ys_prob);
+        graph_scores.push_back(graph_score);
+        ys_prob = 0;
+        graph_score = 0;
+      }
+      num_tokens += 1;
+    }
+
+    // The weight of an arc contains costs, i.e., negative scores
+    ys_prob -= arc.weight.Value2();
+    graph_score -= arc.weight.Value1();
+
+    if (arc.ilabel != 0) {
+      prev_id = i;
+    }
+  }
+
+  if (num_tokens > 0) {
+    ys_probs.push_back(ys_prob);
+    graph_scores.push_back(graph_score - best_path.Final(cur_state).Value1());
+  }
+
+  result->ys_probs = std::move(ys_probs);
+  result->graph_scores = std::move(graph_scores);
+}
+
 static void DecodeOne(const float *log_probs, int32_t num_rows,
                       int32_t num_cols, OnlineCtcDecoderResult *result,
                       OnlineStream *s, int32_t blank_id) {
@@ -84,6 +161,7 @@ static void DecodeOne(const float *log_probs, int32_t num_rows,
       result->tokens = std::move(tokens);
       result->words = std::move(osymbols_out);
       result->timestamps = std::move(timestamps);
+      ComputeTokenScores(fst_out, blank_id, result);
       // no need to set frame_offset
     }
   }
@@ -91,6 +169,49 @@ static void DecodeOne(const float *log_probs, int32_t num_rows,
   processed_frames += num_rows;
 }
 
+// Like DecodeOne() but keep the N best paths in the result
+static void DecodeNbest(const float *log_probs, int32_t num_rows,
+                        int32_t num_cols, OnlineCtcDecoderResult *result,
+                        OnlineStream *s) {
+  int32_t &processed_frames = s->GetFasterDecoderProcessedFrames();
+
+  CtcFstNbestDecoder *decoder = s->GetNbestDecoder();
+  if (processed_frames == 0) {
+    decoder->InitDecoding();
+  }
+
+  decoder->AdvanceDecoding(log_probs, num_rows, num_cols);
+  processed_frames += num_rows;
+
+  if (!decoder->ReachedFinal()) {
+    return;
+  }
+
+  auto paths = decoder->GetNbest();
+  if (paths.empty()) {
+    return;
+  }
+
+  std::vector<OnlineCtcDecoderResult> nbest;
+  nbest.reserve(paths.size());
+  for (auto &path : paths) {
+    OnlineCtcDecoderResult h;
+    h.tokens = std::move(path.tokens);
+    h.words = std::move(path.words);
+    h.timestamps = std::move(path.timestamps);
+    h.ys_probs = std::move(path.ys_probs);
+    h.graph_scores = std::move(path.graph_scores);
+    h.num_trailing_blanks = path.num_trailing_blanks;
+    nbest.push_back(std::move(h));
+  }
+
+  // no need to set frame_offset
+  int32_t frame_offset = result->frame_offset;
+  *result = nbest[0];
+  result->frame_offset = frame_offset;
+  result->nbest = std::move(nbest);
+}
+
 void OnlineCtcFstDecoder::Decode(const float *log_probs, int32_t batch_size,
                                  int32_t num_frames, int32_t vocab_size,
                                  std::vector<OnlineCtcDecoderResult> *results,
@@ -110,6 +231,12 @@ void OnlineCtcFstDecoder::Decode(const float *log_probs, int32_t batch_size,
   const float *p = log_probs;
 
   for (int32_t i = 0; i != batch_size; ++i) {
+    if (ss[i]->GetNbestDecoder()) {
+      DecodeNbest(p + i * num_frames * vocab_size, num_frames, vocab_size,
+                  &(*results)[i], ss[i]);
+      continue;
+    }
+
     DecodeOne(p + i * num_frames * vocab_size, num_frames, vocab_size,
               &(*results)[i], ss[i], blank_id_);
   }
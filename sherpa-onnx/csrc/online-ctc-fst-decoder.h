@@ -26,6 +26,8 @@ class OnlineCtcFstDecoder : public OnlineCtcDecoder {
   std::unique_ptr<kaldi_decoder::FasterDecoder> CreateFasterDecoder()
       const override;
 
+  std::unique_ptr<CtcFstNbestDecoder> CreateNbestDecoder() const override;
+
  private:
   OnlineCtcFstDecoderConfig config_;
   kaldi_decoder::FasterDecoderOptions options_;
@@ -78,8 +78,8 @@ OnlineLstmTransducerModel::OnlineLstmTransducerModel(
 
 void OnlineLstmTransducerModel::InitEncoder(void *model_data,
                                             size_t model_data_length) {
-  encoder_sess_ = std::make_unique<Ort::Session>(env_, model_data,
-                                                 model_data_length, sess_opts_);
+  encoder_sess_ =
+      CreateSession(env_, model_data, model_data_length, sess_opts_);
 
   GetInputNames(encoder_sess_.get(), &encoder_input_names_,
                 &encoder_input_names_ptr_);
@@ -110,8 +110,8 @@ void OnlineLstmTransducerModel::InitEncoder(void *model_data,
 
 void OnlineLstmTransducerModel::InitDecoder(void *model_data,
                                             size_t model_data_length) {
-  decoder_sess_ = std::make_unique<Ort::Session>(env_, model_data,
-                                                 model_data_length, sess_opts_);
+  decoder_sess_ =
+      CreateSession(env_, model_data, model_data_length, sess_opts_);
 
   GetInputNames(decoder_sess_.get(), &decoder_input_names_,
                 &decoder_input_names_ptr_);
@@ -135,8 +135,7 @@ void OnlineLstmTransducerModel::InitDecoder(void *model_data,
 
 void OnlineLstmTransducerModel::InitJoiner(void *model_data,
                                            size_t model_data_length) {
-  joiner_sess_ = std::make_unique<Ort::Session>(env_, model_data,
-                                                model_data_length, sess_opts_);
+  joiner_sess_ = CreateSession(env_, model_data, model_data_length, sess_opts_);
 
   GetInputNames(joiner_sess_.get(), &joiner_input_names_,
                 &joiner_input_names_ptr_);
@@ -111,10 +111,15 @@ class OnlineParaformerModel::Impl {
 
   OrtAllocator *Allocator() { return allocator_; }
 
+  bool SupportBatchProcessing() const {
+    return encoder_support_batch_processing_ &&
+           decoder_support_batch_processing_;
+  }
+
  private:
   void InitEncoder(void *model_data, size_t model_data_length) {
-    encoder_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    encoder_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(encoder_sess_.get(), &encoder_input_names_,
                   &encoder_input_names_ptr_);
@@ -122,6 +127,8 @@ class OnlineParaformerModel::Impl {
     GetOutputNames(encoder_sess_.get(), &encoder_output_names_,
                    &encoder_output_names_ptr_);
 
+    encoder_support_batch_processing_ = HasDynamicBatchDim(encoder_sess_.get());
+
     // get meta data
     Ort::ModelMetadata meta_data = encoder_sess_->GetModelMetadata();
     if (config_.debug) {
@@ -152,14 +159,23 @@ class OnlineParaformerModel::Impl {
   }
 
   void InitDecoder(void *model_data, size_t model_data_length) {
-    decoder_sess_ = std::make_unique<Ort::Session>(
-        env_, model_data, model_data_length, sess_opts_);
+    decoder_sess_ =
+        CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(decoder_sess_.get(), &decoder_input_names_,
                   &decoder_input_names_ptr_);
 
     GetOutputNames(decoder_sess_.get(), &decoder_output_names_,
                    &decoder_output_names_ptr_);
+
+    decoder_support_batch_processing_ = HasDynamicBatchDim(decoder_sess_.get());
+  }
+
+  // Return true if the first input of the model accepts any batch size
+  static bool HasDynamicBatchDim(Ort::Session *sess) {
+    std::vector<int64_t> shape =
+        sess->GetInputTypeInfo(0).GetTensorTypeAndShapeInfo().GetShape();
+    return !shape.empty() && shape[0] < 0;
   }
 
  private:
@@ -194,6 +210,9 @@ class OnlineParaformerModel::Impl {
   int32_t encoder_output_size_ = 0;
   int32_t decoder_num_blocks_ = 0;
   int32_t decoder_kernel_size_ = 0;
+
+  bool encoder_support_batch_processing_ = false;
+  bool decoder_support_batch_processing_ = false;
 };
 
 OnlineParaformerModel::OnlineParaformerModel(const OnlineModelConfig &config)
@@ -253,6 +272,10 @@ OrtAllocator *OnlineParaformerModel::Allocator() const {
   return impl_->Allocator();
 }
 
+bool OnlineParaformerModel::SupportBatchProcessing() const {
+  return impl_->SupportBatchProcessing();
+}
+
 #if __ANDROID_API__ >= 9
 template OnlineParaformerModel::OnlineParaformerModel(
     AAssetManager *mgr, const OnlineModelConfig &config);
@@ -60,6 +60,11 @@ class OnlineParaformerModel {
    */
   OrtAllocator *Allocator() const;
 
+  /** Return true if the encoder and the decoder accept inputs with
+   * batch size > 1
+   */
+  bool SupportBatchProcessing() const;
+
  private:
   class Impl;
   std::unique_ptr<Impl> impl_;
@@ -22,6 +22,7 @@
 #include "sherpa-onnx/csrc/online-ctc-model.h"
 #include "sherpa-onnx/csrc/online-recognizer-impl.h"
 #include "sherpa-onnx/csrc/symbol-table.h"
+#include "sherpa-onnx/csrc/thread-pool.h"
 
 namespace sherpa_onnx {
 
@@ -65,10 +66,20 @@ OnlineRecognizerResult ConvertCtc(const OnlineCtcDecoderResult &src,
     r.timestamps.push_back(time);
   }
 
+  r.ys_probs = src.ys_probs;
+  r.graph_scores = src.graph_scores;
+
   r.segment = segment;
   r.words = std::move(src.words);
   r.start_time = frames_since_start * frame_shift_ms / 1000.;
 
+  r.nbest.reserve(src.nbest.size());
+  for (const auto &h : src.nbest) {
+    r.nbest.push_back(ConvertCtc(h, sym_table, frame_shift_ms,
+                                 subsampling_factor, segment,
+                                 frames_since_start));
+  }
+
   return r;
 }
 
@@ -97,6 +108,7 @@ class OnlineRecognizerCtcImpl : public OnlineRecognizerImpl {
     }
 
     InitDecoder();
+    InitThreadPool();
   }
 
   template <typename Manager>
@@ -118,12 +130,14 @@ class OnlineRecognizerCtcImpl : public OnlineRecognizerImpl {
     }
 
     InitDecoder();
+    InitThreadPool();
   }
 
   std::unique_ptr<OnlineStream> CreateStream() const override {
     auto stream = std::make_unique<OnlineStream>(config_.feat_config);
     stream->SetStates(model_->GetInitStates());
     stream->SetFasterDecoder(decoder_->CreateFasterDecoder());
+    stream->SetNbestDecoder(decoder_->CreateNbestDecoder());
 
     return stream;
   }
@@ -135,6 +149,13 @@ class OnlineRecognizerCtcImpl : public OnlineRecognizerImpl {
 
   void DecodeStreams(OnlineStream **ss, int32_t n) const override {
     if (n == 1 || !model_->SupportBatchProcessing()) {
+      if (pool_ && n > 1) {
+        // The model accepts only one stream at a time, so we run streams
+        // in parallel instead. Each stream owns its states and decoder.
+        pool_->ParallelFor(n, [this, ss](int32_t i) { DecodeStream(ss[i]); });
+        return;
+      }
+
       for (int32_t i = 0; i != n; ++i) {
         DecodeStream(ss[i]);
       }
@@ -216,6 +237,12 @@ class OnlineRecognizerCtcImpl : public OnlineRecognizerImpl {
                    s->GetCurrentSegment(), s->GetNumFramesSinceStart());
     r.text = ApplyInverseTextNormalization(std::move(r.text));
     r.text = ApplyHomophoneReplacer(std::move(r.text));
+
+    for (auto &h : r.nbest) {
+      h.text = ApplyInverseTextNormalization(std::move(h.text));
+      h.text = ApplyHomophoneReplacer(std::move(h.text));
+    }
+
     return r;
   }
 
@@ -291,6 +318,12 @@ class OnlineRecognizerCtcImpl : public OnlineRecognizerImpl {
     }
   }
 
+  void InitThreadPool() {
+    if (!model_->SupportBatchProcessing() && config_.num_decode_workers > 1) {
+      pool_ = std::make_unique<ThreadPool>(config_.num_decode_workers);
+    }
+  }
+
   void DecodeStream(OnlineStream *s) const {
     int32_t chunk_length = model_->ChunkLength();
     int32_t chunk_shift = model_->ChunkShift();
@@ -342,6 +375,9 @@ class OnlineRecognizerCtcImpl : public OnlineRecognizerImpl {
   std::unique_ptr<OnlineCtcDecoder> decoder_;
   SymbolTable sym_;
   Endpoint endpoint_;
+
+  // Used only if the model does not support batch processing
+  std::unique_ptr<ThreadPool> pool_;
 };
 
 }  // namespace sherpa_onnx
@@ -41,6 +41,17 @@ class OnlineRecognizerImpl {
     exit(-1);
   }
 
+  virtual std::unique_ptr<OnlineStream> CreateStream(
+      ContextGraphPtr context_graph) const {
+    SHERPA_ONNX_LOGE("Only transducer models support contextual biasing.");
+    exit(-1);
+  }
+
+  virtual ContextGraphPtr CompileHotwords(const std::string &hotwords) const {
+    SHERPA_ONNX_LOGE("Only transducer models support contextual biasing.");
+    exit(-1);
+  }
+
   virtual bool IsReady(OnlineStream *s) const = 0;
 
   virtual void WarmpUpRecognizer(int32_t warmup, int32_t mbs) const {
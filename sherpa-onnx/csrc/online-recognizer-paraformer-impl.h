@@ -6,12 +6,17 @@
 #define SHERPA_ONNX_CSRC_ONLINE_RECOGNIZER_PARAFORMER_IMPL_H_
 
 #include <algorithm>
+#include <array>
+#include <cmath>
 #include <memory>
 #include <string>
 #include <utility>
 #include <vector>
 
+#include "Eigen/Dense"
+#include "sherpa-onnx/csrc/cat.h"
 #include "sherpa-onnx/csrc/file-utils.h"
+#include "sherpa-onnx/csrc/length-buckets.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/online-lm.h"
 #include "sherpa-onnx/csrc/online-paraformer-decoder.h"
@@ -19,6 +24,7 @@
 #include "sherpa-onnx/csrc/online-recognizer-impl.h"
 #include "sherpa-onnx/csrc/online-recognizer.h"
 #include "sherpa-onnx/csrc/symbol-table.h"
+#include "sherpa-onnx/csrc/unbind.h"
 
 namespace sherpa_onnx {
 
@@ -118,6 +124,8 @@ class OnlineRecognizerParaformerImpl : public OnlineRecognizerImpl {
     // Paraformer models assume input samples are in the range
     // [-32768, 32767], so we set normalize_samples to false
     config_.feat_config.normalize_samples = false;
+
+    Init();
   }
 
   template <typename Manager>
@@ -137,6 +145,8 @@ class OnlineRecognizerParaformerImpl : public OnlineRecognizerImpl {
     // Paraformer models assume input samples are in the range
     // [-32768, 32767], so we set normalize_samples to false
     config_.feat_config.normalize_samples = false;
+
+    Init();
   }
 
   OnlineRecognizerParaformerImpl(const OnlineRecognizerParaformerImpl &) =
@@ -159,10 +169,14 @@ class OnlineRecognizerParaformerImpl : public OnlineRecognizerImpl {
   }
 
   void DecodeStreams(OnlineStream **ss, int32_t n) const override {
-    // TODO(fangjun): Support batch size > 1
-    for (int32_t i = 0; i != n; ++i) {
-      DecodeStream(ss[i]);
+    if (n > 1 && !model_.SupportBatchProcessing()) {
+      for (int32_t i = 0; i != n; ++i) {
+        DecodeBatch(ss + i, 1);
+      }
+      return;
     }
+
+    DecodeBatch(ss, n);
   }
 
   OnlineRecognizerResult GetResult(OnlineStream *s) const override {
@@ -209,47 +223,61 @@ class OnlineRecognizerParaformerImpl : public OnlineRecognizerImpl {
   }
 
  private:
-  void DecodeStream(OnlineStream *s) const {
-    const auto num_processed_frames = s->GetNumProcessedFrames();
-    std::vector<float> frames = s->GetFrames(num_processed_frames, chunk_size_);
-    s->GetNumProcessedFrames() += chunk_size_ - 1;
+  void Init() {
+    int32_t feat_dim = config_.feat_config.feature_dim * model_.LfrWindowSize();
 
-    frames = ApplyLFR(frames);
-    ApplyCMVN(&frames);
-    PositionalEncoding(&frames, num_processed_frames / model_.LfrWindowShift());
+    // log(10000)/(7*80/2-1) == 0.03301197265941284
+    // 7 is lfr_window_size
+    // 80 is in_feat_dim
+    // 7*80 is feat_dim
+    constexpr float kScale = -0.03301197265941284;
+
+    inv_timescales_.resize(feat_dim / 2);
+    for (int32_t d = 0; d != feat_dim / 2; ++d) {
+      inv_timescales_[d] = std::exp(d * kScale);
+    }
+  }
 
+  // Decode the next chunk of each stream.
+  //
+  // All streams use the same chunk size, so the encoder runs once for
+  // the whole batch without padding. The CIF search is done for each
+  // stream with its own cache. Streams that emit the same number of
+  // acoustic embeddings share a decoder run. The decoder caches the last
+  // frames of its input, so padding the acoustic embeddings would corrupt
+  // the states of shorter streams.
+  void DecodeBatch(OnlineStream **ss, int32_t n) const {
     int32_t feat_dim = model_.NegativeMean().size();
 
-    // We have scaled inv_stddev by sqrt(encoder_output_size)
-    // so the following line can be commented out
-    // frames *= encoder_output_size ** 0.5
+    std::vector<int32_t> num_processed_frames(n);
+    std::vector<float> features;
+    int32_t num_frames = 0;
 
-    // add overlap chunk
-    std::vector<float> &feat_cache = s->GetParaformerFeatCache();
-    if (feat_cache.empty()) {
-      int32_t n = (left_chunk_size_ + right_chunk_size_) * feat_dim;
-      feat_cache.resize(n, 0);
-    }
+    for (int32_t i = 0; i != n; ++i) {
+      num_processed_frames[i] = ss[i]->GetNumProcessedFrames();
 
-    frames.insert(frames.begin(), feat_cache.begin(), feat_cache.end());
-    std::copy(frames.end() - feat_cache.size(), frames.end(),
-              feat_cache.begin());
+      std::vector<float> frames = GetEncoderInput(ss[i]);
+      num_frames = frames.size() / feat_dim;
 
-    int32_t num_frames = frames.size() / feat_dim;
+      if (features.empty()) {
+        features.reserve(n * frames.size());
+      }
+      features.insert(features.end(), frames.begin(), frames.end());
+    }
 
     auto memory_info =
         Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
 
-    std::array<int64_t, 3> x_shape{1, num_frames, feat_dim};
+    std::array<int64_t, 3> x_shape{n, num_frames, feat_dim};
     Ort::Value x =
-        Ort::Value::CreateTensor(memory_info, frames.data(), frames.size(),
+        Ort::Value::CreateTensor(memory_info, features.data(), features.size(),
                                  x_shape.data(), x_shape.size());
 
-    int64_t x_len_shape = 1;
-    int32_t x_len_val = num_frames;
+    int64_t x_len_shape = n;
+    std::vector<int32_t> x_len_val(n, num_frames);
 
-    Ort::Value x_length =
-        Ort::Value::CreateTensor(memory_info, &x_len_val, 1, &x_len_shape, 1);
+    Ort::Value x_length = Ort::Value::CreateTensor(
+        memory_info, x_len_val.data(), x_len_val.size(), &x_len_shape, 1);
 
     auto encoder_out_vec =
         model_.ForwardEncoder(std::move(x), std::move(x_length));
@@ -264,18 +292,130 @@ class OnlineRecognizerParaformerImpl : public OnlineRecognizerImpl {
     std::vector<int64_t> alpha_shape =
         alpha.GetTensorTypeAndShapeInfo().GetShape();
 
-    std::fill(p_alpha, p_alpha + left_chunk_size_, 0);
-    std::fill(p_alpha + alpha_shape[1] - right_chunk_size_,
-              p_alpha + alpha_shape[1], 0);
-
     const float *p_encoder_out = encoder_out.GetTensorData<float>();
 
     std::vector<int64_t> encoder_out_shape =
         encoder_out.GetTensorTypeAndShapeInfo().GetShape();
 
+    int32_t encoder_out_dim = encoder_out_shape[2];
+
+    std::vector<std::vector<float>> acoustic_embeddings(n);
+    std::vector<int32_t> num_tokens(n);
+    std::vector<int32_t> indexes;  // streams with at least one token
+    indexes.reserve(n);
+
+    for (int32_t i = 0; i != n; ++i) {
+      float *this_alpha = p_alpha + i * alpha_shape[1];
+
+      std::fill(this_alpha, this_alpha + left_chunk_size_, 0);
+      std::fill(this_alpha + alpha_shape[1] - right_chunk_size_,
+                this_alpha + alpha_shape[1], 0);
+
+      acoustic_embeddings[i] = CifSearch(
+          ss[i], p_encoder_out + i * encoder_out_shape[1] * encoder_out_dim,
+          this_alpha, encoder_out_shape[1], encoder_out_dim);
+
+      num_tokens[i] = acoustic_embeddings[i].size() / encoder_out_dim;
+      if (num_tokens[i] > 0) {
+        indexes.push_back(i);
+      }
+    }
+
+    if (indexes.empty()) {
+      return;
+    }
+
+    if (n == 1) {
+      RunDecoder(ss, num_processed_frames.data(), 1, std::move(encoder_out),
+                 std::move(encoder_out_len), std::move(acoustic_embeddings[0]));
+      return;
+    }
+
+    std::vector<Ort::Value> encoder_out_list =
+        Unbind(model_.Allocator(), &encoder_out, 0);
+
+    std::vector<int32_t> lens;
+    lens.reserve(indexes.size());
+    for (auto i : indexes) {
+      lens.push_back(num_tokens[i]);
+    }
+
+    auto buckets = SplitIntoLengthBuckets(
+        lens.data(), static_cast<int32_t>(lens.size()), 0, 0);
+
+    for (const auto &b : buckets) {
+      int32_t batch_size = static_cast<int32_t>(b.size());
+
+      std::vector<OnlineStream *> this_ss;
+      std::vector<int32_t> this_num_processed_frames;
+      std::vector<const Ort::Value *> this_encoder_out;
+      std::vector<float> this_acoustic_embedding;
+
+      this_ss.reserve(batch_size);
+      this_num_processed_frames.reserve(batch_size);
+      this_encoder_out.reserve(batch_size);
+      this_acoustic_embedding.reserve(batch_size * lens[b[0]] *
+                                      encoder_out_dim);
+
+      for (auto j : b) {
+        int32_t i = indexes[j];
+        this_ss.push_back(ss[i]);
+        this_num_processed_frames.push_back(num_processed_frames[i]);
+        this_encoder_out.push_back(&encoder_out_list[i]);
+        this_acoustic_embedding.insert(this_acoustic_embedding.end(),
+                                       acoustic_embeddings[i].begin(),
+                                       acoustic_embeddings[i].end());
+      }
+
+      RunDecoder(this_ss.data(), this_num_processed_frames.data(), batch_size,
+                 Cat(model_.Allocator(), this_encoder_out, 0),
+                 RepeatLength(encoder_out_len, batch_size),
+                 std::move(this_acoustic_embedding));
+    }
+  }
+
+  // Return the features of the next chunk of s with positional encoding,
+  // prepended with the cached features of the previous chunk.
+  std::vector<float> GetEncoderInput(OnlineStream *s) const {
+    const auto num_processed_frames = s->GetNumProcessedFrames();
+    std::vector<float> frames = s->GetFrames(num_processed_frames, chunk_size_);
+    s->GetNumProcessedFrames() += chunk_size_ - 1;
+
+    frames = ApplyLfrAndCmvn(frames);
+    PositionalEncoding(&frames, num_processed_frames / model_.LfrWindowShift());
+
+    int32_t feat_dim = model_.NegativeMean().size();
+
+    // We have scaled inv_stddev by sqrt(encoder_output_size)
+    // so the following line can be commented out
+    // frames *= encoder_output_size ** 0.5
+
+    // add overlap chunk
+    std::vector<float> &feat_cache = s->GetParaformerFeatCache();
+    if (feat_cache.empty()) {
+      int32_t n = (left_chunk_size_ + right_chunk_size_) * feat_dim;
+      feat_cache.resize(n, 0);
+    }
+
+    frames.insert(frames.begin(), feat_cache.begin(), feat_cache.end());
+    std::copy(frames.end() - feat_cache.size(), frames.end(),
+              feat_cache.begin());
+
+    return frames;
+  }
+
+  // Continuous integrate-and-fire over the encoder output of a stream.
+  //
+  // @param s The stream. Its CIF cache is updated in place.
+  // @param encoder_out Pointer to an array of shape (num_frames, dim)
+  // @param alpha Pointer to an array of shape (num_frames,)
+  // @return Return the fired acoustic embeddings of shape (num_tokens, dim)
+  std::vector<float> CifSearch(OnlineStream *s, const float *encoder_out,
+                               const float *alpha, int32_t num_frames,
+                               int32_t dim) const {
     std::vector<float> &initial_hidden = s->GetParaformerEncoderOutCache();
     if (initial_hidden.empty()) {
-      initial_hidden.resize(encoder_out_shape[2]);
+      initial_hidden.resize(dim);
     }
 
     std::vector<float> &alpha_cache = s->GetParaformerAlphaCache();
@@ -284,107 +424,183 @@ class OnlineRecognizerParaformerImpl : public OnlineRecognizerImpl {
     }
 
     std::vector<float> acoustic_embedding;
-    acoustic_embedding.reserve(encoder_out_shape[1] * encoder_out_shape[2]);
+    acoustic_embedding.reserve(num_frames * dim);
 
     float threshold = 1.0;
 
     float integrate = alpha_cache[0];
 
-    for (int32_t i = 0; i != encoder_out_shape[1]; ++i) {
-      float this_alpha = p_alpha[i];
+    for (int32_t i = 0; i != num_frames; ++i) {
+      float this_alpha = alpha[i];
       if (integrate + this_alpha < threshold) {
         integrate += this_alpha;
-        ScaleAddInPlace(p_encoder_out + i * encoder_out_shape[2],
-                        encoder_out_shape[2], this_alpha,
+        ScaleAddInPlace(encoder_out + i * dim, dim, this_alpha,
                         initial_hidden.data());
         continue;
       }
 
       // fire
-      ScaleAddInPlace(p_encoder_out + i * encoder_out_shape[2],
-                      encoder_out_shape[2], threshold - integrate,
+      ScaleAddInPlace(encoder_out + i * dim, dim, threshold - integrate,
                       initial_hidden.data());
       acoustic_embedding.insert(acoustic_embedding.end(),
                                 initial_hidden.begin(), initial_hidden.end());
       integrate += this_alpha - threshold;
 
-      Scale(p_encoder_out + i * encoder_out_shape[2], encoder_out_shape[2],
-            integrate, initial_hidden.data());
+      Scale(encoder_out + i * dim, dim, integrate, initial_hidden.data());
     }
 
     alpha_cache[0] = integrate;
 
-    if (acoustic_embedding.empty()) {
-      return;
-    }
-
-    auto &states = s->GetStates();
-    if (states.empty()) {
-      states.reserve(model_.DecoderNumBlocks());
-
-      std::array<int64_t, 3> shape{1, model_.EncoderOutputSize(),
-                                   model_.DecoderKernelSize() - 1};
-
-      int32_t num_bytes = sizeof(float) * shape[0] * shape[1] * shape[2];
-
-      for (int32_t i = 0; i != model_.DecoderNumBlocks(); ++i) {
-        Ort::Value this_state = Ort::Value::CreateTensor<float>(
-            model_.Allocator(), shape.data(), shape.size());
+    return acoustic_embedding;
+  }
 
-        memset(this_state.GetTensorMutableData<float>(), 0, num_bytes);
+  // Run the decoder on streams that have the same number of acoustic
+  // embeddings and append the decoded tokens to their results.
+  //
+  // @param ss Pointer to an array of n streams
+  // @param num_processed_frames num_processed_frames[i] is the number of
+  //                             processed frames of ss[i] before this chunk
+  // @param n Number of streams
+  // @param encoder_out A tensor of shape (n, T, C)
+  // @param encoder_out_len A tensor of shape (n,)
+  // @param acoustic_embedding A flattened array of shape (n, num_tokens, C)
+  void RunDecoder(OnlineStream **ss, const int32_t *num_processed_frames,
+                  int32_t n, Ort::Value encoder_out, Ort::Value encoder_out_len,
+                  std::vector<float> acoustic_embedding) const {
+    int32_t num_blocks = model_.DecoderNumBlocks();
+    for (int32_t i = 0; i != n; ++i) {
+      InitDecoderStates(ss[i]);
+    }
 
-        states.push_back(std::move(this_state));
+    std::vector<Ort::Value> states;
+    states.reserve(num_blocks);
+    if (n == 1) {
+      states = std::move(ss[0]->GetStates());
+    } else {
+      std::vector<const Ort::Value *> buf(n);
+      for (int32_t b = 0; b != num_blocks; ++b) {
+        for (int32_t i = 0; i != n; ++i) {
+          buf[i] = &ss[i]->GetStates()[b];
+        }
+        states.push_back(Cat(model_.Allocator(), buf, 0));
       }
     }
 
-    int32_t num_tokens = acoustic_embedding.size() / initial_hidden.size();
-    std::array<int64_t, 3> acoustic_embedding_shape{
-        1, num_tokens, static_cast<int32_t>(initial_hidden.size())};
+    int32_t dim = model_.EncoderOutputSize();
+    int32_t num_tokens = acoustic_embedding.size() / (n * dim);
+
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    std::array<int64_t, 3> acoustic_embedding_shape{n, num_tokens, dim};
 
     Ort::Value acoustic_embedding_tensor = Ort::Value::CreateTensor(
         memory_info, acoustic_embedding.data(), acoustic_embedding.size(),
         acoustic_embedding_shape.data(), acoustic_embedding_shape.size());
 
-    std::array<int64_t, 1> acoustic_embedding_length_shape{1};
-    Ort::Value acoustic_embedding_length_tensor = Ort::Value::CreateTensor(
-        memory_info, &num_tokens, 1, acoustic_embedding_length_shape.data(),
-        acoustic_embedding_length_shape.size());
+    std::vector<int32_t> acoustic_embedding_length(n, num_tokens);
+    std::array<int64_t, 1> acoustic_embedding_length_shape{n};
+    Ort::Value acoustic_embedding_length_tensor =
+        Ort::Value::CreateTensor(memory_info, acoustic_embedding_length.data(),
+                                 acoustic_embedding_length.size(),
+                                 acoustic_embedding_length_shape.data(),
+                                 acoustic_embedding_length_shape.size());
 
     auto decoder_out_vec = model_.ForwardDecoder(
         std::move(encoder_out), std::move(encoder_out_len),
         std::move(acoustic_embedding_tensor),
         std::move(acoustic_embedding_length_tensor), std::move(states));
 
-    states.reserve(model_.DecoderNumBlocks());
-    for (int32_t i = 2; i != decoder_out_vec.size(); ++i) {
+    for (int32_t i = 0; i != n; ++i) {
+      ss[i]->GetStates().clear();
+    }
+
+    for (int32_t b = 2; b != decoder_out_vec.size(); ++b) {
       // TODO(fangjun): When we change chunk_size_, we need to
-      // slice decoder_out_vec[i] accordingly.
-      states.push_back(std::move(decoder_out_vec[i]));
+      // slice decoder_out_vec[b] accordingly.
+      if (n == 1) {
+        ss[0]->GetStates().push_back(std::move(decoder_out_vec[b]));
+        continue;
+      }
+
+      std::vector<Ort::Value> v =
+          Unbind(model_.Allocator(), &decoder_out_vec[b], 0);
+      for (int32_t i = 0; i != n; ++i) {
+        ss[i]->GetStates().push_back(std::move(v[i]));
+      }
     }
 
     const auto &sample_ids = decoder_out_vec[1];
     const int64_t *p_sample_ids = sample_ids.GetTensorData<int64_t>();
 
-    bool non_blank_detected = false;
+    for (int32_t i = 0; i != n; ++i, p_sample_ids += num_tokens) {
+      bool non_blank_detected = false;
 
-    auto &result = s->GetParaformerResult();
+      auto &result = ss[i]->GetParaformerResult();
 
-    for (int32_t i = 0; i != num_tokens; ++i) {
-      int32_t t = p_sample_ids[i];
-      if (t == 0) {
-        continue;
+      for (int32_t k = 0; k != num_tokens; ++k) {
+        int32_t t = p_sample_ids[k];
+        if (t == 0) {
+          continue;
+        }
+
+        non_blank_detected = true;
+        result.tokens.push_back(t);
       }
 
-      non_blank_detected = true;
-      result.tokens.push_back(t);
+      if (non_blank_detected) {
+        result.last_non_blank_frame_index = num_processed_frames[i];
+      }
+    }
+  }
+
+  void InitDecoderStates(OnlineStream *s) const {
+    auto &states = s->GetStates();
+    if (!states.empty()) {
+      return;
+    }
+
+    states.reserve(model_.DecoderNumBlocks());
+
+    std::array<int64_t, 3> shape{1, model_.EncoderOutputSize(),
+                                 model_.DecoderKernelSize() - 1};
+
+    int32_t num_bytes = sizeof(float) * shape[0] * shape[1] * shape[2];
+
+    for (int32_t i = 0; i != model_.DecoderNumBlocks(); ++i) {
+      Ort::Value this_state = Ort::Value::CreateTensor<float>(
+          model_.Allocator(), shape.data(), shape.size());
+
+      memset(this_state.GetTensorMutableData<float>(), 0, num_bytes);
+
+      states.push_back(std::move(this_state));
     }
+  }
 
-    if (non_blank_detected) {
-      result.last_non_blank_frame_index = num_processed_frames;
+  // All streams in a batch have the same encoder output length, so we
+  // take the first n entries of len. Its data type depends on how the
+  // model is exported.
+  Ort::Value RepeatLength(const Ort::Value &len, int32_t n) const {
+    std::array<int64_t, 1> shape{n};
+    auto type = len.GetTensorTypeAndShapeInfo().GetElementType();
+    if (type == ONNX_TENSOR_ELEMENT_DATA_TYPE_INT64) {
+      Ort::Value ans = Ort::Value::CreateTensor<int64_t>(
+          model_.Allocator(), shape.data(), shape.size());
+      const int64_t *p = len.GetTensorData<int64_t>();
+      std::copy(p, p + n, ans.GetTensorMutableData<int64_t>());
+      return ans;
     }
+
+    Ort::Value ans = Ort::Value::CreateTensor<int32_t>(
+        model_.Allocator(), shape.data(), shape.size());
+    const int32_t *p = len.GetTensorData<int32_t>();
+    std::copy(p, p + n, ans.GetTensorMutableData<int32_t>());
+    return ans;
   }
 
-  std::vector<float> ApplyLFR(const std::vector<float> &in) const {
+  // Stack every lfr_window_size frames with a shift of lfr_window_shift
+  // and apply CMVN to the stacked frames in a single pass.
+  std::vector<float> ApplyLfrAndCmvn(const std::vector<float> &in) const {
     int32_t lfr_window_size = model_.LfrWindowSize();
     int32_t lfr_window_shift = model_.LfrWindowShift();
     int32_t in_feat_dim = config_.feat_config.feature_dim;
@@ -396,35 +612,25 @@ class OnlineRecognizerParaformerImpl : public OnlineRecognizerImpl {
 
     std::vector<float> out(out_num_frames * out_feat_dim);
 
-    const float *p_in = in.data();
-    float *p_out = out.data();
+    using RowMajorMat =
+        Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>;
 
-    for (int32_t i = 0; i != out_num_frames; ++i) {
-      std::copy(p_in, p_in + out_feat_dim, p_out);
+    // Output frames overlap in the input, so the input is viewed as a
+    // matrix whose rows are lfr_window_shift input frames apart.
+    Eigen::Map<const RowMajorMat, 0, Eigen::OuterStride<>> x(
+        in.data(), out_num_frames, out_feat_dim,
+        Eigen::OuterStride<>(lfr_window_shift * in_feat_dim));
 
-      p_out += out_feat_dim;
-      p_in += lfr_window_shift * in_feat_dim;
-    }
-
-    return out;
-  }
-
-  void ApplyCMVN(std::vector<float> *v) const {
-    const std::vector<float> &neg_mean = model_.NegativeMean();
-    const std::vector<float> &inv_stddev = model_.InverseStdDev();
+    Eigen::Map<RowMajorMat> y(out.data(), out_num_frames, out_feat_dim);
 
-    int32_t dim = neg_mean.size();
-    int32_t num_frames = v->size() / dim;
+    Eigen::Map<const Eigen::RowVectorXf> neg_mean(model_.NegativeMean().data(),
+                                                  out_feat_dim);
+    Eigen::Map<const Eigen::RowVectorXf> inv_stddev(
+        model_.InverseStdDev().data(), out_feat_dim);
 
-    float *p = v->data();
+    y = (x.array().rowwise() + neg_mean.array()).rowwise() * inv_stddev.array();
 
-    for (int32_t i = 0; i != num_frames; ++i) {
-      for (int32_t k = 0; k != dim; ++k) {
-        p[k] = (p[k] + neg_mean[k]) * inv_stddev[k];
-      }
-
-      p += dim;
-    }
+    return out;
   }
 
   void PositionalEncoding(std::vector<float> *v, int32_t t_offset) const {
@@ -434,19 +640,13 @@ class OnlineRecognizerParaformerImpl : public OnlineRecognizerImpl {
     int32_t feat_dim = in_feat_dim * lfr_window_size;
     int32_t T = v->size() / feat_dim;
 
-    // log(10000)/(7*80/2-1) == 0.03301197265941284
-    // 7 is lfr_window_size
-    // 80 is in_feat_dim
-    // 7*80 is feat_dim
-    constexpr float kScale = -0.03301197265941284;
-
     for (int32_t t = 0; t != T; ++t) {
       float *p = v->data() + t * feat_dim;
 
       int32_t offset = t + 1 + t_offset;
 
       for (int32_t d = 0; d < feat_dim / 2; ++d) {
-        float inv_timescale = offset * std::exp(d * kScale);
+        float inv_timescale = offset * inv_timescales_[d];
 
         float sin_d = std::sin(inv_timescale);
         float cos_d = std::cos(inv_timescale);
@@ -469,6 +669,9 @@ class OnlineRecognizerParaformerImpl : public OnlineRecognizerImpl {
 
   int32_t left_chunk_size_ = 5;
   int32_t right_chunk_size_ = 3;
+
+  // exp(-d * log(10000) / (feat_dim / 2 - 1)) for positional encoding
+  std::vector<float> inv_timescales_;
 };
 
 }  // namespace sherpa_onnx
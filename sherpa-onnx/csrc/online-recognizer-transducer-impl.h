@@ -8,6 +8,7 @@
 #include <algorithm>
 #include <ios>
 #include <memory>
+#include <mutex>  // NOLINT
 #include <regex>  // NOLINT
 #include <sstream>
 #include <string>
@@ -15,6 +16,7 @@
 #include <vector>
 
 #include "sherpa-onnx/csrc/file-utils.h"
+#include "sherpa-onnx/csrc/lru-cache.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/offline-whisper-model.h"
 #include "sherpa-onnx/csrc/online-lm.h"
@@ -200,8 +202,12 @@ class OnlineRecognizerTransducerImpl : public OnlineRecognizerImpl {
     return stream;
   }
 
-  std::unique_ptr<OnlineStream> CreateStream(
-      const std::string &hotwords) const override {
+  ContextGraphPtr CompileHotwords(const std::string &hotwords) const override {
+    auto context_graph = hotwords_cache_.Get(hotwords);
+    if (context_graph) {
+      return context_graph;
+    }
+
     auto hws = std::regex_replace(hotwords, std::regex("/"), "\n");
     std::istringstream is(hws);
     std::vector<std::vector<int32_t>> current;
@@ -232,8 +238,20 @@ class OnlineRecognizerTransducerImpl : public OnlineRecognizerImpl {
       // Do nothing.
     }
 
-    auto context_graph = std::make_shared<ContextGraph>(
+    context_graph = std::make_shared<ContextGraph>(
         current, config_.hotwords_score, current_scores);
+    hotwords_cache_.Put(hotwords, context_graph);
+
+    return context_graph;
+  }
+
+  std::unique_ptr<OnlineStream> CreateStream(
+      const std::string &hotwords) const override {
+    return CreateStream(CompileHotwords(hotwords));
+  }
+
+  std::unique_ptr<OnlineStream> CreateStream(
+      ContextGraphPtr context_graph) const override {
     auto stream =
         std::make_unique<OnlineStream>(config_.feat_config, context_graph);
     InitOnlineStream(stream.get());
@@ -286,6 +304,33 @@ class OnlineRecognizerTransducerImpl : public OnlineRecognizerImpl {
 
     int32_t feature_dim = ss[0]->FeatureDim();
 
+    // If the given streams are exactly the streams of the slab from the
+    // previous call, we reuse its stacked states directly. In that case,
+    // the streams are decoded in the order of slab->streams.
+    std::shared_ptr<OnlineStateSlab> slab = ss[0]->GetStateSlab();
+    std::vector<OnlineStream *> streams;
+    std::vector<Ort::Value> states;
+    bool reuse = false;
+
+    if (slab) {
+      std::lock_guard<std::mutex> lock(slab->mutex);
+      reuse = !slab->states.empty() &&
+              static_cast<int32_t>(slab->streams.size()) == n;
+
+      for (int32_t i = 0; reuse && i != n; ++i) {
+        reuse = ss[i]->GetStateSlab() == slab;
+      }
+
+      if (reuse) {
+        streams = slab->streams;
+        states = std::move(slab->states);
+      }
+    }
+
+    if (!reuse) {
+      streams.assign(ss, ss + n);
+    }
+
     std::vector<OnlineTransducerDecoderResult> results(n);
     std::vector<float> features_vec(n * chunk_size * feature_dim);
     std::vector<std::vector<Ort::Value>> states_vec(n);
@@ -293,13 +338,15 @@ class OnlineRecognizerTransducerImpl : public OnlineRecognizerImpl {
     bool has_context_graph = false;
 
     for (int32_t i = 0; i != n; ++i) {
-      if (!has_context_graph && ss[i]->GetContextGraph()) {
+      OnlineStream *s = streams[i];
+
+      if (!has_context_graph && s->GetContextGraph()) {
         has_context_graph = true;
       }
 
-      const auto num_processed_frames = ss[i]->GetNumProcessedFrames();
+      const auto num_processed_frames = s->GetNumProcessedFrames();
       std::vector<float> features =
-          ss[i]->GetFrames(num_processed_frames, chunk_size);
+          s->GetFrames(num_processed_frames, chunk_size);
 
       if (config_.feat_config.is_whisper) {
         OfflineWhisperModel::NormalizeFeatures(features.data(), chunk_size,
@@ -307,13 +354,16 @@ class OnlineRecognizerTransducerImpl : public OnlineRecognizerImpl {
       }
 
       // Question: should num_processed_frames include chunk_shift?
-      ss[i]->GetNumProcessedFrames() += chunk_shift;
+      s->GetNumProcessedFrames() += chunk_shift;
 
       std::copy(features.begin(), features.end(),
                 features_vec.data() + i * chunk_size * feature_dim);
 
-      results[i] = std::move(ss[i]->GetResult());
-      states_vec[i] = std::move(ss[i]->GetStates());
+      results[i] = std::move(s->GetResult());
+      if (!reuse) {
+        TakeStatesFromSlab(s);
+        states_vec[i] = std::move(s->GetStates());
+      }
       all_processed_frames[i] = num_processed_frames;
     }
 
@@ -333,23 +383,36 @@ class OnlineRecognizerTransducerImpl : public OnlineRecognizerImpl {
         memory_info, all_processed_frames.data(), all_processed_frames.size(),
         processed_frames_shape.data(), processed_frames_shape.size());
 
-    auto states = model_->StackStates(states_vec);
+    if (!reuse) {
+      states = model_->StackStates(states_vec);
+    }
 
     auto pair = model_->RunEncoder(std::move(x), std::move(states),
                                    std::move(processed_frames));
 
     if (has_context_graph) {
-      decoder_->Decode(std::move(pair.first), ss, &results);
+      decoder_->Decode(std::move(pair.first), streams.data(), &results);
     } else {
       decoder_->Decode(std::move(pair.first), &results);
     }
 
-    std::vector<std::vector<Ort::Value>> next_states =
-        model_->UnStackStates(pair.second);
+    // The next states stay in the stacked form. They are unstacked only
+    // when the streams are not decoded together in the next call.
+    if (reuse) {
+      std::lock_guard<std::mutex> lock(slab->mutex);
+      slab->states = std::move(pair.second);
+    } else {
+      slab = std::make_shared<OnlineStateSlab>();
+      slab->streams = streams;
+      slab->states = std::move(pair.second);
+
+      for (auto s : streams) {
+        s->SetStateSlab(slab);
+      }
+    }
 
     for (int32_t i = 0; i != n; ++i) {
-      ss[i]->SetResult(results[i]);
-      ss[i]->SetStates(std::move(next_states[i]));
+      streams[i]->SetResult(results[i]);
     }
   }
 
@@ -508,11 +571,49 @@ class OnlineRecognizerTransducerImpl : public OnlineRecognizerImpl {
     stream->SetStates(model_->GetEncoderInitStates());
   }
 
+  // If the states of s are kept in a slab, move them back to s.
+  //
+  // The slab is unstacked on first use so that the other streams in it
+  // can also get their states back without another copy.
+  void TakeStatesFromSlab(OnlineStream *s) const {
+    std::shared_ptr<OnlineStateSlab> slab = s->GetStateSlab();
+    if (!slab) {
+      return;
+    }
+
+    std::vector<Ort::Value> states;
+    {
+      std::lock_guard<std::mutex> lock(slab->mutex);
+      if (!slab->states.empty()) {
+        slab->unstacked_states = model_->UnStackStates(slab->states);
+        slab->states.clear();
+      }
+
+      for (int32_t i = 0; i != static_cast<int32_t>(slab->streams.size());
+           ++i) {
+        if (slab->streams[i] == s) {
+          states = std::move(slab->unstacked_states[i]);
+          slab->streams[i] = nullptr;
+          break;
+        }
+      }
+    }
+
+    // It also removes s from the slab
+    s->SetStates(std::move(states));
+  }
+
  private:
   OnlineRecognizerConfig config_;
   std::vector<std::vector<int32_t>> hotwords_;
   std::vector<float> boost_scores_;
   ContextGraphPtr hotwords_graph_;
+
+  // Up to 100 compiled graphs of hotwords passed to CreateStream(), keyed
+  // by the hotwords text. A graph is not modified after it is built, so it
+  // can be shared by streams decoded in different threads.
+  mutable LruCache<ContextGraph> hotwords_cache_{100};
+
   std::unique_ptr<ssentencepiece::Ssentencepiece> bpe_encoder_;
   std::unique_ptr<OnlineTransducerModel> model_;
   std::unique_ptr<OnlineLM> lm_;
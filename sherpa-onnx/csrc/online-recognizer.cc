@@ -91,6 +91,11 @@ void OnlineRecognizerConfig::Register(ParseOptions *po) {
   ctc_fst_decoder_config.Register(po);
   hr.Register(po);
 
+  po->Register(
+      "num-decode-workers", &num_decode_workers,
+      "Number of threads to decode streams in parallel in DecodeStreams() "
+      "for CTC models that do not support batch processing, e.g., "
+      "WeNet CTC models");
   po->Register("enable-endpoint", &enable_endpoint,
                "True to enable endpoint detection. False to disable it.");
   po->Register("max-active-paths", &max_active_paths,
@@ -189,6 +194,12 @@ bool OnlineRecognizerConfig::Validate() const {
     return false;
   }
 
+  if (num_decode_workers < 1) {
+    SHERPA_ONNX_LOGE("num_decode_workers should be >= 1. Given: %d",
+                     num_decode_workers);
+    return false;
+  }
+
   return model_config.Validate();
 }
 
@@ -211,7 +222,8 @@ std::string OnlineRecognizerConfig::ToString() const {
   os << "rule_fsts=\"" << rule_fsts << "\", ";
   os << "rule_fars=\"" << rule_fars << "\", ";
   os << "reset_encoder=" << (reset_encoder ? "True" : "False") << ", ";
-  os << "hr=" << hr.ToString() << ")";
+  os << "hr=" << hr.ToString() << ", ";
+  os << "num_decode_workers=" << num_decode_workers << ")";
 
   return os.str();
 }
@@ -235,6 +247,16 @@ std::unique_ptr<OnlineStream> OnlineRecognizer::CreateStream(
   return impl_->CreateStream(hotwords);
 }
 
+ContextGraphPtr OnlineRecognizer::CompileHotwords(
+    const std::string &hotwords) const {
+  return impl_->CompileHotwords(hotwords);
+}
+
+std::unique_ptr<OnlineStream> OnlineRecognizer::CreateStream(
+    ContextGraphPtr hotwords) const {
+  return impl_->CreateStream(std::move(hotwords));
+}
+
 bool OnlineRecognizer::IsReady(OnlineStream *s) const {
   return impl_->IsReady(s);
 }
@@ -247,17 +269,71 @@ void OnlineRecognizer::WarmpUpRecognizer(int32_t warmup, int32_t mbs) const {
 
 void OnlineRecognizer::DecodeStreams(OnlineStream **ss, int32_t n) const {
   impl_->DecodeStreams(ss, n);
+
+  for (int32_t i = 0; i != n; ++i) {
+    ss[i]->GetCachedResult() = nullptr;
+  }
 }
 
 OnlineRecognizerResult OnlineRecognizer::GetResult(OnlineStream *s) const {
-  return impl_->GetResult(s);
+  return *GetSharedResult(s);
+}
+
+std::shared_ptr<const OnlineRecognizerResult> OnlineRecognizer::GetSharedResult(
+    OnlineStream *s) const {
+  auto &cached = s->GetCachedResult();
+  if (!cached) {
+    cached =
+        std::make_shared<const OnlineRecognizerResult>(impl_->GetResult(s));
+  }
+  return cached;
+}
+
+OnlineRecognizerResultDelta OnlineRecognizer::GetResultDelta(
+    OnlineStream *s) const {
+  auto r = GetSharedResult(s);
+  auto &last = s->GetLastPolledResult();
+
+  OnlineRecognizerResultDelta ans;
+  ans.segment = r->segment;
+
+  if (last == r) {
+    // not decoded since the last poll
+    ans.start = static_cast<int32_t>(r->tokens.size());
+    return ans;
+  }
+
+  int32_t start = 0;
+  if (last && last->segment == r->segment) {
+    // With greedy search, tokens are only appended. With beam search,
+    // the best path may change, so find the first token that differs.
+    auto n = std::min(last->tokens.size(), r->tokens.size());
+    start = static_cast<int32_t>(std::mismatch(r->tokens.begin(),
+                                               r->tokens.begin() + n,
+                                               last->tokens.begin())
+                                     .first -
+                                 r->tokens.begin());
+  }
+
+  ans.start = start;
+  ans.tokens.assign(r->tokens.begin() + start, r->tokens.end());
+  if (r->timestamps.size() == r->tokens.size()) {
+    ans.timestamps.assign(r->timestamps.begin() + start, r->timestamps.end());
+  }
+
+  last = std::move(r);
+
+  return ans;
 }
 
 bool OnlineRecognizer::IsEndpoint(OnlineStream *s) const {
   return impl_->IsEndpoint(s);
 }
 
-void OnlineRecognizer::Reset(OnlineStream *s) const { impl_->Reset(s); }
+void OnlineRecognizer::Reset(OnlineStream *s) const {
+  impl_->Reset(s);
+  s->GetCachedResult() = nullptr;
+}
 
 #if __ANDROID_API__ >= 9
 template OnlineRecognizer::OnlineRecognizer(
@@ -43,6 +43,10 @@ struct OnlineRecognizerResult {
   /// log-domain scores from "hot-phrase" contextual boosting
   std::vector<float> context_scores;
 
+  /// scores from the decoding graph for CTC decoding with an HLG, HL,
+  /// or H graph. ys_probs contains scores from the model in this case.
+  std::vector<float> graph_scores;
+
   std::vector<int32_t> words;
 
   /// ID of this segment
@@ -61,6 +65,12 @@ struct OnlineRecognizerResult {
   /// If it is true, it means the server has processed all received samples
   bool is_eof = false;
 
+  /// The N best results of this segment, best first. It is not empty only
+  /// for CTC decoding with an HLG, HL, or H graph and
+  /// ctc_fst_decoder_config.nbest > 1. The fields above are those of
+  /// nbest[0].
+  std::vector<OnlineRecognizerResult> nbest;
+
   /** Return a json string.
    *
    * The returned string contains:
@@ -80,6 +90,27 @@ struct OnlineRecognizerResult {
   std::string AsJsonString() const;
 };
 
+/// Tokens of a stream that have changed since the previous call of
+/// OnlineRecognizer::GetResultDelta().
+///
+/// To keep a copy of the tokens of the current segment in sync, drop
+/// tokens from index `start` on and append `tokens`. `start` is equal to
+/// the number of tokens returned so far for this segment unless previous
+/// tokens have been revised, e.g., by modified beam search.
+struct OnlineRecognizerResultDelta {
+  /// Index of tokens[0] in OnlineRecognizerResult::tokens
+  int32_t start = 0;
+
+  std::vector<std::string> tokens;
+
+  /// It is empty if the model does not output timestamps
+  std::vector<float> timestamps;
+
+  /// ID of the segment. If it differs from the previous one, an endpoint
+  /// has been detected and `start` is 0.
+  int32_t segment = 0;
+};
+
 struct OnlineRecognizerConfig {
   FeatureExtractorConfig feat_config;
   OnlineModelConfig model_config;
@@ -121,6 +152,10 @@ struct OnlineRecognizerConfig {
   /// "hotwords_file"
   std::string hotwords_buf;
 
+  // Number of threads to decode streams in parallel for CTC models that
+  // do not support batch processing
+  int32_t num_decode_workers = 1;
+
   OnlineRecognizerConfig() = default;
 
   OnlineRecognizerConfig(
@@ -132,7 +167,8 @@ struct OnlineRecognizerConfig {
       int32_t max_active_paths, const std::string &hotwords_file,
       float hotwords_score, float blank_penalty, float temperature_scale,
       const std::string &rule_fsts, const std::string &rule_fars,
-      bool reset_encoder, const HomophoneReplacerConfig &hr)
+      bool reset_encoder, const HomophoneReplacerConfig &hr,
+      int32_t num_decode_workers = 1)
       : feat_config(feat_config),
         model_config(model_config),
         lm_config(lm_config),
@@ -148,7 +184,8 @@ struct OnlineRecognizerConfig {
         rule_fsts(rule_fsts),
         rule_fars(rule_fars),
         reset_encoder(reset_encoder),
-        hr(hr) {}
+        hr(hr),
+        num_decode_workers(num_decode_workers) {}
 
   void Register(ParseOptions *po);
   bool Validate() const;
@@ -181,6 +218,21 @@ class OnlineRecognizer {
    */
   std::unique_ptr<OnlineStream> CreateStream(const std::string &hotwords) const;
 
+  /** Compile the given hotwords into a context graph.
+   *
+   * The result can be passed to CreateStream() to create streams that
+   * share the same graph. Compiled graphs are also cached inside the
+   * recognizer, so calling it again with the same hotwords is cheap.
+   *
+   * @param hotwords  See the above CreateStream().
+   */
+  ContextGraphPtr CompileHotwords(const std::string &hotwords) const;
+
+  /** Create a stream for decoding with hotwords compiled by
+   * CompileHotwords().
+   */
+  std::unique_ptr<OnlineStream> CreateStream(ContextGraphPtr hotwords) const;
+
   /**
    * Return true if the given stream has enough frames for decoding.
    * Return false otherwise
@@ -211,6 +263,16 @@ class OnlineRecognizer {
 
   OnlineRecognizerResult GetResult(OnlineStream *s) const;
 
+  // Same as GetResult() but without copying. The result is computed once
+  // and cached in the stream until the stream is decoded or reset, so it
+  // is cheap to poll it.
+  std::shared_ptr<const OnlineRecognizerResult> GetSharedResult(
+      OnlineStream *s) const;
+
+  // Return tokens that have changed since the last call of this function
+  // for the given stream.
+  OnlineRecognizerResultDelta GetResultDelta(OnlineStream *s) const;
+
   // Return true if we detect an endpoint for this stream.
   // Note: If this function returns true, you usually want to
   // invoke Reset(s).
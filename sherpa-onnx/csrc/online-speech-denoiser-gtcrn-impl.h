@@ -0,0 +1,206 @@
+// sherpa-onnx/csrc/online-speech-denoiser-gtcrn-impl.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_GTCRN_IMPL_H_
+#define SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_GTCRN_IMPL_H_
+
+#include <array>
+#include <cmath>
+#include <memory>
+#include <utility>
+#include <vector>
+
+#include "kaldi-native-fbank/csrc/feature-window.h"
+#include "kaldi-native-fbank/csrc/istft.h"
+#include "kaldi-native-fbank/csrc/stft.h"
+#include "sherpa-onnx/csrc/offline-speech-denoiser-gtcrn-model.h"
+#include "sherpa-onnx/csrc/online-speech-denoiser-impl.h"
+#include "sherpa-onnx/csrc/online-speech-denoiser.h"
+
+namespace sherpa_onnx {
+
+// GTCRN processes one STFT frame at a time and carries its recurrent states
+// from frame to frame, so it can be used for streaming.
+//
+// As in OfflineSpeechDenoiserGtcrnImpl, n_fft/2 samples are reflected at
+// both ends of the input, so the frames are the same as the offline ones
+// when hop_length is n_fft/2. An output sample is ready once all frames that
+// overlap with it are enhanced, so the output lags behind the input by
+// n_fft - hop_length samples.
+class OnlineSpeechDenoiserGtcrnImpl : public OnlineSpeechDenoiserImpl {
+ public:
+  explicit OnlineSpeechDenoiserGtcrnImpl(
+      const OnlineSpeechDenoiserConfig &config)
+      : model_(config.model) {
+    Init();
+  }
+
+  template <typename Manager>
+  OnlineSpeechDenoiserGtcrnImpl(Manager *mgr,
+                                const OnlineSpeechDenoiserConfig &config)
+      : model_(mgr, config.model) {
+    Init();
+  }
+
+  std::unique_ptr<OnlineSpeechDenoiserStream> CreateStream() const override {
+    const auto &meta = model_.GetMetaData();
+
+    // With the padding on the left, the first input sample is covered by as
+    // many frames as the other samples. The zeros on the right make sure
+    // that the last input sample is output.
+    auto s = std::make_unique<OnlineSpeechDenoiserStream>(
+        meta.sample_rate, (num_overlapped_frames_ - 1) * meta.hop_length,
+        meta.n_fft, meta.n_fft / 2);
+
+    s->GetStates() = model_.GetInitStates();
+    return s;
+  }
+
+  bool IsReady(OnlineSpeechDenoiserStream *s) const override {
+    return s->NumInputSamples() >= model_.GetMetaData().n_fft;
+  }
+
+  void Process(OnlineSpeechDenoiserStream **ss, int32_t n) const override {
+    std::vector<OnlineSpeechDenoiserStream *> ready;
+    ready.reserve(n);
+
+    while (true) {
+      ready.clear();
+      for (int32_t i = 0; i != n; ++i) {
+        if (IsReady(ss[i])) {
+          ready.push_back(ss[i]);
+        }
+      }
+
+      if (ready.empty()) {
+        break;
+      }
+
+      if (model_.SupportBatchProcessing()) {
+        ProcessFrame(ready.data(), static_cast<int32_t>(ready.size()));
+      } else {
+        for (auto s : ready) {
+          ProcessFrame(&s, 1);
+        }
+      }
+    }
+  }
+
+  int32_t GetSampleRate() const override {
+    return model_.GetMetaData().sample_rate;
+  }
+
+  int32_t GetLatency() const override {
+    const auto &meta = model_.GetMetaData();
+    return meta.n_fft - meta.hop_length;
+  }
+
+ private:
+  void Init() {
+    const auto &meta = model_.GetMetaData();
+
+    stft_config_.n_fft = meta.n_fft;
+    stft_config_.hop_length = meta.hop_length;
+    stft_config_.win_length = meta.window_length;
+    stft_config_.window_type = meta.window_type;
+    stft_config_.center = false;
+    if (stft_config_.window_type == "hann_sqrt") {
+      auto window = knf::GetWindow("hann", stft_config_.win_length);
+      for (auto &w : window) {
+        w = std::sqrt(w);
+      }
+      stft_config_.window = std::move(window);
+    }
+
+    num_overlapped_frames_ =
+        (meta.n_fft + meta.hop_length - 1) / meta.hop_length;
+  }
+
+  // Process the next frame of each stream in a single model call
+  void ProcessFrame(OnlineSpeechDenoiserStream **ss, int32_t n) const {
+    const auto &meta = model_.GetMetaData();
+    int32_t num_bins = meta.n_fft / 2 + 1;
+
+    knf::Stft stft(stft_config_);
+
+    std::vector<float> x(n * num_bins * 2);
+    std::vector<OfflineSpeechDenoiserGtcrnModel::States> states;
+    states.reserve(n);
+
+    for (int32_t k = 0; k != n; ++k) {
+      knf::StftResult r = stft.Compute(ss[k]->GetInputSamples(), meta.n_fft);
+      ss[k]->DiscardInputSamples(meta.hop_length);
+
+      float *p = x.data() + k * num_bins * 2;
+      for (int32_t i = 0; i != num_bins; ++i) {
+        p[2 * i] = r.real[i];
+        p[2 * i + 1] = r.imag[i];
+      }
+
+      states.push_back(std::move(ss[k]->GetStates()));
+    }
+
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    std::array<int64_t, 4> x_shape{n, num_bins, 1, 2};
+    Ort::Value x_tensor = Ort::Value::CreateTensor(
+        memory_info, x.data(), x.size(), x_shape.data(), x_shape.size());
+
+    auto out =
+        model_.Run(std::move(x_tensor), model_.StackStates(std::move(states)));
+
+    auto next_states = model_.UnStackStates(std::move(out.second));
+
+    const float *p = out.first.GetTensorData<float>();
+    for (int32_t k = 0; k != n; ++k) {
+      ss[k]->GetStates() = std::move(next_states[k]);
+      OverlapAdd(p + k * num_bins * 2, ss[k]);
+    }
+  }
+
+  // @param frame Enhanced frame of shape (n_fft/2+1, 2)
+  void OverlapAdd(const float *frame, OnlineSpeechDenoiserStream *s) const {
+    const auto &meta = model_.GetMetaData();
+    int32_t num_bins = meta.n_fft / 2 + 1;
+
+    auto &real = s->GetFramesReal();
+    auto &imag = s->GetFramesImag();
+    for (int32_t i = 0; i != num_bins; ++i) {
+      real.push_back(frame[2 * i]);
+      imag.push_back(frame[2 * i + 1]);
+    }
+
+    if (static_cast<int32_t>(real.size()) < num_overlapped_frames_ * num_bins) {
+      return;
+    }
+
+    knf::StftResult r;
+    r.num_frames = num_overlapped_frames_;
+    r.real = real;
+    r.imag = imag;
+
+    knf::IStft istft(stft_config_);
+    std::vector<float> samples = istft.Compute(r);
+
+    // Samples in this range are covered by all of the frames
+    s->AddDenoisedSamples(
+        samples.data() + (num_overlapped_frames_ - 1) * meta.hop_length,
+        meta.hop_length);
+
+    real.erase(real.begin(), real.begin() + num_bins);
+    imag.erase(imag.begin(), imag.begin() + num_bins);
+  }
+
+ private:
+  OfflineSpeechDenoiserGtcrnModel model_;
+  knf::StftConfig stft_config_;
+
+  // Number of frames that overlap with a sample
+  int32_t num_overlapped_frames_ = 1;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_GTCRN_IMPL_H_
@@ -0,0 +1,38 @@
+// sherpa-onnx/csrc/online-speech-denoiser-impl.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_IMPL_H_
+#define SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_IMPL_H_
+
+#include <memory>
+
+#include "sherpa-onnx/csrc/online-speech-denoiser.h"
+
+namespace sherpa_onnx {
+
+class OnlineSpeechDenoiserImpl {
+ public:
+  virtual ~OnlineSpeechDenoiserImpl() = default;
+
+  static std::unique_ptr<OnlineSpeechDenoiserImpl> Create(
+      const OnlineSpeechDenoiserConfig &config);
+
+  template <typename Manager>
+  static std::unique_ptr<OnlineSpeechDenoiserImpl> Create(
+      Manager *mgr, const OnlineSpeechDenoiserConfig &config);
+
+  virtual std::unique_ptr<OnlineSpeechDenoiserStream> CreateStream() const = 0;
+
+  virtual bool IsReady(OnlineSpeechDenoiserStream *s) const = 0;
+
+  virtual void Process(OnlineSpeechDenoiserStream **ss, int32_t n) const = 0;
+
+  virtual int32_t GetSampleRate() const = 0;
+
+  virtual int32_t GetLatency() const = 0;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_IMPL_H_
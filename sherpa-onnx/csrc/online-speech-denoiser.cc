@@ -0,0 +1,344 @@
+// sherpa-onnx/csrc/online-speech-denoiser.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/online-speech-denoiser.h"
+
+#include <algorithm>
+#include <memory>
+#include <sstream>
+#include <string>
+#include <utility>
+#include <vector>
+
+#if __ANDROID_API__ >= 9
+#include "android/asset_manager.h"
+#include "android/asset_manager_jni.h"
+#endif
+
+#if __OHOS__
+#include "rawfile/raw_file_manager.h"
+#endif
+
+#include "sherpa-onnx/csrc/macros.h"
+#include "sherpa-onnx/csrc/online-speech-denoiser-impl.h"
+#include "sherpa-onnx/csrc/resample.h"
+
+namespace sherpa_onnx {
+
+void OnlineSpeechDenoiserConfig::Register(ParseOptions *po) {
+  model.Register(po);
+}
+
+bool OnlineSpeechDenoiserConfig::Validate() const { return model.Validate(); }
+
+std::string OnlineSpeechDenoiserConfig::ToString() const {
+  std::ostringstream os;
+
+  os << "OnlineSpeechDenoiserConfig(";
+  os << "model=" << model.ToString() << ")";
+  return os.str();
+}
+
+class OnlineSpeechDenoiserStream::Impl {
+ public:
+  Impl(int32_t sample_rate, int32_t left_padding, int32_t right_padding,
+       int32_t reflect_padding)
+      : sample_rate_(sample_rate),
+        right_padding_(right_padding),
+        reflect_padding_(reflect_padding),
+        input_(left_padding - reflect_padding, 0),
+        left_reflected_(reflect_padding == 0) {}
+
+  void AcceptWaveform(int32_t sample_rate, const float *samples, int32_t n) {
+    if (input_finished_) {
+      SHERPA_ONNX_LOGE("Input is finished. Ignore the given samples");
+      return;
+    }
+
+    RemoveProcessedSamples();
+
+    if (sample_rate == sample_rate_) {
+      input_.insert(input_.end(), samples, samples + n);
+      num_input_samples_ += n;
+      ReflectLeft();
+      return;
+    }
+
+    if (!resampler_) {
+      SHERPA_ONNX_LOGE(
+          "Creating a resampler:\n"
+          "   in_sample_rate: %d\n"
+          "   output_sample_rate: %d\n",
+          sample_rate, sample_rate_);
+
+      float min_freq = std::min<int32_t>(sample_rate, sample_rate_);
+      float lowpass_cutoff = 0.99 * 0.5 * min_freq;
+
+      int32_t lowpass_filter_width = 6;
+      resampler_ = std::make_unique<LinearResample>(
+          sample_rate, sample_rate_, lowpass_cutoff, lowpass_filter_width);
+    } else if (resampler_->GetInputSamplingRate() != sample_rate) {
+      SHERPA_ONNX_LOGE(
+          "You changed the input sampling rate!! Expected: %d, given: "
+          "%d",
+          resampler_->GetInputSamplingRate(), sample_rate);
+      exit(-1);
+    }
+
+    std::vector<float> tmp;
+    resampler_->Resample(samples, n, false, &tmp);
+    input_.insert(input_.end(), tmp.begin(), tmp.end());
+    num_input_samples_ += tmp.size();
+    ReflectLeft();
+  }
+
+  void InputFinished() {
+    if (input_finished_) {
+      return;
+    }
+
+    RemoveProcessedSamples();
+
+    if (resampler_) {
+      std::vector<float> tmp;
+      resampler_->Resample(nullptr, 0, true, &tmp);
+      input_.insert(input_.end(), tmp.begin(), tmp.end());
+      num_input_samples_ += tmp.size();
+    }
+
+    ReflectLeft(true);
+    ReflectRight();
+
+    input_.resize(input_.size() + right_padding_, 0);
+    input_finished_ = true;
+  }
+
+  bool IsInputFinished() const { return input_finished_; }
+
+  std::vector<float> GetDenoisedSamples() {
+    std::vector<float> ans;
+    ans.swap(output_);
+    return ans;
+  }
+
+  const float *GetInputSamples() const { return input_.data() + offset_; }
+
+  int32_t NumInputSamples() const {
+    if (!left_reflected_) {
+      return 0;
+    }
+
+    return static_cast<int32_t>(input_.size() - offset_);
+  }
+
+  void DiscardInputSamples(int32_t n) {
+    offset_ = std::min(offset_ + n, input_.size());
+  }
+
+  std::vector<Ort::Value> &GetStates() { return states_; }
+
+  std::vector<float> &GetFramesReal() { return frames_real_; }
+
+  std::vector<float> &GetFramesImag() { return frames_imag_; }
+
+  void AddDenoisedSamples(const float *samples, int32_t n) {
+    n = static_cast<int32_t>(
+        std::min<int64_t>(n, num_input_samples_ - num_output_samples_));
+    if (n <= 0) {
+      return;
+    }
+
+    output_.insert(output_.end(), samples, samples + n);
+    num_output_samples_ += n;
+  }
+
+ private:
+  void RemoveProcessedSamples() {
+    // Keep the last samples for the reflection on the right
+    size_t n = std::min<size_t>(
+        offset_, std::max<int64_t>(0, static_cast<int64_t>(input_.size()) -
+                                          reflect_padding_ - 1));
+
+    input_.erase(input_.begin(), input_.begin() + n);
+    offset_ -= n;
+  }
+
+  // Insert x[reflect_padding_], ..., x[1] before the first input sample
+  // x[0]. If force is false, it waits until x[reflect_padding_] is
+  // available. Otherwise, missing samples are replaced with zeros.
+  void ReflectLeft(bool force = false) {
+    if (left_reflected_ || (!force && num_input_samples_ <= reflect_padding_)) {
+      return;
+    }
+
+    // Nothing is processed before the reflection is added
+    const float *x = input_.data() + input_.size() - num_input_samples_;
+
+    std::vector<float> tmp(reflect_padding_);
+    for (int32_t i = 0; i != reflect_padding_; ++i) {
+      int32_t k = reflect_padding_ - i;
+      tmp[i] = k < num_input_samples_ ? x[k] : 0;
+    }
+
+    input_.insert(input_.end() - num_input_samples_, tmp.begin(), tmp.end());
+    left_reflected_ = true;
+  }
+
+  // Append x[N-2], ..., x[N-1-reflect_padding_] after the last input
+  // sample x[N-1]
+  void ReflectRight() {
+    const float *end = input_.data() + input_.size();
+
+    std::vector<float> tmp(reflect_padding_);
+    for (int32_t i = 0; i != reflect_padding_; ++i) {
+      int32_t k = i + 2;
+      tmp[i] = k <= num_input_samples_ ? *(end - k) : 0;
+    }
+
+    input_.insert(input_.end(), tmp.begin(), tmp.end());
+  }
+
+ private:
+  int32_t sample_rate_;
+  int32_t right_padding_;
+  int32_t reflect_padding_;
+
+  std::unique_ptr<LinearResample> resampler_;
+
+  std::vector<float> input_;
+  // Samples before it are processed. They are removed in a single call
+  // when new samples are appended, instead of one hop at a time.
+  size_t offset_ = 0;
+  bool left_reflected_;
+
+  std::vector<Ort::Value> states_;
+  std::vector<float> frames_real_;
+  std::vector<float> frames_imag_;
+  std::vector<float> output_;
+
+  // Excluding the padding
+  int64_t num_input_samples_ = 0;
+  int64_t num_output_samples_ = 0;
+
+  bool input_finished_ = false;
+};
+
+OnlineSpeechDenoiserStream::OnlineSpeechDenoiserStream(int32_t sample_rate,
+                                                       int32_t left_padding,
+                                                       int32_t right_padding,
+                                                       int32_t reflect_padding)
+    : impl_(std::make_unique<Impl>(sample_rate, left_padding, right_padding,
+                                   reflect_padding)) {}
+
+OnlineSpeechDenoiserStream::~OnlineSpeechDenoiserStream() = default;
+
+void OnlineSpeechDenoiserStream::AcceptWaveform(int32_t sample_rate,
+                                                const float *samples,
+                                                int32_t n) {
+  impl_->AcceptWaveform(sample_rate, samples, n);
+}
+
+void OnlineSpeechDenoiserStream::InputFinished() { impl_->InputFinished(); }
+
+bool OnlineSpeechDenoiserStream::IsInputFinished() const {
+  return impl_->IsInputFinished();
+}
+
+std::vector<float> OnlineSpeechDenoiserStream::GetDenoisedSamples() {
+  return impl_->GetDenoisedSamples();
+}
+
+const float *OnlineSpeechDenoiserStream::GetInputSamples() const {
+  return impl_->GetInputSamples();
+}
+
+int32_t OnlineSpeechDenoiserStream::NumInputSamples() const {
+  return impl_->NumInputSamples();
+}
+
+void OnlineSpeechDenoiserStream::DiscardInputSamples(int32_t n) {
+  impl_->DiscardInputSamples(n);
+}
+
+std::vector<Ort::Value> &OnlineSpeechDenoiserStream::GetStates() {
+  return impl_->GetStates();
+}
+
+std::vector<float> &OnlineSpeechDenoiserStream::GetFramesReal() {
+  return impl_->GetFramesReal();
+}
+
+std::vector<float> &OnlineSpeechDenoiserStream::GetFramesImag() {
+  return impl_->GetFramesImag();
+}
+
+void OnlineSpeechDenoiserStream::AddDenoisedSamples(const float *samples,
+                                                    int32_t n) {
+  impl_->AddDenoisedSamples(samples, n);
+}
+
+OnlineSpeechDenoiser::OnlineSpeechDenoiser(
+    const OnlineSpeechDenoiserConfig &config)
+    : impl_(OnlineSpeechDenoiserImpl::Create(config)) {}
+
+template <typename Manager>
+OnlineSpeechDenoiser::OnlineSpeechDenoiser(
+    Manager *mgr, const OnlineSpeechDenoiserConfig &config)
+    : impl_(OnlineSpeechDenoiserImpl::Create(mgr, config)) {}
+
+OnlineSpeechDenoiser::~OnlineSpeechDenoiser() = default;
+
+std::unique_ptr<OnlineSpeechDenoiserStream> OnlineSpeechDenoiser::CreateStream()
+    const {
+  return impl_->CreateStream();
+}
+
+bool OnlineSpeechDenoiser::IsReady(OnlineSpeechDenoiserStream *s) const {
+  return impl_->IsReady(s);
+}
+
+void OnlineSpeechDenoiser::Process(OnlineSpeechDenoiserStream **ss,
+                                   int32_t n) const {
+  impl_->Process(ss, n);
+}
+
+DenoisedAudio OnlineSpeechDenoiser::Run(OnlineSpeechDenoiserStream *s,
+                                        const float *samples, int32_t n,
+                                        int32_t sample_rate) const {
+  s->AcceptWaveform(sample_rate, samples, n);
+  Process(&s, 1);
+
+  DenoisedAudio ans;
+  ans.sample_rate = GetSampleRate();
+  ans.samples = s->GetDenoisedSamples();
+  return ans;
+}
+
+DenoisedAudio OnlineSpeechDenoiser::Flush(OnlineSpeechDenoiserStream *s) const {
+  s->InputFinished();
+  Process(&s, 1);
+
+  DenoisedAudio ans;
+  ans.sample_rate = GetSampleRate();
+  ans.samples = s->GetDenoisedSamples();
+  return ans;
+}
+
+int32_t OnlineSpeechDenoiser::GetSampleRate() const {
+  return impl_->GetSampleRate();
+}
+
+int32_t OnlineSpeechDenoiser::GetLatency() const { return impl_->GetLatency(); }
+
+#if __ANDROID_API__ >= 9
+template OnlineSpeechDenoiser::OnlineSpeechDenoiser(
+    AAssetManager *mgr, const OnlineSpeechDenoiserConfig &config);
+#endif
+
+#if __OHOS__
+template OnlineSpeechDenoiser::OnlineSpeechDenoiser(
+    NativeResourceManager *mgr, const OnlineSpeechDenoiserConfig &config);
+#endif
+
+}  // namespace sherpa_onnx
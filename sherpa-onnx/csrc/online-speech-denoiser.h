@@ -0,0 +1,152 @@
+// sherpa-onnx/csrc/online-speech-denoiser.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_H_
+#define SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_H_
+
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "onnxruntime_cxx_api.h"  // NOLINT
+#include "sherpa-onnx/csrc/offline-speech-denoiser-model-config.h"
+#include "sherpa-onnx/csrc/offline-speech-denoiser.h"
+#include "sherpa-onnx/csrc/parse-options.h"
+
+namespace sherpa_onnx {
+
+struct OnlineSpeechDenoiserConfig {
+  // The same models as the ones for OfflineSpeechDenoiser are used
+  OfflineSpeechDenoiserModelConfig model;
+
+  OnlineSpeechDenoiserConfig() = default;
+  explicit OnlineSpeechDenoiserConfig(
+      const OfflineSpeechDenoiserModelConfig &model)
+      : model(model) {}
+
+  void Register(ParseOptions *po);
+  bool Validate() const;
+
+  std::string ToString() const;
+};
+
+class OnlineSpeechDenoiserStream {
+ public:
+  /**
+   * @param sample_rate Sample rate expected by the model.
+   * @param left_padding Number of samples added before the first sample.
+   *                     The last reflect_padding of them are the reflection
+   *                     of the first samples; the others are zeros.
+   * @param right_padding Number of zeros added after the last sample
+   *                      when InputFinished() is called.
+   * @param reflect_padding Number of samples reflected at both ends, as
+   *                        with center=true for an STFT. The reflection on
+   *                        the right goes before the zeros of right_padding.
+   */
+  OnlineSpeechDenoiserStream(int32_t sample_rate, int32_t left_padding,
+                             int32_t right_padding,
+                             int32_t reflect_padding = 0);
+  ~OnlineSpeechDenoiserStream();
+
+  /**
+   * @param sample_rate Sample rate of the input samples. If it is different
+   *                    from the one expected by the model, samples are
+   *                    resampled.
+   * @param samples 1-D array of audio samples. Each sample is in the
+   *                range [-1, 1].
+   * @param n Number of samples
+   */
+  void AcceptWaveform(int32_t sample_rate, const float *samples, int32_t n);
+
+  // Signal that no more samples will be given, so that the last samples
+  // can be denoised.
+  void InputFinished();
+
+  bool IsInputFinished() const;
+
+  // Return the denoised samples that are not returned before. They are
+  // at the sample rate of the model.
+  std::vector<float> GetDenoisedSamples();
+
+  // Used by OnlineSpeechDenoiser
+
+  // Samples at the sample rate of the model that are not processed yet.
+  // It is empty until the reflection on the left can be added.
+  const float *GetInputSamples() const;
+  int32_t NumInputSamples() const;
+
+  // Mark the first n samples returned by GetInputSamples() as processed.
+  // Processed samples are removed when more samples are accepted.
+  void DiscardInputSamples(int32_t n);
+
+  // Model states
+  std::vector<Ort::Value> &GetStates();
+
+  // Enhanced STFT frames that still contribute to samples that are not
+  // output yet. Each frame has n_fft/2+1 bins.
+  std::vector<float> &GetFramesReal();
+  std::vector<float> &GetFramesImag();
+
+  // Add denoised samples. Samples that come from the padding after the
+  // last input sample are discarded.
+  void AddDenoisedSamples(const float *samples, int32_t n);
+
+ private:
+  class Impl;
+  std::unique_ptr<Impl> impl_;
+};
+
+class OnlineSpeechDenoiserImpl;
+
+class OnlineSpeechDenoiser {
+ public:
+  explicit OnlineSpeechDenoiser(const OnlineSpeechDenoiserConfig &config);
+  ~OnlineSpeechDenoiser();
+
+  template <typename Manager>
+  OnlineSpeechDenoiser(Manager *mgr, const OnlineSpeechDenoiserConfig &config);
+
+  std::unique_ptr<OnlineSpeechDenoiserStream> CreateStream() const;
+
+  // Return true if the stream has enough samples for the next frame
+  bool IsReady(OnlineSpeechDenoiserStream *s) const;
+
+  /** Denoise all available frames of the given streams.
+   *
+   * Frames from different streams are processed in a single model call
+   * if the model supports it.
+   *
+   * @param ss Pointer to an array of streams.
+   * @param n  Number of streams in ss.
+   */
+  void Process(OnlineSpeechDenoiserStream **ss, int32_t n) const;
+
+  /** Accept a chunk of samples and return the denoised samples that are
+   * ready.
+   *
+   * The output lags behind the input by GetLatency() samples. Call Flush()
+   * at the end of the stream to get the remaining samples.
+   */
+  DenoisedAudio Run(OnlineSpeechDenoiserStream *s, const float *samples,
+                    int32_t n, int32_t sample_rate) const;
+
+  // Denoise the remaining samples of the stream
+  DenoisedAudio Flush(OnlineSpeechDenoiserStream *s) const;
+
+  /*
+   * Return the sample rate of the denoised audio
+   */
+  int32_t GetSampleRate() const;
+
+  // Return the algorithmic latency in samples at GetSampleRate(),
+  // i.e., n_fft - hop_length.
+  int32_t GetLatency() const;
+
+ private:
+  std::unique_ptr<OnlineSpeechDenoiserImpl> impl_;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_ONLINE_SPEECH_DENOISER_H_
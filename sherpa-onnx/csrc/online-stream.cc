@@ -23,6 +23,12 @@ class OnlineStream::Impl {
     feat_extractor_.AcceptWaveform(sampling_rate, waveform, n);
   }
 
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    feat_extractor_.AcceptWaveform(sampling_rate, waveform, n);
+  }
+
   void InputFinished() const {
     std::lock_guard<std::mutex> lock(mutex_);
     feat_extractor_.InputFinished();
@@ -108,6 +114,14 @@ class OnlineStream::Impl {
 
   std::vector<Ort::Value> &GetStates() { return states_; }
 
+  void SetStateSlab(std::shared_ptr<OnlineStateSlab> slab) {
+    state_slab_ = std::move(slab);
+  }
+
+  const std::shared_ptr<OnlineStateSlab> &GetStateSlab() const {
+    return state_slab_;
+  }
+
   void SetNeMoDecoderStates(std::vector<Ort::Value> decoder_states) {
     decoder_states_ = std::move(decoder_states);
   }
@@ -140,6 +154,20 @@ class OnlineStream::Impl {
     return faster_decoder_processed_frames_;
   }
 
+  void SetNbestDecoder(std::unique_ptr<CtcFstNbestDecoder> decoder) {
+    nbest_decoder_ = std::move(decoder);
+  }
+
+  CtcFstNbestDecoder *GetNbestDecoder() const { return nbest_decoder_.get(); }
+
+  std::shared_ptr<const OnlineRecognizerResult> &GetCachedResult() {
+    return cached_result_;
+  }
+
+  std::shared_ptr<const OnlineRecognizerResult> &GetLastPolledResult() {
+    return last_polled_result_;
+  }
+
  private:
   FeatureExtractor feat_extractor_;
   mutable std::mutex mutex_;
@@ -154,6 +182,7 @@ class OnlineStream::Impl {
   TransducerKeywordResult empty_keyword_result_;
   OnlineCtcDecoderResult ctc_result_;
   std::vector<Ort::Value> states_;  // states for transducer or ctc models
+  std::shared_ptr<OnlineStateSlab> state_slab_;
   std::vector<Ort::Value> decoder_states_;  // states for nemo transducer models
   std::vector<float> paraformer_feat_cache_;
   std::vector<float> paraformer_encoder_out_cache_;
@@ -161,19 +190,27 @@ class OnlineStream::Impl {
   OnlineParaformerDecoderResult paraformer_result_;
   std::unique_ptr<kaldi_decoder::FasterDecoder> faster_decoder_;
   int32_t faster_decoder_processed_frames_ = 0;
+  std::unique_ptr<CtcFstNbestDecoder> nbest_decoder_;
+  std::shared_ptr<const OnlineRecognizerResult> cached_result_;
+  std::shared_ptr<const OnlineRecognizerResult> last_polled_result_;
 };
 
 OnlineStream::OnlineStream(const FeatureExtractorConfig &config /*= {}*/,
                            ContextGraphPtr context_graph /*= nullptr */)
     : impl_(std::make_unique<Impl>(config, std::move(context_graph))) {}
 
-OnlineStream::~OnlineStream() = default;
+OnlineStream::~OnlineStream() { LeaveStateSlab(); }
 
 void OnlineStream::AcceptWaveform(int32_t sampling_rate, const float *waveform,
                                   int32_t n) const {
   impl_->AcceptWaveform(sampling_rate, waveform, n);
 }
 
+void OnlineStream::AcceptWaveform(int32_t sampling_rate,
+                                  const int16_t *waveform, int32_t n) const {
+  impl_->AcceptWaveform(sampling_rate, waveform, n);
+}
+
 void OnlineStream::InputFinished() const { impl_->InputFinished(); }
 
 int32_t OnlineStream::NumFramesReady() const { return impl_->NumFramesReady(); }
@@ -237,6 +274,7 @@ OnlineParaformerDecoderResult &OnlineStream::GetParaformerResult() {
 }
 
 void OnlineStream::SetStates(std::vector<Ort::Value> states) {
+  LeaveStateSlab();
   impl_->SetStates(std::move(states));
 }
 
@@ -244,6 +282,39 @@ std::vector<Ort::Value> &OnlineStream::GetStates() {
   return impl_->GetStates();
 }
 
+void OnlineStream::SetStateSlab(std::shared_ptr<OnlineStateSlab> slab) {
+  LeaveStateSlab();
+  impl_->SetStateSlab(std::move(slab));
+}
+
+const std::shared_ptr<OnlineStateSlab> &OnlineStream::GetStateSlab() const {
+  return impl_->GetStateSlab();
+}
+
+void OnlineStream::LeaveStateSlab() {
+  const auto &slab = impl_->GetStateSlab();
+  if (!slab) {
+    return;
+  }
+
+  {
+    std::lock_guard<std::mutex> lock(slab->mutex);
+    for (int32_t i = 0; i != static_cast<int32_t>(slab->streams.size());
+         ++i) {
+      if (slab->streams[i] != this) {
+        continue;
+      }
+
+      slab->streams[i] = nullptr;
+      if (!slab->unstacked_states.empty()) {
+        slab->unstacked_states[i].clear();
+      }
+    }
+  }
+
+  impl_->SetStateSlab(nullptr);
+}
+
 void OnlineStream::SetNeMoDecoderStates(
     std::vector<Ort::Value> decoder_states) {
   return impl_->SetNeMoDecoderStates(std::move(decoder_states));
@@ -270,6 +341,15 @@ int32_t &OnlineStream::GetFasterDecoderProcessedFrames() {
   return impl_->GetFasterDecoderProcessedFrames();
 }
 
+void OnlineStream::SetNbestDecoder(
+    std::unique_ptr<CtcFstNbestDecoder> decoder) {
+  impl_->SetNbestDecoder(std::move(decoder));
+}
+
+CtcFstNbestDecoder *OnlineStream::GetNbestDecoder() const {
+  return impl_->GetNbestDecoder();
+}
+
 std::vector<float> &OnlineStream::GetParaformerFeatCache() {
   return impl_->GetParaformerFeatCache();
 }
@@ -282,4 +362,13 @@ std::vector<float> &OnlineStream::GetParaformerAlphaCache() {
   return impl_->GetParaformerAlphaCache();
 }
 
+std::shared_ptr<const OnlineRecognizerResult> &OnlineStream::GetCachedResult() {
+  return impl_->GetCachedResult();
+}
+
+std::shared_ptr<const OnlineRecognizerResult> &
+OnlineStream::GetLastPolledResult() {
+  return impl_->GetLastPolledResult();
+}
+
 }  // namespace sherpa_onnx
@@ -6,6 +6,7 @@
 #define SHERPA_ONNX_CSRC_ONLINE_STREAM_H_
 
 #include <memory>
+#include <mutex>  // NOLINT
 #include <vector>
 
 #include "kaldi-decoder/csrc/faster-decoder.h"
@@ -18,7 +19,33 @@
 
 namespace sherpa_onnx {
 
+struct OnlineRecognizerResult;
 struct TransducerKeywordResult;
+class OnlineStream;
+
+// Encoder states of a batch of streams kept in the stacked form, i.e.,
+// the form that is passed to the encoder model.
+//
+// Streams that are decoded together keep their states in a slab between
+// two calls of DecodeStreams(), so the states need to be stacked and
+// unstacked only when a stream joins or leaves the batch.
+// See OnlineRecognizerTransducerImpl::DecodeStreams().
+struct OnlineStateSlab {
+  std::mutex mutex;
+
+  // streams[i] is the i-th entry of the batch. It is set to nullptr
+  // when the stream leaves the slab, e.g., when it is destroyed.
+  std::vector<OnlineStream *> streams;
+
+  // The stacked states of streams. It is empty once the slab has been
+  // unstacked.
+  std::vector<Ort::Value> states;
+
+  // Valid only if states is empty. unstacked_states[i] contains the states
+  // of streams[i].
+  std::vector<std::vector<Ort::Value>> unstacked_states;
+};
+
 class OnlineStream {
  public:
   explicit OnlineStream(const FeatureExtractorConfig &config = {},
@@ -37,6 +64,13 @@ class OnlineStream {
   void AcceptWaveform(int32_t sampling_rate, const float *waveform,
                       int32_t n) const;
 
+  /**
+     Same as the above one except that the input is 16-bit PCM, i.e., in
+     the range [-32768, 32767]. The samples are scaled inside.
+   */
+  void AcceptWaveform(int32_t sampling_rate, const int16_t *waveform,
+                      int32_t n) const;
+
   /**
    * InputFinished() tells the class you won't be providing any
    * more waveform.  This will help flush out the last frame or two
@@ -88,9 +122,18 @@ class OnlineStream {
   void SetParaformerResult(const OnlineParaformerDecoderResult &r);
   OnlineParaformerDecoderResult &GetParaformerResult();
 
+  // It also removes this stream from its state slab, if any.
   void SetStates(std::vector<Ort::Value> states);
+
+  // Note: If GetStateSlab() is not nullptr, the states of this stream are
+  // kept in the slab and the returned value is not valid.
   std::vector<Ort::Value> &GetStates();
 
+  // Put the states of this stream into a slab. It is called by the
+  // recognizer after it has added this stream to slab->streams.
+  void SetStateSlab(std::shared_ptr<OnlineStateSlab> slab);
+  const std::shared_ptr<OnlineStateSlab> &GetStateSlab() const;
+
   void SetNeMoDecoderStates(std::vector<Ort::Value> decoder_states);
   std::vector<Ort::Value> &GetNeMoDecoderStates();
 
@@ -106,11 +149,26 @@ class OnlineStream {
   kaldi_decoder::FasterDecoder *GetFasterDecoder() const;
   int32_t &GetFasterDecoderProcessedFrames();
 
+  // for online ctc decoder with nbest > 1. It is used in place of the
+  // FasterDecoder and GetFasterDecoderProcessedFrames() counts its frames.
+  void SetNbestDecoder(std::unique_ptr<CtcFstNbestDecoder> decoder);
+  CtcFstNbestDecoder *GetNbestDecoder() const;
+
   // for streaming paraformer
   std::vector<float> &GetParaformerFeatCache();
   std::vector<float> &GetParaformerEncoderOutCache();
   std::vector<float> &GetParaformerAlphaCache();
 
+  // Used by OnlineRecognizer::GetResult(). It is set to nullptr each time
+  // the stream is decoded or reset.
+  std::shared_ptr<const OnlineRecognizerResult> &GetCachedResult();
+
+  // The result at the last call of OnlineRecognizer::GetResultDelta().
+  std::shared_ptr<const OnlineRecognizerResult> &GetLastPolledResult();
+
+ private:
+  void LeaveStateSlab();
+
  private:
   class Impl;
   std::unique_ptr<Impl> impl_;
@@ -115,8 +115,11 @@ void OnlineTransducerModifiedBeamSearchDecoder::Decode(
     cur.clear();
     cur.reserve(batch_size);
 
-    Ort::Value decoder_input = model_->BuildDecoderInput(prev);
-    Ort::Value decoder_out = model_->RunDecoder(std::move(decoder_input));
+    Ort::Value decoder_out = decoder_out_cache_.Run(
+        model_->Allocator(), prev, model_->ContextSize(),
+        [this](Ort::Value decoder_input) {
+          return model_->RunDecoder(std::move(decoder_input));
+        });
     if (t == 0) {
       UseCachedDecoderOut(hyps_row_splits, *result, &decoder_out);
     }
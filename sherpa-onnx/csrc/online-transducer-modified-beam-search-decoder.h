@@ -8,6 +8,7 @@
 
 #include <vector>
 
+#include "sherpa-onnx/csrc/decoder-out-cache.h"
 #include "sherpa-onnx/csrc/online-lm.h"
 #include "sherpa-onnx/csrc/online-stream.h"
 #include "sherpa-onnx/csrc/online-transducer-decoder.h"
@@ -57,6 +58,9 @@ class OnlineTransducerModifiedBeamSearchDecoder
   int32_t unk_id_;
   float blank_penalty_;
   float temperature_scale_;
+
+  // Shared by all hyps of all streams
+  DecoderOutCache decoder_out_cache_;
 };
 
 }  // namespace sherpa_onnx
@@ -86,8 +86,8 @@ OnlineZipformer2TransducerModel::OnlineZipformer2TransducerModel(
 
 void OnlineZipformer2TransducerModel::InitEncoder(void *model_data,
                                                   size_t model_data_length) {
-  encoder_sess_ = std::make_unique<Ort::Session>(
-      env_, model_data, model_data_length, encoder_sess_opts_);
+  encoder_sess_ =
+      CreateSession(env_, model_data, model_data_length, encoder_sess_opts_);
 
   GetInputNames(encoder_sess_.get(), &encoder_input_names_,
                 &encoder_input_names_ptr_);
@@ -159,8 +159,8 @@ void OnlineZipformer2TransducerModel::InitEncoder(void *model_data,
 
 void OnlineZipformer2TransducerModel::InitDecoder(void *model_data,
                                                   size_t model_data_length) {
-  decoder_sess_ = std::make_unique<Ort::Session>(
-      env_, model_data, model_data_length, decoder_sess_opts_);
+  decoder_sess_ =
+      CreateSession(env_, model_data, model_data_length, decoder_sess_opts_);
 
   GetInputNames(decoder_sess_.get(), &decoder_input_names_,
                 &decoder_input_names_ptr_);
@@ -184,8 +184,8 @@ void OnlineZipformer2TransducerModel::InitDecoder(void *model_data,
 
 void OnlineZipformer2TransducerModel::InitJoiner(void *model_data,
                                                  size_t model_data_length) {
-  joiner_sess_ = std::make_unique<Ort::Session>(
-      env_, model_data, model_data_length, joiner_sess_opts_);
+  joiner_sess_ =
+      CreateSession(env_, model_data, model_data_length, joiner_sess_opts_);
 
   GetInputNames(joiner_sess_.get(), &joiner_input_names_,
                 &joiner_input_names_ptr_);
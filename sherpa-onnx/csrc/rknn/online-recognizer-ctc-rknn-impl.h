@@ -66,6 +66,7 @@ class OnlineRecognizerCtcRknnImpl : public OnlineRecognizerImpl {
     auto stream = std::make_unique<OnlineStreamRknn>(config_.feat_config);
     stream->SetZipformerEncoderStates(model_->GetInitStates());
     stream->SetFasterDecoder(decoder_->CreateFasterDecoder());
+    stream->SetNbestDecoder(decoder_->CreateNbestDecoder());
     return stream;
   }
 
@@ -23,6 +23,7 @@
 #include "sherpa-onnx/csrc/rknn/macros.h"
 #include "sherpa-onnx/csrc/rknn/utils.h"
 #include "sherpa-onnx/csrc/text-utils.h"
+#include "sherpa-onnx/csrc/vad-trigger.h"
 
 namespace sherpa_onnx {
 
@@ -79,10 +80,7 @@ class SileroVadModelRknn::Impl {
       std::fill(s.begin(), s.end(), 0);
     }
 
-    triggered_ = false;
-    current_sample_ = 0;
-    temp_start_ = 0;
-    temp_end_ = 0;
+    trigger_.Reset();
   }
 
   bool IsSpeech(const float *samples, int32_t n) {
@@ -95,66 +93,8 @@ class SileroVadModelRknn::Impl {
 
     float threshold = config_.silero_vad.threshold;
 
-    current_sample_ += config_.silero_vad.window_size;
-
-    if (prob > threshold && temp_end_ != 0) {
-      temp_end_ = 0;
-    }
-
-    if (prob > threshold && temp_start_ == 0) {
-      // start speaking, but we require that it must satisfy
-      // min_speech_duration
-      temp_start_ = current_sample_;
-      return false;
-    }
-
-    if (prob > threshold && temp_start_ != 0 && !triggered_) {
-      if (current_sample_ - temp_start_ < min_speech_samples_) {
-        return false;
-      }
-
-      triggered_ = true;
-
-      return true;
-    }
-
-    if ((prob < threshold) && !triggered_) {
-      // silence
-      temp_start_ = 0;
-      temp_end_ = 0;
-      return false;
-    }
-
-    if ((prob > threshold - 0.15) && triggered_) {
-      // speaking
-      return true;
-    }
-
-    if ((prob > threshold) && !triggered_) {
-      // start speaking
-      triggered_ = true;
-
-      return true;
-    }
-
-    if ((prob < threshold) && triggered_) {
-      // stop to speak
-      if (temp_end_ == 0) {
-        temp_end_ = current_sample_;
-      }
-
-      if (current_sample_ - temp_end_ < min_silence_samples_) {
-        // continue speaking
-        return true;
-      }
-      // stopped speaking
-      temp_start_ = 0;
-      temp_end_ = 0;
-      triggered_ = false;
-      return false;
-    }
-
-    return false;
+    return trigger_.IsSpeech(prob, threshold, config_.silero_vad.window_size,
+                             min_speech_samples_, min_silence_samples_);
   }
 
   int32_t WindowShift() const { return config_.silero_vad.window_size; }
@@ -351,10 +291,7 @@ class SileroVadModelRknn::Impl {
   int32_t min_silence_samples_;
   int32_t min_speech_samples_;
 
-  bool triggered_ = false;
-  int32_t current_sample_ = 0;
-  int32_t temp_start_ = 0;
-  int32_t temp_end_ = 0;
+  VadTrigger trigger_;
 
   int32_t window_overlap_ = 0;
 };
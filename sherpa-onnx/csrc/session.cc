@@ -5,6 +5,8 @@
 #include "sherpa-onnx/csrc/session.h"
 
 #include <algorithm>
+#include <memory>
+#include <mutex>  // NOLINT
 #include <string>
 #include <utility>
 #include <vector>
@@ -35,11 +37,125 @@ static void OrtStatusFailure(OrtStatus *status, const char *s) {
   api.ReleaseStatus(status);
 }
 
+static std::mutex g_mutex;
+
+// Set to true once any session options are created
+static bool g_session_options_created = false;
+
+// It owns the process-wide environment with global thread pools.
+// Environments created by models afterwards refer to the same one.
+static std::unique_ptr<Ort::Env> g_env;
+
+// Set to false if g_env turns out to have no global thread pools. It
+// happens if an onnxruntime environment existed before UseGlobalThreadPool()
+// was called, since onnxruntime then returns the existing environment.
+static bool g_global_thread_pool_available = true;
+
+static std::unique_ptr<Ort::PrepackedWeightsContainer> g_prepacked_weights;
+
+bool UseGlobalThreadPool(int32_t num_threads) {
+  std::lock_guard<std::mutex> lock(g_mutex);
+  if (g_env) {
+    return true;
+  }
+
+  if (g_session_options_created) {
+    SHERPA_ONNX_LOGE(
+        "Please call UseGlobalThreadPool() before creating any models");
+    return false;
+  }
+
+#if ORT_API_VERSION >= 13
+  Ort::ThreadingOptions tp_options;
+  tp_options.SetGlobalIntraOpNumThreads(num_threads);
+  tp_options.SetGlobalInterOpNumThreads(1);
+
+  g_env = std::make_unique<Ort::Env>(tp_options, ORT_LOGGING_LEVEL_ERROR,
+                                     "sherpa-onnx");
+  return true;
+#else
+  SHERPA_ONNX_LOGE(
+      "Global thread pools are not supported by onnxruntime API version %d",
+      static_cast<int32_t>(ORT_API_VERSION));
+  return false;
+#endif
+}
+
+void SharePrepackedWeights() {
+  std::lock_guard<std::mutex> lock(g_mutex);
+  if (!g_prepacked_weights) {
+    g_prepacked_weights = std::make_unique<Ort::PrepackedWeightsContainer>();
+  }
+}
+
+static std::unique_ptr<Ort::Session> CreateSessionImpl(
+    const Ort::Env &env, const void *model_data, size_t model_data_length,
+    const Ort::SessionOptions &sess_opts,
+    Ort::PrepackedWeightsContainer *prepacked_weights) {
+  if (prepacked_weights) {
+    return std::make_unique<Ort::Session>(env, model_data, model_data_length,
+                                          sess_opts, *prepacked_weights);
+  }
+
+  return std::make_unique<Ort::Session>(env, model_data, model_data_length,
+                                        sess_opts);
+}
+
+std::unique_ptr<Ort::Session> CreateSession(
+    const Ort::Env &env, const void *model_data, size_t model_data_length,
+    const Ort::SessionOptions &sess_opts) {
+  Ort::PrepackedWeightsContainer *prepacked_weights = nullptr;
+  bool use_global_thread_pool = false;
+  {
+    std::lock_guard<std::mutex> lock(g_mutex);
+    prepacked_weights = g_prepacked_weights.get();
+    use_global_thread_pool = g_env && g_global_thread_pool_available;
+  }
+
+  if (!use_global_thread_pool) {
+    return CreateSessionImpl(env, model_data, model_data_length, sess_opts,
+                             prepacked_weights);
+  }
+
+  // Per-session threads are disabled only here, so that the session falls
+  // back to its own thread pools if the environment has no global ones.
+  Ort::SessionOptions opts = sess_opts.Clone();
+  opts.DisablePerSessionThreads();
+
+  try {
+    return CreateSessionImpl(env, model_data, model_data_length, opts,
+                             prepacked_weights);
+  } catch (const Ort::Exception &e) {
+    std::string msg = e.what();
+    if (msg.find("CreateEnvWithGlobalThreadPools") == std::string::npos) {
+      throw;
+    }
+
+    SHERPA_ONNX_LOGE(
+        "The onnxruntime environment has no global thread pools. It was "
+        "probably created before UseGlobalThreadPool() was called. Use "
+        "per-session thread pools instead.");
+
+    std::lock_guard<std::mutex> lock(g_mutex);
+    g_global_thread_pool_available = false;
+  }
+
+  return CreateSessionImpl(env, model_data, model_data_length, sess_opts,
+                           prepacked_weights);
+}
+
 Ort::SessionOptions GetSessionOptionsImpl(
     int32_t num_threads, const std::string &provider_str,
     const ProviderConfig *provider_config /*= nullptr*/) {
   Provider p = StringToProvider(provider_str);
 
+  {
+    std::lock_guard<std::mutex> lock(g_mutex);
+    g_session_options_created = true;
+  }
+
+  // If UseGlobalThreadPool() has been called, CreateSession() disables
+  // per-session threads and these two settings are not used.
   Ort::SessionOptions sess_opts;
   sess_opts.SetIntraOpNumThreads(num_threads);
 
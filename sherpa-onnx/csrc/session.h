@@ -5,6 +5,7 @@
 #ifndef SHERPA_ONNX_CSRC_SESSION_H_
 #define SHERPA_ONNX_CSRC_SESSION_H_
 
+#include <memory>
 #include <string>
 
 #include "onnxruntime_cxx_api.h"  // NOLINT
@@ -34,6 +35,35 @@ Ort::SessionOptions GetSessionOptions(const T &config) {
   return GetSessionOptionsImpl(config.num_threads, config.provider);
 }
 
+/** Let all sessions in this process share a single intra-op thread pool
+ * with num_threads threads instead of creating a thread pool per session.
+ * num_threads in model configs is ignored afterwards.
+ *
+ * onnxruntime keeps only one environment per process, so this function
+ * must be called before any model is created. If an environment without
+ * global thread pools already exists, e.g., one created by another library,
+ * an error is logged when the first session is created and sessions keep
+ * using their own thread pools.
+ *
+ * @return Return true on success.
+ */
+bool UseGlobalThreadPool(int32_t num_threads);
+
+/** Let sessions that are created afterwards share their prepacked weights,
+ * so that N recognizers created from the same model keep only one copy of
+ * the weights that are prepacked by onnxruntime kernels.
+ *
+ * Shared weights are kept until the process exits.
+ */
+void SharePrepackedWeights();
+
+// Create a session from a model in memory. It should be used instead of
+// constructing Ort::Session directly so that SharePrepackedWeights() takes
+// effect.
+std::unique_ptr<Ort::Session> CreateSession(
+    const Ort::Env &env, const void *model_data, size_t model_data_length,
+    const Ort::SessionOptions &sess_opts);
+
 }  // namespace sherpa_onnx
 
 #endif  // SHERPA_ONNX_CSRC_SESSION_H_
@@ -4,6 +4,9 @@
 
 #include "sherpa-onnx/csrc/silero-vad-model.h"
 
+#include <algorithm>
+#include <array>
+#include <memory>
 #include <string>
 #include <utility>
 #include <vector>
@@ -17,13 +20,20 @@
 #include "rawfile/raw_file_manager.h"
 #endif
 
+#include "sherpa-onnx/csrc/cat.h"
 #include "sherpa-onnx/csrc/file-utils.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/onnx-utils.h"
 #include "sherpa-onnx/csrc/session.h"
+#include "sherpa-onnx/csrc/unbind.h"
+#include "sherpa-onnx/csrc/vad-trigger.h"
 
 namespace sherpa_onnx {
 
+struct SileroVadModelState : public VadModelState {
+  std::vector<Ort::Value> states;
+};
+
 class SileroVadModel::Impl {
  public:
   explicit Impl(const VadModelConfig &config)
@@ -70,24 +80,13 @@ class SileroVadModel::Impl {
   }
 
   float Run(const float *samples, int32_t n) {
-    if (is_v5_) {
-      return RunV5(samples, n);
-    } else {
-      return RunV4(samples, n);
-    }
+    return RunBatch(samples, 1, n, &states_)[0];
   }
 
   void Reset() {
-    if (is_v5_) {
-      ResetV5();
-    } else {
-      ResetV4();
-    }
+    states_ = GetInitStates();
 
-    triggered_ = false;
-    current_sample_ = 0;
-    temp_start_ = 0;
-    temp_end_ = 0;
+    trigger_.Reset();
   }
 
   bool IsSpeech(const float *samples, int32_t n) {
@@ -100,66 +99,8 @@ class SileroVadModel::Impl {
 
     float threshold = config_.silero_vad.threshold;
 
-    current_sample_ += config_.silero_vad.window_size;
-
-    if (prob > threshold && temp_end_ != 0) {
-      temp_end_ = 0;
-    }
-
-    if (prob > threshold && temp_start_ == 0) {
-      // start speaking, but we require that it must satisfy
-      // min_speech_duration
-      temp_start_ = current_sample_;
-      return false;
-    }
-
-    if (prob > threshold && temp_start_ != 0 && !triggered_) {
-      if (current_sample_ - temp_start_ < min_speech_samples_) {
-        return false;
-      }
-
-      triggered_ = true;
-
-      return true;
-    }
-
-    if ((prob < threshold) && !triggered_) {
-      // silence
-      temp_start_ = 0;
-      temp_end_ = 0;
-      return false;
-    }
-
-    if ((prob > threshold - 0.15) && triggered_) {
-      // speaking
-      return true;
-    }
-
-    if ((prob > threshold) && !triggered_) {
-      // start speaking
-      triggered_ = true;
-
-      return true;
-    }
-
-    if ((prob < threshold) && triggered_) {
-      // stop to speak
-      if (temp_end_ == 0) {
-        temp_end_ = current_sample_;
-      }
-
-      if (current_sample_ - temp_end_ < min_silence_samples_) {
-        // continue speaking
-        return true;
-      }
-      // stopped speaking
-      temp_start_ = 0;
-      temp_end_ = 0;
-      triggered_ = false;
-      return false;
-    }
-
-    return false;
+    return trigger_.IsSpeech(prob, threshold, config_.silero_vad.window_size,
+                             min_speech_samples_, min_silence_samples_);
   }
 
   int32_t WindowShift() const { return config_.silero_vad.window_size; }
@@ -180,10 +121,56 @@ class SileroVadModel::Impl {
     config_.silero_vad.threshold = threshold;
   }
 
+  std::unique_ptr<VadModelState> CreateState() {
+    auto ans = std::make_unique<SileroVadModelState>();
+    ans->states = GetInitStates();
+    return ans;
+  }
+
+  void ComputeBatch(const float *samples, int32_t n, VadModelState **states,
+                    float *probs) {
+    int32_t window_size = WindowSize();
+
+    if (n == 1 || !support_batch_) {
+      for (int32_t i = 0; i != n; ++i) {
+        auto s = static_cast<SileroVadModelState *>(states[i]);
+        probs[i] = RunBatch(samples + i * window_size, 1, window_size,
+                            &s->states)[0];
+      }
+      return;
+    }
+
+    // states of a single stream have shape (2, 1, hidden_dim), so we
+    // stack them along dim 1
+    int32_t num_states = is_v5_ ? 1 : 2;
+
+    std::vector<Ort::Value> batched_states;
+    batched_states.reserve(num_states);
+
+    std::vector<const Ort::Value *> buf(n);
+    for (int32_t k = 0; k != num_states; ++k) {
+      for (int32_t i = 0; i != n; ++i) {
+        buf[i] = &static_cast<SileroVadModelState *>(states[i])->states[k];
+      }
+      batched_states.push_back(Cat(allocator_, buf, 1));
+    }
+
+    std::vector<float> p = RunBatch(samples, n, window_size, &batched_states);
+
+    for (int32_t k = 0; k != num_states; ++k) {
+      std::vector<Ort::Value> v = Unbind(allocator_, &batched_states[k], 1);
+      for (int32_t i = 0; i != n; ++i) {
+        static_cast<SileroVadModelState *>(states[i])->states[k] =
+            std::move(v[i]);
+      }
+    }
+
+    std::copy(p.begin(), p.end(), probs);
+  }
+
  private:
   void Init(void *model_data, size_t model_data_length) {
-    sess_ = std::make_unique<Ort::Session>(env_, model_data, model_data_length,
-                                           sess_opts_);
+    sess_ = CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(sess_.get(), &input_names_, &input_names_ptr_);
     GetOutputNames(sess_.get(), &output_names_, &output_names_ptr_);
@@ -210,10 +197,24 @@ class SileroVadModel::Impl {
 
     Check();
 
+    // If the batch dim of the input is dynamic, we can run windows from
+    // several streams in a single batch
+    std::vector<int64_t> x_shape =
+        sess_->GetInputTypeInfo(0).GetTensorTypeAndShapeInfo().GetShape();
+    support_batch_ = !x_shape.empty() && x_shape[0] != 1;
+
     Reset();
   }
 
-  void ResetV5() {
+  std::vector<Ort::Value> GetInitStates() {
+    if (is_v5_) {
+      return GetInitStatesV5();
+    } else {
+      return GetInitStatesV4();
+    }
+  }
+
+  std::vector<Ort::Value> GetInitStatesV5() {
     // 2 - number of LSTM layer
     // 1 - batch size
     // 128 - hidden dim
@@ -223,11 +224,13 @@ class SileroVadModel::Impl {
         Ort::Value::CreateTensor<float>(allocator_, shape.data(), shape.size());
 
     Fill<float>(&s, 0);
-    states_.clear();
-    states_.push_back(std::move(s));
+
+    std::vector<Ort::Value> states;
+    states.push_back(std::move(s));
+    return states;
   }
 
-  void ResetV4() {
+  std::vector<Ort::Value> GetInitStatesV4() {
     // 2 - number of LSTM layer
     // 1 - batch size
     // 64 - hidden dim
@@ -242,11 +245,12 @@ class SileroVadModel::Impl {
     Fill<float>(&h, 0);
     Fill<float>(&c, 0);
 
-    states_.clear();
+    std::vector<Ort::Value> states;
 
-    states_.reserve(2);
-    states_.push_back(std::move(h));
-    states_.push_back(std::move(c));
+    states.reserve(2);
+    states.push_back(std::move(h));
+    states.push_back(std::move(c));
+    return states;
   }
 
   void Check() const {
@@ -369,42 +373,25 @@ class SileroVadModel::Impl {
     }
   }
 
-  float RunV5(const float *samples, int32_t n) {
-    auto memory_info =
-        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
-
-    std::array<int64_t, 2> x_shape = {1, n};
-
-    Ort::Value x =
-        Ort::Value::CreateTensor(memory_info, const_cast<float *>(samples), n,
-                                 x_shape.data(), x_shape.size());
-
-    int64_t sr_shape = 1;
-    Ort::Value sr =
-        Ort::Value::CreateTensor(memory_info, &sample_rate_, 1, &sr_shape, 1);
-
-    std::array<Ort::Value, 3> inputs = {std::move(x), std::move(states_[0]),
-                                        std::move(sr)};
-
-    auto out =
-        sess_->Run({}, input_names_ptr_.data(), inputs.data(), inputs.size(),
-                   output_names_ptr_.data(), output_names_ptr_.size());
-
-    states_[0] = std::move(out[1]);
-
-    float prob = out[0].GetTensorData<float>()[0];
-    return prob;
-  }
-
-  float RunV4(const float *samples, int32_t n) {
+  /**
+   * @param samples Pointer to a 2-d array of shape (batch_size, n)
+   * @param batch_size Number of windows
+   * @param n Number of samples per window
+   * @param states Model states with batch size batch_size. They are updated
+   *               in place.
+   *
+   * @return Return the speech probabilities of the batch_size windows.
+   */
+  std::vector<float> RunBatch(const float *samples, int32_t batch_size,
+                              int32_t n, std::vector<Ort::Value> *states) {
     auto memory_info =
         Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
 
-    std::array<int64_t, 2> x_shape = {1, n};
+    std::array<int64_t, 2> x_shape = {batch_size, n};
 
-    Ort::Value x =
-        Ort::Value::CreateTensor(memory_info, const_cast<float *>(samples), n,
-                                 x_shape.data(), x_shape.size());
+    Ort::Value x = Ort::Value::CreateTensor(
+        memory_info, const_cast<float *>(samples), batch_size * n,
+        x_shape.data(), x_shape.size());
 
     int64_t sr_shape = 1;
     Ort::Value sr =
@@ -414,21 +401,27 @@ class SileroVadModel::Impl {
     inputs.reserve(input_names_.size());
 
     inputs.push_back(std::move(x));
-    if (input_names_.size() == 4) {
+    if (is_v5_) {
+      inputs.push_back(std::move((*states)[0]));
       inputs.push_back(std::move(sr));
+    } else {
+      if (input_names_.size() == 4) {
+        inputs.push_back(std::move(sr));
+      }
+      inputs.push_back(std::move((*states)[0]));
+      inputs.push_back(std::move((*states)[1]));
     }
-    inputs.push_back(std::move(states_[0]));
-    inputs.push_back(std::move(states_[1]));
 
     auto out =
         sess_->Run({}, input_names_ptr_.data(), inputs.data(), inputs.size(),
                    output_names_ptr_.data(), output_names_ptr_.size());
 
-    states_[0] = std::move(out[1]);
-    states_[1] = std::move(out[2]);
+    for (int32_t i = 1; i != static_cast<int32_t>(out.size()); ++i) {
+      (*states)[i - 1] = std::move(out[i]);
+    }
 
-    float prob = out[0].GetTensorData<float>()[0];
-    return prob;
+    const float *p = out[0].GetTensorData<float>();
+    return {p, p + batch_size};
   }
 
  private:
@@ -451,14 +444,14 @@ class SileroVadModel::Impl {
   int32_t min_silence_samples_;
   int32_t min_speech_samples_;
 
-  bool triggered_ = false;
-  int32_t current_sample_ = 0;
-  int32_t temp_start_ = 0;
-  int32_t temp_end_ = 0;
+  VadTrigger trigger_;
 
   int32_t window_overlap_ = 0;
 
   bool is_v5_ = false;
+
+  // true if the model accepts batch size > 1
+  bool support_batch_ = false;
 };
 
 SileroVadModel::SileroVadModel(const VadModelConfig &config)
@@ -500,6 +493,15 @@ float SileroVadModel::Compute(const float *samples, int32_t n) {
   return impl_->Run(samples, n);
 }
 
+std::unique_ptr<VadModelState> SileroVadModel::CreateState() {
+  return impl_->CreateState();
+}
+
+void SileroVadModel::ComputeBatch(const float *samples, int32_t n,
+                                  VadModelState **states, float *probs) {
+  impl_->ComputeBatch(samples, n, states, probs);
+}
+
 #if __ANDROID_API__ >= 9
 template SileroVadModel::SileroVadModel(AAssetManager *mgr,
                                         const VadModelConfig &config);
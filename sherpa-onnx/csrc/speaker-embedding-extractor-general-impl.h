@@ -5,11 +5,13 @@
 #ifndef SHERPA_ONNX_CSRC_SPEAKER_EMBEDDING_EXTRACTOR_GENERAL_IMPL_H_
 #define SHERPA_ONNX_CSRC_SPEAKER_EMBEDDING_EXTRACTOR_GENERAL_IMPL_H_
 #include <algorithm>
+#include <array>
 #include <memory>
 #include <utility>
 #include <vector>
 
 #include "Eigen/Dense"
+#include "sherpa-onnx/csrc/length-buckets.h"
 #include "sherpa-onnx/csrc/speaker-embedding-extractor-impl.h"
 #include "sherpa-onnx/csrc/speaker-embedding-extractor-model.h"
 
@@ -43,31 +45,116 @@ class SpeakerEmbeddingExtractorGeneralImpl
   }
 
   std::vector<float> Compute(OnlineStream *s) const override {
-    int32_t num_frames = s->NumFramesReady() - s->GetNumProcessedFrames();
-    if (num_frames <= 0) {
+    int32_t num_frames = 0;
+    std::vector<float> features = GetFeatures(s, &num_frames);
+    if (features.empty()) {
+      return {};
+    }
+
+    int32_t feat_dim = features.size() / num_frames;
+
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    std::array<int64_t, 3> x_shape{1, num_frames, feat_dim};
+    Ort::Value x =
+        Ort::Value::CreateTensor(memory_info, features.data(), features.size(),
+                                 x_shape.data(), x_shape.size());
+    Ort::Value embedding = model_.Compute(std::move(x));
+    std::vector<int64_t> embedding_shape =
+        embedding.GetTensorTypeAndShapeInfo().GetShape();
+
+    std::vector<float> ans(embedding_shape[1]);
+    std::copy(embedding.GetTensorData<float>(),
+              embedding.GetTensorData<float>() + ans.size(), ans.begin());
+
+    return ans;
+  }
+
+  std::vector<std::vector<float>> Compute(OnlineStream **ss,
+                                          int32_t n) const override {
+    if (n == 1 || !model_.SupportBatchProcessing()) {
+      return SpeakerEmbeddingExtractorImpl::Compute(ss, n);
+    }
+
+    std::vector<std::vector<float>> features(n);
+    std::vector<int32_t> num_frames(n);
+    for (int32_t i = 0; i != n; ++i) {
+      features[i] = GetFeatures(ss[i], &num_frames[i]);
+    }
+
+    // The model has no input for the number of valid frames and its pooling
+    // layer would also average over padded frames, so only streams with
+    // the same number of frames are put into the same batch.
+    auto buckets = SplitIntoLengthBuckets(num_frames.data(), n, 0, 0);
+
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    std::vector<std::vector<float>> ans(n);
+    for (const auto &b : buckets) {
+      int32_t batch_size = static_cast<int32_t>(b.size());
+      int32_t t = num_frames[b[0]];
+      if (t <= 0) {
+        // GetFeatures() has already printed an error message
+        continue;
+      }
+
+      int32_t feat_dim = features[b[0]].size() / t;
+
+      std::vector<float> x(batch_size * t * feat_dim);
+      float *p = x.data();
+      for (auto i : b) {
+        std::copy(features[i].begin(), features[i].end(), p);
+        p += features[i].size();
+        features[i] = {};
+      }
+
+      std::array<int64_t, 3> x_shape{batch_size, t, feat_dim};
+      Ort::Value x_tensor = Ort::Value::CreateTensor(
+          memory_info, x.data(), x.size(), x_shape.data(), x_shape.size());
+
+      Ort::Value embedding = model_.Compute(std::move(x_tensor));
+      int32_t dim = embedding.GetTensorTypeAndShapeInfo().GetShape()[1];
+      const float *e = embedding.GetTensorData<float>();
+
+      for (int32_t k = 0; k != batch_size; ++k) {
+        ans[b[k]] = {e + k * dim, e + (k + 1) * dim};
+      }
+    }
+
+    return ans;
+  }
+
+ private:
+  // Return the normalized features of the unprocessed frames and mark
+  // them as processed. Return an empty vector if there are no such frames.
+  std::vector<float> GetFeatures(OnlineStream *s, int32_t *num_frames) const {
+    *num_frames = s->NumFramesReady() - s->GetNumProcessedFrames();
+    if (*num_frames <= 0) {
 #if __OHOS__
       SHERPA_ONNX_LOGE(
           "Please make sure IsReady(s) returns true. num_frames: %{public}d",
-          num_frames);
+          *num_frames);
 #else
       SHERPA_ONNX_LOGE(
           "Please make sure IsReady(s) returns true. num_frames: %d",
-          num_frames);
+          *num_frames);
 #endif
       return {};
     }
 
     std::vector<float> features =
-        s->GetFrames(s->GetNumProcessedFrames(), num_frames);
+        s->GetFrames(s->GetNumProcessedFrames(), *num_frames);
 
-    s->GetNumProcessedFrames() += num_frames;
+    s->GetNumProcessedFrames() += *num_frames;
 
-    int32_t feat_dim = features.size() / num_frames;
+    int32_t feat_dim = features.size() / *num_frames;
 
     const auto &meta_data = model_.GetMetaData();
     if (!meta_data.feature_normalize_type.empty()) {
       if (meta_data.feature_normalize_type == "global-mean") {
-        SubtractGlobalMean(features.data(), num_frames, feat_dim);
+        SubtractGlobalMean(features.data(), *num_frames, feat_dim);
       } else {
 #if __OHOS__
         SHERPA_ONNX_LOGE("Unsupported feature_normalize_type: %{public}s",
@@ -80,25 +167,9 @@ class SpeakerEmbeddingExtractorGeneralImpl
       }
     }
 
-    auto memory_info =
-        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
-
-    std::array<int64_t, 3> x_shape{1, num_frames, feat_dim};
-    Ort::Value x =
-        Ort::Value::CreateTensor(memory_info, features.data(), features.size(),
-                                 x_shape.data(), x_shape.size());
-    Ort::Value embedding = model_.Compute(std::move(x));
-    std::vector<int64_t> embedding_shape =
-        embedding.GetTensorTypeAndShapeInfo().GetShape();
-
-    std::vector<float> ans(embedding_shape[1]);
-    std::copy(embedding.GetTensorData<float>(),
-              embedding.GetTensorData<float>() + ans.size(), ans.begin());
-
-    return ans;
+    return features;
   }
 
- private:
   void SubtractGlobalMean(float *p, int32_t num_frames,
                           int32_t feat_dim) const {
     auto m = Eigen::Map<
@@ -31,6 +31,19 @@ class SpeakerEmbeddingExtractorImpl {
   virtual bool IsReady(OnlineStream *s) const = 0;
 
   virtual std::vector<float> Compute(OnlineStream *s) const = 0;
+
+  // Compute embeddings of n streams. Implementations that support batch
+  // processing should override it. The default one processes the streams
+  // one by one.
+  virtual std::vector<std::vector<float>> Compute(OnlineStream **ss,
+                                                  int32_t n) const {
+    std::vector<std::vector<float>> ans;
+    ans.reserve(n);
+    for (int32_t i = 0; i != n; ++i) {
+      ans.push_back(Compute(ss[i]));
+    }
+    return ans;
+  }
 };
 
 }  // namespace sherpa_onnx
@@ -63,15 +63,20 @@ class SpeakerEmbeddingExtractorModel::Impl {
     return meta_data_;
   }
 
+  bool SupportBatchProcessing() const { return support_batch_processing_; }
+
  private:
   void Init(void *model_data, size_t model_data_length) {
-    sess_ = std::make_unique<Ort::Session>(env_, model_data, model_data_length,
-                                           sess_opts_);
+    sess_ = CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(sess_.get(), &input_names_, &input_names_ptr_);
 
     GetOutputNames(sess_.get(), &output_names_, &output_names_ptr_);
 
+    std::vector<int64_t> x_shape =
+        sess_->GetInputTypeInfo(0).GetTensorTypeAndShapeInfo().GetShape();
+    support_batch_processing_ = !x_shape.empty() && x_shape[0] < 0;
+
     // get meta data
     Ort::ModelMetadata meta_data = sess_->GetModelMetadata();
     if (config_.debug) {
@@ -124,6 +129,8 @@ class SpeakerEmbeddingExtractorModel::Impl {
   std::vector<const char *> output_names_ptr_;
 
   SpeakerEmbeddingExtractorModelMetaData meta_data_;
+
+  bool support_batch_processing_ = false;
 };
 
 SpeakerEmbeddingExtractorModel::SpeakerEmbeddingExtractorModel(
@@ -142,6 +149,10 @@ SpeakerEmbeddingExtractorModel::GetMetaData() const {
   return impl_->GetMetaData();
 }
 
+bool SpeakerEmbeddingExtractorModel::SupportBatchProcessing() const {
+  return impl_->SupportBatchProcessing();
+}
+
 Ort::Value SpeakerEmbeddingExtractorModel::Compute(Ort::Value x) const {
   return impl_->Compute(std::move(x));
 }
@@ -25,6 +25,9 @@ class SpeakerEmbeddingExtractorModel {
 
   const SpeakerEmbeddingExtractorModelMetaData &GetMetaData() const;
 
+  // Return true if the model accepts inputs with batch size > 1
+  bool SupportBatchProcessing() const;
+
   /**
    * @param x A float32 tensor of shape (N, T, C)
    * @return A float32 tensor of shape (N, C)
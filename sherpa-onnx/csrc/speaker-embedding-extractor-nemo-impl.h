@@ -5,11 +5,13 @@
 #ifndef SHERPA_ONNX_CSRC_SPEAKER_EMBEDDING_EXTRACTOR_NEMO_IMPL_H_
 #define SHERPA_ONNX_CSRC_SPEAKER_EMBEDDING_EXTRACTOR_NEMO_IMPL_H_
 #include <algorithm>
+#include <array>
 #include <memory>
 #include <utility>
 #include <vector>
 
 #include "Eigen/Dense"
+#include "sherpa-onnx/csrc/length-buckets.h"
 #include "sherpa-onnx/csrc/speaker-embedding-extractor-impl.h"
 #include "sherpa-onnx/csrc/speaker-embedding-extractor-nemo-model.h"
 #include "sherpa-onnx/csrc/transpose.h"
@@ -51,44 +53,14 @@ class SpeakerEmbeddingExtractorNeMoImpl : public SpeakerEmbeddingExtractorImpl {
   }
 
   std::vector<float> Compute(OnlineStream *s) const override {
-    int32_t num_frames = s->NumFramesReady() - s->GetNumProcessedFrames();
-    if (num_frames <= 0) {
-#if __OHOS__
-      SHERPA_ONNX_LOGE(
-          "Please make sure IsReady(s) returns true. num_frames: %{public}d",
-          num_frames);
-#else
-      SHERPA_ONNX_LOGE(
-          "Please make sure IsReady(s) returns true. num_frames: %d",
-          num_frames);
-#endif
+    int32_t num_frames = 0;
+    std::vector<float> features = GetFeatures(s, &num_frames);
+    if (features.empty()) {
       return {};
     }
 
-    std::vector<float> features =
-        s->GetFrames(s->GetNumProcessedFrames(), num_frames);
-
-    s->GetNumProcessedFrames() += num_frames;
-
     int32_t feat_dim = features.size() / num_frames;
 
-    const auto &meta_data = model_.GetMetaData();
-    if (!meta_data.feature_normalize_type.empty()) {
-      if (meta_data.feature_normalize_type == "per_feature") {
-        NormalizePerFeature(features.data(), num_frames, feat_dim);
-      } else {
-#if __OHOS__
-        SHERPA_ONNX_LOGE("Unsupported feature_normalize_type: %{public}s",
-                         meta_data.feature_normalize_type.c_str());
-#else
-
-        SHERPA_ONNX_LOGE("Unsupported feature_normalize_type: %s",
-                         meta_data.feature_normalize_type.c_str());
-#endif
-        exit(-1);
-      }
-    }
-
     if (num_frames % 16 != 0) {
       int32_t pad = 16 - num_frames % 16;
       features.resize((num_frames + pad) * feat_dim);
@@ -121,7 +93,123 @@ class SpeakerEmbeddingExtractorNeMoImpl : public SpeakerEmbeddingExtractorImpl {
     return ans;
   }
 
+  std::vector<std::vector<float>> Compute(OnlineStream **ss,
+                                          int32_t n) const override {
+    if (n == 1 || !model_.SupportBatchProcessing()) {
+      return SpeakerEmbeddingExtractorImpl::Compute(ss, n);
+    }
+
+    std::vector<std::vector<float>> features(n);
+    std::vector<int32_t> num_frames(n);
+    for (int32_t i = 0; i != n; ++i) {
+      features[i] = GetFeatures(ss[i], &num_frames[i]);
+    }
+
+    // The model takes the number of valid frames of each utterance as
+    // input, so padded frames are masked out. Streams of similar lengths
+    // are grouped to avoid wasting computation on padding.
+    auto buckets =
+        SplitIntoLengthBuckets(num_frames.data(), n, kMaxPaddingRatio, 0);
+
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
+
+    std::vector<std::vector<float>> ans(n);
+    for (auto b : buckets) {
+      // Streams without frames have an empty embedding. GetFeatures() has
+      // already printed an error message for them.
+      b.erase(std::remove_if(
+                  b.begin(), b.end(),
+                  [&num_frames](int32_t i) { return num_frames[i] <= 0; }),
+              b.end());
+      if (b.empty()) {
+        continue;
+      }
+
+      int32_t batch_size = static_cast<int32_t>(b.size());
+
+      // Buckets are sorted by length in descending order
+      int32_t t = num_frames[b[0]];
+      int32_t feat_dim = features[b[0]].size() / t;
+
+      std::vector<float> x(batch_size * t * feat_dim);
+      std::vector<int64_t> x_lens(batch_size);
+      for (int32_t k = 0; k != batch_size; ++k) {
+        auto &f = features[b[k]];
+        std::copy(f.begin(), f.end(), x.data() + k * t * feat_dim);
+        x_lens[k] = num_frames[b[k]];
+        f = {};
+      }
+
+      std::array<int64_t, 3> x_shape{batch_size, t, feat_dim};
+      Ort::Value x_tensor = Ort::Value::CreateTensor(
+          memory_info, x.data(), x.size(), x_shape.data(), x_shape.size());
+
+      x_tensor = Transpose12(model_.Allocator(), &x_tensor);
+
+      std::array<int64_t, 1> x_lens_shape{batch_size};
+      Ort::Value x_lens_tensor =
+          Ort::Value::CreateTensor(memory_info, x_lens.data(), x_lens.size(),
+                                   x_lens_shape.data(), x_lens_shape.size());
+
+      Ort::Value embedding =
+          model_.Compute(std::move(x_tensor), std::move(x_lens_tensor));
+      int32_t dim = embedding.GetTensorTypeAndShapeInfo().GetShape()[1];
+      const float *e = embedding.GetTensorData<float>();
+
+      for (int32_t k = 0; k != batch_size; ++k) {
+        ans[b[k]] = {e + k * dim, e + (k + 1) * dim};
+      }
+    }
+
+    return ans;
+  }
+
  private:
+  // Return the normalized features of the unprocessed frames and mark
+  // them as processed. Return an empty vector if there are no such frames.
+  std::vector<float> GetFeatures(OnlineStream *s, int32_t *num_frames) const {
+    *num_frames = s->NumFramesReady() - s->GetNumProcessedFrames();
+    if (*num_frames <= 0) {
+#if __OHOS__
+      SHERPA_ONNX_LOGE(
+          "Please make sure IsReady(s) returns true. num_frames: %{public}d",
+          *num_frames);
+#else
+      SHERPA_ONNX_LOGE(
+          "Please make sure IsReady(s) returns true. num_frames: %d",
+          *num_frames);
+#endif
+      return {};
+    }
+
+    std::vector<float> features =
+        s->GetFrames(s->GetNumProcessedFrames(), *num_frames);
+
+    s->GetNumProcessedFrames() += *num_frames;
+
+    int32_t feat_dim = features.size() / *num_frames;
+
+    const auto &meta_data = model_.GetMetaData();
+    if (!meta_data.feature_normalize_type.empty()) {
+      if (meta_data.feature_normalize_type == "per_feature") {
+        NormalizePerFeature(features.data(), *num_frames, feat_dim);
+      } else {
+#if __OHOS__
+        SHERPA_ONNX_LOGE("Unsupported feature_normalize_type: %{public}s",
+                         meta_data.feature_normalize_type.c_str());
+#else
+
+        SHERPA_ONNX_LOGE("Unsupported feature_normalize_type: %s",
+                         meta_data.feature_normalize_type.c_str());
+#endif
+        exit(-1);
+      }
+    }
+
+    return features;
+  }
+
   void NormalizePerFeature(float *p, int32_t num_frames,
                            int32_t feat_dim) const {
     auto m = Eigen::Map<
@@ -137,6 +225,9 @@ class SpeakerEmbeddingExtractorNeMoImpl : public SpeakerEmbeddingExtractorImpl {
   }
 
  private:
+  // Max ratio of padded frames in a batch
+  static constexpr float kMaxPaddingRatio = 0.25;
+
   SpeakerEmbeddingExtractorNeMoModel model_;
 };
 
@@ -68,15 +68,20 @@ class SpeakerEmbeddingExtractorNeMoModel::Impl {
     return meta_data_;
   }
 
+  bool SupportBatchProcessing() const { return support_batch_processing_; }
+
  private:
   void Init(void *model_data, size_t model_data_length) {
-    sess_ = std::make_unique<Ort::Session>(env_, model_data, model_data_length,
-                                           sess_opts_);
+    sess_ = CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(sess_.get(), &input_names_, &input_names_ptr_);
 
     GetOutputNames(sess_.get(), &output_names_, &output_names_ptr_);
 
+    std::vector<int64_t> x_shape =
+        sess_->GetInputTypeInfo(0).GetTensorTypeAndShapeInfo().GetShape();
+    support_batch_processing_ = !x_shape.empty() && x_shape[0] < 0;
+
     // get meta data
     Ort::ModelMetadata meta_data = sess_->GetModelMetadata();
     if (config_.debug) {
@@ -131,6 +136,8 @@ class SpeakerEmbeddingExtractorNeMoModel::Impl {
   std::vector<const char *> output_names_ptr_;
 
   SpeakerEmbeddingExtractorNeMoModelMetaData meta_data_;
+
+  bool support_batch_processing_ = false;
 };
 
 SpeakerEmbeddingExtractorNeMoModel::SpeakerEmbeddingExtractorNeMoModel(
@@ -150,6 +157,10 @@ SpeakerEmbeddingExtractorNeMoModel::GetMetaData() const {
   return impl_->GetMetaData();
 }
 
+bool SpeakerEmbeddingExtractorNeMoModel::SupportBatchProcessing() const {
+  return impl_->SupportBatchProcessing();
+}
+
 Ort::Value SpeakerEmbeddingExtractorNeMoModel::Compute(
     Ort::Value x, Ort::Value x_lens) const {
   return impl_->Compute(std::move(x), std::move(x_lens));
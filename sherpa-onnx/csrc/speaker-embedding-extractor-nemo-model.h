@@ -25,6 +25,9 @@ class SpeakerEmbeddingExtractorNeMoModel {
 
   const SpeakerEmbeddingExtractorNeMoModelMetaData &GetMetaData() const;
 
+  // Return true if the model accepts inputs with batch size > 1
+  bool SupportBatchProcessing() const;
+
   /**
    * @param x A float32 tensor of shape (N, C, T)
    * @param x_len A int64 tensor of shape (N,)
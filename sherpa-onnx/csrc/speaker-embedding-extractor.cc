@@ -85,6 +85,11 @@ std::vector<float> SpeakerEmbeddingExtractor::Compute(OnlineStream *s) const {
   return impl_->Compute(s);
 }
 
+std::vector<std::vector<float>> SpeakerEmbeddingExtractor::Compute(
+    OnlineStream **ss, int32_t n) const {
+  return impl_->Compute(ss, n);
+}
+
 #if __ANDROID_API__ >= 9
 template SpeakerEmbeddingExtractor::SpeakerEmbeddingExtractor(
     AAssetManager *mgr, const SpeakerEmbeddingExtractorConfig &config);
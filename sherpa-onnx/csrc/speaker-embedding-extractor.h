@@ -62,6 +62,14 @@ class SpeakerEmbeddingExtractor {
   // You have to ensure IsReady(s) returns true before you call this method.
   std::vector<float> Compute(OnlineStream *s) const;
 
+  // Compute speaker embeddings of n streams.
+  //
+  // Streams are padded and processed in batches if the model supports it.
+  // You have to ensure IsReady(ss[i]) returns true for all i.
+  //
+  // Return a list of n embeddings. The i-th embedding is for ss[i].
+  std::vector<std::vector<float>> Compute(OnlineStream **ss, int32_t n) const;
+
  private:
   std::unique_ptr<SpeakerEmbeddingExtractorImpl> impl_;
 };
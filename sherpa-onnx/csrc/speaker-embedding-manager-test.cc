@@ -4,6 +4,11 @@
 
 #include "sherpa-onnx/csrc/speaker-embedding-manager.h"
 
+#include <cstdio>
+#include <random>
+#include <string>
+#include <vector>
+
 #include "gtest/gtest.h"
 
 namespace sherpa_onnx {
@@ -144,4 +149,138 @@ TEST(SpeakerEmbeddingManager, Verify) {
   ASSERT_FALSE(status);
 }
 
+static std::vector<float> RandomEmbeddings(int32_t n, int32_t dim) {
+  std::mt19937 gen(20250101);
+  std::normal_distribution<float> dist;
+
+  std::vector<float> ans(n * dim);
+  for (auto &x : ans) {
+    x = dist(gen);
+  }
+  return ans;
+}
+
+TEST(SpeakerEmbeddingManager, AddAndSearchBatch) {
+  int32_t dim = 8;
+  int32_t n = 100;
+  SpeakerEmbeddingManager manager(dim);
+
+  std::vector<std::string> names;
+  for (int32_t i = 0; i != n; ++i) {
+    names.push_back("speaker-" + std::to_string(i));
+  }
+
+  std::vector<float> embeddings = RandomEmbeddings(n, dim);
+  ASSERT_TRUE(manager.Add(names, embeddings.data()));
+  ASSERT_EQ(manager.NumSpeakers(), n);
+
+  // duplicate
+  ASSERT_FALSE(manager.Add(std::vector<std::string>{"a", "speaker-3"},
+                           embeddings.data()));
+  ASSERT_FALSE(
+      manager.Add(std::vector<std::string>{"a", "a"}, embeddings.data()));
+  ASSERT_EQ(manager.NumSpeakers(), n);
+
+  auto found = manager.Search(embeddings.data(), n, 0.99);
+  ASSERT_EQ(found, names);
+
+  for (int32_t i = 0; i < n; i += 2) {
+    ASSERT_TRUE(manager.Remove(names[i]));
+  }
+  ASSERT_EQ(manager.NumSpeakers(), n / 2);
+
+  found = manager.Search(embeddings.data(), n, 0.99);
+  for (int32_t i = 0; i != n; ++i) {
+    EXPECT_EQ(found[i], i % 2 ? names[i] : "");
+    EXPECT_EQ(manager.Search(embeddings.data() + i * dim, 0.99), found[i]);
+  }
+}
+
+TEST(SpeakerEmbeddingManager, SaveAndLoad) {
+  int32_t dim = 8;
+  int32_t n = 10;
+  SpeakerEmbeddingManager manager(dim);
+
+  std::vector<float> embeddings = RandomEmbeddings(n, dim);
+  for (int32_t i = 0; i != n; ++i) {
+    ASSERT_TRUE(manager.Add("speaker-" + std::to_string(i),
+                            embeddings.data() + i * dim));
+  }
+  ASSERT_TRUE(manager.Remove("speaker-3"));
+
+  std::string filename = "speaker-embedding-manager-test.bin";
+  ASSERT_TRUE(manager.Save(filename));
+
+  SpeakerEmbeddingManager manager2(dim);
+  ASSERT_TRUE(manager2.Add("someone", embeddings.data()));
+  ASSERT_TRUE(manager2.Load(filename));
+  EXPECT_EQ(manager2.GetAllSpeakers(), manager.GetAllSpeakers());
+
+  for (int32_t i = 0; i != n; ++i) {
+    std::string name = "speaker-" + std::to_string(i);
+    const float *p = embeddings.data() + i * dim;
+    EXPECT_EQ(manager2.Score(name, p), manager.Score(name, p));
+  }
+
+  SpeakerEmbeddingManager manager3(dim + 1);
+  ASSERT_FALSE(manager3.Load(filename));
+
+  std::remove(filename.c_str());
+}
+
+TEST(SpeakerEmbeddingManager, BuildIndex) {
+  int32_t dim = 16;
+  int32_t n = 500;
+  SpeakerEmbeddingManager manager(dim);
+
+  std::vector<std::string> names;
+  for (int32_t i = 0; i != n; ++i) {
+    names.push_back("speaker-" + std::to_string(i));
+  }
+
+  std::vector<float> embeddings = RandomEmbeddings(n, dim);
+  ASSERT_TRUE(manager.Add(names, embeddings.data()));
+
+  ASSERT_FALSE(manager.BuildIndex(10, 0));
+
+  // Searching all lists gives exact results
+  ASSERT_TRUE(manager.BuildIndex(10, 10));
+  EXPECT_EQ(manager.Search(embeddings.data(), n, 0.99), names);
+
+  // Speakers added and removed after building the index can be found
+  std::vector<float> more = RandomEmbeddings(n + 20, dim);
+  for (int32_t i = n; i != n + 20; ++i) {
+    ASSERT_TRUE(manager.Add("new-" + std::to_string(i), more.data() + i * dim));
+  }
+
+  for (int32_t i = 0; i < n; i += 3) {
+    ASSERT_TRUE(manager.Remove(names[i]));
+  }
+
+  for (int32_t i = n; i != n + 20; ++i) {
+    EXPECT_EQ(manager.Search(more.data() + i * dim, 0.99),
+              "new-" + std::to_string(i));
+  }
+
+  for (int32_t i = 0; i != n; ++i) {
+    auto matches = manager.GetBestMatches(embeddings.data() + i * dim, 0.99, 1);
+    if (i % 3 == 0) {
+      EXPECT_TRUE(matches.empty());
+    } else {
+      ASSERT_EQ(matches.size(), 1);
+      EXPECT_EQ(matches[0].name, names[i]);
+    }
+  }
+
+  // An embedding is in the list of its closest centroid, so it is found
+  // when searching only a single list
+  ASSERT_TRUE(manager.BuildIndex(10, 1));
+  for (int32_t i = 1; i < n; i += 3) {
+    EXPECT_EQ(manager.Search(embeddings.data() + i * dim, 0.99), names[i]);
+  }
+
+  ASSERT_TRUE(manager.BuildIndex(0, 1));
+  EXPECT_EQ(manager.Search(embeddings.data() + dim, 0.99), names[1]);
+}
+
 }  // namespace sherpa_onnx
@@ -5,10 +5,14 @@
 #include "sherpa-onnx/csrc/speaker-embedding-manager.h"
 
 #include <algorithm>
+#include <cstring>
+#include <fstream>
 #include <unordered_map>
+#include <unordered_set>
 #include <utility>
 
 #include "Eigen/Dense"
+#include "sherpa-onnx/csrc/file-utils.h"
 #include "sherpa-onnx/csrc/macros.h"
 
 namespace sherpa_onnx {
@@ -16,6 +20,30 @@ namespace sherpa_onnx {
 using FloatMatrix =
     Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>;
 
+// Format of the file written by Save()
+//
+//   - magic, 8 bytes
+//   - version, int32
+//   - dim, int32
+//   - number of speakers, int32
+//   - zero padding up to kFileHeaderSize bytes
+//   - embeddings, float32, (number of speakers, dim) in row major
+//   - for each speaker, length of its name as int32 followed by the name
+//
+// All numbers are in the byte order of the machine that writes the file.
+static constexpr char kFileMagic[8] = {'s', 'h', 'e', 'r', 'p', 'a', 's', 'e'};
+static constexpr int32_t kFileVersion = 1;
+static constexpr int32_t kFileHeaderSize = 64;
+
+// Number of k-means iterations in BuildIndex()
+static constexpr int32_t kNumKMeansIterations = 10;
+
+// At most this number of embeddings per list are used to train k-means
+static constexpr int32_t kMaxTrainingPointsPerList = 64;
+
+// At most this number of scores are computed in a single matrix product
+static constexpr int64_t kMaxScoresPerBlock = 1 << 24;
+
 class SpeakerEmbeddingManager::Impl {
  public:
   explicit Impl(int32_t dim) : dim_(dim) {}
@@ -26,14 +54,7 @@ class SpeakerEmbeddingManager::Impl {
       return false;
     }
 
-    embedding_matrix_.conservativeResize(embedding_matrix_.rows() + 1, dim_);
-
-    std::copy(p, p + dim_, &embedding_matrix_.bottomRows(1)(0, 0));
-
-    embedding_matrix_.bottomRows(1).normalize();  // inplace
-
-    name2row_[name] = embedding_matrix_.rows() - 1;
-    row2name_[embedding_matrix_.rows() - 1] = name;
+    AddRow(name, p);
 
     return true;
   }
@@ -70,16 +91,30 @@ class SpeakerEmbeddingManager::Impl {
       v += Eigen::Map<Eigen::RowVectorXf>(const_cast<float *>(x.data()), dim_);
     }
 
-    // no need to compute the mean since we are going to normalize it anyway
+    // no need to compute the mean since AddRow() normalizes it anyway
     // v /= embedding_list.size();
 
-    v.normalize();
+    AddRow(name, v.data());
 
-    embedding_matrix_.conservativeResize(embedding_matrix_.rows() + 1, dim_);
-    embedding_matrix_.bottomRows(1) = v;
+    return true;
+  }
+
+  bool Add(const std::vector<std::string> &names, const float *p) {
+    std::unordered_set<std::string> new_names;
+    for (const auto &name : names) {
+      if (name2row_.count(name) || !new_names.insert(name).second) {
+        SHERPA_ONNX_LOGE("Duplicate speaker name: '%s'", name.c_str());
+        return false;
+      }
+    }
+
+    embeddings_.reserve(embeddings_.size() + names.size() * dim_);
+    names_.reserve(names_.size() + names.size());
 
-    name2row_[name] = embedding_matrix_.rows() - 1;
-    row2name_[embedding_matrix_.rows() - 1] = name;
+    for (const auto &name : names) {
+      AddRow(name, p);
+      p += dim_;
+    }
 
     return true;
   }
@@ -90,66 +125,106 @@ class SpeakerEmbeddingManager::Impl {
     }
 
     int32_t row_idx = name2row_.at(name);
+    int32_t last_row = NumSpeakers() - 1;
 
-    int32_t num_rows = embedding_matrix_.rows();
-
-    if (row_idx < num_rows - 1) {
-      embedding_matrix_.block(row_idx, 0, num_rows - 1 - row_idx, dim_) =
-          embedding_matrix_.bottomRows(num_rows - 1 - row_idx);
+    if (!lists_.empty()) {
+      RemoveFromList(row_idx);
     }
 
-    embedding_matrix_.conservativeResize(num_rows - 1, dim_);
-    for (auto &p : name2row_) {
-      if (p.second > row_idx) {
-        p.second -= 1;
-        row2name_[p.second] = p.first;
+    // Move the last row to the removed one so that only one row changes
+    if (row_idx != last_row) {
+      std::copy(embeddings_.begin() + last_row * dim_, embeddings_.end(),
+                embeddings_.begin() + row_idx * dim_);
+      names_[row_idx] = std::move(names_[last_row]);
+      name2row_[names_[row_idx]] = row_idx;
+
+      if (!lists_.empty()) {
+        int32_t list = row2list_[last_row];
+        *std::find(lists_[list].begin(), lists_[list].end(), last_row) =
+            row_idx;
+        row2list_[row_idx] = list;
       }
     }
 
+    embeddings_.resize(last_row * dim_);
+    names_.pop_back();
     name2row_.erase(name);
-    row2name_.erase(num_rows - 1);
+    if (!lists_.empty()) {
+      row2list_.pop_back();
+    }
 
     return true;
   }
 
   std::string Search(const float *p, float threshold) {
-    if (embedding_matrix_.rows() == 0) {
-      return {};
+    return Search(p, 1, threshold)[0];
+  }
+
+  std::vector<std::string> Search(const float *p, int32_t n, float threshold) {
+    std::vector<std::string> ans(n);
+    if (NumSpeakers() == 0) {
+      return ans;
     }
 
-    Eigen::VectorXf v =
-        Eigen::Map<Eigen::VectorXf>(const_cast<float *>(p), dim_);
-    v.normalize();
+    if (!lists_.empty()) {
+      std::vector<int32_t> rows;
+      for (int32_t i = 0; i != n; ++i) {
+        Eigen::VectorXf v = Normalize(p + i * dim_);
+        Eigen::VectorXf scores = Scores(v, &rows);
+
+        Eigen::VectorXf::Index max_index = 0;
+        float max_score = scores.maxCoeff(&max_index);
+        if (max_score >= threshold) {
+          ans[i] = names_[rows.empty() ? max_index : rows[max_index]];
+        }
+      }
+      return ans;
+    }
 
-    Eigen::VectorXf scores = embedding_matrix_ * v;
+    auto embeddings = EmbeddingMatrix();
 
-    Eigen::VectorXf::Index max_index = 0;
-    float max_score = scores.maxCoeff(&max_index);
-    if (max_score < threshold) {
-      return {};
+    // Limit the memory for scores
+    int32_t block_size = std::max<int64_t>(
+        1, std::min<int64_t>(n, kMaxScoresPerBlock / NumSpeakers()));
+
+    for (int32_t start = 0; start < n; start += block_size) {
+      int32_t this_block = std::min(block_size, n - start);
+
+      FloatMatrix queries =
+          Eigen::Map<const FloatMatrix>(p + start * dim_, this_block, dim_);
+      queries.rowwise().normalize();
+
+      FloatMatrix scores = queries * embeddings.transpose();
+
+      for (int32_t i = 0; i != this_block; ++i) {
+        Eigen::Index max_index = 0;
+        float max_score = scores.row(i).maxCoeff(&max_index);
+        if (max_score >= threshold) {
+          ans[start + i] = names_[max_index];
+        }
+      }
     }
 
-    return row2name_.at(max_index);
+    return ans;
   }
 
   std::vector<SpeakerMatch> GetBestMatches(const float *p, float threshold,
                                            int32_t n) {
     std::vector<SpeakerMatch> matches;
 
-    if (embedding_matrix_.rows() == 0) {
+    if (NumSpeakers() == 0) {
       return matches;
     }
 
-    Eigen::VectorXf v =
-        Eigen::Map<Eigen::VectorXf>(const_cast<float *>(p), dim_);
-    v.normalize();
+    Eigen::VectorXf v = Normalize(p);
 
-    Eigen::VectorXf scores = embedding_matrix_ * v;
+    std::vector<int32_t> rows;
+    Eigen::VectorXf scores = Scores(v, &rows);
 
     std::vector<std::pair<float, int>> score_indices;
     for (int i = 0; i < scores.size(); ++i) {
       if (scores[i] >= threshold) {
-        score_indices.emplace_back(scores[i], i);
+        score_indices.emplace_back(scores[i], rows.empty() ? i : rows[i]);
       }
     }
 
@@ -160,7 +235,7 @@ class SpeakerEmbeddingManager::Impl {
     for (int i = 0; i < std::min(n, static_cast<int32_t>(score_indices.size()));
          ++i) {
       const auto &pair = score_indices[i];
-      matches.push_back({row2name_.at(pair.second), pair.first});
+      matches.push_back({names_[pair.second], pair.first});
     }
 
     return matches;
@@ -171,13 +246,7 @@ class SpeakerEmbeddingManager::Impl {
       return false;
     }
 
-    int32_t row_idx = name2row_.at(name);
-
-    Eigen::VectorXf v =
-        Eigen::Map<Eigen::VectorXf>(const_cast<float *>(p), dim_);
-    v.normalize();
-
-    float score = embedding_matrix_.row(row_idx) * v;
+    float score = Score(name, p);
 
     if (score < threshold) {
       return false;
@@ -194,11 +263,9 @@ class SpeakerEmbeddingManager::Impl {
 
     int32_t row_idx = name2row_.at(name);
 
-    Eigen::VectorXf v =
-        Eigen::Map<Eigen::VectorXf>(const_cast<float *>(p), dim_);
-    v.normalize();
+    Eigen::VectorXf v = Normalize(p);
 
-    float score = embedding_matrix_.row(row_idx) * v;
+    float score = EmbeddingMatrix().row(row_idx) * v;
 
     return score;
   }
@@ -207,26 +274,333 @@ class SpeakerEmbeddingManager::Impl {
     return name2row_.count(name) > 0;
   }
 
-  int32_t NumSpeakers() const { return embedding_matrix_.rows(); }
+  int32_t NumSpeakers() const { return static_cast<int32_t>(names_.size()); }
 
   int32_t Dim() const { return dim_; }
 
   std::vector<std::string> GetAllSpeakers() const {
-    std::vector<std::string> all_speakers;
-    all_speakers.reserve(name2row_.size());
-    for (const auto &p : name2row_) {
-      all_speakers.push_back(p.first);
-    }
+    std::vector<std::string> all_speakers = names_;
 
     std::sort(all_speakers.begin(), all_speakers.end());
     return all_speakers;
   }
 
+  bool BuildIndex(int32_t num_lists, int32_t num_probes) {
+    if (num_lists == 0) {
+      centroids_.resize(0, dim_);
+      lists_.clear();
+      row2list_.clear();
+      return true;
+    }
+
+    if (num_lists < 0 || num_probes < 1) {
+      SHERPA_ONNX_LOGE("Invalid num_lists: %d or num_probes: %d", num_lists,
+                       num_probes);
+      return false;
+    }
+
+    int32_t num_speakers = NumSpeakers();
+    if (num_speakers == 0) {
+      SHERPA_ONNX_LOGE("Please add speakers before building the index");
+      return false;
+    }
+
+    num_lists = std::min(num_lists, num_speakers);
+    num_probes_ = std::min(num_probes, num_lists);
+
+    auto embeddings = EmbeddingMatrix();
+
+    // Use evenly spaced rows to train k-means
+    int32_t num_points =
+        std::min<int64_t>(num_speakers, static_cast<int64_t>(num_lists) *
+                                            kMaxTrainingPointsPerList);
+    FloatMatrix points(num_points, dim_);
+    for (int32_t i = 0; i != num_points; ++i) {
+      points.row(i) =
+          embeddings.row(static_cast<int64_t>(i) * num_speakers / num_points);
+    }
+
+    centroids_.resize(num_lists, dim_);
+    for (int32_t i = 0; i != num_lists; ++i) {
+      centroids_.row(i) =
+          points.row(static_cast<int64_t>(i) * num_points / num_lists);
+    }
+
+    // Spherical k-means since all embeddings have unit norm
+    std::vector<int32_t> assignment;
+    for (int32_t iter = 0; iter != kNumKMeansIterations; ++iter) {
+      Assign(points, &assignment);
+
+      FloatMatrix sums = FloatMatrix::Zero(num_lists, dim_);
+      for (int32_t i = 0; i != num_points; ++i) {
+        sums.row(assignment[i]) += points.row(i);
+      }
+
+      for (int32_t k = 0; k != num_lists; ++k) {
+        // Keep the old centroid for an empty list
+        if (sums.row(k).squaredNorm() > 0) {
+          centroids_.row(k) = sums.row(k).normalized();
+        }
+      }
+    }
+
+    Assign(embeddings, &row2list_);
+
+    lists_.assign(num_lists, {});
+    for (int32_t i = 0; i != num_speakers; ++i) {
+      lists_[row2list_[i]].push_back(i);
+    }
+
+    return true;
+  }
+
+  bool Save(const std::string &filename) const {
+    std::ofstream os(filename, std::ios::binary);
+    if (!os) {
+      SHERPA_ONNX_LOGE("Failed to open '%s' for writing", filename.c_str());
+      return false;
+    }
+
+    char header[kFileHeaderSize] = {0};
+    int32_t num_speakers = NumSpeakers();
+    std::memcpy(header, kFileMagic, sizeof(kFileMagic));
+    std::memcpy(header + 8, &kFileVersion, sizeof(int32_t));
+    std::memcpy(header + 12, &dim_, sizeof(int32_t));
+    std::memcpy(header + 16, &num_speakers, sizeof(int32_t));
+
+    os.write(header, kFileHeaderSize);
+    os.write(reinterpret_cast<const char *>(embeddings_.data()),
+             embeddings_.size() * sizeof(float));
+
+    for (const auto &name : names_) {
+      int32_t len = name.size();
+      os.write(reinterpret_cast<const char *>(&len), sizeof(len));
+      os.write(name.data(), len);
+    }
+
+    if (!os) {
+      SHERPA_ONNX_LOGE("Failed to write '%s'", filename.c_str());
+      return false;
+    }
+
+    return true;
+  }
+
+  bool Load(const std::string &filename) {
+    if (!FileExists(filename)) {
+      SHERPA_ONNX_LOGE("'%s' does not exist", filename.c_str());
+      return false;
+    }
+
+    MappedFile file(filename);
+    const char *p = file.begin();
+    const char *end = file.end();
+
+    if (file.size() < kFileHeaderSize ||
+        std::memcmp(p, kFileMagic, sizeof(kFileMagic)) != 0) {
+      SHERPA_ONNX_LOGE("'%s' is not a file from SpeakerEmbeddingManager",
+                       filename.c_str());
+      return false;
+    }
+
+    int32_t version = 0;
+    int32_t dim = 0;
+    int32_t num_speakers = 0;
+    std::memcpy(&version, p + 8, sizeof(int32_t));
+    std::memcpy(&dim, p + 12, sizeof(int32_t));
+    std::memcpy(&num_speakers, p + 16, sizeof(int32_t));
+
+    if (version != kFileVersion) {
+      SHERPA_ONNX_LOGE("Unsupported version %d in '%s'. Expected: %d", version,
+                       filename.c_str(), kFileVersion);
+      return false;
+    }
+
+    if (dim != dim_) {
+      SHERPA_ONNX_LOGE("Given dim: %d in '%s', expected dim: %d", dim,
+                       filename.c_str(), dim_);
+      return false;
+    }
+
+    p += kFileHeaderSize;
+
+    int64_t num_floats = static_cast<int64_t>(num_speakers) * dim;
+    if (num_speakers < 0 ||
+        end - p < num_floats * static_cast<int64_t>(sizeof(float))) {
+      SHERPA_ONNX_LOGE("'%s' is truncated", filename.c_str());
+      return false;
+    }
+
+    std::vector<float> embeddings(num_floats);
+    std::memcpy(embeddings.data(), p, num_floats * sizeof(float));
+    p += num_floats * sizeof(float);
+
+    std::vector<std::string> names;
+    names.reserve(num_speakers);
+
+    std::unordered_map<std::string, int32_t> name2row;
+    name2row.reserve(num_speakers);
+
+    for (int32_t i = 0; i != num_speakers; ++i) {
+      int32_t len = 0;
+      if (end - p < static_cast<int64_t>(sizeof(len))) {
+        SHERPA_ONNX_LOGE("'%s' is truncated", filename.c_str());
+        return false;
+      }
+      std::memcpy(&len, p, sizeof(len));
+      p += sizeof(len);
+
+      if (len < 0 || end - p < len) {
+        SHERPA_ONNX_LOGE("'%s' is truncated", filename.c_str());
+        return false;
+      }
+
+      names.emplace_back(p, len);
+      p += len;
+
+      if (!name2row.emplace(names.back(), i).second) {
+        SHERPA_ONNX_LOGE("Duplicate speaker name '%s' in '%s'",
+                         names.back().c_str(), filename.c_str());
+        return false;
+      }
+    }
+
+    embeddings_ = std::move(embeddings);
+    names_ = std::move(names);
+    name2row_ = std::move(name2row);
+
+    // The index is for the previous speakers
+    BuildIndex(0, 1);
+
+    return true;
+  }
+
+ private:
+  Eigen::Map<const FloatMatrix> EmbeddingMatrix() const {
+    return Eigen::Map<const FloatMatrix>(embeddings_.data(), NumSpeakers(),
+                                         dim_);
+  }
+
+  Eigen::VectorXf Normalize(const float *p) const {
+    Eigen::VectorXf v = Eigen::Map<const Eigen::VectorXf>(p, dim_);
+    v.normalize();
+    return v;
+  }
+
+  // Append a speaker. p is normalized before it is saved.
+  void AddRow(const std::string &name, const float *p) {
+    Eigen::VectorXf v = Normalize(p);
+
+    // std::vector grows geometrically, so adding n speakers one by one
+    // takes O(n) time in total
+    embeddings_.insert(embeddings_.end(), v.data(), v.data() + dim_);
+
+    int32_t row = NumSpeakers();
+    names_.push_back(name);
+    name2row_[name] = row;
+
+    if (!lists_.empty()) {
+      Eigen::VectorXf::Index list = 0;
+      (centroids_ * v).maxCoeff(&list);
+      lists_[list].push_back(row);
+      row2list_.push_back(list);
+    }
+  }
+
+  void RemoveFromList(int32_t row) {
+    auto &list = lists_[row2list_[row]];
+    auto it = std::find(list.begin(), list.end(), row);
+    *it = list.back();
+    list.pop_back();
+  }
+
+  // Assign each row of x to its closest centroid
+  template <typename Derived>
+  void Assign(const Eigen::MatrixBase<Derived> &x,
+              std::vector<int32_t> *assignment) const {
+    int32_t num_rows = x.rows();
+    int32_t num_lists = centroids_.rows();
+    assignment->resize(num_rows);
+
+    // Limit the memory for scores
+    int32_t block_size = std::max<int64_t>(
+        1, std::min<int64_t>(num_rows, kMaxScoresPerBlock / num_lists));
+
+    for (int32_t start = 0; start < num_rows; start += block_size) {
+      int32_t this_block = std::min(block_size, num_rows - start);
+
+      FloatMatrix scores =
+          x.middleRows(start, this_block) * centroids_.transpose();
+
+      for (int32_t i = 0; i != this_block; ++i) {
+        Eigen::Index k = 0;
+        scores.row(i).maxCoeff(&k);
+        (*assignment)[start + i] = k;
+      }
+    }
+  }
+
+  // Compute the scores between the normalized embedding v and the
+  // speakers to compare with.
+  //
+  // If there is no index, all speakers are compared, rows is empty on
+  // return, and entry i of the returned vector is for speaker i.
+  // Otherwise, rows contains the speakers from the num_probes_ closest lists
+  // and entry i of the returned vector is for speaker rows[i].
+  Eigen::VectorXf Scores(const Eigen::VectorXf &v,
+                         std::vector<int32_t> *rows) const {
+    rows->clear();
+
+    auto embeddings = EmbeddingMatrix();
+
+    if (lists_.empty()) {
+      return embeddings * v;
+    }
+
+    Eigen::VectorXf centroid_scores = centroids_ * v;
+
+    std::vector<int32_t> lists(centroid_scores.size());
+    for (int32_t i = 0; i != static_cast<int32_t>(lists.size()); ++i) {
+      lists[i] = i;
+    }
+
+    std::partial_sort(lists.begin(), lists.begin() + num_probes_, lists.end(),
+                      [&centroid_scores](int32_t a, int32_t b) {
+                        return centroid_scores[a] > centroid_scores[b];
+                      });
+
+    for (int32_t i = 0; i != num_probes_; ++i) {
+      const auto &list = lists_[lists[i]];
+      rows->insert(rows->end(), list.begin(), list.end());
+    }
+
+    if (rows->empty()) {
+      // All the closest lists are empty. Fall back to all speakers.
+      return embeddings * v;
+    }
+
+    Eigen::VectorXf scores(rows->size());
+    for (int32_t i = 0; i != static_cast<int32_t>(rows->size()); ++i) {
+      scores[i] = embeddings.row((*rows)[i]).dot(v);
+    }
+
+    return scores;
+  }
+
  private:
   int32_t dim_;
-  FloatMatrix embedding_matrix_;
+
+  // Normalized embeddings of all speakers in row major.
+  // Row i belongs to the speaker names_[i].
+  std::vector<float> embeddings_;
+  std::vector<std::string> names_;
   std::unordered_map<std::string, int32_t> name2row_;
-  std::unordered_map<int32_t, std::string> row2name_;
+
+  // The IVF index from BuildIndex(). lists_ is empty if there is no index.
+  FloatMatrix centroids_;                    // (num_lists, dim)
+  std::vector<std::vector<int32_t>> lists_;  // speakers of each list
+  std::vector<int32_t> row2list_;            // the list of each speaker
+  int32_t num_probes_ = 1;
 };
 
 SpeakerEmbeddingManager::SpeakerEmbeddingManager(int32_t dim)
@@ -245,6 +619,11 @@ bool SpeakerEmbeddingManager::Add(
   return impl_->Add(name, embedding_list);
 }
 
+bool SpeakerEmbeddingManager::Add(const std::vector<std::string> &names,
+                                  const float *p) const {
+  return impl_->Add(names, p);
+}
+
 bool SpeakerEmbeddingManager::Remove(const std::string &name) const {
   return impl_->Remove(name);
 }
@@ -254,6 +633,11 @@ std::string SpeakerEmbeddingManager::Search(const float *p,
   return impl_->Search(p, threshold);
 }
 
+std::vector<std::string> SpeakerEmbeddingManager::Search(
+    const float *p, int32_t n, float threshold) const {
+  return impl_->Search(p, n, threshold);
+}
+
 std::vector<SpeakerMatch> SpeakerEmbeddingManager::GetBestMatches(
     const float *p, float threshold, int32_t n) const {
   return impl_->GetBestMatches(p, threshold, n);
@@ -283,4 +667,17 @@ std::vector<std::string> SpeakerEmbeddingManager::GetAllSpeakers() const {
   return impl_->GetAllSpeakers();
 }
 
+bool SpeakerEmbeddingManager::BuildIndex(int32_t num_lists,
+                                         int32_t num_probes) const {
+  return impl_->BuildIndex(num_lists, num_probes);
+}
+
+bool SpeakerEmbeddingManager::Save(const std::string &filename) const {
+  return impl_->Save(filename);
+}
+
+bool SpeakerEmbeddingManager::Load(const std::string &filename) const {
+  return impl_->Load(filename);
+}
+
 }  // namespace sherpa_onnx
@@ -45,6 +45,16 @@ class SpeakerEmbeddingManager {
   bool Add(const std::string &name,
            const std::vector<std::vector<float>> &embedding_list) const;
 
+  /** Add a batch of speakers.
+   *
+   * @param names Names of the speakers.
+   * @param p Pointer to a 2-D array of shape (names.size(), dim) in row
+   *          major. Row i is the embedding of names[i].
+   * @return Return true if added successfully. Return false if a name is
+   *         duplicated or already exists. Nothing is added in that case.
+   */
+  bool Add(const std::vector<std::string> &names, const float *p) const;
+
   /* Remove a speaker by its name.
    *
    * @param name Name of the speaker to remove.
@@ -67,6 +77,20 @@ class SpeakerEmbeddingManager {
    */
   std::string Search(const float *p, float threshold) const;
 
+  /** Search for a batch of embeddings.
+   *
+   * It is equivalent to calling Search() for each embedding but it is
+   * faster.
+   *
+   * @param p Pointer to a 2-D array of shape (n, dim) in row major.
+   * @param n Number of embeddings.
+   * @param threshold A value between 0 and 1.
+   * @return Return a vector of size n. Entry i is the name of the speaker
+   *         for the i-th embedding or an empty string if not found.
+   */
+  std::vector<std::string> Search(const float *p, int32_t n,
+                                  float threshold) const;
+
   /**
    * It is for speaker identification.
    *
@@ -110,6 +134,44 @@ class SpeakerEmbeddingManager {
   // Return a list of speaker names
   std::vector<std::string> GetAllSpeakers() const;
 
+  /** Build an inverted file (IVF) index for Search() and GetBestMatches().
+   *
+   * Embeddings are clustered into num_lists lists with k-means. A query is
+   * compared only with speakers in the num_probes lists whose centroids
+   * are closest to it, so results are approximate but the search is much
+   * faster for a large number of speakers. A good start is to use about
+   * sqrt(NumSpeakers()) lists.
+   *
+   * Speakers added or removed later are kept in the index. Call it again
+   * to re-cluster after many changes.
+   *
+   * @param num_lists Number of lists. If it is 0, the index is removed and
+   *                  all speakers are compared with a query.
+   * @param num_probes Number of lists to search for a query.
+   * @return Return true on success. Return false if there are no speakers
+   *         or the arguments are invalid.
+   */
+  bool BuildIndex(int32_t num_lists, int32_t num_probes) const;
+
+  /** Save all speakers to a binary file.
+   *
+   * The embeddings are saved as a contiguous float32 array right after a
+   * fixed-size header, so the file can be memory-mapped. The index built
+   * by BuildIndex() is not saved.
+   *
+   * @return Return true on success. Return false if the file cannot be
+   *         written.
+   */
+  bool Save(const std::string &filename) const;
+
+  /** Replace all speakers with the ones from a file written by Save().
+   *
+   * @return Return true on success. Return false if the file is invalid or
+   *         its embedding dimension differs from Dim(). Existing speakers
+   *         are kept in that case.
+   */
+  bool Load(const std::string &filename) const;
+
  private:
   class Impl;
   std::unique_ptr<Impl> impl_;
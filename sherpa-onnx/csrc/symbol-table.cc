@@ -8,10 +8,12 @@
 #include <cassert>
 #include <cctype>
 #include <fstream>
+#include <iterator>
 #include <sstream>
 #include <string>
 #include <strstream>
 #include <utility>
+#include <vector>
 
 #if __ANDROID_API__ >= 9
 
@@ -25,6 +27,7 @@
 
 #include "sherpa-onnx/csrc/base64-decode.h"
 #include "sherpa-onnx/csrc/bbpe.h"
+#include "sherpa-onnx/csrc/binary-lexicon.h"
 #include "sherpa-onnx/csrc/file-utils.h"
 #include "sherpa-onnx/csrc/lexicon.h"
 #include "sherpa-onnx/csrc/text-utils.h"
@@ -106,9 +109,40 @@ bool IsByteBPE(const std::unordered_map<std::string, int32_t> &sym2id) {
 
 }  // namespace
 
+// tokens.txt converted by CompileTokens()
+static std::unordered_map<std::string, int32_t> ReadBinaryTokens(
+    std::istream &is, std::unordered_map<int32_t, std::string> *id2token) {
+  std::vector<char> buf{std::istreambuf_iterator<char>(is),
+                        std::istreambuf_iterator<char>()};
+  BinaryLexicon tokens(std::move(buf));
+
+  std::unordered_map<std::string, int32_t> token2id;
+  token2id.reserve(tokens.NumWords());
+
+  int32_t num_ids = 0;
+  for (int32_t i = 0; i != tokens.NumWords(); ++i) {
+    std::string sym = tokens.Word(i);
+    const int32_t *ids = tokens.Ids(i, &num_ids);
+
+    if (id2token) {
+      for (int32_t k = 0; k != num_ids; ++k) {
+        id2token->insert({ids[k], sym});
+      }
+    }
+
+    token2id.insert({std::move(sym), ids[0]});
+  }
+
+  return token2id;
+}
+
 std::unordered_map<std::string, int32_t> ReadTokens(
     std::istream &is,
     std::unordered_map<int32_t, std::string> *id2token /*= nullptr*/) {
+  if (BinaryLexicon::IsBinaryLexicon(is)) {
+    return ReadBinaryTokens(is, id2token);
+  }
+
   std::unordered_map<std::string, int32_t> token2id;
 
   std::string line;
@@ -150,9 +184,25 @@ std::unordered_map<std::string, int32_t> ReadTokens(
   return token2id;
 }
 
+std::vector<int32_t> ConvertTokensToIds(
+    const std::unordered_map<std::string, int32_t> &token2id,
+    const std::vector<std::string> &tokens) {
+  std::vector<int32_t> ids;
+  ids.reserve(tokens.size());
+  for (const auto &s : tokens) {
+    if (!token2id.count(s)) {
+      return {};
+    }
+    int32_t id = token2id.at(s);
+    ids.push_back(id);
+  }
+
+  return ids;
+}
+
 SymbolTable::SymbolTable(const std::string &filename, bool is_file) {
   if (is_file) {
-    std::ifstream is(filename);
+    std::ifstream is(filename, std::ios::binary);
     Init(is);
   } else {
     std::istringstream iss(filename);
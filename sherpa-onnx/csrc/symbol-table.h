@@ -14,6 +14,8 @@ namespace sherpa_onnx {
 
 // The same token can be mapped to different integer IDs, so
 // we need an id2token argument here.
+//
+// Both tokens.txt and its binary form from CompileTokens() are accepted.
 std::unordered_map<std::string, int32_t> ReadTokens(
     std::istream &is,
     std::unordered_map<int32_t, std::string> *id2token = nullptr);
@@ -5,6 +5,7 @@
 #include "sherpa-onnx/csrc/ten-vad-model.h"
 
 #include <algorithm>
+#include <array>
 #include <cmath>
 #include <cstring>
 #include <memory>
@@ -23,14 +24,23 @@
 
 #include "kaldi-native-fbank/csrc/mel-computations.h"
 #include "kaldi-native-fbank/csrc/rfft.h"
+#include "sherpa-onnx/csrc/cat.h"
 #include "sherpa-onnx/csrc/file-utils.h"
 #include "sherpa-onnx/csrc/macros.h"
 #include "sherpa-onnx/csrc/onnx-utils.h"
 #include "sherpa-onnx/csrc/session.h"
 #include "sherpa-onnx/csrc/text-utils.h"
+#include "sherpa-onnx/csrc/unbind.h"
+#include "sherpa-onnx/csrc/vad-trigger.h"
 
 namespace sherpa_onnx {
 
+struct TenVadModelState : public VadModelState {
+  std::vector<Ort::Value> states;
+  float last_sample = 0;
+  std::vector<float> last_features;  // (3, 41), row major
+};
+
 class TenVadModel::Impl {
  public:
   explicit Impl(const VadModelConfig &config)
@@ -57,42 +67,13 @@ class TenVadModel::Impl {
   }
 
   float Run(const float *samples, int32_t n) {
-    ComputeFeatures(samples, n);
-
-    auto memory_info =
-        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
-
-    std::array<int64_t, 3> x_shape = {1, 3, 41};
-
-    Ort::Value x = Ort::Value::CreateTensor(memory_info, last_features_.data(),
-                                            last_features_.size(),
-                                            x_shape.data(), x_shape.size());
-
-    std::vector<Ort::Value> inputs;
-    inputs.reserve(input_names_.size());
+    ComputeFeatures(samples, n, &last_sample_, last_features_.data());
 
-    inputs.push_back(std::move(x));
-    for (auto &s : states_) {
-      inputs.push_back(std::move(s));
-    }
-
-    auto out =
-        sess_->Run({}, input_names_ptr_.data(), inputs.data(), inputs.size(),
-                   output_names_ptr_.data(), output_names_ptr_.size());
-
-    for (int32_t i = 1; i != static_cast<int32_t>(output_names_.size()); ++i) {
-      states_[i - 1] = std::move(out[i]);
-    }
-
-    float prob = out[0].GetTensorData<float>()[0];
-
-    return prob;
+    return RunBatch(last_features_.data(), 1, &states_)[0];
   }
+
   void Reset() {
-    triggered_ = false;
-    current_sample_ = 0;
-    temp_start_ = 0;
-    temp_end_ = 0;
+    trigger_.Reset();
 
     last_sample_ = 0;
 
@@ -100,7 +81,7 @@ class TenVadModel::Impl {
     std::fill(last_features_.begin(), last_features_.end(), 0.0f);
     tmp_samples_.resize(1024);
 
-    ResetStates();
+    states_ = GetInitStates();
   }
 
   bool IsSpeech(const float *samples, int32_t n) {
@@ -113,83 +94,123 @@ class TenVadModel::Impl {
 
     float threshold = config_.ten_vad.threshold;
 
-    current_sample_ += config_.ten_vad.window_size;
+    return trigger_.IsSpeech(prob, threshold, config_.ten_vad.window_size,
+                             min_speech_samples_, min_silence_samples_);
+  }
 
-    if (prob > threshold && temp_end_ != 0) {
-      temp_end_ = 0;
-    }
+  int32_t WindowShift() const { return config_.ten_vad.window_size; }
 
-    if (prob > threshold && temp_start_ == 0) {
-      // start speaking, but we require that it must satisfy
-      // min_speech_duration
-      temp_start_ = current_sample_;
-      return false;
-    }
+  int32_t WindowSize() const { return config_.ten_vad.window_size; }
 
-    if (prob > threshold && temp_start_ != 0 && !triggered_) {
-      if (current_sample_ - temp_start_ < min_speech_samples_) {
-        return false;
-      }
+  int32_t MinSilenceDurationSamples() const { return min_silence_samples_; }
 
-      triggered_ = true;
+  int32_t MinSpeechDurationSamples() const { return min_speech_samples_; }
 
-      return true;
-    }
+  void SetMinSilenceDuration(float s) {
+    min_silence_samples_ = sample_rate_ * s;
+  }
+
+  void SetThreshold(float threshold) { config_.ten_vad.threshold = threshold; }
+
+  std::unique_ptr<VadModelState> CreateState() {
+    auto ans = std::make_unique<TenVadModelState>();
+    ans->states = GetInitStates();
+    ans->last_features.resize(3 * 41);
+    return ans;
+  }
 
-    if ((prob < threshold) && !triggered_) {
-      // silence
-      temp_start_ = 0;
-      temp_end_ = 0;
-      return false;
+  void ComputeBatch(const float *samples, int32_t n, VadModelState **states,
+                    float *probs) {
+    int32_t window_size = WindowSize();
+    int32_t feature_size = 3 * 41;
+
+    // Feature extraction is cheap, so it is done stream by stream
+    std::vector<float> features(n * feature_size);
+    for (int32_t i = 0; i != n; ++i) {
+      auto s = static_cast<TenVadModelState *>(states[i]);
+      ComputeFeatures(samples + i * window_size, window_size, &s->last_sample,
+                      s->last_features.data());
+      std::copy(s->last_features.begin(), s->last_features.end(),
+                features.begin() + i * feature_size);
     }
 
-    if ((prob > threshold - 0.15) && triggered_) {
-      // speaking
-      return true;
+    if (n == 1 || !support_batch_) {
+      for (int32_t i = 0; i != n; ++i) {
+        auto s = static_cast<TenVadModelState *>(states[i]);
+        probs[i] = RunBatch(features.data() + i * feature_size, 1,
+                            &s->states)[0];
+      }
+      return;
     }
 
-    if ((prob > threshold) && !triggered_) {
-      // start speaking
-      triggered_ = true;
+    // each state of a single stream has shape (1, 64), so we stack them
+    // along dim 0
+    int32_t num_states = static_cast<int32_t>(input_names_.size()) - 1;
 
-      return true;
-    }
+    std::vector<Ort::Value> batched_states;
+    batched_states.reserve(num_states);
 
-    if ((prob < threshold) && triggered_) {
-      // stop to speak
-      if (temp_end_ == 0) {
-        temp_end_ = current_sample_;
+    std::vector<const Ort::Value *> buf(n);
+    for (int32_t k = 0; k != num_states; ++k) {
+      for (int32_t i = 0; i != n; ++i) {
+        buf[i] = &static_cast<TenVadModelState *>(states[i])->states[k];
       }
+      batched_states.push_back(Cat(allocator_, buf, 0));
+    }
 
-      if (current_sample_ - temp_end_ < min_silence_samples_) {
-        // continue speaking
-        return true;
+    std::vector<float> p = RunBatch(features.data(), n, &batched_states);
+
+    for (int32_t k = 0; k != num_states; ++k) {
+      std::vector<Ort::Value> v = Unbind(allocator_, &batched_states[k], 0);
+      for (int32_t i = 0; i != n; ++i) {
+        static_cast<TenVadModelState *>(states[i])->states[k] =
+            std::move(v[i]);
       }
-      // stopped speaking
-      temp_start_ = 0;
-      temp_end_ = 0;
-      triggered_ = false;
-      return false;
     }
 
-    return false;
+    std::copy(p.begin(), p.end(), probs);
   }
 
-  int32_t WindowShift() const { return config_.ten_vad.window_size; }
+ private:
+  /**
+   * @param features Pointer to a 3-d array of shape (batch_size, 3, 41)
+   * @param batch_size Number of windows
+   * @param states Model states with batch size batch_size. They are updated
+   *               in place.
+   *
+   * @return Return the speech probabilities of the batch_size windows.
+   */
+  std::vector<float> RunBatch(float *features, int32_t batch_size,
+                              std::vector<Ort::Value> *states) {
+    auto memory_info =
+        Ort::MemoryInfo::CreateCpu(OrtDeviceAllocator, OrtMemTypeDefault);
 
-  int32_t WindowSize() const { return config_.ten_vad.window_size; }
+    std::array<int64_t, 3> x_shape = {batch_size, 3, 41};
 
-  int32_t MinSilenceDurationSamples() const { return min_silence_samples_; }
+    Ort::Value x =
+        Ort::Value::CreateTensor(memory_info, features, batch_size * 3 * 41,
+                                 x_shape.data(), x_shape.size());
 
-  int32_t MinSpeechDurationSamples() const { return min_speech_samples_; }
+    std::vector<Ort::Value> inputs;
+    inputs.reserve(input_names_.size());
 
-  void SetMinSilenceDuration(float s) {
-    min_silence_samples_ = sample_rate_ * s;
-  }
+    inputs.push_back(std::move(x));
+    for (auto &s : *states) {
+      inputs.push_back(std::move(s));
+    }
 
-  void SetThreshold(float threshold) { config_.ten_vad.threshold = threshold; }
+    auto out =
+        sess_->Run({}, input_names_ptr_.data(), inputs.data(), inputs.size(),
+                   output_names_ptr_.data(), output_names_ptr_.size());
+
+    for (int32_t i = 1; i != static_cast<int32_t>(output_names_.size()); ++i) {
+      (*states)[i - 1] = std::move(out[i]);
+    }
+
+    const float *p = out[0].GetTensorData<float>();
+    return {p, p + batch_size};
+  }
 
- private:
   void Init(void *model_data, size_t model_data_length) {
     if (sample_rate_ != 16000) {
       SHERPA_ONNX_LOGE("Expected sample rate 16000. Given: %d",
@@ -207,8 +228,7 @@ class TenVadModel::Impl {
 
     min_speech_samples_ = sample_rate_ * config_.ten_vad.min_speech_duration;
 
-    sess_ = std::make_unique<Ort::Session>(env_, model_data, model_data_length,
-                                           sess_opts_);
+    sess_ = CreateSession(env_, model_data, model_data_length, sess_opts_);
 
     GetInputNames(sess_.get(), &input_names_, &input_names_ptr_);
     GetOutputNames(sess_.get(), &output_names_, &output_names_ptr_);
@@ -217,21 +237,29 @@ class TenVadModel::Impl {
 
     Check();
 
+    // If the batch dim of the input is dynamic, we can run windows from
+    // several streams in a single batch
+    std::vector<int64_t> x_shape =
+        sess_->GetInputTypeInfo(0).GetTensorTypeAndShapeInfo().GetShape();
+    support_batch_ = !x_shape.empty() && x_shape[0] != 1;
+
     Reset();
   }
 
-  void ResetStates() {
+  std::vector<Ort::Value> GetInitStates() {
     std::array<int64_t, 2> shape{1, 64};
 
-    states_.clear();
-    states_.reserve(4);
+    std::vector<Ort::Value> states;
+    states.reserve(4);
     for (int32_t i = 0; i != 4; ++i) {
       Ort::Value s = Ort::Value::CreateTensor<float>(allocator_, shape.data(),
                                                      shape.size());
 
       Fill<float>(&s, 0);
-      states_.push_back(std::move(s));
+      states.push_back(std::move(s));
     }
+
+    return states;
   }
 
   void InitMelBanks() {
@@ -319,16 +347,17 @@ class TenVadModel::Impl {
     }
   }
 
-  void Preemphasis(const float *samples, int32_t n, float *out) {
+  static void Preemphasis(const float *samples, int32_t n, float *out,
+                          float *last_sample) {
     float t = samples[n - 1];
 
     for (int32_t i = n - 1; i > 0; --i) {
       out[i] = samples[i] - 0.97 * samples[i - 1];
     }
 
-    out[0] = samples[0] - 0.97 * last_sample_;
+    out[0] = samples[0] - 0.97 * (*last_sample);
 
-    last_sample_ = t;
+    *last_sample = t;
   }
 
   static void ApplyWindow(const float *samples, const float *window, int32_t n,
@@ -363,12 +392,14 @@ class TenVadModel::Impl {
     }
   }
 
-  void ComputeFeatures(const float *samples, int32_t n) {
+  // last_sample and last_features (3, 41) are updated in place
+  void ComputeFeatures(const float *samples, int32_t n, float *last_sample,
+                       float *last_features) {
     std::fill(tmp_samples_.begin() + n, tmp_samples_.end(), 0.0f);
 
     Scale(samples, n, tmp_samples_.data());
 
-    Preemphasis(tmp_samples_.data(), n, tmp_samples_.data());
+    Preemphasis(tmp_samples_.data(), n, tmp_samples_.data(), last_sample);
     ApplyWindow(tmp_samples_.data(), window_.data(), n, tmp_samples_.data());
 
     rfft_.Compute(tmp_samples_.data());
@@ -388,11 +419,10 @@ class TenVadModel::Impl {
 
     ApplyNormalization(features_.data(), features_.data());
 
-    std::memmove(last_features_.data(),
-                 last_features_.data() + features_.size(),
+    std::memmove(last_features, last_features + features_.size(),
                  2 * features_.size() * sizeof(float));
     std::copy(features_.begin(), features_.end(),
-              last_features_.begin() + 2 * features_.size());
+              last_features + 2 * features_.size());
   }
 
  private:
@@ -417,10 +447,7 @@ class TenVadModel::Impl {
   int32_t min_silence_samples_;
   int32_t min_speech_samples_;
 
-  bool triggered_ = false;
-  int32_t current_sample_ = 0;
-  int32_t temp_start_ = 0;
-  int32_t temp_end_ = 0;
+  VadTrigger trigger_;
 
   float last_sample_ = 0;
 
@@ -431,6 +458,9 @@ class TenVadModel::Impl {
   std::vector<float> features_;
   std::vector<float> last_features_;  // (3, 41), row major
   std::vector<float> tmp_samples_;    // (1024,)
+
+  // true if the model accepts batch size > 1
+  bool support_batch_ = false;
 };
 
 TenVadModel::TenVadModel(const VadModelConfig &config)
@@ -472,6 +502,15 @@ float TenVadModel::Compute(const float *samples, int32_t n) {
   return impl_->Run(samples, n);
 }
 
+std::unique_ptr<VadModelState> TenVadModel::CreateState() {
+  return impl_->CreateState();
+}
+
+void TenVadModel::ComputeBatch(const float *samples, int32_t n,
+                               VadModelState **states, float *probs) {
+  impl_->ComputeBatch(samples, n, states, probs);
+}
+
 #if __ANDROID_API__ >= 9
 template TenVadModel::TenVadModel(AAssetManager *mgr,
                                   const VadModelConfig &config);
@@ -45,6 +45,11 @@ class TenVadModel : public VadModel {
   void SetMinSilenceDuration(float s) override;
   void SetThreshold(float threshold) override;
 
+  std::unique_ptr<VadModelState> CreateState() override;
+
+  void ComputeBatch(const float *samples, int32_t n, VadModelState **states,
+                    float *probs) override;
+
  private:
   class Impl;
   std::unique_ptr<Impl> impl_;
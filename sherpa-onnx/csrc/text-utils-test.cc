@@ -4,6 +4,9 @@
 
 #include "sherpa-onnx/csrc/text-utils.h"
 
+#include <string>
+#include <vector>
+
 #include "gtest/gtest.h"
 
 namespace sherpa_onnx {
@@ -128,4 +131,19 @@ TEST(RemoveInvalidUtf8Sequences, DebugSpaceFollowedByInvalidByte) {
   EXPECT_EQ(output, " ");  // Expect `0xc4` to be removed, leaving only space
 }
 
+TEST(SplitSentences, Case1) {
+  std::vector<std::string> expected = {"How are you?", "Fine.",
+                                       "It costs 3.5 dollars!"};
+  EXPECT_EQ(SplitSentences(" How are you? Fine.  It costs 3.5 dollars! "),
+            expected);
+
+  expected = {"你好。", "今天天气怎么样？", "很好！"};
+  EXPECT_EQ(SplitSentences("你好。今天天气怎么样？很好！"), expected);
+
+  expected = {"first line", "second line."};
+  EXPECT_EQ(SplitSentences("first line\n\nsecond line."), expected);
+
+  EXPECT_TRUE(SplitSentences("  \n ").empty());
+}
+
 }  // namespace sherpa_onnx
@@ -724,4 +724,64 @@ std::vector<std::string> SplitString(const std::string &s, int32_t chunk_size) {
   return ans;
 }
 
+static bool IsSpace(char c) {
+  return c == ' ' || c == '\t' || c == '\n' || c == '\r';
+}
+
+std::vector<std::string> SplitSentences(const std::string &text) {
+  std::vector<std::string> ans;
+
+  auto add = [&ans, &text](size_t begin, size_t end) {
+    while (begin < end && IsSpace(text[begin])) {
+      ++begin;
+    }
+
+    while (end > begin && IsSpace(text[end - 1])) {
+      --end;
+    }
+
+    if (begin < end) {
+      ans.push_back(text.substr(begin, end - begin));
+    }
+  };
+
+  // They are 。！？ in utf8
+  static const char *kCjkEnds[] = {"\xe3\x80\x82", "\xef\xbc\x81",
+                                   "\xef\xbc\x9f"};
+
+  size_t n = text.size();
+  size_t begin = 0;
+  size_t i = 0;
+  while (i < n) {
+    char c = text[i];
+    size_t end = 0;  // end of the current sentence if it is not 0
+
+    if (c == '\n') {
+      end = i + 1;
+    } else if ((c == '.' || c == '!' || c == '?') &&
+               (i + 1 == n || IsSpace(text[i + 1]))) {
+      end = i + 1;
+    } else if (static_cast<uint8_t>(c) >= 0xe0 && i + 3 <= n) {
+      for (const char *p : kCjkEnds) {
+        if (text.compare(i, 3, p) == 0) {
+          end = i + 3;
+          break;
+        }
+      }
+    }
+
+    if (end) {
+      add(begin, end);
+      begin = end;
+      i = end;
+    } else {
+      ++i;
+    }
+  }
+
+  add(begin, n);
+
+  return ans;
+}
+
 }  // namespace sherpa_onnx
@@ -149,6 +149,11 @@ bool EndsWith(const std::string &haystack, const std::string &needle);
 
 std::vector<std::string> SplitString(const std::string &s, int32_t chunk_size);
 
+// Split text into sentences. A sentence ends with a newline, one of 。！？
+// or one of .!? that is followed by a space. Punctuations are kept and
+// leading and trailing spaces are removed. Empty sentences are discarded.
+std::vector<std::string> SplitSentences(const std::string &text);
+
 }  // namespace sherpa_onnx
 
 #endif  // SHERPA_ONNX_CSRC_TEXT_UTILS_H_
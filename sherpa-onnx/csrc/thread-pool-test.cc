@@ -0,0 +1,54 @@
+// sherpa-onnx/csrc/thread-pool-test.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/thread-pool.h"
+
+#include <atomic>
+#include <vector>
+
+#include "gtest/gtest.h"
+
+namespace sherpa_onnx {
+
+TEST(ThreadPool, ParallelFor) {
+  ThreadPool pool(4);
+  EXPECT_EQ(pool.NumThreads(), 4);
+
+  for (int32_t n : {0, 1, 3, 100}) {
+    std::vector<int32_t> v(n, 0);
+    pool.ParallelFor(n, [&v](int32_t i) { v[i] += i; });
+
+    for (int32_t i = 0; i != n; ++i) {
+      EXPECT_EQ(v[i], i);
+    }
+  }
+}
+
+TEST(ThreadPool, SingleThread) {
+  ThreadPool pool(1);
+  EXPECT_EQ(pool.NumThreads(), 1);
+
+  std::atomic<int32_t> sum{0};
+  pool.ParallelFor(10, [&sum](int32_t i) { sum += i; });
+  EXPECT_EQ(sum, 45);
+}
+
+TEST(ThreadPool, Nested) {
+  ThreadPool pool(4);
+  EXPECT_FALSE(pool.InParallelFor());
+
+  std::vector<int32_t> v(8 * 8, 0);
+  pool.ParallelFor(8, [&pool, &v](int32_t i) {
+    EXPECT_TRUE(pool.InParallelFor());
+
+    // It runs in the current thread instead of waiting for the outer loop
+    pool.ParallelFor(8, [&v, i](int32_t k) { v[i * 8 + k] += 1; });
+  });
+
+  for (auto k : v) {
+    EXPECT_EQ(k, 1);
+  }
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,95 @@
+// sherpa-onnx/csrc/thread-pool.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/thread-pool.h"
+
+namespace sherpa_onnx {
+
+// The pool whose iteration is running in this thread
+static thread_local const ThreadPool *tls_current_pool = nullptr;
+
+ThreadPool::ThreadPool(int32_t num_threads) {
+  if (num_threads > 1) {
+    threads_.reserve(num_threads - 1);
+    for (int32_t i = 1; i < num_threads; ++i) {
+      threads_.emplace_back([this]() { WorkerLoop(); });
+    }
+  }
+}
+
+ThreadPool::~ThreadPool() {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    stop_ = true;
+  }
+  cond_.notify_all();
+
+  for (auto &t : threads_) {
+    t.join();
+  }
+}
+
+void ThreadPool::ParallelFor(int32_t n, const std::function<void(int32_t)> &f) {
+  if (n <= 0) {
+    return;
+  }
+
+  if (threads_.empty() || n == 1 || InParallelFor()) {
+    for (int32_t i = 0; i != n; ++i) {
+      f(i);
+    }
+    return;
+  }
+
+  std::lock_guard<std::mutex> call_lock(call_mutex_);
+
+  std::unique_lock<std::mutex> lock(mutex_);
+  f_ = &f;
+  n_ = n;
+  next_ = 0;
+  num_done_ = 0;
+  cond_.notify_all();
+
+  RunIterations(&lock);
+
+  done_cond_.wait(lock, [this]() { return num_done_ == n_; });
+
+  f_ = nullptr;
+  n_ = 0;
+  next_ = 0;
+}
+
+bool ThreadPool::InParallelFor() const { return tls_current_pool == this; }
+
+void ThreadPool::WorkerLoop() {
+  std::unique_lock<std::mutex> lock(mutex_);
+  while (true) {
+    cond_.wait(lock, [this]() { return stop_ || next_ < n_; });
+    if (stop_) {
+      return;
+    }
+
+    RunIterations(&lock);
+  }
+}
+
+void ThreadPool::RunIterations(std::unique_lock<std::mutex> *lock) {
+  while (next_ < n_) {
+    int32_t i = next_++;
+    const auto &f = *f_;
+
+    lock->unlock();
+    const ThreadPool *prev = tls_current_pool;
+    tls_current_pool = this;
+    f(i);
+    tls_current_pool = prev;
+    lock->lock();
+
+    if (++num_done_ == n_) {
+      done_cond_.notify_all();
+    }
+  }
+}
+
+}  // namespace sherpa_onnx
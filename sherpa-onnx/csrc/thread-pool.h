@@ -0,0 +1,81 @@
+// sherpa-onnx/csrc/thread-pool.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_THREAD_POOL_H_
+#define SHERPA_ONNX_CSRC_THREAD_POOL_H_
+
+#include <condition_variable>  // NOLINT
+#include <cstdint>
+#include <functional>
+#include <mutex>   // NOLINT
+#include <thread>  // NOLINT
+#include <vector>
+
+namespace sherpa_onnx {
+
+/** A fixed number of worker threads that run the iterations of a loop in
+ * parallel.
+ *
+ * The threads are created once and reused by every call of ParallelFor(),
+ * so it is cheap enough to be called for every chunk of streaming
+ * decoding.
+ */
+class ThreadPool {
+ public:
+  /**
+   * @param num_threads Number of threads that run the loop, including the
+   *                    thread that calls ParallelFor(). If it is <= 1, no
+   *                    thread is created and loops run in the calling
+   *                    thread.
+   */
+  explicit ThreadPool(int32_t num_threads);
+  ~ThreadPool();
+
+  ThreadPool(const ThreadPool &) = delete;
+  ThreadPool &operator=(const ThreadPool &) = delete;
+
+  /** Call f(i) for i in [0, n) and return after all of them are finished.
+   *
+   * Iterations are handed out one at a time, so they can take different
+   * amounts of time. The calling thread also runs iterations. Calls from
+   * different threads are serialized. If it is called from an iteration of
+   * this pool, i.e., it is nested, the loop runs in the calling thread.
+   */
+  void ParallelFor(int32_t n, const std::function<void(int32_t)> &f);
+
+  // Return true if it is called from an iteration run by this pool
+  bool InParallelFor() const;
+
+  int32_t NumThreads() const {
+    return static_cast<int32_t>(threads_.size()) + 1;
+  }
+
+ private:
+  void WorkerLoop();
+
+  // Run the remaining iterations of the current job. lock has to hold
+  // mutex_ and it is released while an iteration is running.
+  void RunIterations(std::unique_lock<std::mutex> *lock);
+
+ private:
+  std::vector<std::thread> threads_;
+
+  // Only one ParallelFor() at a time
+  std::mutex call_mutex_;
+
+  std::mutex mutex_;
+  std::condition_variable cond_;
+  std::condition_variable done_cond_;
+
+  // The current job. They are protected by mutex_.
+  const std::function<void(int32_t)> *f_ = nullptr;
+  int32_t n_ = 0;
+  int32_t next_ = 0;
+  int32_t num_done_ = 0;
+
+  bool stop_ = false;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_THREAD_POOL_H_
@@ -132,7 +132,7 @@ void TransducerKeywordDecoder::Decode(
           new_hyp.context_state = std::get<1>(context_res);
           // Start matching from the start state, forget the decoder history.
           if (new_hyp.context_state->token == -1) {
-            new_hyp.ys = blanks;
+            new_hyp.SetYs(blanks);
             new_hyp.timestamps.clear();
             new_hyp.ys_probs.clear();
           }
@@ -84,6 +84,18 @@ std::unique_ptr<VadModel> VadModel::Create(Manager *mgr,
   return nullptr;
 }
 
+std::unique_ptr<VadModelState> VadModel::CreateState() {
+  SHERPA_ONNX_LOGE("This VAD model does not support multiple streams");
+  SHERPA_ONNX_EXIT(-1);
+  return nullptr;
+}
+
+void VadModel::ComputeBatch(const float * /*samples*/, int32_t /*n*/,
+                            VadModelState ** /*states*/, float * /*probs*/) {
+  SHERPA_ONNX_LOGE("This VAD model does not support multiple streams");
+  SHERPA_ONNX_EXIT(-1);
+}
+
 #if __ANDROID_API__ >= 9
 template std::unique_ptr<VadModel> VadModel::Create(
     AAssetManager *mgr, const VadModelConfig &config);
@@ -10,6 +10,15 @@
 
 namespace sherpa_onnx {
 
+// Model states of a single stream, e.g., the LSTM states of silero-vad.
+//
+// It is used by MultiStreamVoiceActivityDetector, which shares a single
+// model among many streams.
+class VadModelState {
+ public:
+  virtual ~VadModelState() = default;
+};
+
 class VadModel {
  public:
   virtual ~VadModel() = default;
@@ -42,6 +51,26 @@ class VadModel {
   virtual int32_t MinSpeechDurationSamples() const = 0;
   virtual void SetMinSilenceDuration(float s) = 0;
   virtual void SetThreshold(float threshold) = 0;
+
+  // Return the initial model states for a new stream.
+  //
+  // The following two methods are used by MultiStreamVoiceActivityDetector.
+  // They don't change the states used by IsSpeech() and Compute().
+  virtual std::unique_ptr<VadModelState> CreateState();
+
+  /**
+   * Compute the speech probabilities of one window from each of n streams
+   * in a batch.
+   *
+   * @param samples Pointer to a 2-d array of shape (n, WindowSize()).
+   *                Each sample should be normalized to the range [-1, 1].
+   * @param n Number of streams.
+   * @param states  Model states of the n streams, created by CreateState().
+   *                They are updated in place.
+   * @param probs On return, it contains the n speech probabilities.
+   */
+  virtual void ComputeBatch(const float *samples, int32_t n,
+                            VadModelState **states, float *probs);
 };
 
 }  // namespace sherpa_onnx
@@ -0,0 +1,81 @@
+// sherpa-onnx/csrc/vad-trigger.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/csrc/vad-trigger.h"
+
+namespace sherpa_onnx {
+
+bool VadTrigger::IsSpeech(float prob, float threshold, int32_t window_shift,
+                          int32_t min_speech_samples,
+                          int32_t min_silence_samples) {
+  current_sample_ += window_shift;
+
+  if (prob > threshold && temp_end_ != 0) {
+    temp_end_ = 0;
+  }
+
+  if (prob > threshold && temp_start_ == 0) {
+    // start speaking, but we require that it must satisfy
+    // min_speech_duration
+    temp_start_ = current_sample_;
+    return false;
+  }
+
+  if (prob > threshold && temp_start_ != 0 && !triggered_) {
+    if (current_sample_ - temp_start_ < min_speech_samples) {
+      return false;
+    }
+
+    triggered_ = true;
+
+    return true;
+  }
+
+  if ((prob < threshold) && !triggered_) {
+    // silence
+    temp_start_ = 0;
+    temp_end_ = 0;
+    return false;
+  }
+
+  if ((prob > threshold - 0.15) && triggered_) {
+    // speaking
+    return true;
+  }
+
+  if ((prob > threshold) && !triggered_) {
+    // start speaking
+    triggered_ = true;
+
+    return true;
+  }
+
+  if ((prob < threshold) && triggered_) {
+    // stop to speak
+    if (temp_end_ == 0) {
+      temp_end_ = current_sample_;
+    }
+
+    if (current_sample_ - temp_end_ < min_silence_samples) {
+      // continue speaking
+      return true;
+    }
+    // stopped speaking
+    temp_start_ = 0;
+    temp_end_ = 0;
+    triggered_ = false;
+    return false;
+  }
+
+  return false;
+}
+
+void VadTrigger::Reset() {
+  triggered_ = false;
+  current_sample_ = 0;
+  temp_start_ = 0;
+  temp_end_ = 0;
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,42 @@
+// sherpa-onnx/csrc/vad-trigger.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+#ifndef SHERPA_ONNX_CSRC_VAD_TRIGGER_H_
+#define SHERPA_ONNX_CSRC_VAD_TRIGGER_H_
+
+#include <cstdint>
+
+namespace sherpa_onnx {
+
+// It decides whether a window is speech from its speech probability.
+//
+// Speech starts only after the probability has stayed above the threshold
+// for min_speech_samples and it ends only after the probability has stayed
+// below the threshold for min_silence_samples. It is shared by the VAD
+// models, e.g., silero-vad and ten-vad.
+class VadTrigger {
+ public:
+  /**
+   * @param prob Speech probability of the current window.
+   * @param threshold Windows with prob above it are considered as speech.
+   * @param window_shift Number of new samples in the current window.
+   * @param min_speech_samples Minimum number of samples of a speech segment.
+   * @param min_silence_samples Minimum number of samples of silence to end
+   *                            a speech segment.
+   * @return Return true if speech is detected. Return false otherwise.
+   */
+  bool IsSpeech(float prob, float threshold, int32_t window_shift,
+                int32_t min_speech_samples, int32_t min_silence_samples);
+
+  void Reset();
+
+ private:
+  bool triggered_ = false;
+  int32_t current_sample_ = 0;
+  int32_t temp_start_ = 0;
+  int32_t temp_end_ = 0;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_CSRC_VAD_TRIGGER_H_
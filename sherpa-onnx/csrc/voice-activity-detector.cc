@@ -7,6 +7,7 @@
 #include <algorithm>
 #include <queue>
 #include <utility>
+#include <vector>
 
 #if __ANDROID_API__ >= 9
 #include "android/asset_manager.h"
@@ -41,11 +42,125 @@ class VoiceActivityDetector::Impl {
     Init();
   }
 
+  Impl(std::unique_ptr<VadModel> model, const VadModelConfig &config,
+       float buffer_size_in_seconds)
+      : model_(std::move(model)),
+        config_(config),
+        buffer_(buffer_size_in_seconds * config.sample_rate) {
+    Init();
+  }
+
   float Compute(const float *samples, int32_t n) {
     return model_->Compute(samples, n);
   }
 
   void AcceptWaveform(const float *samples, int32_t n) {
+    // note n is usually window_size and there is no need to use
+    // an extra buffer here
+    last_.insert(last_.end(), samples, samples + n);
+    ProcessBufferedSamples();
+  }
+
+  void AcceptWaveform(const int16_t *samples, int32_t n) {
+    last_.reserve(last_.size() + n);
+    for (int32_t i = 0; i != n; ++i) {
+      last_.push_back(samples[i] / 32768.0f);
+    }
+    ProcessBufferedSamples();
+  }
+
+  bool Empty() const { return segments_.empty(); }
+
+  void Pop() { segments_.pop(); }
+
+  void Clear() { std::queue<SpeechSegment>().swap(segments_); }
+
+  const SpeechSegment &Front() const { return segments_.front(); }
+
+  void Reset() {
+    std::queue<SpeechSegment>().swap(segments_);
+
+    model_->Reset();
+    buffer_.Reset();
+    last_.clear();
+
+    start_ = -1;
+
+    ClearCurrentSegment();
+  }
+
+  void Flush() {
+    if (start_ == -1 || buffer_.Size() == 0) {
+      return;
+    }
+
+    int32_t end = buffer_.Tail();
+    if (end <= start_) {
+      return;
+    }
+
+    std::vector<float> s = TakeCurrentSegmentSamples(end);
+
+    SpeechSegment segment;
+
+    segment.start = start_;
+    segment.samples = std::move(s);
+
+    segments_.push(std::move(segment));
+
+    buffer_.Pop(end - buffer_.Head());
+    start_ = -1;
+
+    ClearCurrentSegment();
+  }
+
+  bool IsSpeechDetected() const { return start_ != -1; }
+
+  SpeechSegment CurrentSpeechSegment() const { return cur_segment_; }
+
+  const SpeechSegment &CurrentSpeechSegmentRef() const { return cur_segment_; }
+
+  std::vector<float> GetNewSpeechSamples() {
+    const auto &samples = cur_segment_.samples;
+    int32_t n = static_cast<int32_t>(samples.size());
+    if (num_polled_samples_ >= n) {
+      return {};
+    }
+
+    std::vector<float> ans(samples.begin() + num_polled_samples_,
+                           samples.end());
+    num_polled_samples_ = n;
+
+    return ans;
+  }
+
+  const VadModelConfig &GetConfig() const { return config_; }
+
+ private:
+  void ClearCurrentSegment() {
+    cur_segment_.start = -1;
+    cur_segment_.samples.clear();
+    num_polled_samples_ = 0;
+  }
+
+  // Return samples in the range [start_, end) of buffer_. The samples
+  // already copied to cur_segment_ are moved instead of being copied again.
+  std::vector<float> TakeCurrentSegmentSamples(int32_t end) {
+    std::vector<float> ans = std::move(cur_segment_.samples);
+    ClearCurrentSegment();
+
+    int32_t cur_end = start_ + static_cast<int32_t>(ans.size());
+    if (end <= cur_end) {
+      ans.resize(std::max(0, end - start_));
+    } else {
+      std::vector<float> s = buffer_.Get(cur_end, end - cur_end);
+      ans.insert(ans.end(), s.begin(), s.end());
+    }
+
+    return ans;
+  }
+
+  void ProcessBufferedSamples() {
     if (buffer_.Size() > max_utterance_length_) {
       model_->SetMinSilenceDuration(new_min_silence_duration_s_);
       model_->SetThreshold(new_threshold_);
@@ -65,10 +180,6 @@ class VoiceActivityDetector::Impl {
     int32_t window_size = model_->WindowSize();
     int32_t window_shift = model_->WindowShift();
 
-    // note n is usually window_size and there is no need to use
-    // an extra buffer here
-    last_.insert(last_.end(), samples, samples + n);
-
     if (last_.size() < window_size) {
       return;
     }
@@ -97,19 +208,24 @@ class VoiceActivityDetector::Impl {
                           buffer_.Head());
         cur_segment_.start = start_;
       }
-      int32_t num_samples = buffer_.Tail() - start_ - 1;
-      cur_segment_.samples = buffer_.Get(start_, num_samples);
+      // Append only the samples received since the last call so that
+      // the cost does not grow with the length of the current segment.
+      int32_t end = buffer_.Tail() - 1;
+      int32_t cur_end =
+          start_ + static_cast<int32_t>(cur_segment_.samples.size());
+      if (end > cur_end) {
+        std::vector<float> s = buffer_.Get(cur_end, end - cur_end);
+        cur_segment_.samples.insert(cur_segment_.samples.end(), s.begin(),
+                                    s.end());
+      }
     } else {
       // non-speech
 
-      cur_segment_.start = -1;
-      cur_segment_.samples.clear();
-
       if (start_ != -1 && buffer_.Size()) {
         // end of speech, save the speech segment
         int32_t end = buffer_.Tail() - model_->MinSilenceDurationSamples();
 
-        std::vector<float> s = buffer_.Get(start_, end - start_);
+        std::vector<float> s = TakeCurrentSegmentSamples(end);
         SpeechSegment segment;
 
         segment.start = start_;
@@ -129,64 +245,11 @@ class VoiceActivityDetector::Impl {
         }
       }
 
+      ClearCurrentSegment();
       start_ = -1;
     }
   }
 
-  bool Empty() const { return segments_.empty(); }
-
-  void Pop() { segments_.pop(); }
-
-  void Clear() { std::queue<SpeechSegment>().swap(segments_); }
-
-  const SpeechSegment &Front() const { return segments_.front(); }
-
-  void Reset() {
-    std::queue<SpeechSegment>().swap(segments_);
-
-    model_->Reset();
-    buffer_.Reset();
-    last_.clear();
-
-    start_ = -1;
-
-    cur_segment_.start = -1;
-    cur_segment_.samples.clear();
-  }
-
-  void Flush() {
-    if (start_ == -1 || buffer_.Size() == 0) {
-      return;
-    }
-
-    int32_t end = buffer_.Tail();
-    if (end <= start_) {
-      return;
-    }
-
-    std::vector<float> s = buffer_.Get(start_, end - start_);
-
-    SpeechSegment segment;
-
-    segment.start = start_;
-    segment.samples = std::move(s);
-
-    segments_.push(std::move(segment));
-
-    buffer_.Pop(end - buffer_.Head());
-    start_ = -1;
-
-    cur_segment_.start = -1;
-    cur_segment_.samples.clear();
-  }
-
-  bool IsSpeechDetected() const { return start_ != -1; }
-
-  SpeechSegment CurrentSpeechSegment() const { return cur_segment_; }
-
-  const VadModelConfig &GetConfig() const { return config_; }
-
- private:
   void Init() {
     if (!config_.silero_vad.model.empty()) {
       max_utterance_length_ =
@@ -206,6 +269,9 @@ class VoiceActivityDetector::Impl {
   // it is empty if no speech is detected
   SpeechSegment cur_segment_;
 
+  // number of samples in cur_segment_ returned by GetNewSpeechSamples()
+  int32_t num_polled_samples_ = 0;
+
   std::unique_ptr<VadModel> model_;
   VadModelConfig config_;
   CircularBuffer buffer_;
@@ -228,12 +294,22 @@ VoiceActivityDetector::VoiceActivityDetector(
     float buffer_size_in_seconds /*= 60*/)
     : impl_(std::make_unique<Impl>(mgr, config, buffer_size_in_seconds)) {}
 
+VoiceActivityDetector::VoiceActivityDetector(
+    std::unique_ptr<VadModel> model, const VadModelConfig &config,
+    float buffer_size_in_seconds /*= 60*/)
+    : impl_(std::make_unique<Impl>(std::move(model), config,
+                                   buffer_size_in_seconds)) {}
+
 VoiceActivityDetector::~VoiceActivityDetector() = default;
 
 void VoiceActivityDetector::AcceptWaveform(const float *samples, int32_t n) {
   impl_->AcceptWaveform(samples, n);
 }
 
+void VoiceActivityDetector::AcceptWaveform(const int16_t *samples, int32_t n) {
+  impl_->AcceptWaveform(samples, n);
+}
+
 bool VoiceActivityDetector::Empty() const { return impl_->Empty(); }
 
 void VoiceActivityDetector::Pop() { impl_->Pop(); }
@@ -256,6 +332,14 @@ SpeechSegment VoiceActivityDetector::CurrentSpeechSegment() const {
   return impl_->CurrentSpeechSegment();
 }
 
+const SpeechSegment &VoiceActivityDetector::CurrentSpeechSegmentRef() const {
+  return impl_->CurrentSpeechSegmentRef();
+}
+
+std::vector<float> VoiceActivityDetector::GetNewSpeechSamples() {
+  return impl_->GetNewSpeechSamples();
+}
+
 const VadModelConfig &VoiceActivityDetector::GetConfig() const {
   return impl_->GetConfig();
 }
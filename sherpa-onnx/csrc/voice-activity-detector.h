@@ -11,6 +11,8 @@
 
 namespace sherpa_onnx {
 
+class VadModel;
+
 struct SpeechSegment {
   int32_t start;  // in samples
   std::vector<float> samples;
@@ -25,9 +27,20 @@ class VoiceActivityDetector {
   VoiceActivityDetector(Manager *mgr, const VadModelConfig &config,
                         float buffer_size_in_seconds = 60);
 
+  // Use the given model instead of creating one from the config.
+  // It is used, e.g., by MultiStreamVoiceActivityDetector.
+  VoiceActivityDetector(std::unique_ptr<VadModel> model,
+                        const VadModelConfig &config,
+                        float buffer_size_in_seconds = 60);
+
   ~VoiceActivityDetector();
 
   void AcceptWaveform(const float *samples, int32_t n);
+
+  // Same as the above one except that the input is 16-bit PCM, i.e.,
+  // in the range [-32768, 32767]. The samples are scaled inside.
+  void AcceptWaveform(const int16_t *samples, int32_t n);
+
   float Compute(const float *samples, int32_t n);
 
   bool Empty() const;
@@ -45,6 +58,19 @@ class VoiceActivityDetector {
   // It is empty if IsSpeechDetected() returns false
   SpeechSegment CurrentSpeechSegment() const;
 
+  // Same as CurrentSpeechSegment() but without copying the samples.
+  //
+  // The returned reference is valid until the next call to any
+  // methods of VoiceActivityDetector.
+  const SpeechSegment &CurrentSpeechSegmentRef() const;
+
+  // Return samples of the current speech segment that have not been
+  // returned by a previous call of this method. When a new speech segment
+  // starts, it begins from the first sample of that segment.
+  //
+  // It is empty if IsSpeechDetected() returns false.
+  std::vector<float> GetNewSpeechSamples();
+
   void Reset() const;
 
   // At the end of the utterance, you can invoke this method so that
@@ -0,0 +1,24 @@
+// sherpa-onnx/python/csrc/binary-lexicon.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/python/csrc/binary-lexicon.h"
+
+#include "sherpa-onnx/csrc/binary-lexicon.h"
+
+namespace sherpa_onnx {
+
+void PybindBinaryLexicon(py::module *m) {
+  m->def("compile_lexicon", &CompileLexicon, py::arg("lexicon"),
+         py::arg("tokens"), py::arg("output"),
+         py::call_guard<py::gil_scoped_release>(),
+         R"(Convert lexicon.txt to a binary lexicon that can be used in place
+of lexicon.txt. Return True on success.)");
+
+  m->def("compile_tokens", &CompileTokens, py::arg("tokens"), py::arg("output"),
+         py::call_guard<py::gil_scoped_release>(),
+         R"(Convert tokens.txt to the binary format that can be used in place
+of tokens.txt. Return True on success.)");
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,16 @@
+// sherpa-onnx/python/csrc/binary-lexicon.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_PYTHON_CSRC_BINARY_LEXICON_H_
+#define SHERPA_ONNX_PYTHON_CSRC_BINARY_LEXICON_H_
+
+#include "sherpa-onnx/python/csrc/sherpa-onnx.h"
+
+namespace sherpa_onnx {
+
+void PybindBinaryLexicon(py::module *m);
+
+}
+
+#endif  // SHERPA_ONNX_PYTHON_CSRC_BINARY_LEXICON_H_
@@ -0,0 +1,20 @@
+// sherpa-onnx/python/csrc/context-graph.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/python/csrc/context-graph.h"
+
+#include <memory>
+
+#include "sherpa-onnx/csrc/context-graph.h"
+
+namespace sherpa_onnx {
+
+void PybindContextGraph(py::module *m) {
+  // It is returned by compile_hotwords() of a recognizer and can be passed
+  // to create_stream() of the same recognizer.
+  using PyClass = ContextGraph;
+  py::class_<PyClass, std::shared_ptr<PyClass>>(*m, "HotwordsHandle");
+}
+
+}  // namespace sherpa_onnx
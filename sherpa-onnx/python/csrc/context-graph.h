@@ -0,0 +1,16 @@
+// sherpa-onnx/python/csrc/context-graph.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_PYTHON_CSRC_CONTEXT_GRAPH_H_
+#define SHERPA_ONNX_PYTHON_CSRC_CONTEXT_GRAPH_H_
+
+#include "sherpa-onnx/python/csrc/sherpa-onnx.h"
+
+namespace sherpa_onnx {
+
+void PybindContextGraph(py::module *m);
+
+}
+
+#endif  // SHERPA_ONNX_PYTHON_CSRC_CONTEXT_GRAPH_H_
@@ -0,0 +1,120 @@
+// sherpa-onnx/python/csrc/multi-stream-voice-activity-detector.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/python/csrc/multi-stream-voice-activity-detector.h"
+
+#include <utility>
+#include <vector>
+
+#include "sherpa-onnx/csrc/multi-stream-voice-activity-detector.h"
+#include "sherpa-onnx/python/csrc/numpy-array.h"
+#include "sherpa-onnx/python/csrc/waveform-view.h"
+
+namespace sherpa_onnx {
+
+constexpr const char *kVadStreamAcceptWaveformUsage = R"(
+Buffer audio samples. They are processed by the next call of
+MultiStreamVoiceActivityDetector.process().
+
+Args:
+  samples:
+    A 1-D float32 tensor containing audio samples in the range [-1, 1],
+    or a 1-D int16 array containing 16-bit PCM samples. See also
+    VoiceActivityDetector.accept_waveform().
+)";
+
+constexpr const char *kProcessUsage = R"(
+Run the VAD model on the buffered samples of the given streams.
+
+Windows from different streams are computed in a single batch, so a
+single call for all active streams is much cheaper than one call per
+stream. The GIL is released during the computation.
+)";
+
+static void PybindVadStream(py::module *m) {
+  using PyClass = VadStream;
+  py::class_<PyClass>(*m, "VadStream",
+                      R"(
+The VAD state of a single audio stream. Create it with
+MultiStreamVoiceActivityDetector.create_stream(). Apart from the fact that
+samples are processed only in MultiStreamVoiceActivityDetector.process(),
+it has the same methods as VoiceActivityDetector.
+      )")
+      .def(
+          "accept_waveform",
+          [](PyClass &self, py::object samples) {
+            WaveformView view(samples);
+
+            py::gil_scoped_release release;
+            if (view.Int16Data()) {
+              self.AcceptWaveform(view.Int16Data(), view.Size());
+            } else {
+              self.AcceptWaveform(view.FloatData(), view.Size());
+            }
+          },
+          py::arg("samples"), kVadStreamAcceptWaveformUsage)
+      .def("empty", &PyClass::Empty, py::call_guard<py::gil_scoped_release>())
+      .def("pop", &PyClass::Pop, py::call_guard<py::gil_scoped_release>())
+      .def("clear", &PyClass::Clear, py::call_guard<py::gil_scoped_release>())
+      .def("is_speech_detected", &PyClass::IsSpeechDetected,
+           py::call_guard<py::gil_scoped_release>())
+      .def("reset", &PyClass::Reset, py::call_guard<py::gil_scoped_release>())
+      .def("flush", &PyClass::Flush, py::call_guard<py::gil_scoped_release>())
+      .def_property_readonly("front", &PyClass::Front)
+      .def_property_readonly("current_segment", &PyClass::CurrentSpeechSegment)
+      .def_property_readonly("current_segment_start",
+                             [](const PyClass &self) {
+                               return self.CurrentSpeechSegmentRef().start;
+                             })
+      .def("current_segment_view",
+           [](py::object obj) {
+             const auto &self = obj.cast<const PyClass &>();
+             const auto &samples = self.CurrentSpeechSegmentRef().samples;
+             return NumpyArrayView(samples.data(), samples.size(), obj);
+           })
+      .def("get_new_speech_samples", [](PyClass &self) {
+        std::vector<float> samples;
+        {
+          py::gil_scoped_release release;
+          samples = self.GetNewSpeechSamples();
+        }
+        return MoveToNumpyArray(std::move(samples));
+      });
+}
+
+void PybindMultiStreamVoiceActivityDetector(py::module *m) {
+  PybindVadStream(m);
+
+  using PyClass = MultiStreamVoiceActivityDetector;
+  py::class_<PyClass>(*m, "MultiStreamVoiceActivityDetector",
+                      R"(
+A voice activity detector that shares a single model among many audio
+streams, e.g., the clients of a server.
+
+  vad = MultiStreamVoiceActivityDetector(config)
+  s = vad.create_stream()
+  s.accept_waveform(samples)
+  vad.process([s for s in streams if vad.is_ready(s)])
+  while not s.empty():
+      segment = s.front
+      s.pop()
+      )")
+      .def(py::init<const VadModelConfig &, float>(), py::arg("config"),
+           py::arg("buffer_size_in_seconds") = 60,
+           py::call_guard<py::gil_scoped_release>())
+      .def("create_stream", &PyClass::CreateStream,
+           py::call_guard<py::gil_scoped_release>())
+      .def("is_ready", &PyClass::IsReady, py::arg("s"),
+           py::call_guard<py::gil_scoped_release>())
+      .def(
+          "process",
+          [](const PyClass &self, std::vector<VadStream *> ss) {
+            self.Process(ss.data(), ss.size());
+          },
+          py::arg("ss"), py::call_guard<py::gil_scoped_release>(),
+          kProcessUsage)
+      .def_property_readonly("config", &PyClass::GetConfig);
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,32 @@
+// sherpa-onnx/python/csrc/numpy-array.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/python/csrc/numpy-array.h"
+
+#include <utility>
+
+namespace sherpa_onnx {
+
+py::array_t<float> MoveToNumpyArray(std::vector<float> &&v) {
+  auto p = new std::vector<float>(std::move(v));
+
+  py::capsule owner(p, [](void *ptr) {
+    delete reinterpret_cast<std::vector<float> *>(ptr);
+  });
+
+  return py::array_t<float>(p->size(), p->data(), owner);
+}
+
+py::array_t<float> NumpyArrayView(const float *data, int32_t n,
+                                  py::handle base) {
+  py::array_t<float> ans(n, data, base);
+
+  // Clear the writeable flag so that numpy raises if someone tries to
+  // modify memory owned by the C++ object
+  ans.attr("setflags")(py::arg("write") = false);
+
+  return ans;
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,26 @@
+// sherpa-onnx/python/csrc/numpy-array.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_PYTHON_CSRC_NUMPY_ARRAY_H_
+#define SHERPA_ONNX_PYTHON_CSRC_NUMPY_ARRAY_H_
+
+#include <vector>
+
+#include "sherpa-onnx/python/csrc/sherpa-onnx.h"
+
+namespace sherpa_onnx {
+
+// Move the storage of v into a 1-D float32 numpy array without copying.
+// The returned array owns the data through a capsule.
+py::array_t<float> MoveToNumpyArray(std::vector<float> &&v);
+
+// Return a read-only 1-D float32 numpy array that shares memory with
+// [data, data + n). The given base object is kept alive as long as the
+// array is alive, so data must be owned by base.
+py::array_t<float> NumpyArrayView(const float *data, int32_t n,
+                                  py::handle base);
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_PYTHON_CSRC_NUMPY_ARRAY_H_
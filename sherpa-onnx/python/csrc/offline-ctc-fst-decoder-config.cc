@@ -13,10 +13,15 @@ namespace sherpa_onnx {
 void PybindOfflineCtcFstDecoderConfig(py::module *m) {
   using PyClass = OfflineCtcFstDecoderConfig;
   py::class_<PyClass>(*m, "OfflineCtcFstDecoderConfig")
-      .def(py::init<const std::string &, int32_t>(), py::arg("graph") = "",
-           py::arg("max_active") = 3000)
+      .def(py::init<const std::string &, int32_t, int32_t, bool, int32_t>(),
+           py::arg("graph") = "", py::arg("max_active") = 3000,
+           py::arg("num_threads") = 1, py::arg("use_mmap") = false,
+           py::arg("nbest") = 1)
       .def_readwrite("graph", &PyClass::graph)
       .def_readwrite("max_active", &PyClass::max_active)
+      .def_readwrite("num_threads", &PyClass::num_threads)
+      .def_readwrite("use_mmap", &PyClass::use_mmap)
+      .def_readwrite("nbest", &PyClass::nbest)
       .def("__str__", &PyClass::ToString);
 }
 
@@ -5,12 +5,33 @@
 #include "sherpa-onnx/python/csrc/offline-recognizer.h"
 
 #include <string>
+#include <utility>
 #include <vector>
 
 #include "sherpa-onnx/csrc/offline-recognizer.h"
 
 namespace sherpa_onnx {
 
+constexpr const char *kDecodeStreamsUsage = R"(
+Decode a list of streams. The result of each stream is saved in
+stream.result.
+
+By default, all streams are decoded in a single batch and are padded to the
+longest one. If max_padding_ratio < 1 or max_frames_per_batch > 0, streams
+are sorted by length and split into buckets, and each bucket is decoded as
+a separate batch.
+
+Args:
+  ss:
+    A list of streams.
+  max_padding_ratio:
+    Max ratio of padded frames to num_streams * max_num_frames in a bucket.
+    A value >= 1 disables this limit.
+  max_frames_per_batch:
+    Max value of num_streams * max_num_frames in a bucket. A value <= 0
+    disables this limit.
+)";
+
 static void PybindOfflineRecognizerConfig(py::module *m) {
   using PyClass = OfflineRecognizerConfig;
   py::class_<PyClass>(*m, "OfflineRecognizerConfig")
@@ -18,7 +39,7 @@ static void PybindOfflineRecognizerConfig(py::module *m) {
                     const OfflineLMConfig &, const OfflineCtcFstDecoderConfig &,
                     const std::string &, int32_t, const std::string &, float,
                     float, const std::string &, const std::string &,
-                    const HomophoneReplacerConfig &>(),
+                    const HomophoneReplacerConfig &, int32_t>(),
            py::arg("feat_config") = FeatureExtractorConfig(),
            py::arg("model_config") = OfflineModelConfig(),
            py::arg("lm_config") = OfflineLMConfig(),
@@ -27,7 +48,8 @@ static void PybindOfflineRecognizerConfig(py::module *m) {
            py::arg("max_active_paths") = 4, py::arg("hotwords_file") = "",
            py::arg("hotwords_score") = 1.5, py::arg("blank_penalty") = 0.0,
            py::arg("rule_fsts") = "", py::arg("rule_fars") = "",
-           py::arg("hr") = HomophoneReplacerConfig{})
+           py::arg("hr") = HomophoneReplacerConfig{},
+           py::arg("num_decode_workers") = 1)
       .def_readwrite("feat_config", &PyClass::feat_config)
       .def_readwrite("model_config", &PyClass::model_config)
       .def_readwrite("lm_config", &PyClass::lm_config)
@@ -40,6 +62,7 @@ static void PybindOfflineRecognizerConfig(py::module *m) {
       .def_readwrite("rule_fsts", &PyClass::rule_fsts)
       .def_readwrite("rule_fars", &PyClass::rule_fars)
       .def_readwrite("hr", &PyClass::hr)
+      .def_readwrite("num_decode_workers", &PyClass::num_decode_workers)
       .def("__str__", &PyClass::ToString);
 }
 
@@ -60,16 +83,28 @@ void PybindOfflineRecognizer(py::module *m) {
             return self.CreateStream(hotwords);
           },
           py::arg("hotwords"), py::call_guard<py::gil_scoped_release>())
+      .def(
+          "create_stream",
+          [](const PyClass &self, ContextGraphPtr hotwords) {
+            return self.CreateStream(std::move(hotwords));
+          },
+          py::arg("hotwords"), py::call_guard<py::gil_scoped_release>())
+      .def("compile_hotwords", &PyClass::CompileHotwords, py::arg("hotwords"),
+           py::call_guard<py::gil_scoped_release>())
       .def("decode_stream", &PyClass::DecodeStream, py::arg("s"),
            py::call_guard<py::gil_scoped_release>())
       .def("set_config", &PyClass::SetConfig, py::arg("config"),
            py::call_guard<py::gil_scoped_release>())
       .def(
           "decode_streams",
-          [](const PyClass &self, std::vector<OfflineStream *> ss) {
-            self.DecodeStreams(ss.data(), ss.size());
+          [](const PyClass &self, std::vector<OfflineStream *> ss,
+             float max_padding_ratio, int32_t max_frames_per_batch) {
+            self.DecodeStreams(ss.data(), ss.size(), max_padding_ratio,
+                               max_frames_per_batch);
           },
-          py::arg("ss"), py::call_guard<py::gil_scoped_release>());
+          py::arg("ss"), py::arg("max_padding_ratio") = 1.0f,
+          py::arg("max_frames_per_batch") = 0,
+          py::call_guard<py::gil_scoped_release>(), kDecodeStreamsUsage);
 }
 
 }  // namespace sherpa_onnx
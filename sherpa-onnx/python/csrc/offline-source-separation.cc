@@ -19,9 +19,11 @@ static void PybindOfflineSourceSeparationConfig(py::module *m) {
 
   using PyClass = OfflineSourceSeparationConfig;
   py::class_<PyClass>(*m, "OfflineSourceSeparationConfig")
-      .def(py::init<const OfflineSourceSeparationModelConfig &>(),
-           py::arg("model") = OfflineSourceSeparationModelConfig{})
+      .def(py::init<const OfflineSourceSeparationModelConfig &, int32_t>(),
+           py::arg("model") = OfflineSourceSeparationModelConfig{},
+           py::arg("num_chunks_per_run") = 1)
       .def_readwrite("model", &PyClass::model)
+      .def_readwrite("num_chunks_per_run", &PyClass::num_chunks_per_run)
       .def("validate", &PyClass::Validate)
       .def("__str__", &PyClass::ToString);
 }
@@ -10,6 +10,7 @@
 #include "sherpa-onnx/csrc/offline-speaker-diarization.h"
 #include "sherpa-onnx/csrc/offline-speaker-segmentation-model-config.h"
 #include "sherpa-onnx/csrc/offline-speaker-segmentation-pyannote-model-config.h"
+#include "sherpa-onnx/python/csrc/waveform-view.h"
 
 namespace sherpa_onnx {
 
@@ -48,14 +49,23 @@ static void PybindOfflineSpeakerDiarizationConfig(py::module *m) {
   py::class_<PyClass>(*m, "OfflineSpeakerDiarizationConfig")
       .def(py::init<const OfflineSpeakerSegmentationModelConfig &,
                     const SpeakerEmbeddingExtractorConfig &,
-                    const FastClusteringConfig &, float, float>(),
+                    const FastClusteringConfig &, float, float, int32_t,
+                    int32_t, int32_t>(),
            py::arg("segmentation"), py::arg("embedding"), py::arg("clustering"),
-           py::arg("min_duration_on") = 0.3, py::arg("min_duration_off") = 0.5)
+           py::arg("min_duration_on") = 0.3, py::arg("min_duration_off") = 0.5,
+           py::arg("embedding_batch_size") = 1,
+           py::arg("segmentation_batch_size") = 1,
+           py::arg("segmentation_num_workers") = 1)
       .def_readwrite("segmentation", &PyClass::segmentation)
       .def_readwrite("embedding", &PyClass::embedding)
       .def_readwrite("clustering", &PyClass::clustering)
       .def_readwrite("min_duration_on", &PyClass::min_duration_on)
       .def_readwrite("min_duration_off", &PyClass::min_duration_off)
+      .def_readwrite("embedding_batch_size", &PyClass::embedding_batch_size)
+      .def_readwrite("segmentation_batch_size",
+                     &PyClass::segmentation_batch_size)
+      .def_readwrite("segmentation_num_workers",
+                     &PyClass::segmentation_num_workers)
       .def("__str__", &PyClass::ToString)
       .def("validate", &PyClass::Validate);
 }
@@ -71,20 +81,24 @@ void PybindOfflineSpeakerDiarization(py::module *m) {
       .def("set_config", &PyClass::SetConfig, py::arg("config"))
       .def(
           "process",
-          [](const PyClass &self, const std::vector<float> samples,
+          [](const PyClass &self, py::object samples,
              std::function<int32_t(int32_t, int32_t)> callback) {
+            WaveformView view(samples, /*allow_int16*/ false);
+
+            py::gil_scoped_release release;
             if (!callback) {
-              return self.Process(samples.data(), samples.size());
+              return self.Process(view.FloatData(), view.Size());
             }
 
             std::function<int32_t(int32_t, int32_t, void *)> callback_wrapper =
                 [callback](int32_t processed_chunks, int32_t num_chunks,
                            void *) -> int32_t {
+              pybind11::gil_scoped_acquire acquire;
               callback(processed_chunks, num_chunks);
               return 0;
             };
 
-            return self.Process(samples.data(), samples.size(),
+            return self.Process(view.FloatData(), view.Size(),
                                 callback_wrapper);
           },
           py::arg("samples"), py::arg("callback") = py::none());
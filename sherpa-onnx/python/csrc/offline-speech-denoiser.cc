@@ -7,10 +7,17 @@
 #include <vector>
 
 #include "sherpa-onnx/csrc/offline-speech-denoiser.h"
+#include "sherpa-onnx/python/csrc/numpy-array.h"
 #include "sherpa-onnx/python/csrc/offline-speech-denoiser-model-config.h"
 
 namespace sherpa_onnx {
 
+constexpr const char *kSamplesViewUsage = R"(
+Return a read-only float32 numpy array sharing memory with the samples of
+this object. No copy is made. The array keeps this object alive; it must
+not be used after this object is modified.
+)";
+
 void PybindOfflineSpeechDenoiserConfig(py::module *m) {
   PybindOfflineSpeechDenoiserModelConfig(m);
 
@@ -30,8 +37,19 @@ void PybindDenoisedAudio(py::module *m) {
   py::class_<PyClass>(*m, "DenoisedAudio")
       .def_property_readonly(
           "sample_rate", [](const PyClass &self) { return self.sample_rate; })
-      .def_property_readonly("samples",
-                             [](const PyClass &self) { return self.samples; });
+      .def_property_readonly(
+          "samples",
+          [](const PyClass &self) {
+            return MoveToNumpyArray(std::vector<float>(self.samples));
+          })
+      .def(
+          "samples_view",
+          [](py::object obj) {
+            const auto &self = obj.cast<const PyClass &>();
+            return NumpyArrayView(self.samples.data(), self.samples.size(),
+                                  obj);
+          },
+          kSamplesViewUsage);
 }
 
 void PybindOfflineSpeechDenoiser(py::module *m) {
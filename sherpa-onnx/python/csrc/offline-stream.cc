@@ -4,9 +4,12 @@
 
 #include "sherpa-onnx/python/csrc/offline-stream.h"
 
+#include <utility>
 #include <vector>
 
 #include "sherpa-onnx/csrc/offline-stream.h"
+#include "sherpa-onnx/python/csrc/numpy-array.h"
+#include "sherpa-onnx/python/csrc/waveform-view.h"
 
 namespace sherpa_onnx {
 
@@ -19,7 +22,10 @@ Args:
     expected by the model, we will do resampling inside.
   waveform:
     A 1-D float32 tensor containing audio samples. It must be normalized
-    to the range [-1, 1].
+    to the range [-1, 1]. A C-contiguous float32 numpy array, memoryview
+    or bytes object is used in place without copying. A 1-D int16 array
+    (or memoryview(data).cast("h")) containing 16-bit PCM samples is also
+    accepted; it is scaled inside.
 )";
 
 static void PybindOfflineRecognitionResult(py::module *m) {  // NOLINT
@@ -33,17 +39,31 @@ static void PybindOfflineRecognitionResult(py::module *m) {  // NOLINT
                                                 self.text.size(), "ignore"));
           })
       .def_property_readonly("lang",
-                            [](const PyClass &self) { return self.lang; })
+                             [](const PyClass &self) { return self.lang; })
       .def_property_readonly("emotion",
-                            [](const PyClass &self) { return self.emotion; })
+                             [](const PyClass &self) { return self.emotion; })
       .def_property_readonly("event",
-                            [](const PyClass &self) { return self.event; })
+                             [](const PyClass &self) { return self.event; })
       .def_property_readonly("tokens",
                              [](const PyClass &self) { return self.tokens; })
       .def_property_readonly("words",
                              [](const PyClass &self) { return self.words; })
       .def_property_readonly(
-          "timestamps", [](const PyClass &self) { return self.timestamps; });
+          "timestamps", [](const PyClass &self) { return self.timestamps; })
+      .def_property_readonly("ys_probs",
+                             [](const PyClass &self) {
+                               auto v = self.ys_probs;
+                               return MoveToNumpyArray(std::move(v));
+                             })
+      .def_property_readonly("graph_scores",
+                             [](const PyClass &self) {
+                               auto v = self.graph_scores;
+                               return MoveToNumpyArray(std::move(v));
+                             })
+      .def_property_readonly(
+          "lm_log_prob", [](const PyClass &self) { return self.lm_log_prob; })
+      .def_property_readonly("nbest",
+                             [](const PyClass &self) { return self.nbest; });
 }
 
 void PybindOfflineStream(py::module *m) {
@@ -53,12 +73,20 @@ void PybindOfflineStream(py::module *m) {
   py::class_<PyClass>(*m, "OfflineStream")
       .def(
           "accept_waveform",
-          [](PyClass &self, float sample_rate,
-             const std::vector<float> &waveform) {
-            self.AcceptWaveform(sample_rate, waveform.data(), waveform.size());
+          [](PyClass &self, float sample_rate, py::object waveform) {
+            WaveformView samples(waveform);
+
+            py::gil_scoped_release release;
+            if (samples.Int16Data()) {
+              self.AcceptWaveform(sample_rate, samples.Int16Data(),
+                                  samples.Size());
+            } else {
+              self.AcceptWaveform(sample_rate, samples.FloatData(),
+                                  samples.Size());
+            }
           },
-          py::arg("sample_rate"), py::arg("waveform"), kAcceptWaveformUsage,
-          py::call_guard<py::gil_scoped_release>())
+          py::arg("sample_rate"), py::arg("waveform"), kAcceptWaveformUsage)
+      .def_property_readonly("num_frames", &PyClass::NumFramesReady)
       .def_property_readonly("result", &PyClass::GetResult);
 }
 
@@ -5,17 +5,44 @@
 
 #include <algorithm>
 #include <string>
+#include <tuple>
+#include <vector>
 
 #include "sherpa-onnx/csrc/offline-tts.h"
+#include "sherpa-onnx/python/csrc/numpy-array.h"
 #include "sherpa-onnx/python/csrc/offline-tts-model-config.h"
+#include "sherpa-onnx/python/csrc/waveform-view.h"
 
 namespace sherpa_onnx {
 
+constexpr const char *kSamplesViewUsage = R"(
+Return a read-only float32 numpy array sharing memory with the samples of
+this object. No copy is made. The array keeps this object alive; it must
+not be used after this object is modified, e.g., by assigning to samples.
+)";
+
 static void PybindGeneratedAudio(py::module *m) {
   using PyClass = GeneratedAudio;
   py::class_<PyClass>(*m, "GeneratedAudio")
       .def(py::init<>())
-      .def_readwrite("samples", &PyClass::samples)
+      .def_property(
+          "samples",
+          [](const PyClass &self) {
+            return MoveToNumpyArray(std::vector<float>(self.samples));
+          },
+          [](PyClass &self, py::object samples) {
+            WaveformView view(samples, /*allow_int16*/ false);
+            self.samples.assign(view.FloatData(),
+                                view.FloatData() + view.Size());
+          })
+      .def(
+          "samples_view",
+          [](py::object obj) {
+            const auto &self = obj.cast<const PyClass &>();
+            return NumpyArrayView(self.samples.data(), self.samples.size(),
+                                  obj);
+          },
+          kSamplesViewUsage)
       .def_readwrite("sample_rate", &PyClass::sample_rate)
       .def("__str__", [](PyClass &self) {
         std::ostringstream os;
@@ -25,6 +52,27 @@ static void PybindGeneratedAudio(py::module *m) {
       });
 }
 
+static void PybindLruCacheStats(py::module *m) {
+  using PyClass = LruCacheStats;
+  py::class_<PyClass>(*m, "LruCacheStats")
+      .def_readonly("hits", &PyClass::hits)
+      .def_readonly("misses", &PyClass::misses)
+      .def_readonly("size", &PyClass::size)
+      .def_readonly("capacity", &PyClass::capacity)
+      .def_property_readonly("hit_rate", &PyClass::HitRate)
+      .def("__str__", &PyClass::ToString);
+}
+
+static std::vector<OfflineTtsRequest> ToRequests(
+    const std::vector<std::tuple<std::string, int64_t, float>> &requests) {
+  std::vector<OfflineTtsRequest> ans;
+  ans.reserve(requests.size());
+  for (const auto &t : requests) {
+    ans.push_back({std::get<0>(t), std::get<1>(t), std::get<2>(t)});
+  }
+  return ans;
+}
+
 static void PybindOfflineTtsConfig(py::module *m) {
   PybindOfflineTtsModelConfig(m);
 
@@ -32,15 +80,20 @@ static void PybindOfflineTtsConfig(py::module *m) {
   py::class_<PyClass>(*m, "OfflineTtsConfig")
       .def(py::init<>())
       .def(py::init<const OfflineTtsModelConfig &, const std::string &,
-                    const std::string &, int32_t, float>(),
+                    const std::string &, int32_t, float, int32_t, int32_t,
+                    int32_t>(),
            py::arg("model"), py::arg("rule_fsts") = "",
            py::arg("rule_fars") = "", py::arg("max_num_sentences") = 1,
-           py::arg("silence_scale") = 0.2)
+           py::arg("silence_scale") = 0.2, py::arg("num_workers") = 1,
+           py::arg("frontend_cache_size") = 0, py::arg("audio_cache_size") = 0)
       .def_readwrite("model", &PyClass::model)
       .def_readwrite("rule_fsts", &PyClass::rule_fsts)
       .def_readwrite("rule_fars", &PyClass::rule_fars)
       .def_readwrite("max_num_sentences", &PyClass::max_num_sentences)
       .def_readwrite("silence_scale", &PyClass::silence_scale)
+      .def_readwrite("num_workers", &PyClass::num_workers)
+      .def_readwrite("frontend_cache_size", &PyClass::frontend_cache_size)
+      .def_readwrite("audio_cache_size", &PyClass::audio_cache_size)
       .def("validate", &PyClass::Validate)
       .def("__str__", &PyClass::ToString);
 }
@@ -48,6 +101,7 @@ static void PybindOfflineTtsConfig(py::module *m) {
 void PybindOfflineTts(py::module *m) {
   PybindOfflineTtsConfig(m);
   PybindGeneratedAudio(m);
+  PybindLruCacheStats(m);
 
   using PyClass = OfflineTts;
   py::class_<PyClass>(*m, "OfflineTts")
@@ -84,7 +138,32 @@ void PybindOfflineTts(py::module *m) {
           },
           py::arg("text"), py::arg("sid") = 0, py::arg("speed") = 1.0,
           py::arg("callback") = py::none(),
-          py::call_guard<py::gil_scoped_release>());
+          py::call_guard<py::gil_scoped_release>())
+      .def(
+          "generate_batch",
+          [](const PyClass &self,
+             const std::vector<std::tuple<std::string, int64_t, float>> &
+                 requests) { return self.GenerateBatch(ToRequests(requests)); },
+          py::arg("requests"), py::call_guard<py::gil_scoped_release>(),
+          R"(Generate audio for a list of requests. Each request is a tuple
+(text, sid, speed). Return a list of GeneratedAudio, one per request.
+Up to config.num_workers requests are synthesized at the same time.)")
+      .def_property_readonly("frontend_cache_stats",
+                             &PyClass::FrontendCacheStats)
+      .def_property_readonly("audio_cache_stats", &PyClass::AudioCacheStats)
+      .def("clear_cache", &PyClass::ClearCache,
+           "Remove all entries from the frontend and audio caches and reset "
+           "their statistics.")
+      .def(
+          "prewarm",
+          [](const PyClass &self,
+             const std::vector<std::tuple<std::string, int64_t, float>>
+                 &requests) { self.GenerateBatch(ToRequests(requests)); },
+          py::arg("requests"), py::call_guard<py::gil_scoped_release>(),
+          R"(Fill the caches with a list of requests, e.g., frequently used
+prompts. Each request is a tuple (text, sid, speed). The generated audio is
+discarded. Token IDs are cached only if config.frontend_cache_size > 0 and
+audio only if config.audio_cache_size > 0.)");
 }
 
 }  // namespace sherpa_onnx
@@ -13,10 +13,12 @@ namespace sherpa_onnx {
 void PybindOnlineCtcFstDecoderConfig(py::module *m) {
   using PyClass = OnlineCtcFstDecoderConfig;
   py::class_<PyClass>(*m, "OnlineCtcFstDecoderConfig")
-      .def(py::init<const std::string &, int32_t>(), py::arg("graph") = "",
-           py::arg("max_active") = 3000)
+      .def(py::init<const std::string &, int32_t, int32_t>(),
+           py::arg("graph") = "", py::arg("max_active") = 3000,
+           py::arg("nbest") = 1)
       .def_readwrite("graph", &PyClass::graph)
       .def_readwrite("max_active", &PyClass::max_active)
+      .def_readwrite("nbest", &PyClass::nbest)
       .def("__str__", &PyClass::ToString);
 }
 
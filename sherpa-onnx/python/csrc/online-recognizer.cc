@@ -4,16 +4,19 @@
 
 #include "sherpa-onnx/python/csrc/online-recognizer.h"
 
+#include <memory>
 #include <string>
+#include <utility>
 #include <vector>
 
 #include "sherpa-onnx/csrc/online-recognizer.h"
+#include "sherpa-onnx/python/csrc/numpy-array.h"
 
 namespace sherpa_onnx {
 
 static void PybindOnlineRecognizerResult(py::module *m) {
   using PyClass = OnlineRecognizerResult;
-  py::class_<PyClass>(*m, "OnlineRecognizerResult")
+  py::class_<PyClass, std::shared_ptr<PyClass>>(*m, "OnlineRecognizerResult")
       .def_property_readonly(
           "text",
           [](PyClass &self) -> py::str {
@@ -28,9 +31,11 @@ static void PybindOnlineRecognizerResult(py::module *m) {
       .def_property_readonly(
           "timestamps",
           [](PyClass &self) -> std::vector<float> { return self.timestamps; })
-      .def_property_readonly(
-          "ys_probs",
-          [](PyClass &self) -> std::vector<float> { return self.ys_probs; })
+      .def_property_readonly("ys_probs",
+                             [](PyClass &self) {
+                               auto v = self.ys_probs;
+                               return MoveToNumpyArray(std::move(v));
+                             })
       .def_property_readonly(
           "lm_probs",
           [](PyClass &self) -> std::vector<float> { return self.lm_probs; })
@@ -38,6 +43,11 @@ static void PybindOnlineRecognizerResult(py::module *m) {
                              [](PyClass &self) -> std::vector<float> {
                                return self.context_scores;
                              })
+      .def_property_readonly("graph_scores",
+                             [](PyClass &self) {
+                               auto v = self.graph_scores;
+                               return MoveToNumpyArray(std::move(v));
+                             })
       .def_property_readonly(
           "segment", [](PyClass &self) -> int32_t { return self.segment; })
       .def_property_readonly(
@@ -45,12 +55,22 @@ static void PybindOnlineRecognizerResult(py::module *m) {
           [](PyClass &self) -> std::vector<int32_t> { return self.words; })
       .def_property_readonly(
           "is_final", [](PyClass &self) -> bool { return self.is_final; })
+      .def_property_readonly("nbest", [](PyClass &self) { return self.nbest; })
       .def("__str__", &PyClass::AsJsonString,
            py::call_guard<py::gil_scoped_release>())
       .def("as_json_string", &PyClass::AsJsonString,
            py::call_guard<py::gil_scoped_release>());
 }
 
+static void PybindOnlineRecognizerResultDelta(py::module *m) {
+  using PyClass = OnlineRecognizerResultDelta;
+  py::class_<PyClass>(*m, "OnlineRecognizerResultDelta")
+      .def_readonly("start", &PyClass::start)
+      .def_readonly("tokens", &PyClass::tokens)
+      .def_readonly("timestamps", &PyClass::timestamps)
+      .def_readonly("segment", &PyClass::segment);
+}
+
 static void PybindOnlineRecognizerConfig(py::module *m) {
   using PyClass = OnlineRecognizerConfig;
   py::class_<PyClass>(*m, "OnlineRecognizerConfig")
@@ -59,7 +79,7 @@ static void PybindOnlineRecognizerConfig(py::module *m) {
                     const OnlineCtcFstDecoderConfig &, bool,
                     const std::string &, int32_t, const std::string &, float,
                     float, float, const std::string &, const std::string &,
-                    bool, const HomophoneReplacerConfig &>(),
+                    bool, const HomophoneReplacerConfig &, int32_t>(),
            py::arg("feat_config"), py::arg("model_config"),
            py::arg("lm_config") = OnlineLMConfig(),
            py::arg("endpoint_config") = EndpointConfig(),
@@ -69,7 +89,8 @@ static void PybindOnlineRecognizerConfig(py::module *m) {
            py::arg("hotwords_score") = 0, py::arg("blank_penalty") = 0.0,
            py::arg("temperature_scale") = 2.0, py::arg("rule_fsts") = "",
            py::arg("rule_fars") = "", py::arg("reset_encoder") = false,
-           py::arg("hr") = HomophoneReplacerConfig{})
+           py::arg("hr") = HomophoneReplacerConfig{},
+           py::arg("num_decode_workers") = 1)
       .def_readwrite("feat_config", &PyClass::feat_config)
       .def_readwrite("model_config", &PyClass::model_config)
       .def_readwrite("lm_config", &PyClass::lm_config)
@@ -86,11 +107,13 @@ static void PybindOnlineRecognizerConfig(py::module *m) {
       .def_readwrite("rule_fars", &PyClass::rule_fars)
       .def_readwrite("reset_encoder", &PyClass::reset_encoder)
       .def_readwrite("hr", &PyClass::hr)
+      .def_readwrite("num_decode_workers", &PyClass::num_decode_workers)
       .def("__str__", &PyClass::ToString);
 }
 
 void PybindOnlineRecognizer(py::module *m) {
   PybindOnlineRecognizerResult(m);
+  PybindOnlineRecognizerResultDelta(m);
   PybindOnlineRecognizerConfig(m);
 
   using PyClass = OnlineRecognizer;
@@ -107,6 +130,14 @@ void PybindOnlineRecognizer(py::module *m) {
             return self.CreateStream(hotwords);
           },
           py::arg("hotwords"), py::call_guard<py::gil_scoped_release>())
+      .def(
+          "create_stream",
+          [](const PyClass &self, ContextGraphPtr hotwords) {
+            return self.CreateStream(std::move(hotwords));
+          },
+          py::arg("hotwords"), py::call_guard<py::gil_scoped_release>())
+      .def("compile_hotwords", &PyClass::CompileHotwords, py::arg("hotwords"),
+           py::call_guard<py::gil_scoped_release>())
       .def("is_ready", &PyClass::IsReady,
            py::call_guard<py::gil_scoped_release>())
       .def("decode_stream", &PyClass::DecodeStream, py::arg("s"),
@@ -117,7 +148,16 @@ void PybindOnlineRecognizer(py::module *m) {
             self.DecodeStreams(ss.data(), ss.size());
           },
           py::arg("ss"), py::call_guard<py::gil_scoped_release>())
-      .def("get_result", &PyClass::GetResult, py::arg("s"),
+      .def(
+          "get_result",
+          [](const PyClass &self, OnlineStream *s) {
+            // The result is cached in the stream and is read-only in Python,
+            // so there is no need to copy it
+            return std::const_pointer_cast<OnlineRecognizerResult>(
+                self.GetSharedResult(s));
+          },
+          py::arg("s"), py::call_guard<py::gil_scoped_release>())
+      .def("get_result_delta", &PyClass::GetResultDelta, py::arg("s"),
            py::call_guard<py::gil_scoped_release>())
       .def("is_endpoint", &PyClass::IsEndpoint, py::arg("s"),
            py::call_guard<py::gil_scoped_release>())
@@ -0,0 +1,99 @@
+// sherpa-onnx/python/csrc/online-speech-denoiser.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/python/csrc/online-speech-denoiser.h"
+
+#include <vector>
+
+#include "sherpa-onnx/csrc/online-speech-denoiser.h"
+#include "sherpa-onnx/python/csrc/numpy-array.h"
+#include "sherpa-onnx/python/csrc/waveform-view.h"
+
+namespace sherpa_onnx {
+
+static void PybindOnlineSpeechDenoiserConfig(py::module *m) {
+  using PyClass = OnlineSpeechDenoiserConfig;
+
+  py::class_<PyClass>(*m, "OnlineSpeechDenoiserConfig")
+      .def(py::init<>())
+      .def(py::init<const OfflineSpeechDenoiserModelConfig &>(),
+           py::arg("model") = OfflineSpeechDenoiserModelConfig{})
+      .def_readwrite("model", &PyClass::model)
+      .def("validate", &PyClass::Validate)
+      .def("__str__", &PyClass::ToString);
+}
+
+static void PybindOnlineSpeechDenoiserStream(py::module *m) {
+  using PyClass = OnlineSpeechDenoiserStream;
+  py::class_<PyClass>(*m, "OnlineSpeechDenoiserStream")
+      .def(
+          "accept_waveform",
+          [](PyClass &self, int32_t sample_rate, py::object waveform) {
+            WaveformView samples(waveform);
+
+            py::gil_scoped_release release;
+            self.AcceptWaveform(sample_rate, samples.FloatData(),
+                                samples.Size());
+          },
+          py::arg("sample_rate"), py::arg("waveform"))
+      .def("input_finished", &PyClass::InputFinished,
+           py::call_guard<py::gil_scoped_release>())
+      .def_property_readonly("is_input_finished", &PyClass::IsInputFinished)
+      .def(
+          "get_denoised_samples",
+          [](PyClass &self) {
+            return MoveToNumpyArray(self.GetDenoisedSamples());
+          },
+          "Return the denoised samples that are not returned before.");
+}
+
+void PybindOnlineSpeechDenoiser(py::module *m) {
+  PybindOnlineSpeechDenoiserConfig(m);
+  PybindOnlineSpeechDenoiserStream(m);
+
+  using PyClass = OnlineSpeechDenoiser;
+  py::class_<PyClass>(*m, "OnlineSpeechDenoiser")
+      .def(py::init<const OnlineSpeechDenoiserConfig &>(), py::arg("config"),
+           py::call_guard<py::gil_scoped_release>())
+      .def("create_stream", &PyClass::CreateStream,
+           py::call_guard<py::gil_scoped_release>())
+      .def("is_ready", &PyClass::IsReady, py::arg("s"),
+           py::call_guard<py::gil_scoped_release>())
+      .def(
+          "process",
+          [](const PyClass &self, OnlineSpeechDenoiserStream *s) {
+            self.Process(&s, 1);
+          },
+          py::arg("s"), py::call_guard<py::gil_scoped_release>())
+      .def(
+          "process_streams",
+          [](const PyClass &self,
+             std::vector<OnlineSpeechDenoiserStream *> ss) {
+            self.Process(ss.data(), ss.size());
+          },
+          py::arg("ss"), py::call_guard<py::gil_scoped_release>(),
+          R"(Denoise all available frames of the given streams. Frames of
+different streams are processed in a single model call if the model
+supports it.)")
+      .def(
+          "run",
+          [](const PyClass &self, OnlineSpeechDenoiserStream *s,
+             py::object samples, int32_t sample_rate) {
+            WaveformView view(samples);
+
+            py::gil_scoped_release release;
+            return self.Run(s, view.FloatData(), view.Size(), sample_rate);
+          },
+          py::arg("s"), py::arg("samples"), py::arg("sample_rate"),
+          R"(Accept a chunk of samples and return the denoised samples that
+are ready. The output lags behind the input by `latency` samples.)")
+      .def("flush", &PyClass::Flush, py::arg("s"),
+           py::call_guard<py::gil_scoped_release>(),
+           "Denoise the remaining samples of the stream.")
+      .def_property_readonly("sample_rate", &PyClass::GetSampleRate)
+      .def_property_readonly("latency", &PyClass::GetLatency,
+                             "Algorithmic latency in samples at sample_rate");
+}
+
+}  // namespace sherpa_onnx
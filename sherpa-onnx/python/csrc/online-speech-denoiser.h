@@ -0,0 +1,16 @@
+// sherpa-onnx/python/csrc/online-speech-denoiser.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_PYTHON_CSRC_ONLINE_SPEECH_DENOISER_H_
+#define SHERPA_ONNX_PYTHON_CSRC_ONLINE_SPEECH_DENOISER_H_
+
+#include "sherpa-onnx/python/csrc/sherpa-onnx.h"
+
+namespace sherpa_onnx {
+
+void PybindOnlineSpeechDenoiser(py::module *m);
+
+}
+
+#endif  // SHERPA_ONNX_PYTHON_CSRC_ONLINE_SPEECH_DENOISER_H_
@@ -7,6 +7,7 @@
 #include <vector>
 
 #include "sherpa-onnx/csrc/online-stream.h"
+#include "sherpa-onnx/python/csrc/waveform-view.h"
 
 namespace sherpa_onnx {
 
@@ -19,7 +20,10 @@ Args:
     expected by the model, we will do resampling inside.
   waveform:
     A 1-D float32 tensor containing audio samples. It must be normalized
-    to the range [-1, 1].
+    to the range [-1, 1]. A C-contiguous float32 numpy array, memoryview
+    or bytes object is used in place without copying. A 1-D int16 array
+    (or memoryview(data).cast("h")) containing 16-bit PCM samples is also
+    accepted; it is scaled inside.
 )";
 
 
@@ -44,12 +48,19 @@ void PybindOnlineStream(py::module *m) {
   py::class_<PyClass>(*m, "OnlineStream")
       .def(
           "accept_waveform",
-          [](PyClass &self, float sample_rate,
-             const std::vector<float> &waveform) {
-            self.AcceptWaveform(sample_rate, waveform.data(), waveform.size());
+          [](PyClass &self, float sample_rate, py::object waveform) {
+            WaveformView samples(waveform);
+
+            py::gil_scoped_release release;
+            if (samples.Int16Data()) {
+              self.AcceptWaveform(sample_rate, samples.Int16Data(),
+                                  samples.Size());
+            } else {
+              self.AcceptWaveform(sample_rate, samples.FloatData(),
+                                  samples.Size());
+            }
           },
-          py::arg("sample_rate"), py::arg("waveform"), kAcceptWaveformUsage,
-          py::call_guard<py::gil_scoped_release>())
+          py::arg("sample_rate"), py::arg("waveform"), kAcceptWaveformUsage)
       .def("input_finished", &PyClass::InputFinished,
            py::call_guard<py::gil_scoped_release>())
       .def("get_frames", &PyClass::GetFrames,
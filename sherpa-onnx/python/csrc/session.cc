@@ -0,0 +1,24 @@
+// sherpa-onnx/python/csrc/session.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/python/csrc/session.h"
+
+#include "sherpa-onnx/csrc/session.h"
+
+namespace sherpa_onnx {
+
+void PybindSession(py::module *m) {
+  m->def("use_global_thread_pool", &UseGlobalThreadPool,
+         py::arg("num_threads"),
+         R"(Let all models share a single intra-op thread pool with
+num_threads threads. It must be called before creating any models.
+Return True on success.)");
+
+  m->def("share_prepacked_weights", &SharePrepackedWeights,
+         R"(Let models created afterwards share the weights prepacked by
+onnxruntime, so that multiple recognizers created from the same model
+keep only one copy of them.)");
+}
+
+}  // namespace sherpa_onnx
@@ -0,0 +1,16 @@
+// sherpa-onnx/python/csrc/session.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_PYTHON_CSRC_SESSION_H_
+#define SHERPA_ONNX_PYTHON_CSRC_SESSION_H_
+
+#include "sherpa-onnx/python/csrc/sherpa-onnx.h"
+
+namespace sherpa_onnx {
+
+void PybindSession(py::module *m);
+
+}
+
+#endif  // SHERPA_ONNX_PYTHON_CSRC_SESSION_H_
@@ -6,12 +6,15 @@
 
 #include "sherpa-onnx/python/csrc/alsa.h"
 #include "sherpa-onnx/python/csrc/audio-tagging.h"
+#include "sherpa-onnx/python/csrc/binary-lexicon.h"
 #include "sherpa-onnx/python/csrc/circular-buffer.h"
+#include "sherpa-onnx/python/csrc/context-graph.h"
 #include "sherpa-onnx/python/csrc/display.h"
 #include "sherpa-onnx/python/csrc/endpoint.h"
 #include "sherpa-onnx/python/csrc/features.h"
 #include "sherpa-onnx/python/csrc/homophone-replacer.h"
 #include "sherpa-onnx/python/csrc/keyword-spotter.h"
+#include "sherpa-onnx/python/csrc/multi-stream-voice-activity-detector.h"
 #include "sherpa-onnx/python/csrc/offline-ctc-fst-decoder-config.h"
 #include "sherpa-onnx/python/csrc/offline-lm-config.h"
 #include "sherpa-onnx/python/csrc/offline-model-config.h"
@@ -25,7 +28,9 @@
 #include "sherpa-onnx/python/csrc/online-model-config.h"
 #include "sherpa-onnx/python/csrc/online-punctuation.h"
 #include "sherpa-onnx/python/csrc/online-recognizer.h"
+#include "sherpa-onnx/python/csrc/online-speech-denoiser.h"
 #include "sherpa-onnx/python/csrc/online-stream.h"
+#include "sherpa-onnx/python/csrc/session.h"
 #include "sherpa-onnx/python/csrc/speaker-embedding-extractor.h"
 #include "sherpa-onnx/python/csrc/speaker-embedding-manager.h"
 #include "sherpa-onnx/python/csrc/spoken-language-identification.h"
@@ -57,6 +62,7 @@ PYBIND11_MODULE(_sherpa_onnx, m) {
   PybindHomophoneReplacer(&m);
 
   PybindFeatures(&m);
+  PybindContextGraph(&m);
   PybindOnlineCtcFstDecoderConfig(&m);
   PybindOnlineModelConfig(&m);
   PybindOnlineLMConfig(&m);
@@ -76,6 +82,7 @@ PYBIND11_MODULE(_sherpa_onnx, m) {
   PybindVadModel(&m);
   PybindCircularBuffer(&m);
   PybindVoiceActivityDetector(&m);
+  PybindMultiStreamVoiceActivityDetector(&m);
 
 #if SHERPA_ONNX_ENABLE_TTS == 1
   PybindOfflineTts(&m);
@@ -112,8 +119,11 @@ PYBIND11_MODULE(_sherpa_onnx, m) {
 
   PybindAlsa(&m);
   PybindOfflineSpeechDenoiser(&m);
+  PybindOnlineSpeechDenoiser(&m);
   PybindOfflineSourceSeparation(&m);
   PybindVersion(&m);
+  PybindSession(&m);
+  PybindBinaryLexicon(&m);
 }
 
 }  // namespace sherpa_onnx
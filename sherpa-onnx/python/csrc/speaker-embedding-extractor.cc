@@ -5,6 +5,7 @@
 #include "sherpa-onnx/python/csrc/speaker-embedding-extractor.h"
 
 #include <string>
+#include <vector>
 
 #include "sherpa-onnx/csrc/speaker-embedding-extractor.h"
 
@@ -35,8 +36,19 @@ void PybindSpeakerEmbeddingExtractor(py::module *m) {
       .def_property_readonly("dim", &PyClass::Dim)
       .def("create_stream", &PyClass::CreateStream,
            py::call_guard<py::gil_scoped_release>())
-      .def("compute", &PyClass::Compute,
+      .def("compute",
+           static_cast<std::vector<float> (PyClass::*)(OnlineStream *) const>(
+               &PyClass::Compute),
            py::call_guard<py::gil_scoped_release>())
+      .def(
+          "compute_batch",
+          [](const PyClass &self, std::vector<OnlineStream *> ss) {
+            return self.Compute(ss.data(), ss.size());
+          },
+          py::arg("streams"), py::call_guard<py::gil_scoped_release>(),
+          R"(Compute speaker embeddings of the given streams. Streams are
+processed in batches if the model supports it. Return a list of embeddings,
+one for each stream.)")
       .def("is_ready", &PyClass::IsReady,
            py::call_guard<py::gil_scoped_release>());
 }
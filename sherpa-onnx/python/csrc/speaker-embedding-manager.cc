@@ -4,6 +4,7 @@
 
 #include "sherpa-onnx/python/csrc/speaker-embedding-manager.h"
 
+#include <sstream>
 #include <string>
 #include <vector>
 
@@ -11,6 +12,26 @@
 
 namespace sherpa_onnx {
 
+using EmbeddingArray =
+    py::array_t<float, py::array::c_style | py::array::forcecast>;
+
+// Check that embeddings is a 2-D array of shape (N, dim)
+static void CheckEmbeddings(const EmbeddingArray &embeddings, int32_t dim) {
+  if (embeddings.ndim() != 2) {
+    std::ostringstream os;
+    os << "Expect an array of 2 dimensions. Given dim: " << embeddings.ndim()
+       << "\n";
+    throw py::value_error(os.str());
+  }
+
+  if (embeddings.shape(1) != dim) {
+    std::ostringstream os;
+    os << "Expect embeddings of dim " << dim
+       << ". Given: " << embeddings.shape(1) << "\n";
+    throw py::value_error(os.str());
+  }
+}
+
 void PybindSpeakerEmbeddingManager(py::module *m) {
   using PyClass = SpeakerEmbeddingManager;
   py::class_<PyClass>(*m, "SpeakerEmbeddingManager")
@@ -41,6 +62,25 @@ void PybindSpeakerEmbeddingManager(py::module *m) {
           },
           py::arg("name"), py::arg("embedding_list"),
           py::call_guard<py::gil_scoped_release>())
+      .def(
+          "add_batch",
+          [](const PyClass &self, const std::vector<std::string> &names,
+             const EmbeddingArray &embeddings) -> bool {
+            CheckEmbeddings(embeddings, self.Dim());
+            if (embeddings.shape(0) != static_cast<int32_t>(names.size())) {
+              std::ostringstream os;
+              os << "Number of names " << names.size()
+                 << " != number of embeddings " << embeddings.shape(0) << "\n";
+              throw py::value_error(os.str());
+            }
+
+            py::gil_scoped_release release;
+            return self.Add(names, embeddings.data());
+          },
+          py::arg("names"), py::arg("embeddings"),
+          R"(Add speakers. embeddings is a 2-D array of shape
+(len(names), dim). Return False if any name is duplicated or already exists,
+in which case no speaker is added.)")
       .def(
           "remove",
           [](const PyClass &self, const std::string &name) -> bool {
@@ -53,6 +93,19 @@ void PybindSpeakerEmbeddingManager(py::module *m) {
               -> std::string { return self.Search(v.data(), threshold); },
           py::arg("v"), py::arg("threshold"),
           py::call_guard<py::gil_scoped_release>())
+      .def(
+          "search_batch",
+          [](const PyClass &self, const EmbeddingArray &embeddings,
+             float threshold) -> std::vector<std::string> {
+            CheckEmbeddings(embeddings, self.Dim());
+            int32_t n = embeddings.shape(0);
+
+            py::gil_scoped_release release;
+            return self.Search(embeddings.data(), n, threshold);
+          },
+          py::arg("embeddings"), py::arg("threshold"),
+          R"(Search for each row of the 2-D array embeddings. Return a list
+of speaker names. An entry is an empty string if no speaker is found for it.)")
       .def(
           "verify",
           [](const PyClass &self, const std::string &name,
@@ -68,7 +121,16 @@ void PybindSpeakerEmbeddingManager(py::module *m) {
             return self.Score(name, v.data());
           },
           py::arg("name"), py::arg("v"),
-          py::call_guard<py::gil_scoped_release>());
+          py::call_guard<py::gil_scoped_release>())
+      .def("build_index", &PyClass::BuildIndex, py::arg("num_lists"),
+           py::arg("num_probes") = 8, py::call_guard<py::gil_scoped_release>(),
+           R"(Build an approximate nearest neighbor (IVF) index with
+num_lists lists. A query is compared only with speakers in the num_probes
+closest lists. Use num_lists=0 to remove the index.)")
+      .def("save", &PyClass::Save, py::arg("filename"),
+           py::call_guard<py::gil_scoped_release>())
+      .def("load", &PyClass::Load, py::arg("filename"),
+           py::call_guard<py::gil_scoped_release>());
 }
 
 }  // namespace sherpa_onnx
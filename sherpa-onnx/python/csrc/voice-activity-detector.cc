@@ -4,19 +4,73 @@
 
 #include "sherpa-onnx/python/csrc/voice-activity-detector.h"
 
+#include <utility>
 #include <vector>
 
 #include "sherpa-onnx/csrc/voice-activity-detector.h"
+#include "sherpa-onnx/python/csrc/numpy-array.h"
+#include "sherpa-onnx/python/csrc/waveform-view.h"
 
 namespace sherpa_onnx {
 
+constexpr const char *kAcceptWaveformUsage = R"(
+Process audio samples.
+
+Args:
+  samples:
+    A 1-D float32 tensor containing audio samples. It must be normalized
+    to the range [-1, 1] and its sample rate must match config.sample_rate.
+    A C-contiguous float32 numpy array, memoryview or bytes object is used
+    in place without copying. A 1-D int16 array (or
+    memoryview(data).cast("h")) containing 16-bit PCM samples is also
+    accepted; it is scaled inside.
+)";
+
+constexpr const char *kSamplesViewUsage = R"(
+Return a read-only float32 numpy array sharing memory with the samples of
+this object. No copy is made. The array keeps this object alive; it must
+not be used after this object is modified.
+
+Caution: For VoiceActivityDetector.front, the memory is released by
+VoiceActivityDetector.pop(), so the view must not be used after that.
+)";
+
+constexpr const char *kCurrentSegmentViewUsage = R"(
+Return a read-only float32 numpy array sharing memory with the samples of
+the current speech segment. No copy is made. It is empty if
+is_speech_detected() returns False.
+
+Caution: The array is valid only until the next call of any methods of
+this class.
+)";
+
+constexpr const char *kGetNewSpeechSamplesUsage = R"(
+Return samples of the current speech segment that have not been returned
+by a previous call of this method as a 1-D float32 numpy array. When a new
+speech segment starts, it begins from the first sample of that segment, so
+concatenating the results gives current_segment.samples.
+
+It is empty if is_speech_detected() returns False.
+)";
+
 void PybindSpeechSegment(py::module *m) {
   using PyClass = SpeechSegment;
   py::class_<PyClass>(*m, "SpeechSegment")
       .def_property_readonly("start",
                              [](const PyClass &self) { return self.start; })
-      .def_property_readonly("samples",
-                             [](const PyClass &self) { return self.samples; });
+      .def_property_readonly(
+          "samples",
+          [](const PyClass &self) {
+            return MoveToNumpyArray(std::vector<float>(self.samples));
+          })
+      .def(
+          "samples_view",
+          [](py::object obj) {
+            const auto &self = obj.cast<const PyClass &>();
+            return NumpyArrayView(self.samples.data(), self.samples.size(),
+                                  obj);
+          },
+          kSamplesViewUsage);
 }
 
 void PybindVoiceActivityDetector(py::module *m) {
@@ -29,7 +83,9 @@ void PybindVoiceActivityDetector(py::module *m) {
    methods of this class
 3. When speech is detected, the method is_speech_detected() return True, you can
    use the property current_segment to get the speech samples since
-   is_speech_detected() returns true
+   is_speech_detected() returns true. Use current_segment_view() to access
+   them without copying, or get_new_speech_samples() to get only the samples
+   received since its last call
 4. When is_speech_detected() is changed from True to False, the method
    empty() returns False.
       )")
@@ -38,10 +94,17 @@ void PybindVoiceActivityDetector(py::module *m) {
            py::call_guard<py::gil_scoped_release>())
       .def(
           "accept_waveform",
-          [](PyClass &self, const std::vector<float> &samples) {
-            self.AcceptWaveform(samples.data(), samples.size());
+          [](PyClass &self, py::object samples) {
+            WaveformView view(samples);
+
+            py::gil_scoped_release release;
+            if (view.Int16Data()) {
+              self.AcceptWaveform(view.Int16Data(), view.Size());
+            } else {
+              self.AcceptWaveform(view.FloatData(), view.Size());
+            }
           },
-          py::arg("samples"), py::call_guard<py::gil_scoped_release>())
+          py::arg("samples"), kAcceptWaveformUsage)
       .def_property_readonly("config", &PyClass::GetConfig)
       .def("empty", &PyClass::Empty, py::call_guard<py::gil_scoped_release>())
       .def("pop", &PyClass::Pop, py::call_guard<py::gil_scoped_release>())
@@ -50,7 +113,30 @@ void PybindVoiceActivityDetector(py::module *m) {
       .def("reset", &PyClass::Reset, py::call_guard<py::gil_scoped_release>())
       .def("flush", &PyClass::Flush, py::call_guard<py::gil_scoped_release>())
       .def_property_readonly("front", &PyClass::Front)
-      .def_property_readonly("current_segment", &PyClass::CurrentSpeechSegment);
+      .def_property_readonly("current_segment", &PyClass::CurrentSpeechSegment)
+      .def_property_readonly("current_segment_start",
+                             [](const PyClass &self) {
+                               return self.CurrentSpeechSegmentRef().start;
+                             })
+      .def(
+          "current_segment_view",
+          [](py::object obj) {
+            const auto &self = obj.cast<const PyClass &>();
+            const auto &samples = self.CurrentSpeechSegmentRef().samples;
+            return NumpyArrayView(samples.data(), samples.size(), obj);
+          },
+          kCurrentSegmentViewUsage)
+      .def(
+          "get_new_speech_samples",
+          [](PyClass &self) {
+            std::vector<float> samples;
+            {
+              py::gil_scoped_release release;
+              samples = self.GetNewSpeechSamples();
+            }
+            return MoveToNumpyArray(std::move(samples));
+          },
+          kGetNewSpeechSamplesUsage);
 }
 
 }  // namespace sherpa_onnx
@@ -5,19 +5,22 @@
 #include "sherpa-onnx/python/csrc/wave-writer.h"
 
 #include <string>
-#include <vector>
 
 #include "sherpa-onnx/csrc/wave-writer.h"
+#include "sherpa-onnx/python/csrc/waveform-view.h"
 
 namespace sherpa_onnx {
 
 void PybindWaveWriter(py::module *m) {
   m->def(
       "write_wave",
-      [](const std::string &filename, const std::vector<float> &samples,
+      [](const std::string &filename, py::object samples,
          int32_t sample_rate) -> bool {
+        WaveformView view(samples, /*allow_int16*/ false);
+
+        py::gil_scoped_release release;
         bool ok =
-            WriteWave(filename, sample_rate, samples.data(), samples.size());
+            WriteWave(filename, sample_rate, view.FloatData(), view.Size());
 
         return ok;
       },
@@ -0,0 +1,99 @@
+// sherpa-onnx/python/csrc/waveform-view.cc
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#include "sherpa-onnx/python/csrc/waveform-view.h"
+
+#include <cstring>
+#include <sstream>
+#include <utility>
+
+namespace sherpa_onnx {
+
+static bool IsContiguous(const py::buffer_info &info) {
+  return info.shape[0] <= 1 || info.strides[0] == info.itemsize;
+}
+
+static bool IsAligned(const void *p, size_t alignment) {
+  return reinterpret_cast<uintptr_t>(p) % alignment == 0;
+}
+
+WaveformView::WaveformView(py::handle obj, bool allow_int16 /*= true*/) {
+  if (PyObject_CheckBuffer(obj.ptr())) {
+    info_ = py::reinterpret_borrow<py::buffer>(obj).request();
+    if (info_.ndim != 1) {
+      std::ostringstream os;
+      os << "Expect a 1-D array of audio samples. Given dim: " << info_.ndim;
+      throw py::value_error(os.str());
+    }
+
+    bool contiguous = IsContiguous(info_);
+
+    if (info_.item_type_is_equivalent_to<int16_t>()) {
+      if (contiguous) {
+        i16_ = static_cast<const int16_t *>(info_.ptr);
+      } else {
+        auto a = py::array_t<int16_t, py::array::c_style |
+                                          py::array::forcecast>::ensure(obj);
+        i16_ = a.data();
+        converted_ = std::move(a);
+      }
+      n_ = info_.size;
+    } else if (info_.item_type_is_equivalent_to<float>() && contiguous) {
+      f32_ = static_cast<const float *>(info_.ptr);
+      n_ = info_.size;
+    } else if (info_.itemsize == 1 && (info_.format == "B" ||
+                                       info_.format == "b" ||
+                                       info_.format == "c")) {
+      // raw bytes of float32 samples, e.g., received from a websocket
+      if (!contiguous || info_.size % sizeof(float) != 0) {
+        std::ostringstream os;
+        os << "Expect contiguous bytes of float32 samples. Given "
+           << info_.size << " bytes";
+        throw py::value_error(os.str());
+      }
+
+      n_ = info_.size / sizeof(float);
+      if (IsAligned(info_.ptr, alignof(float))) {
+        f32_ = static_cast<const float *>(info_.ptr);
+      } else {
+        owned_.resize(n_);
+        std::memcpy(owned_.data(), info_.ptr, info_.size);
+        f32_ = owned_.data();
+      }
+    }
+  }
+
+  if (!f32_ && !i16_) {
+    // Lists, float64 arrays, non-contiguous float32 arrays, etc.
+    auto a =
+        py::array_t<float, py::array::c_style | py::array::forcecast>::ensure(
+            obj);
+    if (!a) {
+      throw py::type_error(
+          "Expect a 1-D float32 or int16 array of audio samples, e.g., a "
+          "numpy array, a memoryview, bytes or a list of floats");
+    }
+
+    if (a.ndim() != 1) {
+      std::ostringstream os;
+      os << "Expect a 1-D array of audio samples. Given dim: " << a.ndim();
+      throw py::value_error(os.str());
+    }
+
+    f32_ = a.data();
+    n_ = a.size();
+    converted_ = std::move(a);
+  }
+
+  if (i16_ && !allow_int16) {
+    owned_.resize(n_);
+    for (int32_t i = 0; i != n_; ++i) {
+      owned_[i] = i16_[i] / 32768.0f;
+    }
+    f32_ = owned_.data();
+    i16_ = nullptr;
+  }
+}
+
+}  // namespace sherpa_onnx
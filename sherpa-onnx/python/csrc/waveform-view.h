@@ -0,0 +1,53 @@
+// sherpa-onnx/python/csrc/waveform-view.h
+//
+// Copyright (c)  2025  Xiaomi Corporation
+
+#ifndef SHERPA_ONNX_PYTHON_CSRC_WAVEFORM_VIEW_H_
+#define SHERPA_ONNX_PYTHON_CSRC_WAVEFORM_VIEW_H_
+
+#include <cstdint>
+#include <vector>
+
+#include "sherpa-onnx/python/csrc/sherpa-onnx.h"
+
+namespace sherpa_onnx {
+
+// A read-only view of 1-D audio samples passed from Python.
+//
+// If the given object exposes a C-contiguous float32 or int16 buffer,
+// e.g., a numpy array, a memoryview or bytes, the view points directly into
+// the memory of that object and no copy is made. Otherwise, e.g., for a list
+// of floats or a float64 array, the input is converted to float32 first.
+//
+// bytes and bytearray are interpreted as native-endian float32 samples.
+// Please use memoryview(data).cast("h") for 16-bit PCM.
+//
+// Caution: The view must be constructed and destroyed with the GIL held.
+// It is safe to release the GIL while the samples are in use.
+class WaveformView {
+ public:
+  // If allow_int16 is false, 16-bit PCM input is converted to float32
+  // samples in the range [-1, 1] so that FloatData() is always valid.
+  explicit WaveformView(py::handle obj, bool allow_int16 = true);
+
+  // Not nullptr if the samples are float32
+  const float *FloatData() const { return f32_; }
+
+  // Not nullptr if the samples are 16-bit PCM
+  const int16_t *Int16Data() const { return i16_; }
+
+  int32_t Size() const { return n_; }
+
+ private:
+  py::buffer_info info_;
+  py::object converted_;
+  std::vector<float> owned_;
+
+  const float *f32_ = nullptr;
+  const int16_t *i16_ = nullptr;
+  int32_t n_ = 0;
+};
+
+}  // namespace sherpa_onnx
+
+#endif  // SHERPA_ONNX_PYTHON_CSRC_WAVEFORM_VIEW_H_
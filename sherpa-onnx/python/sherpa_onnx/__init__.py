@@ -10,6 +10,8 @@ from _sherpa_onnx import (
     FastClusteringConfig,
     FeatureExtractorConfig,
     HomophoneReplacerConfig,
+    HotwordsHandle,
+    MultiStreamVoiceActivityDetector,
     OfflineCanaryModelConfig,
     OfflineCtcFstDecoderConfig,
     OfflineDolphinModelConfig,
@@ -55,6 +57,9 @@ from _sherpa_onnx import (
     OnlinePunctuation,
     OnlinePunctuationConfig,
     OnlinePunctuationModelConfig,
+    OnlineSpeechDenoiser,
+    OnlineSpeechDenoiserConfig,
+    OnlineSpeechDenoiserStream,
     OnlineStream,
     SileroVadModelConfig,
     SpeakerEmbeddingExtractor,
@@ -67,13 +72,19 @@ from _sherpa_onnx import (
     TenVadModelConfig,
     VadModel,
     VadModelConfig,
+    VadStream,
     VoiceActivityDetector,
+    compile_lexicon,
+    compile_tokens,
     git_date,
     git_sha1,
+    share_prepacked_weights,
+    use_global_thread_pool,
     version,
     write_wave,
 )
 
+from .batch_scheduler import BatchScheduler
 from .display import Display
 from .keyword_spotter import KeywordSpotter
 from .offline_recognizer import OfflineRecognizer
@@ -0,0 +1,320 @@
+# Copyright (c)  2025  Xiaomi Corporation
+"""
+An asyncio scheduler that groups requests into batches for the neural
+network.
+
+Requests are put into a queue by :meth:`BatchScheduler.submit`. Consumer
+tasks sleep until the queue is non-empty. Once the first request of a batch
+arrives, a consumer waits until either ``max_batch_size`` requests are
+available or ``max_wait_ms`` milliseconds have passed since that request was
+submitted, whichever comes first, and then runs the batch in a thread pool.
+
+Usage with an online recognizer::
+
+    scheduler = BatchScheduler(recognizer, max_batch_size=5, max_wait_ms=10)
+    await scheduler.start()
+
+    # inside the handler of a connection
+    while recognizer.is_ready(stream):
+        await scheduler.submit(stream)
+
+It works the same way for an offline recognizer. With
+:class:`sherpa_onnx.OfflineTts`, each request is a tuple ``(text, sid, speed)``
+and :meth:`BatchScheduler.submit` returns its generated audio::
+
+    scheduler = BatchScheduler(tts, max_batch_size=8, max_wait_ms=20)
+    await scheduler.start()
+
+    audio = await scheduler.submit(("How are you?", 0, 1.0))
+"""
+
+import asyncio
+import bisect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class Histogram:
+    """A histogram with fixed bucket boundaries.
+
+    ``counts[i]`` is the number of values ``v`` with
+    ``bounds[i-1] < v <= bounds[i]``. The last bucket counts values that
+    are larger than ``bounds[-1]``.
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        assert self.bounds == sorted(self.bounds), self.bounds
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {f"<={b}": c for b, c in zip(self.bounds, self.counts)}
+        buckets[f">{self.bounds[-1]}"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+    def __str__(self) -> str:
+        return str(self.to_dict())
+
+
+def _exponential_bounds(start: float, end: float) -> List[float]:
+    ans = []
+    b = start
+    while b <= end:
+        ans.append(b)
+        b *= 2
+    return ans
+
+
+class _Request:
+    __slots__ = ("item", "future", "enqueue_time")
+
+    def __init__(self, item: Any, future: asyncio.Future):
+        self.item = item
+        self.future = future
+        self.enqueue_time = time.monotonic()
+
+
+class BatchScheduler:
+    def __init__(
+        self,
+        recognizer: Any,
+        max_batch_size: int = 5,
+        max_wait_ms: float = 10,
+        num_workers: int = 1,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        """
+        Args:
+          recognizer:
+            An instance of :class:`sherpa_onnx.OnlineRecognizer` or
+            :class:`sherpa_onnx.OfflineRecognizer`, whose ``decode_streams()``
+            method is called with a list of streams for each batch, or an
+            instance of :class:`sherpa_onnx.OfflineTts`, whose
+            ``generate_batch()`` method is called with a list of requests.
+            It can also be a callable that accepts a list of submitted items.
+            If it returns a list with one entry per item, the entry is
+            returned by :meth:`submit` for that item.
+          max_batch_size:
+            Max number of requests in a batch.
+          max_wait_ms:
+            Max time in milliseconds that the first request of a batch waits
+            for more requests before the batch is processed.
+          num_workers:
+            Number of consumer tasks, i.e., max number of batches that are
+            processed at the same time.
+          executor:
+            The thread pool in which batches are processed. If None, a thread
+            pool with ``num_workers`` threads is created.
+        """
+        if hasattr(recognizer, "decode_streams"):
+            self.process_batch: Callable[[List[Any]], Any] = (
+                recognizer.decode_streams
+            )
+        elif hasattr(recognizer, "generate_batch"):
+            self.process_batch = recognizer.generate_batch
+        elif callable(recognizer):
+            self.process_batch = recognizer
+        else:
+            raise TypeError(
+                "Expect a recognizer with decode_streams(), a TTS with "
+                "generate_batch() or a callable. "
+                f"Given: {type(recognizer)}"
+            )
+
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size should be >= 1. Given {max_batch_size}")
+
+        if max_wait_ms < 0:
+            raise ValueError(f"max_wait_ms should be >= 0. Given {max_wait_ms}")
+
+        if num_workers < 1:
+            raise ValueError(f"num_workers should be >= 1. Given {num_workers}")
+
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.num_workers = num_workers
+
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=num_workers,
+            thread_name_prefix="nn",
+        )
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+        self.queue_depth_histogram = Histogram(
+            _exponential_bounds(1, max(1, 8 * max_batch_size))
+        )
+        self.batch_size_histogram = Histogram(range(1, max_batch_size + 1))
+        self.wait_time_ms_histogram = Histogram(_exponential_bounds(0.5, 1024))
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests that are waiting to be put into a batch."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        """Start the consumer tasks. It must be called from the event loop
+        that invokes :meth:`submit`."""
+        if self._tasks:
+            return
+
+        self._queue = asyncio.Queue()
+        for _ in range(self.num_workers):
+            self._tasks.append(asyncio.create_task(self._consumer_task()))
+
+    async def stop(self):
+        """Stop the consumer tasks. Requests that are still in the queue are
+        cancelled."""
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait().future.cancel()
+
+        if self._own_executor:
+            self.executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "BatchScheduler":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def submit(self, item: Any) -> Any:
+        """Put the item, e.g., a stream, into the queue and wait until
+        the batch containing it has been processed.
+
+        Return the result of the item if the batch is processed by
+        ``generate_batch()`` or a callable returning a list of results.
+        Otherwise, return None.
+
+        Exceptions raised while processing the batch are re-raised here.
+        """
+        if not self._tasks:
+            raise RuntimeError("Please call start() first")
+
+        loop = asyncio.get_running_loop()
+        request = _Request(item, loop.create_future())
+        self._queue.put_nowait(request)
+        return await request.future
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current queue depth and the histograms of queue depth,
+        batch size and wait time in milliseconds.
+
+        The queue depth histogram is sampled each time a batch is started.
+        The wait time is measured from :meth:`submit` until the batch
+        containing the request is handed to the thread pool.
+        """
+        return {
+            "queue_depth": self.queue_depth,
+            "queue_depth_histogram": self.queue_depth_histogram.to_dict(),
+            "batch_size_histogram": self.batch_size_histogram.to_dict(),
+            "wait_time_ms_histogram": self.wait_time_ms_histogram.to_dict(),
+        }
+
+    def reset_stats(self):
+        self.queue_depth_histogram.reset()
+        self.batch_size_histogram.reset()
+        self.wait_time_ms_histogram.reset()
+
+    async def _get_batch(self) -> List[_Request]:
+        # Sleep until there is at least one request
+        first = await self._queue.get()
+        self.queue_depth_histogram.add(self._queue.qsize() + 1)
+
+        batch = [first]
+        deadline = first.enqueue_time + self.max_wait_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+
+            try:
+                r = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+            batch.append(r)
+
+        return batch
+
+    async def _consumer_task(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._get_batch()
+
+            # Skip requests whose callers have been cancelled
+            batch = [r for r in batch if not r.future.done()]
+            if not batch:
+                continue
+
+            now = time.monotonic()
+            for r in batch:
+                self.wait_time_ms_histogram.add((now - r.enqueue_time) * 1000)
+            self.batch_size_histogram.add(len(batch))
+
+            try:
+                results, error = await loop.run_in_executor(
+                    self.executor,
+                    self._process_batch,
+                    [r.item for r in batch],
+                )
+            except asyncio.CancelledError:
+                for r in batch:
+                    r.future.cancel()
+                raise
+
+            if not isinstance(results, list) or len(results) != len(batch):
+                results = [None] * len(batch)
+
+            for r, result in zip(batch, results):
+                if r.future.done():
+                    continue
+
+                if error is None:
+                    r.future.set_result(result)
+                else:
+                    r.future.set_exception(error)
+
+    def _process_batch(self, items: List[Any]) -> Tuple[Any, Optional[Exception]]:
+        # The exception is returned instead of being raised in the consumer
+        # task so that its traceback does not reference the frame of the
+        # consumer task, which is still running.
+        try:
+            return self.process_batch(items), None
+        except Exception as e:
+            return None, e
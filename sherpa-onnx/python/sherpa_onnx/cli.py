@@ -10,7 +10,7 @@ except ImportError:
     raise
 
 from pathlib import Path
-from sherpa_onnx import text2token
+from sherpa_onnx import compile_lexicon, compile_tokens, text2token
 
 
 @click.group()
@@ -107,3 +107,54 @@ def encode_text(
         for i, txt in enumerate(encoded_texts):
             txt += extra_info[i]
             f.write(" ".join(txt) + "\n")
+
+
+@cli.command(name="compile-lexicon")
+@click.argument("input", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output", type=click.Path())
+@click.option(
+    "--tokens",
+    type=click.Path(exists=True, dir_okay=False),
+    required=True,
+    help="The path to tokens.txt of the model that uses the lexicon.",
+)
+def compile_lexicon_cmd(input: Path, output: Path, tokens: Path):
+    """
+    Compile the lexicon.txt given by the INPUT into a binary lexicon and save
+    it to the OUTPUT.
+
+    The binary lexicon contains words sorted in byte order and their token IDs,
+    so it is memory-mapped and used as it is instead of being parsed at startup.
+    It can be passed to a TTS model wherever lexicon.txt is expected, e.g.,
+    --vits-lexicon=./lexicon.bin. Since it contains token IDs instead of tokens,
+    it has to be re-compiled if tokens.txt changes.
+
+    Words that contain tokens not in tokens.txt are dropped, the same as when
+    lexicon.txt is loaded.
+
+    example:
+
+    sherpa-onnx compile-lexicon --tokens ./tokens.txt ./lexicon.txt ./lexicon.bin
+    """
+    if not compile_lexicon(lexicon=str(input), tokens=str(tokens), output=str(output)):
+        raise click.ClickException(f"Failed to compile {input}")
+    logging.info(f"Saved to {output}")
+
+
+@cli.command(name="compile-tokens")
+@click.argument("input", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output", type=click.Path())
+def compile_tokens_cmd(input: Path, output: Path):
+    """
+    Convert the tokens.txt given by the INPUT to the binary format and save it
+    to the OUTPUT. The result can be used in place of tokens.txt.
+
+    Note: tokens.txt in which two tokens share the same ID is not supported.
+
+    example:
+
+    sherpa-onnx compile-tokens ./tokens.txt ./tokens.bin
+    """
+    if not compile_tokens(tokens=str(input), output=str(output)):
+        raise click.ClickException(f"Failed to compile {input}")
+    logging.info(f"Saved to {output}")
@@ -1,11 +1,12 @@
 # Copyright (c)  2023 by manyeyes
 # Copyright (c)  2023  Xiaomi Corporation
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from _sherpa_onnx import (
     FeatureExtractorConfig,
     HomophoneReplacerConfig,
+    HotwordsHandle,
     OfflineCanaryModelConfig,
     OfflineCtcFstDecoderConfig,
     OfflineDolphinModelConfig,
@@ -391,6 +392,7 @@ class OfflineRecognizer(object):
         hr_dict_dir: str = "",
         hr_rule_fsts: str = "",
         hr_lexicon: str = "",
+        num_decode_workers: int = 1,
     ):
         """
         Please refer to
@@ -426,6 +428,10 @@ class OfflineRecognizer(object):
           rule_fars:
             If not empty, it specifies fst archives for inverse text normalization.
             If there are multiple archives, they are separated by a comma.
+          num_decode_workers:
+            Number of threads to decode streams in parallel in
+            ``decode_streams()``. The model accepts only one stream at a time,
+            so streams are decoded in parallel instead of in a batch.
         """
         self = cls.__new__(cls)
         model_config = OfflineModelConfig(
@@ -450,6 +456,7 @@ class OfflineRecognizer(object):
             hr=HomophoneReplacerConfig(
                 dict_dir=hr_dict_dir, lexicon=hr_lexicon, rule_fsts=hr_rule_fsts
             ),
+            num_decode_workers=num_decode_workers,
         )
         self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
@@ -1158,6 +1165,7 @@ class OfflineRecognizer(object):
         hr_dict_dir: str = "",
         hr_rule_fsts: str = "",
         hr_lexicon: str = "",
+        num_decode_workers: int = 1,
     ):
         """
         Please refer to
@@ -1192,6 +1200,10 @@ class OfflineRecognizer(object):
           rule_fars:
             If not empty, it specifies fst archives for inverse text normalization.
             If there are multiple archives, they are separated by a comma.
+          num_decode_workers:
+            Number of threads to decode streams in parallel in
+            ``decode_streams()``. The model accepts only one stream at a time,
+            so streams are decoded in parallel instead of in a batch.
         """
         self = cls.__new__(cls)
         model_config = OfflineModelConfig(
@@ -1219,19 +1231,65 @@ class OfflineRecognizer(object):
                 lexicon=hr_lexicon,
                 rule_fsts=hr_rule_fsts,
             ),
+            num_decode_workers=num_decode_workers,
         )
         self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
-    def create_stream(self, hotwords: Optional[str] = None):
+    def create_stream(
+        self, hotwords: Optional[Union[str, HotwordsHandle]] = None
+    ) -> OfflineStream:
+        """Create a stream for decoding.
+
+        Args:
+          hotwords:
+            Hotwords for this stream, separated by ``/``. It can also be
+            the return value of :meth:`compile_hotwords`, which avoids
+            compiling the same hotwords for every stream.
+        """
         if hotwords is None:
             return self.recognizer.create_stream()
         else:
             return self.recognizer.create_stream(hotwords)
 
+    def compile_hotwords(self, hotwords: str) -> HotwordsHandle:
+        """Compile hotwords into a handle that can be passed to
+        :meth:`create_stream`.
+
+        Streams created from the same handle share a single compiled
+        context graph. Compiled hotwords are also cached inside the
+        recognizer, so passing the same text to :meth:`create_stream`
+        again does not compile it again.
+
+        Only transducer models support hotwords.
+        """
+        return self.recognizer.compile_hotwords(hotwords)
+
     def decode_stream(self, s: OfflineStream):
         self.recognizer.decode_stream(s)
 
-    def decode_streams(self, ss: List[OfflineStream]):
-        self.recognizer.decode_streams(ss)
+    def decode_streams(
+        self,
+        ss: List[OfflineStream],
+        max_padding_ratio: float = 1.0,
+        max_frames_per_batch: int = 0,
+    ):
+        """Decode a list of streams.
+
+        Args:
+          ss:
+            A list of streams.
+          max_padding_ratio:
+            If less than 1, streams are sorted by length and split into
+            buckets so that the ratio of padded frames in each bucket does
+            not exceed it. Each bucket is decoded as a separate batch.
+          max_frames_per_batch:
+            If positive, num_streams * max_num_frames of each bucket does not
+            exceed it. A stream longer than it is decoded alone.
+        """
+        self.recognizer.decode_streams(
+            ss,
+            max_padding_ratio=max_padding_ratio,
+            max_frames_per_batch=max_frames_per_batch,
+        )
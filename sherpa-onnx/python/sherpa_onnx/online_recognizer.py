@@ -1,12 +1,13 @@
 # Copyright (c)  2023  Xiaomi Corporation
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from _sherpa_onnx import (
     CudaConfig,
     EndpointConfig,
     FeatureExtractorConfig,
     HomophoneReplacerConfig,
+    HotwordsHandle,
     OnlineCtcFstDecoderConfig,
     OnlineLMConfig,
     OnlineModelConfig,
@@ -17,6 +18,7 @@ from _sherpa_onnx import OnlineRecognizer as _Recognizer
 from _sherpa_onnx import (
     OnlineRecognizerConfig,
     OnlineRecognizerResult,
+    OnlineRecognizerResultDelta,
     OnlineStream,
     OnlineTransducerModelConfig,
     OnlineWenetCtcModelConfig,
@@ -751,6 +753,7 @@ class OnlineRecognizer(object):
         hr_dict_dir: str = "",
         hr_rule_fsts: str = "",
         hr_lexicon: str = "",
+        num_decode_workers: int = 1,
     ):
         """
         Please refer to
@@ -805,6 +808,10 @@ class OnlineRecognizer(object):
             If there are multiple archives, they are separated by a comma.
           device:
             onnxruntime cuda device index.
+          num_decode_workers:
+            Number of threads to decode streams in parallel in
+            ``decode_streams()``. The model accepts only one stream at a time,
+            so streams are decoded in parallel instead of in a batch.
         """
         self = cls.__new__(cls)
         _assert_file_exists(tokens)
@@ -855,18 +862,42 @@ class OnlineRecognizer(object):
                 lexicon=hr_lexicon,
                 rule_fsts=hr_rule_fsts,
             ),
+            num_decode_workers=num_decode_workers,
         )
 
         self.recognizer = _Recognizer(recognizer_config)
         self.config = recognizer_config
         return self
 
-    def create_stream(self, hotwords: Optional[str] = None):
+    def create_stream(
+        self, hotwords: Optional[Union[str, HotwordsHandle]] = None
+    ) -> OnlineStream:
+        """Create a stream for decoding.
+
+        Args:
+          hotwords:
+            Hotwords for this stream, separated by ``/``. It can also be
+            the return value of :meth:`compile_hotwords`, which avoids
+            compiling the same hotwords for every stream.
+        """
         if hotwords is None:
             return self.recognizer.create_stream()
         else:
             return self.recognizer.create_stream(hotwords)
 
+    def compile_hotwords(self, hotwords: str) -> HotwordsHandle:
+        """Compile hotwords into a handle that can be passed to
+        :meth:`create_stream`.
+
+        Streams created from the same handle share a single compiled
+        context graph. Compiled hotwords are also cached inside the
+        recognizer, so passing the same text to :meth:`create_stream`
+        again does not compile it again.
+
+        Only transducer models support hotwords.
+        """
+        return self.recognizer.compile_hotwords(hotwords)
+
     def decode_stream(self, s: OnlineStream):
         self.recognizer.decode_stream(s)
 
@@ -894,7 +925,7 @@ class OnlineRecognizer(object):
     def start_time(self, s: OnlineStream) -> float:
         return self.recognizer.get_result(s).start_time
 
-    def ys_probs(self, s: OnlineStream) -> List[float]:
+    def ys_probs(self, s: OnlineStream) -> "numpy.ndarray":
         return self.recognizer.get_result(s).ys_probs
 
     def lm_probs(self, s: OnlineStream) -> List[float]:
@@ -903,6 +934,26 @@ class OnlineRecognizer(object):
     def context_scores(self, s: OnlineStream) -> List[float]:
         return self.recognizer.get_result(s).context_scores
 
+    def get_result_delta(self, s: OnlineStream) -> OnlineRecognizerResultDelta:
+        """Return the tokens that have changed since the last call of this
+        method for the given stream.
+
+        To keep a list of tokens of the current segment up to date, use::
+
+            delta = recognizer.get_result_delta(s)
+            if delta.segment != segment:
+                segment = delta.segment
+                tokens = []
+            del tokens[delta.start :]
+            tokens.extend(delta.tokens)
+
+        ``delta.start`` is less than ``len(tokens)`` only if previously
+        returned tokens have been revised, e.g., by modified beam search.
+        It is cheaper than :meth:`get_result_all` for long segments since only
+        new tokens are converted to Python objects.
+        """
+        return self.recognizer.get_result_delta(s)
+
     def is_endpoint(self, s: OnlineStream) -> bool:
         return self.recognizer.is_endpoint(s)
 
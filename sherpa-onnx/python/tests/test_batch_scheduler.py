@@ -0,0 +1,111 @@
+# sherpa-onnx/python/tests/test_batch_scheduler.py
+#
+# Copyright (c)  2025  Xiaomi Corporation
+#
+# To run this single test, use
+#
+#  ctest --verbose -R  test_batch_scheduler_py
+import asyncio
+import time
+import unittest
+
+from sherpa_onnx.batch_scheduler import BatchScheduler
+
+
+class FakeRecognizer:
+    def __init__(self):
+        self.batches = []
+
+    def decode_streams(self, streams):
+        if "bad" in streams:
+            raise ValueError("bad stream")
+        self.batches.append(list(streams))
+
+
+class FakeTts:
+    def __init__(self):
+        self.batches = []
+
+    def generate_batch(self, requests):
+        self.batches.append(list(requests))
+        return [f"{text}-{sid}-{speed}" for text, sid, speed in requests]
+
+
+class TestBatchScheduler(unittest.TestCase):
+    def test_batch_by_size(self):
+        async def run():
+            recognizer = FakeRecognizer()
+            async with BatchScheduler(
+                recognizer, max_batch_size=4, max_wait_ms=1000
+            ) as scheduler:
+                start = time.monotonic()
+                await asyncio.gather(*[scheduler.submit(i) for i in range(8)])
+                elapsed = time.monotonic() - start
+
+                # full batches must not wait for max_wait_ms
+                assert elapsed < 0.5, elapsed
+                assert recognizer.batches == [[0, 1, 2, 3], [4, 5, 6, 7]], (
+                    recognizer.batches
+                )
+
+                stats = scheduler.stats()
+                assert stats["queue_depth"] == 0, stats
+                assert stats["batch_size_histogram"]["count"] == 2, stats
+                assert stats["wait_time_ms_histogram"]["count"] == 8, stats
+
+        asyncio.run(run())
+
+    def test_batch_by_deadline(self):
+        async def run():
+            recognizer = FakeRecognizer()
+            async with BatchScheduler(
+                recognizer, max_batch_size=10, max_wait_ms=50
+            ) as scheduler:
+                start = time.monotonic()
+                await asyncio.gather(scheduler.submit("a"), scheduler.submit("b"))
+                elapsed = time.monotonic() - start
+
+                assert 0.04 < elapsed < 1, elapsed
+                assert recognizer.batches == [["a", "b"]], recognizer.batches
+                assert scheduler.wait_time_ms_histogram.max >= 40, scheduler.stats()
+
+        asyncio.run(run())
+
+    def test_exception(self):
+        async def run():
+            recognizer = FakeRecognizer()
+            async with BatchScheduler(
+                recognizer, max_batch_size=2, max_wait_ms=10
+            ) as scheduler:
+                with self.assertRaises(ValueError):
+                    await scheduler.submit("bad")
+
+                # the scheduler still works after an error
+                await scheduler.submit("good")
+                assert recognizer.batches == [["good"]], recognizer.batches
+
+        asyncio.run(run())
+
+    def test_results(self):
+        async def run():
+            tts = FakeTts()
+            async with BatchScheduler(
+                tts, max_batch_size=3, max_wait_ms=10
+            ) as scheduler:
+                results = await asyncio.gather(
+                    *[scheduler.submit((f"t{i}", i, 1.0)) for i in range(4)]
+                )
+                assert results == [f"t{i}-{i}-1.0" for i in range(4)], results
+                assert [len(b) for b in tts.batches] == [3, 1], tts.batches
+
+            # decode_streams() returns None
+            async with BatchScheduler(
+                FakeRecognizer(), max_batch_size=2, max_wait_ms=10
+            ) as scheduler:
+                assert await scheduler.submit("a") is None
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+# sherpa-onnx/python/tests/test_multi_stream_vad.py
+#
+# Copyright (c)  2025  Xiaomi Corporation
+#
+# To run this single test, use
+#
+#  ctest --verbose -R  test_multi_stream_vad_py
+
+import unittest
+import wave
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import sherpa_onnx
+
+d = "/tmp/vad-models"
+
+
+def read_wave(wave_filename: str) -> np.ndarray:
+    """
+    Args:
+      wave_filename:
+        Path to a wave file. It should be single channel, 16kHz, and each
+        sample should be 16-bit.
+    Returns:
+      Return a 1-D array of dtype np.float32 containing the samples, which
+      are normalized to the range [-1, 1].
+    """
+    with wave.open(wave_filename) as f:
+        assert f.getnchannels() == 1, f.getnchannels()
+        assert f.getsampwidth() == 2, f.getsampwidth()  # it is in bytes
+        assert f.getframerate() == 16000, f.getframerate()
+        num_samples = f.getnframes()
+        samples = f.readframes(num_samples)
+        samples_int16 = np.frombuffer(samples, dtype=np.int16)
+        samples_float32 = samples_int16.astype(np.float32)
+
+        return samples_float32 / 32768
+
+
+def get_config(model: str) -> sherpa_onnx.VadModelConfig:
+    config = sherpa_onnx.VadModelConfig()
+    if "ten" in Path(model).name:
+        config.ten_vad.model = model
+        config.ten_vad.min_silence_duration = 0.25
+    else:
+        config.silero_vad.model = model
+        config.silero_vad.min_silence_duration = 0.25
+    config.sample_rate = 16000
+    return config
+
+
+def get_segments(vad) -> List[Tuple[int, int]]:
+    ans = []
+    while not vad.empty():
+        ans.append((vad.front.start, len(vad.front.samples)))
+        vad.pop()
+    return ans
+
+
+def run_single_stream(
+    config: sherpa_onnx.VadModelConfig, samples: np.ndarray, chunk_size: int
+) -> List[Tuple[int, int]]:
+    vad = sherpa_onnx.VoiceActivityDetector(config, buffer_size_in_seconds=100)
+
+    segments = []
+    for start in range(0, samples.shape[0], chunk_size):
+        vad.accept_waveform(samples[start : start + chunk_size])
+        segments += get_segments(vad)
+
+    vad.flush()
+    segments += get_segments(vad)
+
+    return segments
+
+
+def run_multi_stream(
+    config: sherpa_onnx.VadModelConfig,
+    waves: List[np.ndarray],
+    chunk_sizes: List[int],
+) -> List[List[Tuple[int, int]]]:
+    vad = sherpa_onnx.MultiStreamVoiceActivityDetector(
+        config, buffer_size_in_seconds=100
+    )
+    streams = [vad.create_stream() for _ in waves]
+    offsets = [0] * len(waves)
+    segments = [[] for _ in waves]
+
+    while any(o < w.shape[0] for o, w in zip(offsets, waves)):
+        for i, s in enumerate(streams):
+            if offsets[i] < waves[i].shape[0]:
+                s.accept_waveform(waves[i][offsets[i] : offsets[i] + chunk_sizes[i]])
+                offsets[i] += chunk_sizes[i]
+
+        ready = [s for s in streams if vad.is_ready(s)]
+        if ready:
+            vad.process(ready)
+
+        for i, s in enumerate(streams):
+            segments[i] += get_segments(s)
+
+    for i, s in enumerate(streams):
+        s.flush()
+        segments[i] += get_segments(s)
+
+    return segments
+
+
+class TestMultiStreamVoiceActivityDetector(unittest.TestCase):
+    def test_same_as_single_stream(self):
+        wave_filename = f"{d}/lei-jun-test.wav"
+        if not Path(wave_filename).is_file():
+            print(f"{wave_filename} does not exist, skipping test")
+            return
+
+        samples = read_wave(wave_filename)[: 16000 * 60]
+
+        # Streams of different lengths, fed with different chunk sizes,
+        # so that they have different numbers of windows in a batch
+        waves = [samples, samples[16000 * 3 :], samples[: 16000 * 20], samples]
+        chunk_sizes = [1600, 512, 4000, 100]
+
+        for model in [f"{d}/silero_vad.onnx", f"{d}/ten-vad.onnx"]:
+            if not Path(model).is_file():
+                print(f"{model} does not exist, skipping it")
+                continue
+
+            config = get_config(model)
+
+            expected = [
+                run_single_stream(config, w, c) for w, c in zip(waves, chunk_sizes)
+            ]
+            self.assertTrue(any(expected), model)
+
+            segments = run_multi_stream(config, waves, chunk_sizes)
+            self.assertEqual(segments, expected, model)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -143,6 +143,69 @@ class TestOnlineRecognizer(unittest.TestCase):
                     print(f"{wave_filename}\n{result}")
                     print("-" * 10)
 
+    def test_transducer_result_delta(self):
+        encoder = f"{d}/sherpa-onnx-streaming-zipformer-bilingual-zh-en-2023-02-20/encoder-epoch-99-avg-1.int8.onnx"
+        decoder = f"{d}/sherpa-onnx-streaming-zipformer-bilingual-zh-en-2023-02-20/decoder-epoch-99-avg-1.onnx"
+        joiner = f"{d}/sherpa-onnx-streaming-zipformer-bilingual-zh-en-2023-02-20/joiner-epoch-99-avg-1.int8.onnx"
+        tokens = f"{d}/sherpa-onnx-streaming-zipformer-bilingual-zh-en-2023-02-20/tokens.txt"
+        wave0 = f"{d}/sherpa-onnx-streaming-zipformer-bilingual-zh-en-2023-02-20/test_wavs/0.wav"
+
+        if not Path(encoder).is_file():
+            print("skipping test_transducer_result_delta()")
+            return
+
+        for decoding_method in ["greedy_search", "modified_beam_search"]:
+            recognizer = sherpa_onnx.OnlineRecognizer.from_transducer(
+                encoder=encoder,
+                decoder=decoder,
+                joiner=joiner,
+                tokens=tokens,
+                num_threads=1,
+                decoding_method=decoding_method,
+                provider="cpu",
+            )
+            s = recognizer.create_stream()
+            samples, sample_rate = read_wave(wave0)
+            tail_paddings = np.zeros(int(0.2 * sample_rate), dtype=np.float32)
+            samples = np.concatenate([samples, tail_paddings])
+
+            segment = None
+            result_tokens = []
+            chunk = int(0.2 * sample_rate)
+            for start in range(0, samples.shape[0], chunk):
+                s.accept_waveform(sample_rate, samples[start : start + chunk])
+                while recognizer.is_ready(s):
+                    recognizer.decode_stream(s)
+
+                delta = recognizer.get_result_delta(s)
+                if delta.segment != segment:
+                    segment = delta.segment
+                    result_tokens = []
+                self.assertLessEqual(delta.start, len(result_tokens))
+                del result_tokens[delta.start :]
+                result_tokens.extend(delta.tokens)
+
+                r = recognizer.get_result_all(s)
+                self.assertEqual(result_tokens, r.tokens)
+                self.assertEqual("".join(result_tokens), r.text)
+
+                # Nothing is decoded between two polls
+                delta = recognizer.get_result_delta(s)
+                self.assertEqual(delta.start, len(result_tokens))
+                self.assertEqual(len(delta.tokens), 0)
+
+            self.assertNotEqual(recognizer.get_result(s), "")
+
+            # The cached result must not survive a reset
+            recognizer.reset(s)
+            self.assertEqual(recognizer.get_result(s), "")
+            self.assertEqual(len(recognizer.tokens(s)), 0)
+
+            delta = recognizer.get_result_delta(s)
+            self.assertNotEqual(delta.segment, segment)
+            self.assertEqual(delta.start, 0)
+            self.assertEqual(len(delta.tokens), 0)
+
     def test_zipformer2_ctc(self):
         m = "sherpa-onnx-streaming-zipformer-ctc-multi-zh-hans-2023-12-13"
         for use_int8 in [True, False]:
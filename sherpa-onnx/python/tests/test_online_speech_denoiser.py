@@ -0,0 +1,92 @@
+# sherpa-onnx/python/tests/test_online_speech_denoiser.py
+#
+# Copyright (c)  2025  Xiaomi Corporation
+#
+# To run this single test, use
+#
+#  ctest --verbose -R  test_online_speech_denoiser_py
+
+import unittest
+import wave
+from pathlib import Path
+
+import numpy as np
+import sherpa_onnx
+
+d = "/tmp/speech-enhancement-models"
+
+
+def read_wave(wave_filename: str) -> np.ndarray:
+    """
+    Args:
+      wave_filename:
+        Path to a wave file. It should be single channel, 16kHz, and each
+        sample should be 16-bit.
+    Returns:
+      Return a 1-D array of dtype np.float32 containing the samples, which
+      are normalized to the range [-1, 1].
+    """
+    with wave.open(wave_filename) as f:
+        assert f.getnchannels() == 1, f.getnchannels()
+        assert f.getsampwidth() == 2, f.getsampwidth()  # it is in bytes
+        assert f.getframerate() == 16000, f.getframerate()
+        num_samples = f.getnframes()
+        samples = f.readframes(num_samples)
+        samples_int16 = np.frombuffer(samples, dtype=np.int16)
+        samples_float32 = samples_int16.astype(np.float32)
+
+        return samples_float32 / 32768
+
+
+def get_model_config(
+    model: str,
+) -> sherpa_onnx.OfflineSpeechDenoiserModelConfig:
+    return sherpa_onnx.OfflineSpeechDenoiserModelConfig(
+        gtcrn=sherpa_onnx.OfflineSpeechDenoiserGtcrnModelConfig(model=model),
+        num_threads=1,
+    )
+
+
+class TestOnlineSpeechDenoiser(unittest.TestCase):
+    def test_gtcrn_same_as_offline(self):
+        model = f"{d}/gtcrn_simple.onnx"
+        wave_filename = f"{d}/speech_with_noise.wav"
+        if not Path(model).is_file() or not Path(wave_filename).is_file():
+            print(f"{model} or {wave_filename} does not exist, skipping test")
+            return
+
+        samples = read_wave(wave_filename)
+
+        offline_sd = sherpa_onnx.OfflineSpeechDenoiser(
+            sherpa_onnx.OfflineSpeechDenoiserConfig(model=get_model_config(model))
+        )
+        expected = offline_sd.run(samples, 16000).samples
+
+        online_sd = sherpa_onnx.OnlineSpeechDenoiser(
+            sherpa_onnx.OnlineSpeechDenoiserConfig(model=get_model_config(model))
+        )
+
+        for chunk_size in [160, 1000, 4096]:
+            stream = online_sd.create_stream()
+            denoised = []
+            for start in range(0, samples.shape[0], chunk_size):
+                chunk = samples[start : start + chunk_size]
+                out = online_sd.run(stream, chunk, 16000)
+                denoised.append(out.samples)
+            denoised.append(online_sd.flush(stream).samples)
+            denoised = np.concatenate(denoised)
+
+            self.assertEqual(denoised.shape[0], samples.shape[0], chunk_size)
+
+            # The offline denoiser drops the samples after the last
+            # complete frame
+            n = min(denoised.shape[0], expected.shape[0])
+            self.assertGreater(n, samples.shape[0] - 512, chunk_size)
+
+            np.testing.assert_allclose(
+                denoised[:n], expected[:n], atol=1e-4, err_msg=str(chunk_size)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()